@@ -4,6 +4,7 @@ import requests
 import json
 import sys
 from datetime import datetime
+from harness_metrics import ServerTimingCollector
 
 # Configuration
 BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
@@ -14,6 +15,8 @@ TEST_USER_NAME = "API Test User"
 class APIEndpointsTester:
     def __init__(self):
         self.session = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session)
         self.auth_token = None
         self.test_results = []
         
@@ -499,6 +502,56 @@ class APIEndpointsTester:
             self.log_result("API Response Validation", False, f"Response validation error: {str(e)}")
             return False
     
+    def test_conditional_get(self):
+        """Test that repeating a GET with If-None-Match returns 304 with no body"""
+        try:
+            print("\n🔄 Testing Conditional GET (ETag / If-None-Match)...")
+            
+            all_passed = True
+            for endpoint in ["profile", "auth/me", "matches", "conversations"]:
+                first = self.session.get(f"{BASE_URL}/{endpoint}")
+                etag = first.headers.get('ETag')
+                if first.status_code != 200 or not etag:
+                    self.log_result(f"Conditional GET - {endpoint}", False,
+                                  f"First request returned {first.status_code} with ETag {etag!r}")
+                    all_passed = False
+                    continue
+                
+                second = self.session.get(f"{BASE_URL}/{endpoint}", headers={'If-None-Match': etag})
+                if second.status_code == 304 and not second.content and second.headers.get('ETag') == etag:
+                    self.log_result(f"Conditional GET - {endpoint}", True,
+                                  f"304 with empty body ({len(first.content)} bytes saved)")
+                else:
+                    self.log_result(f"Conditional GET - {endpoint}", False,
+                                  f"Expected empty 304, got {second.status_code} with {len(second.content)} bytes")
+                    all_passed = False
+            
+            # A profile write must change the profile and auth/me ETags
+            before = {endpoint: self.session.get(f"{BASE_URL}/{endpoint}").headers.get('ETag')
+                      for endpoint in ["profile", "auth/me"]}
+            current = self.session.get(f"{BASE_URL}/profile").json().get('profile') or {}
+            update = {key: current.get(key) for key in ['bio', 'looksToConnect', 'skills', 'interests', 'experience',
+                                                         'projects', 'awards', 'socials', 'preferences']}
+            self.session.put(f"{BASE_URL}/profile", json=update)
+            for endpoint, etag in before.items():
+                response = self.session.get(f"{BASE_URL}/{endpoint}", headers={'If-None-Match': etag})
+                if response.status_code == 200 and response.headers.get('ETag') != etag:
+                    self.log_result(f"ETag Invalidation - {endpoint}", True, "New ETag after profile update")
+                else:
+                    self.log_result(f"ETag Invalidation - {endpoint}", False,
+                                  f"Stale ETag honoured after profile update ({response.status_code})")
+                    all_passed = False
+            
+            return all_passed
+                
+        except Exception as e:
+            self.log_result("Conditional GET", False, f"Conditional GET error: {str(e)}")
+            return False
+    
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+    
     def run_all_tests(self):
         """Run all API endpoint tests"""
         print("🚀 Starting Enhanced Profile API Endpoints Testing...")
@@ -514,7 +567,9 @@ class APIEndpointsTester:
             self.test_put_profile_endpoint,
             self.test_get_auth_me_endpoint,
             self.test_enhanced_profile_structure_handling,
-            self.test_api_response_validation
+            self.test_api_response_validation,
+            self.test_conditional_get,
+            self.check_query_budgets
         ]
         
         passed_tests = 0
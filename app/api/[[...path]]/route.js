@@ -1,10 +1,47 @@
+import path from 'path';
 import { MongoClient } from 'mongodb';
 import bcrypt from 'bcryptjs';
 import { v4 as uuidv4 } from 'uuid';
-import { NextResponse } from 'next/server';
-
-const client = new MongoClient(process.env.MONGO_URL);
+import { buildProfilePatch, revisionFilter } from '@/lib/profile-patch';
+import { createRouter, runRoute } from '@/lib/router';
+import { cardWithProfile } from '@/lib/card-cache';
+import { CARD_VIEWS, createCardViews, DEFAULT_CARD_VIEW, selectView } from '@/lib/card-views';
+import { conditionalJson, documentVersion, encodeResponse, json, versionTag } from '@/lib/respond';
+import { createRequestMetrics, formatServerTiming, increment, runWithMetrics, timed, trackCommands } from '@/lib/request-metrics';
+import { encodeFeatures, markFeaturesStale, precomputedCandidates, removeFeatures, syncFeatureIndex, updateFeatures } from '@/lib/ranking';
+import { issueSession, resolveSession, revokeSession } from '@/lib/sessions';
+import { postSkillFields, profileSkillFields } from '@/lib/skill-taxonomy';
+import { selectSkillFilter, skillFilterQuery } from '@/lib/skills';
+import { geocode } from '@/lib/gazetteer';
+import { radiusQuery, selectRadius } from '@/lib/geo';
+import { highlight, searchPeople, selectSearch, textSearch } from '@/lib/search';
+import {
+  countPendingAdmirers, ensureAdmirerIndexes, interleaveAdmirers, MAX_ADMIRERS_PER_DECK, pendingAdmirers
+} from '@/lib/admirers';
+import { createSwipeBuffer } from '@/lib/swipe-buffer';
+import { compactedSwipeCount, compactedTargetIds, hasCompactedSwipe } from '@/lib/swipe-sets';
+import { idTimestamp, uuidv7 } from '@/lib/ids';
+import { ensureMessageIndexes, olderThanCursor, selectMessagePage } from '@/lib/messages';
+import {
+  advanceReadCursor, getOrCreateConversation, nextMessageSeq, participantKey, unreadCount
+} from '@/lib/conversations';
+import { exportStream } from '@/lib/export';
+import { csvRows, importPosts, MAX_IMPORT_ROWS, ndjsonRows } from '@/lib/post-import';
+import { createCascadeDeleter } from '@/lib/cascade-delete';
+import { createJobQueue } from '@/lib/job-queue';
+import { applyDecisions, parseDecisions, upsertMatch } from '@/lib/inquiries';
+
+const client = new MongoClient(process.env.MONGO_URL, { monitorCommands: true });
+trackCommands(client);
 const dbName = process.env.DB_NAME || 'hackathon_tinder';
+const DECK_SIZE = 10;
+// Filtered people decks rank at most this many matching profiles
+const FILTER_CANDIDATES = 2000;
+
+// Fields derived from a post's skillsNeeded and location for the explore filters
+function postFilterFields(post) {
+  return { ...postSkillFields(post), geo: geocode(post.location) };
+}
 
 // Database connection helper
 async function connectDB() {
@@ -14,6 +51,116 @@ async function connectDB() {
   return client.db(dbName);
 }
 
+// LEFT swipes have no side effects, so they are acknowledged once journaled
+// and inserted in batches; SWIPE_BUFFER=off writes them synchronously. Each
+// buffer journals into its own subdirectory of SWIPE_JOURNAL_DIR, which must
+// be local to the host
+const swipeBuffer = process.env.SWIPE_BUFFER === 'off' ? null : createSwipeBuffer({
+  dir: process.env.SWIPE_JOURNAL_DIR || path.join(process.cwd(), '.swipe-journal'),
+  getCollection: async () => (await connectDB()).collection('swipes'),
+  flushMs: Number(process.env.SWIPE_FLUSH_MS || 5),
+  maxBatch: Number(process.env.SWIPE_FLUSH_BATCH || 500)
+});
+
+// Dependents of deleted posts and accounts go in background batches; see
+// lib/cascade-delete.js
+const cascadeDeleter = createCascadeDeleter({
+  batchSize: Number(process.env.DELETE_BATCH || 1000),
+  pauseMs: Number(process.env.DELETE_PAUSE_MS || 10)
+});
+
+// Whether the post and users a queued side effect refers to still exist.
+// Deleting a post or account removes it before queueing the cascade, so a
+// job that checks again after writing either sees the deletion and undoes
+// its write, or wrote before the cascade started and is swept by it.
+async function jobTargetsExist(db, postId, userIds) {
+  const [posts, users] = await Promise.all([
+    db.collection('posts').countDocuments({ id: postId }, { limit: 1 }),
+    db.collection('users').countDocuments({ id: { $in: userIds } })
+  ]);
+  return posts === 1 && users === new Set(userIds).size;
+}
+
+// Side effects handlers need not wait for. Jobs can run more than once, so
+// each handler upserts, and may run after a cascade deletion, so each one
+// skips or undoes writes for a deleted post or user.
+const jobHandlers = {
+  'inquiry.create': async (db, inquiry) => {
+    const targets = [db, inquiry.postId, [inquiry.userId]];
+    if (!await jobTargetsExist(...targets)) return;
+    const filter = { postId: inquiry.postId, userId: inquiry.userId };
+    await db.collection('inquiries').updateOne(filter, { $setOnInsert: inquiry }, { upsert: true });
+    if (!await jobTargetsExist(...targets)) await db.collection('inquiries').deleteOne(filter);
+  },
+  'match.create': async (db, match) => {
+    const targets = [db, match.postId, [match.aId, match.bId]];
+    if (!await jobTargetsExist(...targets)) return;
+    await upsertMatch(db, match);
+    if (!await jobTargetsExist(...targets)) {
+      await db.collection('matches').deleteOne({ aId: match.aId, bId: match.bId, postId: match.postId });
+    }
+  }
+};
+
+// Runs them on a durable queue in the background; JOB_QUEUE=off runs them
+// inline. See lib/job-queue.js.
+const jobQueue = process.env.JOB_QUEUE === 'off' ? null : createJobQueue({
+  getDb: connectDB,
+  handlers: jobHandlers,
+  concurrency: Number(process.env.JOB_CONCURRENCY || 4),
+  pollMs: Number(process.env.JOB_POLL_MS || 500),
+  maxAttempts: Number(process.env.JOB_MAX_ATTEMPTS || 5)
+});
+
+async function runSideEffect(db, type, payload, key) {
+  if (!jobQueue) {
+    await jobHandlers[type](db, payload);
+    return;
+  }
+  await jobQueue.enqueue(db, type, payload, { key });
+  increment('jobs_enqueued', 1);
+}
+
+// Ids the user swiped on: recent raw swipes, compacted older LEFT swipes and
+// swipes still waiting in the buffer
+async function swipedTargetIds(db, userId, targetType) {
+  // Swipes replayed from a crashed process's journal must be in Mongo first
+  await swipeBuffer?.ready();
+  const [swipes, compacted] = await Promise.all([
+    db.collection('swipes').find({
+      swiperId: userId,
+      targetType
+    }, { projection: { _id: 0, targetId: 1 } }).toArray(),
+    compactedTargetIds(db, userId, targetType)
+  ]);
+  const ids = [...swipes.map(s => s.targetId), ...compacted];
+  return swipeBuffer ? [...ids, ...swipeBuffer.pendingTargets(userId, targetType)] : ids;
+}
+
+// Loads user cards (user + profile) projected to one card view
+async function loadCards(userIds, projection) {
+  const db = await connectDB();
+  const [users, profiles] = await Promise.all([
+    db.collection('users').find({ id: { $in: userIds } }, { projection: projection.user }).toArray(),
+    db.collection('profiles').find({ userId: { $in: userIds } }, { projection: projection.profile }).toArray()
+  ]);
+
+  const profilesByUser = new Map(profiles.map(profile => [profile.userId, profile]));
+  const cards = new Map();
+  for (const user of users) {
+    cards.set(user.id, { user, profile: profilesByUser.get(user.id) || null });
+  }
+  return cards;
+}
+
+// Shared by every handler that hydrates users; invalidated on profile writes
+const cardViews = createCardViews({
+  load: loadCards,
+  maxEntries: Number(process.env.CARD_CACHE_SIZE || 5000),
+  ttlMs: Number(process.env.CARD_CACHE_TTL_SECONDS || 30) * 1000
+});
+const cards = cardViews.view(DEFAULT_CARD_VIEW);
+
 // Helper to get current user from session
 async function getCurrentUser(request) {
   const authorization = request.headers.get('authorization');
@@ -21,1670 +168,1911 @@ async function getCurrentUser(request) {
   
   const token = authorization.replace('Bearer ', '');
   const db = await connectDB();
-  const session = await db.collection('sessions').findOne({ token });
-  
-  if (!session || session.expiresAt < new Date()) {
+  const userId = await resolveSession(db, token);
+  if (!userId) {
     return null;
   }
   
-  const user = await db.collection('users').findOne({ id: session.userId });
-  return user;
+  const card = await cards.get(userId);
+  return card ? card.user : null;
 }
 
-// Authentication endpoints
-async function handleAuth(request, { params }) {
-  const path = params.path?.join('/') || '';
-  const method = request.method;
-
-  try {
-    const db = await connectDB();
-
-    // Register endpoint
-    if (path === 'auth/register' && method === 'POST') {
-      const { email, password, name } = await request.json();
-      
-      // Validate input
-      if (!email || !password || !name) {
-        return NextResponse.json({ error: 'Missing required fields' }, { status: 400 });
-      }
-
-      // Check if user exists
-      const existingUser = await db.collection('users').findOne({ email });
-      if (existingUser) {
-        return NextResponse.json({ error: 'User already exists' }, { status: 400 });
-      }
-
-      // Create user
-      const hashedPassword = await bcrypt.hash(password, 10);
-      const userId = uuidv4();
-      const user = {
-        id: userId,
-        email,
-        name,
-        username: email.split('@')[0] + '_' + userId.slice(0, 8),
-        passwordHash: hashedPassword,
-        imageUrl: 'https://images.unsplash.com/photo-1623479322729-28b25c16b011?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2Nzh8MHwxfHNlYXJjaHwzfHxkZXZlbG9wZXJzfGVufDB8fHx8MTc1OTYwODk3Nnww&ixlib=rb-4.1.0&q=85',
-        roleHeadline: null,
-        location: null,
-        timezone: null,
-        createdAt: new Date(),
-        updatedAt: new Date()
-      };
-
-      await db.collection('users').insertOne(user);
-
-      // Create session
-      const sessionToken = uuidv4();
-      const session = {
-        id: uuidv4(),
-        token: sessionToken,
-        userId: userId,
-        expiresAt: new Date(Date.now() + 30 * 24 * 60 * 60 * 1000), // 30 days
-        createdAt: new Date()
-      };
-
-      await db.collection('sessions').insertOne(session);
-
-      const { passwordHash, ...userWithoutPassword } = user;
-      return NextResponse.json({ 
-        user: userWithoutPassword, 
-        token: sessionToken 
-      });
-    }
-
-    // Login endpoint
-    if (path === 'auth/login' && method === 'POST') {
-      const { email, password } = await request.json();
-      
-      const user = await db.collection('users').findOne({ email });
-      if (!user) {
-        return NextResponse.json({ error: 'Invalid credentials' }, { status: 401 });
-      }
+// Route middleware: resolves the session user or rejects with 401
+async function requireUser(ctx) {
+  ctx.user = await timed('auth', () => getCurrentUser(ctx.request));
+  if (!ctx.user) {
+    return json({ error: 'Not authenticated' }, { status: 401 });
+  }
+}
 
-      const isValid = await bcrypt.compare(password, user.passwordHash);
-      if (!isValid) {
-        return NextResponse.json({ error: 'Invalid credentials' }, { status: 401 });
-      }
+const router = createRouter();
 
-      // Create session
-      const sessionToken = uuidv4();
-      const session = {
-        id: uuidv4(),
-        token: sessionToken,
-        userId: user.id,
-        expiresAt: new Date(Date.now() + 30 * 24 * 60 * 60 * 1000),
-        createdAt: new Date()
-      };
+// Register endpoint
+router.post('auth/register', async ({ request, db }) => {
+  const { email, password, name } = await request.json();
+  
+  // Validate input
+  if (!email || !password || !name) {
+    return json({ error: 'Missing required fields' }, { status: 400 });
+  }
 
-      await db.collection('sessions').insertOne(session);
+  // Check if user exists
+  const existingUser = await db.collection('users').findOne({ email });
+  if (existingUser) {
+    return json({ error: 'User already exists' }, { status: 400 });
+  }
 
-      const { passwordHash, ...userWithoutPassword } = user;
-      return NextResponse.json({ 
-        user: userWithoutPassword, 
-        token: sessionToken 
-      });
-    }
+  // Create user
+  const hashedPassword = await bcrypt.hash(password, 10);
+  const userId = uuidv4();
+  const user = {
+    id: userId,
+    email,
+    name,
+    username: email.split('@')[0] + '_' + userId.slice(0, 8),
+    passwordHash: hashedPassword,
+    imageUrl: 'https://images.unsplash.com/photo-1623479322729-28b25c16b011?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2Nzh8MHwxfHNlYXJjaHwzfHxkZXZlbG9wZXJzfGVufDB8fHx8MTc1OTYwODk3Nnww&ixlib=rb-4.1.0&q=85',
+    roleHeadline: null,
+    location: null,
+    timezone: null,
+    createdAt: new Date(),
+    updatedAt: new Date()
+  };
+
+  await db.collection('users').insertOne(user);
+
+  // Create session
+  const sessionToken = await issueSession(db, userId);
+
+  const { passwordHash, ...userWithoutPassword } = user;
+  return json({ 
+    user: userWithoutPassword, 
+    token: sessionToken 
+  });
+});
+
+// Login endpoint
+router.post('auth/login', async ({ request, db }) => {
+  const { email, password } = await request.json();
+  
+  const user = await db.collection('users').findOne({ email });
+  if (!user) {
+    return json({ error: 'Invalid credentials' }, { status: 401 });
+  }
 
-    // Logout endpoint
-    if (path === 'auth/logout' && method === 'POST') {
-      const authorization = request.headers.get('authorization');
-      if (authorization) {
-        const token = authorization.replace('Bearer ', '');
-        await db.collection('sessions').deleteOne({ token });
-      }
-      return NextResponse.json({ success: true });
-    }
+  const isValid = await bcrypt.compare(password, user.passwordHash);
+  if (!isValid) {
+    return json({ error: 'Invalid credentials' }, { status: 401 });
+  }
 
-    // Get current user
-    if (path === 'auth/me' && method === 'GET') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
-      
-      // Get user profile
-      const profile = await db.collection('profiles').findOne({ userId: user.id });
-      
-      const { passwordHash, ...userWithoutPassword } = user;
-      return NextResponse.json({ 
-        user: userWithoutPassword,
-        profile: profile || null
-      });
-    }
+  // Create session
+  const sessionToken = await issueSession(db, user.id);
 
-    // Profile endpoints
-    if (path === 'profile' && method === 'PUT') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
+  const { passwordHash, ...userWithoutPassword } = user;
+  return json({ 
+    user: userWithoutPassword, 
+    token: sessionToken 
+  });
+});
 
-      const profileData = await request.json();
-      const profileId = uuidv4();
-      
-      const profile = {
-        id: profileId,
-        userId: user.id,
-        bio: profileData.bio || null,
-        looksToConnect: profileData.looksToConnect || null,
-        skills: profileData.skills || [],
-        interests: profileData.interests || [],
-        experience: profileData.experience || [],
-        projects: profileData.projects || [],
-        awards: profileData.awards || [],
-        socials: profileData.socials || [],
-        preferences: profileData.preferences || {
-          desiredRoles: [],
-          techStack: [],
-          interestTags: [],
-          locationRadiusKm: 50,
-          remoteOk: true,
-          availabilityHrs: 20,
-          searchPeople: true,
-          searchProjects: true,
-          searchHackathons: true
-        },
-        createdAt: new Date(),
-        updatedAt: new Date()
-      };
+// Logout endpoint
+router.post('auth/logout', async ({ request, db }) => {
+  const authorization = request.headers.get('authorization');
+  if (authorization) {
+    const token = authorization.replace('Bearer ', '');
+    await revokeSession(db, token);
+  }
+  return json({ success: true });
+});
 
-      await db.collection('profiles').replaceOne(
-        { userId: user.id },
-        profile,
-        { upsert: true }
-      );
+// Get current user
+router.get('auth/me', requireUser, async ({ user }) => {
+  // Get user profile
+  const { profile } = await cards.get(user.id);
+  
+  const etag = versionTag('auth/me', documentVersion(user), documentVersion(profile));
+  return conditionalJson(etag, () => ({ 
+    user,
+    profile: profile || null
+  }));
+});
+
+// Profile endpoints
+router.put('profile', requireUser, async ({ request, db, user }) => {
+  const profileData = await request.json();
+  const now = new Date();
+  
+  const fields = {
+    bio: profileData.bio || null,
+    looksToConnect: profileData.looksToConnect || null,
+    skills: profileData.skills || [],
+    interests: profileData.interests || [],
+    experience: profileData.experience || [],
+    projects: profileData.projects || [],
+    awards: profileData.awards || [],
+    socials: profileData.socials || [],
+    preferences: profileData.preferences || {
+      desiredRoles: [],
+      techStack: [],
+      interestTags: [],
+      locationRadiusKm: 50,
+      remoteOk: true,
+      availabilityHrs: 20,
+      searchPeople: true,
+      searchProjects: true,
+      searchHackathons: true
+    },
+    updatedAt: now
+  };
+  Object.assign(fields, profileSkillFields(fields));
+
+  // `location` lives on the user; the profile keeps its geocoded point
+  let owner = user;
+  if (typeof profileData.location === 'string') {
+    const location = profileData.location.trim() || null;
+    await db.collection('users').updateOne({ id: user.id }, { $set: { location, updatedAt: now } });
+    owner = { ...user, location };
+  }
+  fields.geo = geocode(owner.location);
+
+  // Keeps the profile's id and createdAt across edits
+  const profile = await db.collection('profiles').findOneAndUpdate(
+    { userId: user.id },
+    {
+      $set: fields,
+      $setOnInsert: { id: uuidv4(), userId: user.id, createdAt: now },
+      $inc: { revision: 1 }
+    },
+    { upsert: true, returnDocument: 'after', projection: { _id: 0 } }
+  );
+  cardViews.invalidate(user.id);
+  updateFeatures(owner, profile);
+
+  return json({ profile });
+});
+
+// Partial profile update; see lib/profile-patch.js for the body format
+router.patch('profile', requireUser, async ({ request, db, user }) => {
+  const patch = buildProfilePatch(await request.json());
+  if (patch.error) {
+    return json({ error: patch.error }, { status: 400 });
+  }
 
-      return NextResponse.json({ profile });
+  const projection = { _id: 0, userId: 1, revision: 1, updatedAt: 1 };
+  for (const field of patch.fields) projection[field] = 1;
+
+  const profile = await db.collection('profiles').findOneAndUpdate(
+    revisionFilter(user.id, patch.revision),
+    patch.update,
+    { returnDocument: 'after', projection }
+  );
+
+  if (!profile) {
+    const current = await db.collection('profiles').findOne(
+      { userId: user.id },
+      { projection: { _id: 0, revision: 1 } }
+    );
+    if (!current) {
+      return json({ error: 'Profile not found' }, { status: 404 });
     }
+    return json({ error: 'Revision conflict', revision: current.revision || 0 }, { status: 409 });
+  }
 
-    // Get profile
-    if (path === 'profile' && method === 'GET') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
-
-      const profile = await db.collection('profiles').findOne({ userId: user.id });
-      return NextResponse.json({ profile });
+  // Array operators cannot derive the ids, so they follow in a second write
+  // that only applies if nothing else changed the profile in between
+  if (patch.fields.includes('skills') || patch.fields.includes('interests')) {
+    const ids = profileSkillFields(profile);
+    const $set = {};
+    if (patch.fields.includes('skills')) $set.skillIds = ids.skillIds;
+    if (patch.fields.includes('interests')) $set.interestIds = ids.interestIds;
+    await db.collection('profiles').updateOne({ userId: user.id, revision: profile.revision }, { $set });
+  }
+  cardViews.invalidate(user.id);
+  markFeaturesStale();
+
+  // Only the changed fields come back; clients merge them into their copy
+  return json({ profile });
+});
+
+// Get profile
+router.get('profile', requireUser, async ({ user }) => {
+  const { profile } = await cards.get(user.id);
+  const etag = versionTag('profile', user.id, documentVersion(profile));
+  return conditionalJson(etag, () => ({ profile }));
+});
+
+// Explore people endpoint
+router.get('explore/people', requireUser, selectView, selectSkillFilter, selectRadius, async ({ request, db, user, view, skillFilter, radiusKm }) => {
+  // Get users who haven't been swiped by current user
+  const swipedUserIds = await swipedTargetIds(db, user.id, 'PERSON');
+  
+  const exclude = new Set([...swipedUserIds, user.id]);
+
+  const { profile } = await cards.get(user.id);
+
+  // Skill/interest and distance filters narrow the candidates to matching profiles
+  let matching = null;
+  if (skillFilter || radiusKm) {
+    const filter = { ...(skillFilter && skillFilterQuery(skillFilter)), userId: { $nin: [...exclude] } };
+    if (radiusKm) {
+      const radius = radiusQuery(radiusKm, profile);
+      if (radius.error) return radius.error;
+      Object.assign(filter, radius.query);
     }
+    const profiles = await db.collection('profiles').find(filter, { projection: { _id: 0, userId: 1 } })
+      .limit(FILTER_CANDIDATES).toArray();
+    matching = profiles.map(p => p.userId);
+  }
 
-    // Explore people endpoint
-    if (path === 'explore/people' && method === 'GET') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
-
-      // Get users who haven't been swiped by current user
-      const swipes = await db.collection('swipes').find({ 
-        swiperId: user.id,
-        targetType: 'PERSON'
-      }).toArray();
-      
-      const swipedUserIds = swipes.map(s => s.targetId);
-      
-      const people = await db.collection('users').find({
-        id: { $nin: [...swipedUserIds, user.id] }
-      }).limit(10).toArray();
-
-      // Get profiles for these users
-      const peopleWithProfiles = await Promise.all(
-        people.map(async (person) => {
-          const profile = await db.collection('profiles').findOne({ userId: person.id });
-          const { passwordHash, ...personWithoutPassword } = person;
-          return {
-            ...personWithoutPassword,
-            profile: profile || null
-          };
-        })
-      );
-
-      return NextResponse.json({ people: peopleWithProfiles });
-    }
+  // Serve the offline top-K list first, then rank live against the viewer's
+  // own profile and preferences for whatever it cannot fill
+  const peopleIds = matching ? [] : await precomputedCandidates(db, user.id, exclude, DECK_SIZE);
+  increment('precomputed', peopleIds.length);
+  if (peopleIds.length < DECK_SIZE && (!matching || matching.length > 0)) {
+    const featureIndex = await syncFeatureIndex(db);
+    const ranked = await timed('rank', async () => featureIndex.rank(
+      encodeFeatures(user, profile), new Set([...exclude, ...peopleIds]), DECK_SIZE - peopleIds.length, matching
+    ));
+    peopleIds.push(...ranked.map(candidate => candidate.userId));
+  }
 
-    // Swipe endpoint
-    if (path === 'swipe' && method === 'POST') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
+  if (matching) {
+    // Matches the feature index has not synced yet follow the ranked ones
+    const taken = new Set(peopleIds);
+    peopleIds.push(...matching.filter(id => !taken.has(id)).slice(0, DECK_SIZE - peopleIds.length));
+  } else if (peopleIds.length < DECK_SIZE) {
+    // Users without a profile are not ranked; they fill the rest of the deck
+    const unranked = await db.collection('users').find(
+      { id: { $nin: [...exclude, ...peopleIds] } },
+      { projection: { _id: 0, id: 1 } }
+    ).limit(DECK_SIZE - peopleIds.length).toArray();
+    peopleIds.push(...unranked.map(person => person.id));
+  }
 
-      const { targetType, targetId, direction } = await request.json();
+  // ?admirers=interleave puts people who already liked the viewer into the
+  // deck, so a right swipe on them is an immediate match
+  let deckIds = peopleIds;
+  let admirerIds = new Set();
+  if (new URL(request.url).searchParams.get('admirers') === 'interleave') {
+    const admirers = await pendingAdmirers(db, user.id, exclude, matching ? FILTER_CANDIDATES : MAX_ADMIRERS_PER_DECK);
+    const allowed = matching && new Set(matching);
+    const picked = admirers.map(a => a.userId).filter(id => !allowed || allowed.has(id)).slice(0, MAX_ADMIRERS_PER_DECK);
+    admirerIds = new Set(picked);
+    deckIds = interleaveAdmirers(peopleIds, picked, DECK_SIZE);
+  }
 
-      // Prevent duplicate swipes
-      const existingSwipe = await db.collection('swipes').findOne({
-        swiperId: user.id,
-        targetType,
-        targetId
-      });
+  // Get profiles for these users
+  const peopleCards = await cardViews.view(view).getMany(deckIds);
+  // Ranked users with no card were deleted, possibly through another process
+  deckIds.filter(id => !peopleCards.get(id)).forEach(removeFeatures);
+  const peopleWithProfiles = deckIds
+    .map(id => peopleCards.get(id))
+    .filter(Boolean)
+    .map(card => (admirerIds.has(card.user.id) ? { ...cardWithProfile(card), likedYou: true } : cardWithProfile(card)));
+
+  return json({ people: peopleWithProfiles });
+});
+
+// People who liked the viewer and are still waiting for a swipe back
+router.get('likes', requireUser, selectView, async ({ request, db, user, view }) => {
+  const limit = Math.min(100, Math.max(1, Number(new URL(request.url).searchParams.get('limit')) || 20));
+
+  const exclude = new Set([...await swipedTargetIds(db, user.id, 'PERSON'), user.id]);
+
+  const [admirers, total] = await Promise.all([
+    pendingAdmirers(db, user.id, exclude, limit),
+    countPendingAdmirers(db, user.id, exclude)
+  ]);
+  const admirerCards = await cardViews.view(view).getMany(admirers.map(a => a.userId));
+
+  return json({
+    admirers: admirers
+      .filter(a => admirerCards.has(a.userId))
+      .map(a => ({ ...cardWithProfile(admirerCards.get(a.userId)), likedAt: a.likedAt })),
+    total
+  });
+});
+
+// Swipe endpoint
+router.post('swipe', requireUser, async ({ request, db, user }) => {
+  const { targetType, targetId, direction } = await request.json();
+
+  // Prevent duplicate swipes, including ones replayed from the journal
+  await swipeBuffer?.ready();
+  const existingSwipe = swipeBuffer?.pending(user.id, targetType, targetId) || await db.collection('swipes').findOne({
+    swiperId: user.id,
+    targetType,
+    targetId
+  });
+
+  if (existingSwipe || await hasCompactedSwipe(db, user.id, targetType, targetId)) {
+    return json({ error: 'Already swiped' }, { status: 400 });
+  }
 
-      if (existingSwipe) {
-        return NextResponse.json({ error: 'Already swiped' }, { status: 400 });
-      }
+  // Create swipe
+  const swipe = {
+    id: uuidv7(),
+    swiperId: user.id,
+    targetType,
+    targetId,
+    direction,
+    createdAt: new Date()
+  };
+
+  if (direction === 'LEFT' && swipeBuffer) {
+    await swipeBuffer.enqueue(swipe);
+    increment('swipes_buffered', 1);
+    return json({ swipe, match: null });
+  }
 
-      // Create swipe
-      const swipe = {
-        id: uuidv4(),
-        swiperId: user.id,
-        targetType,
-        targetId,
-        direction,
+  await db.collection('swipes').insertOne(swipe);
+
+  // Check for match if it's a right swipe on a person
+  let match = null;
+  if (direction === 'RIGHT' && targetType === 'PERSON') {
+    // Check if the target user has also swiped right on current user; the
+    // admirer index serves this lookup
+    await ensureAdmirerIndexes(db);
+    const reciprocalSwipe = await db.collection('swipes').findOne({
+      swiperId: targetId,
+      targetType: 'PERSON',
+      targetId: user.id,
+      direction: 'RIGHT'
+    });
+
+    if (reciprocalSwipe) {
+      // Create match
+      match = {
+        id: uuidv7(),
+        aId: user.id,
+        bId: targetId,
+        context: 'PEOPLE',
+        postId: null,
         createdAt: new Date()
       };
 
-      await db.collection('swipes').insertOne(swipe);
-
-      // Check for match if it's a right swipe on a person
-      let match = null;
-      if (direction === 'RIGHT' && targetType === 'PERSON') {
-        // Check if the target user has also swiped right on current user
-        const reciprocalSwipe = await db.collection('swipes').findOne({
-          swiperId: targetId,
-          targetType: 'PERSON',
-          targetId: user.id,
-          direction: 'RIGHT'
-        });
-
-        if (reciprocalSwipe) {
-          // Create match
-          match = {
-            id: uuidv4(),
-            aId: user.id,
-            bId: targetId,
-            context: 'PEOPLE',
-            postId: null,
-            createdAt: new Date()
-          };
-
-          await db.collection('matches').insertOne(match);
-        }
-      }
-
-      // If it's a right swipe on a post, create an inquiry
-      if (direction === 'RIGHT' && (targetType === 'HACKATHON' || targetType === 'PROJECT')) {
-        const inquiry = {
-          id: uuidv4(),
-          postId: targetId,
-          userId: user.id,
-          message: null,
-          status: 'PENDING',
-          createdAt: new Date()
-        };
-
-        await db.collection('inquiries').insertOne(inquiry);
-      }
-
-      return NextResponse.json({ 
-        swipe,
-        match: match ? { ...match, isNew: true } : null
-      });
+      await db.collection('matches').insertOne(match);
     }
+  }
 
-    // Posts endpoints
-    if (path === 'posts' && method === 'POST') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
+  // If it's a right swipe on a post, create an inquiry
+  if (direction === 'RIGHT' && (targetType === 'HACKATHON' || targetType === 'PROJECT')) {
+    const inquiry = {
+      id: uuidv7(),
+      postId: targetId,
+      userId: user.id,
+      message: null,
+      status: 'PENDING',
+      createdAt: new Date()
+    };
+
+    // The leader sees it on the next inquiries read; the swiper needs nothing back
+    await runSideEffect(db, 'inquiry.create', inquiry, `inquiry:${targetId}:${user.id}`);
+  }
 
-      const postData = await request.json();
-      const post = {
-        id: uuidv4(),
-        type: postData.type, // HACKATHON or PROJECT
-        leaderId: user.id,
-        title: postData.title,
-        location: postData.location || null,
-        websiteUrl: postData.websiteUrl || null,
-        skillsNeeded: postData.skillsNeeded || [],
-        notes: postData.notes || null,
-        status: 'OPEN',
-        visibility: 'PUBLIC',
-        createdAt: new Date(),
-        updatedAt: new Date()
-      };
+  return json({ 
+    swipe,
+    match: match ? { ...match, isNew: true } : null
+  });
+});
+
+// Posts endpoints
+router.post('posts', requireUser, async ({ request, db, user }) => {
+  const postData = await request.json();
+  const post = {
+    id: uuidv4(),
+    type: postData.type, // HACKATHON or PROJECT
+    leaderId: user.id,
+    title: postData.title,
+    location: postData.location || null,
+    websiteUrl: postData.websiteUrl || null,
+    skillsNeeded: postData.skillsNeeded || [],
+    notes: postData.notes || null,
+    status: 'OPEN',
+    visibility: 'PUBLIC',
+    createdAt: new Date(),
+    updatedAt: new Date()
+  };
+  Object.assign(post, postFilterFields(post));
+
+  await db.collection('posts').insertOne(post);
+  return json({ post });
+});
+
+// Bulk create-or-update of the user's posts from an NDJSON or CSV feed,
+// keyed by each row's externalId; see lib/post-import.js
+router.post('posts/import', requireUser, async ({ request, db, user }) => {
+  const contentType = request.headers.get('content-type') || '';
+  let rows;
+  if (contentType.startsWith('application/x-ndjson')) {
+    rows = ndjsonRows(request.body);
+  } else if (contentType.startsWith('text/csv')) {
+    rows = csvRows(request.body);
+  } else {
+    return json({ error: 'Send application/x-ndjson or text/csv' }, { status: 415 });
+  }
 
-      await db.collection('posts').insertOne(post);
-      return NextResponse.json({ post });
-    }
+  const started = performance.now();
+  const summary = await importPosts(db, user.id, rows, postFilterFields);
+  const durationMs = Math.round(performance.now() - started);
+  increment('posts_imported', summary.inserted + summary.updated);
+  if (summary.truncated) {
+    summary.error = `Imports are limited to ${MAX_IMPORT_ROWS} rows per request; rows after ${summary.received} were not read`;
+  }
+  return json({ ...summary, durationMs });
+});
 
-    // Get posts
-    if (path.startsWith('explore/') && method === 'GET') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
+// Get posts
+router.get('explore/:type', requireUser, selectView, selectSkillFilter, selectRadius, async ({ db, user, params, view, skillFilter, radiusKm }) => {
+  const type = params.type; // hackathons, projects
 
-      const type = path.split('/')[1]; // hackathons, projects, people
-
-      if (type === 'hackathons' || type === 'projects') {
-        // Get posts (hackathons or projects)
-        const postType = type === 'hackathons' ? 'HACKATHON' : 'PROJECT';
-        
-        const swipes = await db.collection('swipes').find({ 
-          swiperId: user.id,
-          targetType: postType.toUpperCase()
-        }).toArray();
-        
-        const swipedPostIds = swipes.map(s => s.targetId);
-        
-        const posts = await db.collection('posts').find({
-          type: postType,
-          id: { $nin: swipedPostIds },
-          leaderId: { $ne: user.id }
-        }).limit(10).toArray();
-
-        // Get leader info for posts
-        const postsWithLeaders = await Promise.all(
-          posts.map(async (post) => {
-            const leader = await db.collection('users').findOne({ id: post.leaderId });
-            const leaderProfile = await db.collection('profiles').findOne({ userId: post.leaderId });
-            
-            if (leader) {
-              const { passwordHash, ...leaderWithoutPassword } = leader;
-              return {
-                ...post,
-                leader: {
-                  ...leaderWithoutPassword,
-                  profile: leaderProfile || null
-                }
-              };
-            }
-            return post;
-          })
-        );
-
-        return NextResponse.json({ posts: postsWithLeaders });
-      }
+  if (type === 'hackathons' || type === 'projects') {
+    // Posts only carry skills
+    if (skillFilter?.interests.length > 0) {
+      return json({ error: 'The interests filter only applies to explore/people' }, { status: 400 });
     }
 
-    // Random project matcher
-    if (path === 'random-project' && method === 'GET') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
+    // Get posts (hackathons or projects)
+    const postType = type === 'hackathons' ? 'HACKATHON' : 'PROJECT';
+    
+    const swipedPostIds = await swipedTargetIds(db, user.id, postType);
+    
+    const filter = {
+      type: postType,
+      ...(skillFilter && skillFilterQuery(skillFilter)),
+      id: { $nin: swipedPostIds },
+      leaderId: { $ne: user.id }
+    };
+    if (radiusKm) {
+      const radius = radiusQuery(radiusKm, (await cards.get(user.id)).profile);
+      if (radius.error) return radius.error;
+      Object.assign(filter, radius.query);
+    }
 
-      const swipes = await db.collection('swipes').find({ 
-        swiperId: user.id,
-        targetType: 'PROJECT'
-      }).toArray();
-      
-      const swipedPostIds = swipes.map(s => s.targetId);
-      
-      const projects = await db.collection('posts').find({
-        type: 'PROJECT',
-        id: { $nin: swipedPostIds },
-        leaderId: { $ne: user.id }
-      }).toArray();
-
-      if (projects.length === 0) {
-        return NextResponse.json({ project: null });
-      }
+    const posts = await db.collection('posts').find(filter, { projection: CARD_VIEWS[view].post })
+      .limit(10).toArray();
 
-      const randomProject = projects[Math.floor(Math.random() * projects.length)];
-      
-      // Get leader info
-      const leader = await db.collection('users').findOne({ id: randomProject.leaderId });
-      const leaderProfile = await db.collection('profiles').findOne({ userId: randomProject.leaderId });
-      
+    // Get leader info for posts
+    const leaders = await cardViews.view(view).getMany(posts.map(post => post.leaderId));
+    const postsWithLeaders = posts.map((post) => {
+      const leader = leaders.get(post.leaderId);
       if (leader) {
-        const { passwordHash, ...leaderWithoutPassword } = leader;
-        randomProject.leader = {
-          ...leaderWithoutPassword,
-          profile: leaderProfile || null
+        return {
+          ...post,
+          leader: cardWithProfile(leader)
         };
       }
+      return post;
+    });
 
-      return NextResponse.json({ project: randomProject });
-    }
-
-    // Get matches endpoint
-    if (path === 'matches' && method === 'GET') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
-
-      const matches = await db.collection('matches').find({
-        $or: [
-          { aId: user.id },
-          { bId: user.id }
-        ],
-        context: 'PEOPLE'
-      }).toArray();
-
-      // Get user details for matches
-      const matchesWithUsers = await Promise.all(
-        matches.map(async (match) => {
-          const otherUserId = match.aId === user.id ? match.bId : match.aId;
-          const otherUser = await db.collection('users').findOne({ id: otherUserId });
-          const otherProfile = await db.collection('profiles').findOne({ userId: otherUserId });
-          
-          if (otherUser) {
-            const { passwordHash, ...userWithoutPassword } = otherUser;
-            return {
-              ...match,
-              otherUser: {
-                ...userWithoutPassword,
-                profile: otherProfile || null
-              }
-            };
-          }
-          return match;
-        })
-      );
-
-      return NextResponse.json({ matches: matchesWithUsers });
-    }
-
-    // Get inquiries for user's posts
-    if (path === 'inquiries' && method === 'GET') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
-
-      // Get user's posts
-      const userPosts = await db.collection('posts').find({ leaderId: user.id }).toArray();
-      const postIds = userPosts.map(p => p.id);
-
-      // Get inquiries for these posts
-      const inquiries = await db.collection('inquiries').find({
-        postId: { $in: postIds }
-      }).toArray();
-
-      // Get user details for inquiries
-      const inquiriesWithUsers = await Promise.all(
-        inquiries.map(async (inquiry) => {
-          const inquiryUser = await db.collection('users').findOne({ id: inquiry.userId });
-          const inquiryProfile = await db.collection('profiles').findOne({ userId: inquiry.userId });
-          const post = userPosts.find(p => p.id === inquiry.postId);
-          
-          if (inquiryUser) {
-            const { passwordHash, ...userWithoutPassword } = inquiryUser;
-            return {
-              ...inquiry,
-              user: {
-                ...userWithoutPassword,
-                profile: inquiryProfile || null
-              },
-              post: post || null
-            };
-          }
-          return inquiry;
-        })
-      );
+    return json({ posts: postsWithLeaders });
+  }
 
-      return NextResponse.json({ inquiries: inquiriesWithUsers });
+  return json({ error: 'Not found' }, { status: 404 });
+});
+
+// Full-text search over posts and people; see lib/search.js
+const SEARCH_POST_PROJECTION = {
+  _id: 0, id: 1, type: 1, leaderId: 1, title: 1, location: 1, skillsNeeded: 1, notes: 1, status: 1, createdAt: 1
+};
+
+router.get('search', requireUser, selectSearch, async ({ db, search }) => {
+  const { q, type, page, limit, terms } = search;
+
+  // Deep enough into each kind to fill this page after merging, plus one
+  // to tell whether more results were seen; ranking past that depth is
+  // approximate (see lib/search.js)
+  const depth = page * limit + 1;
+  const [posts, people] = await Promise.all([
+    type === 'people' ? [] : textSearch(db, 'posts', q, { visibility: 'PUBLIC' }, SEARCH_POST_PROJECTION, depth),
+    type === 'posts' ? [] : searchPeople(db, q, depth)
+  ]);
+
+  const ranked = [
+    ...posts.map(post => ({ kind: 'post', score: post.score, post })),
+    ...people.map(person => ({ kind: 'person', score: person.score, userId: person.userId }))
+  ].sort((a, b) => b.score - a.score);
+  const window = ranked.slice((page - 1) * limit, page * limit);
+
+  const cardsById = await cardViews.view('card').getMany(
+    window.filter(result => result.kind === 'person').map(result => result.userId)
+  );
+
+  const results = [];
+  for (const result of window) {
+    const score = Math.round(result.score * 1000) / 1000;
+    if (result.kind === 'post') {
+      const { score: textScore, notes, ...post } = result.post;
+      results.push({
+        kind: 'post',
+        score,
+        post,
+        highlights: highlight(result.post, ['title', 'skillsNeeded', 'notes'], terms)
+      });
+    } else {
+      const card = cardsById.get(result.userId);
+      if (!card) continue;
+      results.push({
+        kind: 'person',
+        score,
+        person: cardWithProfile(card),
+        highlights: [
+          ...highlight(card.user, ['name', 'roleHeadline'], terms),
+          ...highlight(card.profile, ['skills', 'bio'], terms)
+        ]
+      });
     }
+  }
 
-    // Accept/Decline inquiry
-    if (path.startsWith('inquiries/') && method === 'PATCH') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
-
-      const inquiryId = path.split('/')[1];
-      const { status } = await request.json();
-
-      // Verify user owns the post
-      const inquiry = await db.collection('inquiries').findOne({ id: inquiryId });
-      if (!inquiry) {
-        return NextResponse.json({ error: 'Inquiry not found' }, { status: 404 });
-      }
+  return json({ query: q, type, page, limit, results, hasMore: ranked.length > page * limit });
+});
 
-      const post = await db.collection('posts').findOne({ id: inquiry.postId });
-      if (!post || post.leaderId !== user.id) {
-        return NextResponse.json({ error: 'Unauthorized' }, { status: 403 });
-      }
+// Random project matcher
+router.get('random-project', requireUser, selectView, async ({ db, user, view }) => {
+  const swipedPostIds = await swipedTargetIds(db, user.id, 'PROJECT');
+  
+  const projects = await db.collection('posts').find({
+    type: 'PROJECT',
+    id: { $nin: swipedPostIds },
+    leaderId: { $ne: user.id }
+  }, { projection: CARD_VIEWS[view].post }).toArray();
+
+  if (projects.length === 0) {
+    return json({ project: null });
+  }
 
-      // Update inquiry status
-      await db.collection('inquiries').updateOne(
-        { id: inquiryId },
-        { $set: { status } }
-      );
+  const randomProject = projects[Math.floor(Math.random() * projects.length)];
+  
+  // Get leader info
+  const leader = await cardViews.view(view).get(randomProject.leaderId);
+  
+  if (leader) {
+    randomProject.leader = cardWithProfile(leader);
+  }
 
-      // If accepted, create a match
-      if (status === 'ACCEPTED') {
-        const match = {
-          id: uuidv4(),
-          aId: user.id,
-          bId: inquiry.userId,
-          context: 'POST',
-          postId: inquiry.postId,
-          createdAt: new Date()
+  return json({ project: randomProject });
+});
+
+// Get matches endpoint
+router.get('matches', requireUser, selectView, async ({ db, user, view }) => {
+  const matches = await db.collection('matches').find({
+    $or: [
+      { aId: user.id },
+      { bId: user.id }
+    ],
+    context: 'PEOPLE'
+  }, { projection: CARD_VIEWS[view].match }).toArray();
+
+  // Get user details for matches
+  const otherUserId = (match) => (match.aId === user.id ? match.bId : match.aId);
+  const otherUsers = await cardViews.view(view).getMany(matches.map(otherUserId));
+  const etag = versionTag('matches', view, user.id, ...matches.flatMap((match) => {
+    const otherUser = otherUsers.get(otherUserId(match));
+    return [documentVersion(match), documentVersion(otherUser?.user), documentVersion(otherUser?.profile)];
+  }));
+
+  return conditionalJson(etag, () => ({
+    matches: matches.map((match) => {
+      const otherUser = otherUsers.get(otherUserId(match));
+      if (otherUser) {
+        return {
+          ...match,
+          otherUser: cardWithProfile(otherUser)
         };
-
-        await db.collection('matches').insertOne(match);
       }
-
-      return NextResponse.json({ success: true });
+      return match;
+    })
+  }));
+});
+
+// Get inquiries for user's posts
+router.get('inquiries', requireUser, async ({ db, user }) => {
+  // Get user's posts
+  const userPosts = await db.collection('posts').find({ leaderId: user.id }).toArray();
+  const postIds = userPosts.map(p => p.id);
+
+  // Get inquiries for these posts
+  const inquiries = await db.collection('inquiries').find({
+    postId: { $in: postIds }
+  }).toArray();
+
+  // Get user details for inquiries
+  const inquiryUsers = await cards.getMany(inquiries.map(inquiry => inquiry.userId));
+  const inquiriesWithUsers = inquiries.map((inquiry) => {
+    const inquiryUser = inquiryUsers.get(inquiry.userId);
+    const post = userPosts.find(p => p.id === inquiry.postId);
+    
+    if (inquiryUser) {
+      return {
+        ...inquiry,
+        user: cardWithProfile(inquiryUser),
+        post: post || null
+      };
     }
+    return inquiry;
+  });
 
-    // Messages endpoints
-    if (path === 'conversations' && method === 'GET') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
-
-      // Get conversations where user is a participant
-      const participants = await db.collection('conversationParticipants').find({
-        userId: user.id
-      }).toArray();
-
-      const conversationIds = participants.map(p => p.conversationId);
-      
-      const conversations = await db.collection('conversations').find({
-        id: { $in: conversationIds }
-      }).toArray();
-
-      // Get latest message for each conversation
-      const conversationsWithMessages = await Promise.all(
-        conversations.map(async (conv) => {
-          const latestMessage = await db.collection('messages').findOne(
-            { conversationId: conv.id },
-            { sort: { createdAt: -1 } }
-          );
-
-          // Get other participants
-          const allParticipants = await db.collection('conversationParticipants').find({
-            conversationId: conv.id
-          }).toArray();
-
-          const otherParticipants = await Promise.all(
-            allParticipants
-              .filter(p => p.userId !== user.id)
-              .map(async (p) => {
-                const participant = await db.collection('users').findOne({ id: p.userId });
-                if (participant) {
-                  const { passwordHash, ...userWithoutPassword } = participant;
-                  return userWithoutPassword;
-                }
-                return null;
-              })
-          );
-
-          return {
-            ...conv,
-            latestMessage: latestMessage || null,
-            participants: otherParticipants.filter(p => p !== null)
-          };
-        })
-      );
+  return json({ inquiries: inquiriesWithUsers });
+});
 
-      return NextResponse.json({ conversations: conversationsWithMessages });
-    }
-
-    if (path === 'conversations' && method === 'POST') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
+// Accept/decline many inquiries at once; see lib/inquiries.js
+router.patch('inquiries', requireUser, async ({ request, db, user }) => {
+  const { decisions, error } = parseDecisions(await request.json());
+  if (error) {
+    return json({ error }, { status: 400 });
+  }
 
-      const { participantIds, isGroup, name, postId } = await request.json();
+  const results = await applyDecisions(db, user.id, decisions);
+  const updated = results.filter((result) => result.outcome === 'UPDATED').length;
+  return json({ results, updated, rejected: results.length - updated });
+});
 
-      const conversationId = uuidv4();
-      const conversation = {
-        id: conversationId,
-        isGroup: isGroup || false,
-        name: name || null,
-        postId: postId || null,
-        createdAt: new Date()
-      };
+// Accept/Decline inquiry
+router.patch('inquiries/:id', requireUser, async ({ request, db, user, params }) => {
+  const inquiryId = params.id;
+  const { status } = await request.json();
 
-      await db.collection('conversations').insertOne(conversation);
+  // Verify user owns the post
+  const inquiry = await db.collection('inquiries').findOne({ id: inquiryId });
+  if (!inquiry) {
+    return json({ error: 'Inquiry not found' }, { status: 404 });
+  }
 
-      // Add participants
-      const allParticipants = [user.id, ...participantIds];
-      const participantDocs = allParticipants.map((userId, index) => ({
-        id: uuidv4(),
-        conversationId: conversationId,
-        userId: userId,
-        role: index === 0 ? 'OWNER' : 'MEMBER'
-      }));
+  const post = await db.collection('posts').findOne({ id: inquiry.postId });
+  if (!post || post.leaderId !== user.id) {
+    return json({ error: 'Unauthorized' }, { status: 403 });
+  }
 
-      await db.collection('conversationParticipants').insertMany(participantDocs);
+  // Update inquiry status
+  await db.collection('inquiries').updateOne(
+    { id: inquiryId },
+    { $set: { status } }
+  );
+
+  // If accepted, create a match
+  if (status === 'ACCEPTED') {
+    const match = {
+      id: uuidv7(),
+      aId: user.id,
+      bId: inquiry.userId,
+      context: 'POST',
+      postId: inquiry.postId,
+      createdAt: new Date()
+    };
+
+    await runSideEffect(db, 'match.create', match, `match:inquiry:${inquiryId}`);
+  }
 
-      return NextResponse.json({ conversation });
-    }
+  return json({ success: true });
+});
 
-    // Get messages for a conversation
-    if (path.startsWith('conversations/') && path.includes('/messages') && method === 'GET') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
+// Messages endpoints
+router.get('conversations', requireUser, async ({ db, user }) => {
+  // Get conversations where user is a participant
+  const participants = await db.collection('conversationParticipants').find({
+    userId: user.id
+  }).toArray();
 
-      const conversationId = path.split('/')[1];
-
-      // Verify user is participant
-      const participant = await db.collection('conversationParticipants').findOne({
-        conversationId: conversationId,
-        userId: user.id
-      });
+  const conversationIds = participants.map(p => p.conversationId);
+  const ownParticipant = new Map(participants.map(p => [p.conversationId, p]));
+  
+  const conversations = await db.collection('conversations').find({
+    id: { $in: conversationIds }
+  }).toArray();
+
+  // Get other participants of every conversation in one pass
+  const allParticipants = await db.collection('conversationParticipants').find({
+    conversationId: { $in: conversationIds },
+    userId: { $ne: user.id }
+  }).toArray();
+  const participantCards = await cards.getMany(allParticipants.map(p => p.userId));
+
+  // Latest message of every conversation in one aggregation, walking the
+  // (conversationId, createdAt, id) index
+  const latestMessages = await db.collection('messages').aggregate([
+    { $match: { conversationId: { $in: conversationIds } } },
+    { $sort: { conversationId: 1, createdAt: -1, id: -1 } },
+    { $group: { _id: '$conversationId', message: { $first: '$$ROOT' } } }
+  ]).toArray();
+  const latestByConversation = new Map(latestMessages.map(latest => [latest._id, latest.message]));
+
+  const conversationsWithMessages = conversations.map((conv) => {
+    const otherParticipants = allParticipants
+      .filter(p => p.conversationId === conv.id)
+      .map(p => participantCards.get(p.userId))
+      .filter(Boolean)
+      .map(card => card.user);
+
+    return {
+      ...conv,
+      latestMessage: latestByConversation.get(conv.id) || null,
+      participants: otherParticipants,
+      unreadCount: unreadCount(conv, ownParticipant.get(conv.id))
+    };
+  });
+
+  const etag = versionTag('conversations', user.id, ...conversationsWithMessages.flatMap(conv => [
+    documentVersion(conv),
+    documentVersion(conv.latestMessage),
+    conv.unreadCount,
+    ...conv.participants.map(documentVersion)
+  ]));
+  return conditionalJson(etag, () => ({
+    conversations: conversationsWithMessages,
+    unreadTotal: conversationsWithMessages.reduce((total, conv) => total + conv.unreadCount, 0)
+  }));
+});
+
+router.post('conversations', requireUser, async ({ request, db, user }) => {
+  const { participantIds, isGroup, name, postId } = await request.json();
+
+  const allParticipants = [...new Set([user.id, ...participantIds])];
+  const conversationId = uuidv4();
+  const conversation = {
+    id: conversationId,
+    isGroup: isGroup || false,
+    name: name || null,
+    postId: postId || null,
+    createdAt: new Date()
+  };
+
+  // DMs and post conversations are get-or-create on their participant set
+  const key = participantKey(allParticipants, conversation);
+  if (key) conversation.participantKey = key;
+
+  const participantDocs = allParticipants.map((userId, index) => ({
+    id: uuidv4(),
+    conversationId: conversationId,
+    userId: userId,
+    role: index === 0 ? 'OWNER' : 'MEMBER'
+  }));
+
+  const result = await getOrCreateConversation(db, conversation, participantDocs);
+  return json(result);
+});
+
+// Get messages for a conversation
+router.get('conversations/:id/messages', requireUser, selectMessagePage, async ({ db, user, params, messagePage }) => {
+  const conversationId = params.id;
+
+  // Verify user is participant
+  const participant = await db.collection('conversationParticipants').findOne({
+    conversationId: conversationId,
+    userId: user.id
+  });
+
+  if (!participant) {
+    return json({ error: 'Unauthorized' }, { status: 403 });
+  }
 
-      if (!participant) {
-        return NextResponse.json({ error: 'Unauthorized' }, { status: 403 });
+  let messages;
+  let nextCursor = null;
+  if (messagePage) {
+    // Keyset page: newest first from the cursor, returned oldest first
+    await ensureMessageIndexes(db);
+    const filter = { conversationId };
+    if (messagePage.before) {
+      const older = await olderThanCursor(db, conversationId, messagePage.before);
+      if (!older) {
+        return json({ error: 'Unknown cursor' }, { status: 400 });
       }
-
-      const messages = await db.collection('messages').find({
-        conversationId: conversationId
-      }).sort({ createdAt: 1 }).toArray();
-
-      // Get sender details for messages
-      const messagesWithSenders = await Promise.all(
-        messages.map(async (message) => {
-          const sender = await db.collection('users').findOne({ id: message.senderId });
-          if (sender) {
-            const { passwordHash, ...senderWithoutPassword } = sender;
-            return {
-              ...message,
-              sender: senderWithoutPassword
-            };
-          }
-          return message;
-        })
-      );
-
-      return NextResponse.json({ messages: messagesWithSenders });
+      Object.assign(filter, older);
     }
+    const newestFirst = await db.collection('messages').find(filter)
+      .sort({ createdAt: -1, id: -1 })
+      .limit(messagePage.limit + 1)
+      .toArray();
+    messages = newestFirst.slice(0, messagePage.limit).reverse();
+    nextCursor = newestFirst.length > messagePage.limit ? messages[0].id : null;
+  } else {
+    messages = await db.collection('messages').find({
+      conversationId: conversationId
+    }).sort({ createdAt: 1 }).toArray();
+  }
 
-    // Send message
-    if (path === 'messages' && method === 'POST') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
-
-      const { conversationId, content, attachmentUrl } = await request.json();
-
-      // Verify user is participant
-      const participant = await db.collection('conversationParticipants').findOne({
-        conversationId: conversationId,
-        userId: user.id
-      });
-
-      if (!participant) {
-        return NextResponse.json({ error: 'Unauthorized' }, { status: 403 });
-      }
-
-      const message = {
-        id: uuidv4(),
-        conversationId: conversationId,
-        senderId: user.id,
-        content: content || null,
-        attachmentUrl: attachmentUrl || null,
-        createdAt: new Date()
-      };
-
-      await db.collection('messages').insertOne(message);
-
-      // Get sender details
-      const { passwordHash, ...userWithoutPassword } = user;
-      const messageWithSender = {
+  // Get sender details for messages
+  const senders = await cards.getMany(messages.map(message => message.senderId));
+  const messagesWithSenders = messages.map((message) => {
+    const sender = senders.get(message.senderId);
+    if (sender) {
+      return {
         ...message,
-        sender: userWithoutPassword
+        sender: sender.user
       };
-
-      return NextResponse.json({ message: messageWithSender });
     }
+    return message;
+  });
+
+  return json(messagePage ? { messages: messagesWithSenders, nextCursor } : { messages: messagesWithSenders });
+});
+
+// Mark a conversation read, up to `messageId` or its newest message
+router.post('conversations/:id/read', requireUser, async ({ request, db, user, params }) => {
+  const conversationId = params.id;
+  const { messageId } = await request.json().catch(() => ({}));
+
+  const [participant, conversation] = await Promise.all([
+    db.collection('conversationParticipants').findOne({ conversationId, userId: user.id }),
+    db.collection('conversations').findOne({ id: conversationId }, { projection: { _id: 0, messageSeq: 1 } })
+  ]);
+  if (!participant || !conversation) {
+    return json({ error: 'Unauthorized' }, { status: 403 });
+  }
 
-    // Get user's own posts
-    if (path === 'posts/my-posts' && method === 'GET') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
+  let readSeq = conversation.messageSeq || 0;
+  if (messageId) {
+    const message = await db.collection('messages').findOne(
+      { conversationId, id: messageId },
+      { projection: { _id: 0, seq: 1 } }
+    );
+    if (!message) {
+      return json({ error: 'Message not found' }, { status: 404 });
+    }
+    // Messages from before read tracking have no seq; reading one reads all
+    readSeq = message.seq ?? readSeq;
+  }
 
-      const posts = await db.collection('posts').find({ leaderId: user.id }).toArray();
-      
-      // Get inquiry counts for each post
-      const postsWithStats = await Promise.all(
-        posts.map(async (post) => {
-          const inquiryCount = await db.collection('inquiries').countDocuments({ postId: post.id });
-          const acceptedInquiries = await db.collection('inquiries').countDocuments({ 
-            postId: post.id, 
-            status: 'ACCEPTED' 
-          });
-          
-          return {
-            ...post,
-            inquiryCount,
-            acceptedCount: acceptedInquiries
-          };
-        })
-      );
+  await advanceReadCursor(db, conversationId, user.id, readSeq);
+  const effective = Math.max(readSeq, participant.readSeq || 0);
+  return json({ conversationId, readSeq: effective, unreadCount: unreadCount(conversation, { readSeq: effective }) });
+});
 
-      return NextResponse.json({ posts: postsWithStats });
-    }
+// Send message
+router.post('messages', requireUser, async ({ request, db, user }) => {
+  const { conversationId, content, attachmentUrl } = await request.json();
 
-    // Update user's post
-    if (path.startsWith('posts/') && method === 'PUT') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
+  // Verify user is participant
+  const participant = await db.collection('conversationParticipants').findOne({
+    conversationId: conversationId,
+    userId: user.id
+  });
 
-      const postId = path.split('/')[1];
-      const postData = await request.json();
+  if (!participant) {
+    return json({ error: 'Unauthorized' }, { status: 403 });
+  }
 
-      // Verify user owns the post
-      const post = await db.collection('posts').findOne({ id: postId, leaderId: user.id });
-      if (!post) {
-        return NextResponse.json({ error: 'Post not found or unauthorized' }, { status: 404 });
-      }
+  // createdAt comes from the time-ordered id so the id works as a page cursor
+  const messageId = uuidv7();
+  const message = {
+    id: messageId,
+    conversationId: conversationId,
+    senderId: user.id,
+    content: content || null,
+    attachmentUrl: attachmentUrl || null,
+    seq: await nextMessageSeq(db, conversationId),
+    createdAt: idTimestamp(messageId)
+  };
+
+  await db.collection('messages').insertOne(message);
+
+  // Everyone else now has one more unread message; the sender has read up to it
+  if (message.seq !== null) {
+    await advanceReadCursor(db, conversationId, user.id, message.seq);
+  }
 
-      // Validate required fields
-      if (!postData.title?.trim()) {
-        return NextResponse.json({ error: 'Title is required' }, { status: 400 });
-      }
-      if (!postData.location?.trim()) {
-        return NextResponse.json({ error: 'Location is required' }, { status: 400 });
+  // Get sender details
+  const { passwordHash, ...userWithoutPassword } = user;
+  const messageWithSender = {
+    ...message,
+    sender: userWithoutPassword
+  };
+
+  return json({ message: messageWithSender });
+});
+
+// Get user's own posts
+router.get('posts/my-posts', requireUser, async ({ db, user }) => {
+  const posts = await db.collection('posts').find({ leaderId: user.id }).toArray();
+
+  // Inquiry and accepted counts of every post in one aggregation
+  const counts = await db.collection('inquiries').aggregate([
+    { $match: { postId: { $in: posts.map(post => post.id) } } },
+    {
+      $group: {
+        _id: '$postId',
+        inquiryCount: { $sum: 1 },
+        acceptedCount: { $sum: { $cond: [{ $eq: ['$status', 'ACCEPTED'] }, 1, 0] } }
       }
+    }
+  ]).toArray();
+  const countsByPost = new Map(counts.map(count => [count._id, count]));
+
+  const postsWithStats = posts.map((post) => ({
+    ...post,
+    inquiryCount: countsByPost.get(post.id)?.inquiryCount || 0,
+    acceptedCount: countsByPost.get(post.id)?.acceptedCount || 0
+  }));
+
+  return json({ posts: postsWithStats });
+});
+
+// Update user's post
+router.put('posts/:id', requireUser, async ({ request, db, user, params }) => {
+  const postId = params.id;
+  const postData = await request.json();
+
+  // Verify user owns the post
+  const post = await db.collection('posts').findOne({ id: postId, leaderId: user.id });
+  if (!post) {
+    return json({ error: 'Post not found or unauthorized' }, { status: 404 });
+  }
 
-      await db.collection('posts').updateOne(
-        { id: postId },
-        { 
-          $set: {
-            title: postData.title.trim(),
-            location: postData.location.trim(),
-            websiteUrl: postData.websiteUrl || null,
-            skillsNeeded: postData.skillsNeeded || [],
-            notes: postData.notes || null,
-            updatedAt: new Date()
-          }
-        }
-      );
+  // Validate required fields
+  if (!postData.title?.trim()) {
+    return json({ error: 'Title is required' }, { status: 400 });
+  }
+  if (!postData.location?.trim()) {
+    return json({ error: 'Location is required' }, { status: 400 });
+  }
 
-      const updatedPost = await db.collection('posts').findOne({ id: postId });
-      return NextResponse.json({ post: updatedPost });
+  await db.collection('posts').updateOne(
+    { id: postId },
+    { 
+      $set: {
+        title: postData.title.trim(),
+        location: postData.location.trim(),
+        websiteUrl: postData.websiteUrl || null,
+        skillsNeeded: postData.skillsNeeded || [],
+        ...postFilterFields({ skillsNeeded: postData.skillsNeeded, location: postData.location }),
+        notes: postData.notes || null,
+        updatedAt: new Date()
+      }
     }
+  );
 
-    // Delete user's post
-    if (path.startsWith('posts/') && method === 'DELETE') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
+  const updatedPost = await db.collection('posts').findOne({ id: postId });
+  return json({ post: updatedPost });
+});
 
-      const postId = path.split('/')[1];
+// Delete user's post
+router.delete('posts/:id', requireUser, async ({ db, user, params }) => {
+  const postId = params.id;
 
-      // Verify user owns the post
-      const post = await db.collection('posts').findOne({ id: postId, leaderId: user.id });
-      if (!post) {
-        return NextResponse.json({ error: 'Post not found or unauthorized' }, { status: 404 });
-      }
+  // Verify user owns the post
+  const post = await db.collection('posts').findOne({ id: postId, leaderId: user.id });
+  if (!post) {
+    return json({ error: 'Post not found or unauthorized' }, { status: 404 });
+  }
 
-      // Delete related inquiries
-      await db.collection('inquiries').deleteMany({ postId: postId });
-      
-      // Delete the post
-      await db.collection('posts').deleteOne({ id: postId });
+  // The post disappears now; its inquiries, swipes, matches and
+  // conversations are deleted in the background
+  await db.collection('posts').deleteOne({ id: postId });
+  const deletion = await cascadeDeleter.request(db, 'POST', postId, user.id);
+
+  return json({ success: true, deletion });
+});
+
+// Deletes the account: the user, profile and sessions at once, everything
+// else the user owns or took part in through a background job
+router.delete('account', requireUser, async ({ db, user }) => {
+  // Buffered swipes must be in Mongo for the job to find them
+  await swipeBuffer?.flush();
+
+  await Promise.all([
+    db.collection('users').deleteOne({ id: user.id }),
+    db.collection('profiles').deleteOne({ userId: user.id }),
+    db.collection('sessions').deleteMany({ userId: user.id })
+  ]);
+  cardViews.invalidate(user.id);
+  removeFeatures(user.id);
+  const deletion = await cascadeDeleter.request(db, 'ACCOUNT', user.id, user.id);
+
+  return json({ success: true, deletion }, { status: 202 });
+});
+
+// Progress of a deletion job, for the user who requested it. An account
+// deletion signs its owner out, so its job is read with the status token
+// from DELETE account in X-Deletion-Token instead of a session.
+router.get('deletions/:id', async ({ request, db, params }) => {
+  const statusToken = request.headers.get('x-deletion-token');
+  const user = statusToken ? null : await timed('auth', () => getCurrentUser(request));
+  if (!user && !statusToken) {
+    return json({ error: 'Not authenticated' }, { status: 401 });
+  }
+  const deletion = await cascadeDeleter.status(db, params.id, { userId: user?.id, statusToken });
+  if (!deletion) {
+    return json({ error: 'Deletion not found' }, { status: 404 });
+  }
+  return json({ deletion });
+});
+
+// Get notifications
+router.get('notifications', requireUser, async ({ db, user }) => {
+  const notifications = [];
+
+  // Get real matches for notifications
+  const userMatches = await db.collection('matches').find({
+    $or: [{ aId: user.id }, { bId: user.id }]
+  }).sort({ createdAt: -1 }).limit(3).toArray();
+
+  const matchUsers = await cards.getMany(userMatches.map(match => (match.aId === user.id ? match.bId : match.aId)));
+  for (const match of userMatches) {
+    const otherUserId = match.aId === user.id ? match.bId : match.aId;
+    const otherUser = matchUsers.get(otherUserId)?.user;
+    
+    if (otherUser) {
+      notifications.push({
+        id: uuidv4(),
+        type: 'MATCH',
+        message: `You matched with ${otherUser.name}!`,
+        createdAt: match.createdAt,
+        read: false,
+        userId: otherUser.id,
+        userName: otherUser.name
+      });
+    }
+  }
 
-      return NextResponse.json({ success: true });
+  // Get real inquiries for notifications
+  const userPosts = await db.collection('posts').find({ leaderId: user.id }).toArray();
+  const postIds = userPosts.map(p => p.id);
+
+  const recentInquiries = await db.collection('inquiries').find({
+    postId: { $in: postIds },
+    status: 'PENDING'
+  }).sort({ createdAt: -1 }).limit(2).toArray();
+
+  const inquiryUsers = await cards.getMany(recentInquiries.map(inquiry => inquiry.userId));
+  for (const inquiry of recentInquiries) {
+    const inquiryUser = inquiryUsers.get(inquiry.userId)?.user;
+    const post = userPosts.find(p => p.id === inquiry.postId);
+    
+    if (inquiryUser && post) {
+      notifications.push({
+        id: uuidv4(),
+        type: 'INQUIRY',
+        message: `${inquiryUser.name} is interested in your ${post.type.toLowerCase()}: ${post.title}`,
+        createdAt: inquiry.createdAt,
+        read: false,
+        userId: inquiryUser.id,
+        userName: inquiryUser.name,
+        postId: post.id,
+        postTitle: post.title
+      });
     }
+  }
 
-    // Get notifications
-    if (path === 'notifications' && method === 'GET') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
+  // Get recent conversations for message notifications
+  const participants = await db.collection('conversationParticipants').find({
+    userId: user.id
+  }).limit(2).toArray();
+
+  for (const participant of participants) {
+    const recentMessage = await db.collection('messages').findOne(
+      { 
+        conversationId: participant.conversationId,
+        senderId: { $ne: user.id }
+      },
+      { sort: { createdAt: -1 } }
+    );
+
+    if (recentMessage && new Date() - new Date(recentMessage.createdAt) < 24 * 60 * 60 * 1000) {
+      const sender = (await cards.get(recentMessage.senderId))?.user;
+      if (sender) {
+        notifications.push({
+          id: uuidv4(),
+          type: 'MESSAGE',
+          message: `New message from ${sender.name}`,
+          createdAt: recentMessage.createdAt,
+          read: recentMessage.seq !== undefined && recentMessage.seq <= (participant.readSeq || 0),
+          userId: sender.id,
+          userName: sender.name,
+          conversationId: participant.conversationId
+        });
       }
+    }
+  }
 
-      const notifications = [];
+  // Sort notifications by date (newest first)
+  notifications.sort((a, b) => new Date(b.createdAt) - new Date(a.createdAt));
 
-      // Get real matches for notifications
-      const userMatches = await db.collection('matches').find({
-        $or: [{ aId: user.id }, { bId: user.id }]
-      }).sort({ createdAt: -1 }).limit(3).toArray();
+  return json({ notifications: notifications.slice(0, 5) });
+});
 
-      for (const match of userMatches) {
-        const otherUserId = match.aId === user.id ? match.bId : match.aId;
-        const otherUser = await db.collection('users').findOne({ id: otherUserId });
-        
-        if (otherUser) {
-          notifications.push({
-            id: uuidv4(),
-            type: 'MATCH',
-            message: `You matched with ${otherUser.name}!`,
-            createdAt: match.createdAt,
-            read: false,
-            userId: otherUser.id,
-            userName: otherUser.name
-          });
-        }
-      }
-
-      // Get real inquiries for notifications
-      const userPosts = await db.collection('posts').find({ leaderId: user.id }).toArray();
-      const postIds = userPosts.map(p => p.id);
-
-      const recentInquiries = await db.collection('inquiries').find({
-        postId: { $in: postIds },
-        status: 'PENDING'
-      }).sort({ createdAt: -1 }).limit(2).toArray();
-
-      for (const inquiry of recentInquiries) {
-        const inquiryUser = await db.collection('users').findOne({ id: inquiry.userId });
-        const post = userPosts.find(p => p.id === inquiry.postId);
-        
-        if (inquiryUser && post) {
-          notifications.push({
-            id: uuidv4(),
-            type: 'INQUIRY',
-            message: `${inquiryUser.name} is interested in your ${post.type.toLowerCase()}: ${post.title}`,
-            createdAt: inquiry.createdAt,
-            read: false,
-            userId: inquiryUser.id,
-            userName: inquiryUser.name,
-            postId: post.id,
-            postTitle: post.title
-          });
-        }
+// Create dummy data for demo
+router.post('dummy-data', requireUser, async ({ db }) => {
+  try {
+    // Create comprehensive dummy users with profiles
+    const dummyUsers = [
+      {
+        id: uuidv4(),
+        email: "aisha.kandhari@gmail.com",
+        name: "Aisha Kandhari",
+        username: "aisha_kandhari",
+        passwordHash: await bcrypt.hash("dummy123", 10),
+        imageUrl: 'https://images.unsplash.com/photo-1494790108755-2616b612b5bc?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2Nzh8MHwxfHNlYXJjaHw1fHx3b21hbiUyMGRldmVsb3BlcnxlbnwwfHx8fDE3NTk2MDg5NzZ8MA&ixlib=rb-4.1.0&q=85',
+        roleHeadline: "Senior AI/ML Engineer & TensorFlow Specialist",
+        location: "San Francisco, CA",
+        timezone: "PST",
+        createdAt: new Date(),
+        updatedAt: new Date()
+      },
+      {
+        id: uuidv4(),
+        email: "alejandro.rivera@outlook.com",
+        name: "Alejandro Rivera",
+        username: "alejandro_rivera", 
+        passwordHash: await bcrypt.hash("dummy123", 10),
+        imageUrl: 'https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2NzB8MHwxfHNlYXJjaHw3fHxtYW4lMjBkZXZlbG9wZXJ8ZW58MHx8fHwxNzU5NjA4OTc2fDA&ixlib=rb-4.1.0&q=85',
+        roleHeadline: "React Native Expert & Mobile Architecture Lead",
+        location: "Austin, TX",
+        timezone: "CST",
+        createdAt: new Date(),
+        updatedAt: new Date()
+      },
+      {
+        id: uuidv4(),
+        email: "maya.patel.dev@proton.me",
+        name: "Maya Patel",
+        username: "maya_patel",
+        passwordHash: await bcrypt.hash("dummy123", 10),
+        imageUrl: 'https://images.unsplash.com/photo-1573496359142-b8d87734a5a2?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2NzB8MHwxfHNlYXJjaHw5fHx3b21hbiUyMGRldmVsb3BlcnxlbnwwfHx8fDE3NTk2MDg5NzZ8MA&ixlib=rb-4.1.0&q=85',
+        roleHeadline: "Cloud DevOps Engineer & Kubernetes Guru",
+        location: "Seattle, WA", 
+        timezone: "PST",
+        createdAt: new Date(),
+        updatedAt: new Date()
+      },
+      {
+        id: uuidv4(),
+        email: "james.kim.blockchain@yahoo.com",
+        name: "James Kim",
+        username: "james_kim",
+        passwordHash: await bcrypt.hash("dummy123", 10),
+        imageUrl: 'https://images.unsplash.com/photo-1472099645785-5658abf4ff4e?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2NzB8MHwxfHNlYXJjaHwxMXx8bWFuJTIwZGV2ZWxvcGVyfGVufDB8fHx8MTc1OTYwODk3Nnww&ixlib=rb-4.1.0&q=85',
+        roleHeadline: "Senior Solidity Developer & DeFi Protocol Architect",
+        location: "New York, NY",
+        timezone: "EST",
+        createdAt: new Date(),
+        updatedAt: new Date()
+      },
+      {
+        id: uuidv4(),
+        email: "emily.johnson.ai@stanford.edu",
+        name: "Dr. Emily Johnson",
+        username: "emily_johnson",
+        passwordHash: await bcrypt.hash("dummy123", 10),
+        imageUrl: 'https://images.unsplash.com/photo-1438761681033-6461ffad8d80?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2NzB8MHwxfHNlYXJjaHwxM3x8d29tYW4lMjBkZXZlbG9wZXJ8ZW58MHx8fHwxNzU5NjA4OTc2fDA&ixlib=rb-4.1.0&q=85',
+        roleHeadline: "Principal Data Scientist & Computer Vision Researcher",
+        location: "Palo Alto, CA",
+        timezone: "PST",
+        createdAt: new Date(),
+        updatedAt: new Date()
+      },
+      {
+        id: uuidv4(),
+        email: "carlos.mendoza.security@gmail.com",
+        name: "Carlos Mendoza",
+        username: "carlos_mendoza",
+        passwordHash: await bcrypt.hash("dummy123", 10),
+        imageUrl: 'https://images.unsplash.com/photo-1560250097-0b93528c311a?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2NzB8MHwxfHNlYXJjaHwxNXx8bWFuJTIwZGV2ZWxvcGVyfGVufDB8fHx8MTc1OTYwODk3Nnww&ixlib=rb-4.1.0&q=85',
+        roleHeadline: "Cybersecurity Lead & Red Team Specialist",
+        location: "Miami, FL",
+        timezone: "EST",
+        createdAt: new Date(),
+        updatedAt: new Date()
+      },
+      {
+        id: uuidv4(),
+        email: "lisa.wong.design@adobe.com",
+        name: "Lisa Wong",
+        username: "lisa_wong",
+        passwordHash: await bcrypt.hash("dummy123", 10),
+        imageUrl: 'https://images.unsplash.com/photo-1580489944761-15a19d654956?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2NzB8MHwxfHNlYXJjaHwxN3x8d29tYW4lMjBkZXZlbG9wZXJ8ZW58MHx8fHwxNzU5NjA4OTc2fDA&ixlib=rb-4.1.0&q=85',
+        roleHeadline: "Senior Product Designer & Design Systems Lead",
+        location: "Los Angeles, CA",
+        timezone: "PST",
+        createdAt: new Date(),
+        updatedAt: new Date()
+      },
+      {
+        id: uuidv4(),
+        email: "fatima.al.zahra@mit.edu",
+        name: "Fatima Al-Zahra",
+        username: "fatima_alzahra",
+        passwordHash: await bcrypt.hash("dummy123", 10),
+        imageUrl: 'https://images.unsplash.com/photo-1593104547489-5cfb3839a3b5?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2Nzh8MHwxfHNlYXJjaHw5fHx3b21hbiUyMHRlY2h8ZW58MHx8fHwxNzU5NjA4OTc2fDA&ixlib=rb-4.1.0&q=85',
+        roleHeadline: "Full-Stack Engineer & Open Source Contributor",
+        location: "Cambridge, MA",
+        timezone: "EST",
+        createdAt: new Date(),
+        updatedAt: new Date()
+      },
+      {
+        id: uuidv4(),
+        email: "raj.sharma.backend@google.com",
+        name: "Rajesh Sharma",
+        username: "raj_sharma",
+        passwordHash: await bcrypt.hash("dummy123", 10),
+        imageUrl: 'https://images.unsplash.com/photo-1519085360753-af0119f7cbe7?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2Nzh8MHwxfHNlYXJjaHwxMXx8bWFuJTIwZGV2ZWxvcGVyfGVufDB8fHx8MTc1OTYwODk3Nnww&ixlib=rb-4.1.0&q=85',
+        roleHeadline: "Backend Systems Architect & Microservices Expert",
+        location: "Mountain View, CA",
+        timezone: "PST",
+        createdAt: new Date(),
+        updatedAt: new Date()
+      },
+      {
+        id: uuidv4(),
+        email: "zoe.nakamura.game@unity3d.com",
+        name: "Zoe Nakamura",
+        username: "zoe_nakamura",
+        passwordHash: await bcrypt.hash("dummy123", 10),
+        imageUrl: 'https://images.unsplash.com/photo-1598300042247-d088f8ab3a91?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2Nzh8MHwxfHNlYXJjaHwxM3x8d29tYW4lMjBnYW1lJTIwZGV2ZWxvcGVyfGVufDB8fHx8MTc1OTYwODk3Nnww&ixlib=rb-4.1.0&q=85',
+        roleHeadline: "Game Developer & AR/VR Enthusiast",
+        location: "San Jose, CA",
+        timezone: "PST",
+        createdAt: new Date(),
+        updatedAt: new Date()
       }
-
-      // Get recent conversations for message notifications
-      const participants = await db.collection('conversationParticipants').find({
-        userId: user.id
-      }).limit(2).toArray();
-
-      for (const participant of participants) {
-        const recentMessage = await db.collection('messages').findOne(
-          { 
-            conversationId: participant.conversationId,
-            senderId: { $ne: user.id }
+    ];
+
+    // Insert dummy users
+    for (const dummyUser of dummyUsers) {
+      const existingUser = await db.collection('users').findOne({ email: dummyUser.email });
+      if (!existingUser) {
+        await db.collection('users').insertOne(dummyUser);
+
+        // Create comprehensive profiles for dummy users
+        const profilesData = {
+          "aisha.kandhari@gmail.com": {
+            bio: "Senior AI/ML Engineer with 8+ years of experience at top tech companies. Passionate about building ethical AI systems that make a real-world impact. Previously led ML infrastructure at Meta and currently consulting for healthcare startups.",
+            looksToConnect: "Seeking passionate backend engineers and data scientists to revolutionize healthcare AI diagnostics",
+            skills: ["Python", "TensorFlow", "PyTorch", "React", "Node.js", "PostgreSQL", "AWS", "Docker", "Kubernetes", "MLOps", "Computer Vision", "NLP"],
+            interests: ["AI/ML", "Healthcare Tech", "Social Impact", "Computer Vision", "Ethics in AI", "MLOps"],
+            experience: [{
+              title: "Senior AI/ML Engineer",
+              org: "Meta (Facebook)",
+              startDate: "2019-03-01",
+              endDate: "2023-12-01",
+              description: "Led computer vision team for Instagram content moderation, scaled ML models to billions of users"
+            }, {
+              title: "ML Engineering Consultant",
+              org: "HealthTech Ventures",
+              startDate: "2024-01-01",
+              endDate: null,
+              description: "Building AI diagnostic tools for early disease detection"
+            }],
+            projects: [{
+              name: "MediScan AI",
+              description: "Deep learning platform for medical image analysis and early disease detection",
+              tech: ["PyTorch", "FastAPI", "React", "Docker"],
+              repoUrl: "https://github.com/aisha/mediscan",
+              demoUrl: "https://mediscan.health"
+            }]
+          },
+          "alejandro.rivera@outlook.com": {
+            bio: "Senior React Native architect with 7+ years creating award-winning mobile experiences. Former lead developer at Uber and Airbnb. Passionate about cross-platform development and mobile performance optimization.",
+            looksToConnect: "Seeking talented UI/UX designers and frontend engineers to build the next generation social gaming platform",
+            skills: ["React Native", "Flutter", "Swift", "Kotlin", "Firebase", "JavaScript", "TypeScript", "Unity", "GraphQL", "Redux"],
+            interests: ["Mobile Development", "Gaming", "AR/VR", "UI/UX Design", "Performance Optimization", "Social Platforms"],
+            experience: [{
+              title: "Senior Mobile Architect",
+              org: "Uber Technologies",
+              startDate: "2020-01-01",
+              endDate: "2023-11-01",
+              description: "Led mobile architecture for rider and driver apps, serving millions of users globally"
+            }, {
+              title: "Mobile Lead",
+              org: "Airbnb",
+              startDate: "2018-03-01", 
+              endDate: "2019-12-01",
+              description: "Architected host app mobile experience and payment systems integration"
+            }],
+            projects: [{
+              name: "SocialVR Gaming",
+              description: "Cross-platform VR gaming social network with real-time multiplayer",
+              tech: ["React Native", "Unity", "Firebase", "WebRTC"],
+              repoUrl: "https://github.com/alejandro/socialvr",
+              demoUrl: "https://socialvr.games"
+            }]
+          },
+          "maya.patel.dev@proton.me": {
+            bio: "Cloud-native DevOps engineer specializing in sustainable infrastructure. Former AWS Solutions Architect with 6+ years building carbon-efficient systems. Advocate for green technology and renewable energy in tech.",
+            looksToConnect: "Looking for passionate full-stack developers to build revolutionary climate action platform and carbon tracking solutions",
+            skills: ["Kubernetes", "Docker", "AWS", "Terraform", "Python", "Go", "Vue.js", "PostgreSQL", "Jenkins", "Prometheus", "Grafana", "Helm"],
+            interests: ["DevOps", "Climate Tech", "Sustainability", "Cloud Computing", "Green Infrastructure", "Renewable Energy"],
+            experience: [{
+              title: "Senior DevOps Engineer", 
+              org: "Stripe",
+              startDate: "2021-06-01",
+              endDate: null,
+              description: "Building resilient payment infrastructure and optimizing carbon efficiency of global systems"
+            }, {
+              title: "Cloud Solutions Architect",
+              org: "Amazon Web Services",
+              startDate: "2019-01-01",
+              endDate: "2021-05-01", 
+              description: "Designed sustainable cloud architectures for Fortune 500 companies"
+            }],
+            projects: [{
+              name: "EcoCloud Monitor",
+              description: "Real-time carbon footprint tracking for cloud infrastructure with AI-powered optimization",
+              tech: ["Kubernetes", "Python", "Vue.js", "PostgreSQL"],
+              repoUrl: "https://github.com/maya/ecocloud",
+              demoUrl: "https://ecocloud.green"
+            }]
+          },
+          "james.kim.blockchain@yahoo.com": {
+            bio: "Lead Solidity developer and DeFi protocol architect with 5+ years in Web3. Built smart contracts handling $500M+ TVL. Former blockchain lead at Coinbase, passionate about decentralized finance and Web3 innovation.",
+            looksToConnect: "Seeking frontend wizards and smart contract auditors to revolutionize decentralized insurance and build next-gen DeFi protocols",
+            skills: ["Solidity", "Web3", "Ethereum", "Polygon", "React", "TypeScript", "Hardhat", "Foundry", "OpenZeppelin", "DeFi Protocols", "Smart Contract Security"],
+            interests: ["DeFi", "Web3", "Blockchain", "Smart Contracts", "Cryptocurrency", "Decentralized Insurance", "Layer 2 Solutions"],
+            experience: [{
+              title: "Principal Blockchain Engineer",
+              org: "Coinbase",
+              startDate: "2021-09-01",
+              endDate: null,
+              description: "Leading DeFi integrations and smart contract development for institutional products"
+            }, {
+              title: "Smart Contract Developer",
+              org: "Aave",
+              startDate: "2020-03-01",
+              endDate: "2021-08-01",
+              description: "Built lending protocol smart contracts and governance mechanisms"
+            }],
+            projects: [{
+              name: "InsureDAO Protocol",
+              description: "Decentralized insurance protocol with parametric coverage and automated claims processing",
+              tech: ["Solidity", "TypeScript", "React", "The Graph"],
+              repoUrl: "https://github.com/james/insuredao",
+              demoUrl: "https://insuredao.finance"
+            }]
+          },
+          "emily.johnson.ai@stanford.edu": {
+            bio: "Principal AI researcher and computer vision expert with PhD from Stanford. 10+ years advancing state-of-the-art in medical AI. Published 50+ papers in top ML conferences. Leading breakthrough research in AI diagnostics.",
+            looksToConnect: "Recruiting brilliant software engineers and ML researchers for groundbreaking AI healthcare research that will save millions of lives",
+            skills: ["Python", "PyTorch", "TensorFlow", "JAX", "Computer Vision", "NLP", "MLOps", "Research", "Medical AI", "Deep Learning", "Transformers"],
+            interests: ["AI/ML Research", "Computer Vision", "Healthcare AI", "Medical Diagnostics", "Ethics in AI", "Research Publication"],
+            experience: [{
+              title: "Principal Research Scientist",
+              org: "Stanford AI Lab",
+              startDate: "2020-01-01",
+              endDate: null,
+              description: "Leading AI research in medical diagnostics and computer vision applications"
+            }, {
+              title: "Senior AI Researcher",
+              org: "Google DeepMind",
+              startDate: "2017-06-01",
+              endDate: "2019-12-01",
+              description: "Research on transformer architectures and multimodal AI systems"
+            }],
+            projects: [{
+              name: "DiagnosticAI Platform",
+              description: "AI-powered platform for early cancer detection using advanced computer vision and multi-modal analysis",
+              tech: ["PyTorch", "JAX", "FastAPI", "React", "Docker"],
+              repoUrl: "https://github.com/emily/diagnosticai",
+              demoUrl: "https://diagnosticai.stanford.edu"
+            }]
+          },
+          "carlos.mendoza.security@gmail.com": {
+            bio: "Elite cybersecurity expert and certified ethical hacker with 10+ years protecting Fortune 500 companies. Former NSA contractor specializing in advanced persistent threats and zero-day research. CISSP and CEH certified.",
+            looksToConnect: "Seeking skilled developers to build next-generation security tools and automated threat detection systems",
+            skills: ["Penetration Testing", "Vulnerability Research", "Python", "Go", "Rust", "Reverse Engineering", "Malware Analysis", "Network Security", "Cloud Security", "Zero-day Research"],
+            interests: ["Cybersecurity", "Ethical Hacking", "Threat Intelligence", "Security Research", "Privacy", "Cryptography", "Incident Response"],
+            experience: [{
+              title: "Principal Security Researcher",
+              org: "CrowdStrike",
+              startDate: "2021-01-01",
+              endDate: null,
+              description: "Leading advanced threat research and developing cutting-edge security solutions"
+            }, {
+              title: "Senior Penetration Tester",
+              org: "FireEye (Mandiant)",
+              startDate: "2018-04-01",
+              endDate: "2020-12-01",
+              description: "Conducted red team operations and advanced threat hunting for global enterprises"
+            }],
+            projects: [{
+              name: "ThreatHunter AI",
+              description: "AI-powered threat detection system using machine learning for anomaly detection and attack prediction",
+              tech: ["Python", "TensorFlow", "Go", "Elasticsearch"],
+              repoUrl: "https://github.com/carlos/threathunter",
+              demoUrl: "https://threathunter.security"
+            }]
+          },
+          "lisa.wong.design@adobe.com": {
+            bio: "Senior Product Designer and Design Systems Lead at Adobe with 8+ years crafting user-centered experiences. Expert in design thinking methodology and data-driven design. Passionate about accessibility and inclusive design.",
+            looksToConnect: "Looking for talented developers and researchers to create revolutionary accessibility-first design tools and inclusive user experiences",
+            skills: ["Figma", "Adobe Creative Suite", "Sketch", "Principle", "JavaScript", "React", "Design Systems", "User Research", "A/B Testing", "Accessibility", "Prototyping"],
+            interests: ["Product Design", "Design Systems", "Accessibility", "User Research", "EdTech", "Inclusive Design", "Design Tools"],
+            experience: [{
+              title: "Senior Product Designer",
+              org: "Adobe",
+              startDate: "2020-02-01",
+              endDate: null,
+              description: "Leading design systems and accessibility initiatives for Creative Cloud products"
+            }, {
+              title: "UX Design Lead",
+              org: "Shopify",
+              startDate: "2018-06-01",
+              endDate: "2020-01-01",
+              description: "Designed merchant experiences and led accessibility improvements across platform"
+            }],
+            projects: [{
+              name: "AccessiDesign Toolkit",
+              description: "Comprehensive design system and toolkit for creating accessible digital experiences",
+              tech: ["Figma Plugin", "React", "TypeScript", "WCAG"],
+              repoUrl: "https://github.com/lisa/accessidesign",
+              demoUrl: "https://accessidesign.tools"
+            }]
+          },
+          "fatima.al.zahra@mit.edu": {
+            bio: "Full-stack engineer and open-source advocate with computer science background from MIT. 6+ years building scalable web applications. Active contributor to major open-source projects with 10k+ GitHub stars.",
+            looksToConnect: "Seeking passionate developers to contribute to open-source educational technology and democratize access to quality learning",
+            skills: ["JavaScript", "TypeScript", "React", "Node.js", "Python", "PostgreSQL", "MongoDB", "Docker", "AWS", "GraphQL", "Open Source"],
+            interests: ["Open Source", "EdTech", "Web Development", "Community Building", "Educational Equity", "Developer Tools"],
+            experience: [{
+              title: "Senior Full-Stack Engineer",
+              org: "Khan Academy",
+              startDate: "2021-08-01",
+              endDate: null,
+              description: "Building educational tools and learning platforms to make quality education accessible globally"
+            }, {
+              title: "Software Engineer",
+              org: "GitHub",
+              startDate: "2019-06-01",
+              endDate: "2021-07-01",
+              description: "Developed developer tools and improved platform accessibility"
+            }],
+            projects: [{
+              name: "LearnOpen Platform",
+              description: "Open-source learning management system with collaborative coding environments",
+              tech: ["React", "Node.js", "PostgreSQL", "Docker"],
+              repoUrl: "https://github.com/fatima/learnopen",
+              demoUrl: "https://learnopen.org"
+            }]
+          },
+          "raj.sharma.backend@google.com": {
+            bio: "Backend systems architect at Google with 9+ years designing distributed systems at scale. Expert in microservices, event-driven architecture, and high-performance computing. Built systems serving billions of requests.",
+            looksToConnect: "Looking for frontend engineers and DevOps specialists to build next-generation developer tools and cloud-native platforms",
+            skills: ["Go", "Java", "Python", "Kubernetes", "gRPC", "Apache Kafka", "PostgreSQL", "Redis", "Google Cloud", "Microservices", "System Design"],
+            interests: ["Distributed Systems", "Microservices", "Cloud Computing", "Performance Engineering", "Developer Tools", "System Architecture"],
+            experience: [{
+              title: "Staff Software Engineer",
+              org: "Google", 
+              startDate: "2020-01-01",
+              endDate: null,
+              description: "Architecting backend systems for Google Cloud Platform and developer tools"
+            }, {
+              title: "Senior Backend Engineer",
+              org: "Netflix",
+              startDate: "2017-03-01",
+              endDate: "2019-12-01",
+              description: "Built recommendation engine backend systems serving 200M+ global users"
+            }],
+            projects: [{
+              name: "CloudFlow Engine",
+              description: "High-performance serverless computing platform with auto-scaling and edge distribution",
+              tech: ["Go", "Kubernetes", "gRPC", "Apache Kafka"],
+              repoUrl: "https://github.com/raj/cloudflow",
+              demoUrl: "https://cloudflow.dev"
+            }]
           },
-          { sort: { createdAt: -1 } }
-        );
-
-        if (recentMessage && new Date() - new Date(recentMessage.createdAt) < 24 * 60 * 60 * 1000) {
-          const sender = await db.collection('users').findOne({ id: recentMessage.senderId });
-          if (sender) {
-            notifications.push({
-              id: uuidv4(),
-              type: 'MESSAGE',
-              message: `New message from ${sender.name}`,
-              createdAt: recentMessage.createdAt,
-              read: false,
-              userId: sender.id,
-              userName: sender.name,
-              conversationId: participant.conversationId
-            });
+          "zoe.nakamura.game@unity3d.com": {
+            bio: "Creative technologist and game developer with 7+ years creating immersive AR/VR experiences. Unity Certified Expert specializing in mixed reality and interactive installations. Passionate about gamification and educational games.",
+            looksToConnect: "Seeking creative developers and 3D artists to build revolutionary AR/VR educational experiences and interactive art installations",
+            skills: ["Unity3D", "C#", "Unreal Engine", "AR/VR Development", "3D Modeling", "WebGL", "JavaScript", "Blender", "ARCore", "ARKit", "Oculus SDK"],
+            interests: ["Game Development", "AR/VR", "Interactive Art", "Educational Games", "3D Graphics", "Mixed Reality", "Creative Technology"],
+            experience: [{
+              title: "Senior AR/VR Developer",
+              org: "Unity Technologies",
+              startDate: "2021-05-01",
+              endDate: null,
+              description: "Creating AR/VR development tools and immersive educational experiences"
+            }, {
+              title: "Game Developer",
+              org: "Oculus (Meta)",
+              startDate: "2019-02-01",
+              endDate: "2021-04-01",
+              description: "Developed VR games and experiences for Oculus platform"
+            }],
+            projects: [{
+              name: "EduVerse AR",
+              description: "Augmented reality educational platform making learning interactive and immersive",
+              tech: ["Unity3D", "ARCore", "C#", "Firebase"],
+              repoUrl: "https://github.com/zoe/eduverse",
+              demoUrl: "https://eduverse.ar"
+            }]
           }
-        }
-      }
-
-      // Sort notifications by date (newest first)
-      notifications.sort((a, b) => new Date(b.createdAt) - new Date(a.createdAt));
-
-      return NextResponse.json({ notifications: notifications.slice(0, 5) });
-    }
-
-    // Create dummy data for demo
-    if (path === 'dummy-data' && method === 'POST') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
-      }
+        };
 
-      try {
-        // Create comprehensive dummy users with profiles
-        const dummyUsers = [
-          {
+        const profiles = {
+          [dummyUser.email]: {
             id: uuidv4(),
-            email: "aisha.kandhari@gmail.com",
-            name: "Aisha Kandhari",
-            username: "aisha_kandhari",
-            passwordHash: await bcrypt.hash("dummy123", 10),
-            imageUrl: 'https://images.unsplash.com/photo-1494790108755-2616b612b5bc?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2Nzh8MHwxfHNlYXJjaHw1fHx3b21hbiUyMGRldmVsb3BlcnxlbnwwfHx8fDE3NTk2MDg5NzZ8MA&ixlib=rb-4.1.0&q=85',
-            roleHeadline: "Senior AI/ML Engineer & TensorFlow Specialist",
-            location: "San Francisco, CA",
-            timezone: "PST",
+            userId: dummyUser.id,
+            bio: profilesData[dummyUser.email].bio,
+            looksToConnect: profilesData[dummyUser.email].looksToConnect,
+            skills: profilesData[dummyUser.email].skills,
+            interests: profilesData[dummyUser.email].interests,
+            experience: profilesData[dummyUser.email].experience,
+            projects: profilesData[dummyUser.email].projects,
+            awards: [],
+            socials: [{
+              type: "GITHUB",
+              url: `https://github.com/${dummyUser.username}`
+            }],
+            preferences: {
+              desiredRoles: ["Developer", "Engineer"],
+              techStack: [],
+              interestTags: [],
+              locationRadiusKm: 50,
+              remoteOk: true,
+              availabilityHrs: 20,
+              searchPeople: true,
+              searchProjects: true,
+              searchHackathons: true
+            },
             createdAt: new Date(),
             updatedAt: new Date()
-          },
-          {
+          }
+        };
+
+        Object.assign(profiles[dummyUser.email], profileSkillFields(profiles[dummyUser.email]), {
+          geo: geocode(dummyUser.location)
+        });
+        await db.collection('profiles').insertOne(profiles[dummyUser.email]);
+        updateFeatures(dummyUser, profiles[dummyUser.email]);
+
+        // Clear existing posts from dummy users to prevent duplicates
+        await db.collection('posts').deleteMany({ leaderId: dummyUser.id });
+
+        // Create posts for some users
+        if (dummyUser.email === "aisha.kandhari@gmail.com") {
+          const post1 = {
             id: uuidv4(),
-            email: "alejandro.rivera@outlook.com",
-            name: "Alejandro Rivera",
-            username: "alejandro_rivera", 
-            passwordHash: await bcrypt.hash("dummy123", 10),
-            imageUrl: 'https://images.unsplash.com/photo-1507003211169-0a1dd7228f2d?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2NzB8MHwxfHNlYXJjaHw3fHxtYW4lMjBkZXZlbG9wZXJ8ZW58MHx8fHwxNzU5NjA4OTc2fDA&ixlib=rb-4.1.0&q=85',
-            roleHeadline: "React Native Expert & Mobile Architecture Lead",
-            location: "Austin, TX",
-            timezone: "CST",
+            type: "HACKATHON",
+            leaderId: dummyUser.id,
+            title: "AI4Earth: Global Climate Action Hackathon 2024",
+            location: "San Francisco, CA (Hybrid)",
+            websiteUrl: "https://ai4earth.stanford.edu",
+            skillsNeeded: ["Python", "PyTorch", "Computer Vision", "Satellite Data Analysis", "Climate Science", "React"],
+            notes: "Join Stanford AI Lab for a 72-hour intensive hackathon tackling climate change with cutting-edge AI. Build solutions using satellite imagery, climate data, and machine learning to create real impact. $150K in prizes, mentorship from top researchers at Google DeepMind, OpenAI, and leading climate scientists. Winners get fast-track interviews at leading climate tech companies and research labs.",
+            status: "OPEN",
+            visibility: "PUBLIC",
             createdAt: new Date(),
             updatedAt: new Date()
-          },
-          {
+          };
+          await db.collection('posts').insertOne({ ...post1, ...postFilterFields(post1) });
+        }
+
+        if (dummyUser.email === "alejandro.rivera@outlook.com") {
+          const post2 = {
             id: uuidv4(),
-            email: "maya.patel.dev@proton.me",
-            name: "Maya Patel",
-            username: "maya_patel",
-            passwordHash: await bcrypt.hash("dummy123", 10),
-            imageUrl: 'https://images.unsplash.com/photo-1573496359142-b8d87734a5a2?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2NzB8MHwxfHNlYXJjaHw5fHx3b21hbiUyMGRldmVsb3BlcnxlbnwwfHx8fDE3NTk2MDg5NzZ8MA&ixlib=rb-4.1.0&q=85',
-            roleHeadline: "Cloud DevOps Engineer & Kubernetes Guru",
-            location: "Seattle, WA", 
-            timezone: "PST",
+            type: "PROJECT",
+            leaderId: dummyUser.id,
+            title: "SocialVR: Next-Gen AR/VR Social Gaming Platform",
+            location: "Austin, TX (Remote Welcome)",
+            websiteUrl: "https://socialvr.games",
+            skillsNeeded: ["React Native", "Unity3D", "WebRTC", "AR/VR Development", "3D Graphics", "Multiplayer Networking"],
+            notes: "Building the future of social gaming with immersive AR/VR experiences. We're creating cross-platform social games that connect people in virtual worlds. Seeking passionate developers, 3D artists, and UX designers to join our funded startup. Equity compensation, flexible remote work, and opportunity to shape the future of social gaming. Recently secured $2M seed funding from top VR investors.",
+            status: "OPEN",
+            visibility: "PUBLIC",
             createdAt: new Date(),
             updatedAt: new Date()
-          },
-          {
+          };
+          await db.collection('posts').insertOne({ ...post2, ...postFilterFields(post2) });
+        }
+
+        if (dummyUser.email === "james.kim.blockchain@yahoo.com") {
+          const post3 = {
             id: uuidv4(),
-            email: "james.kim.blockchain@yahoo.com",
-            name: "James Kim",
-            username: "james_kim",
-            passwordHash: await bcrypt.hash("dummy123", 10),
-            imageUrl: 'https://images.unsplash.com/photo-1472099645785-5658abf4ff4e?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2NzB8MHwxfHNlYXJjaHwxMXx8bWFuJTIwZGV2ZWxvcGVyfGVufDB8fHx8MTc1OTYwODk3Nnww&ixlib=rb-4.1.0&q=85',
-            roleHeadline: "Senior Solidity Developer & DeFi Protocol Architect",
+            type: "HACKATHON",
+            leaderId: dummyUser.id,
+            title: "Web3 Social Impact Hackathon",
             location: "New York, NY",
-            timezone: "EST",
+            websiteUrl: "https://web3impact.org",
+            skillsNeeded: ["Solidity", "React", "Web3", "Smart Contracts"],
+            notes: "Revolutionary 3-day hackathon building decentralized applications for social good. Connect with Web3 pioneers and create the future!",
+            status: "OPEN",
+            visibility: "PUBLIC",
             createdAt: new Date(),
             updatedAt: new Date()
-          },
-          {
+          };
+          await db.collection('posts').insertOne({ ...post3, ...postFilterFields(post3) });
+        }
+
+        if (dummyUser.email === "emily.johnson.ai@stanford.edu") {
+          const post4 = {
             id: uuidv4(),
-            email: "emily.johnson.ai@stanford.edu",
-            name: "Dr. Emily Johnson",
-            username: "emily_johnson",
-            passwordHash: await bcrypt.hash("dummy123", 10),
-            imageUrl: 'https://images.unsplash.com/photo-1438761681033-6461ffad8d80?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2NzB8MHwxfHNlYXJjaHwxM3x8d29tYW4lMjBkZXZlbG9wZXJ8ZW58MHx8fHwxNzU5NjA4OTc2fDA&ixlib=rb-4.1.0&q=85',
-            roleHeadline: "Principal Data Scientist & Computer Vision Researcher",
-            location: "Palo Alto, CA",
-            timezone: "PST",
+            type: "PROJECT",
+            leaderId: dummyUser.id,
+            title: "HealthAI - Medical Diagnosis Assistant",
+            location: "Boston, MA (Hybrid)",
+            websiteUrl: "https://health-ai.research.edu",
+            skillsNeeded: ["Python", "PyTorch", "Medical Data", "React", "API Development"],
+            notes: "Open-source AI project for medical diagnosis assistance. Collaborating with hospitals and research institutions. Join us in revolutionizing healthcare!",
+            status: "OPEN",
+            visibility: "PUBLIC",
             createdAt: new Date(),
             updatedAt: new Date()
-          },
-          {
+          };
+          await db.collection('posts').insertOne({ ...post4, ...postFilterFields(post4) });
+        }
+
+        if (dummyUser.email === "carlos.mendoza.security@gmail.com") {
+          const post5 = {
             id: uuidv4(),
-            email: "carlos.mendoza.security@gmail.com",
-            name: "Carlos Mendoza",
-            username: "carlos_mendoza",
-            passwordHash: await bcrypt.hash("dummy123", 10),
-            imageUrl: 'https://images.unsplash.com/photo-1560250097-0b93528c311a?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2NzB8MHwxfHNlYXJjaHwxNXx8bWFuJTIwZGV2ZWxvcGVyfGVufDB8fHx8MTc1OTYwODk3Nnww&ixlib=rb-4.1.0&q=85',
-            roleHeadline: "Cybersecurity Lead & Red Team Specialist",
-            location: "Miami, FL",
-            timezone: "EST",
+            type: "HACKATHON",
+            leaderId: dummyUser.id,
+            title: "CyberSec Challenge 2024",
+            location: "Denver, CO",
+            websiteUrl: "https://cybersec-challenge.com",
+            skillsNeeded: ["Cybersecurity", "Python", "Penetration Testing", "Network Security"],
+            notes: "Elite cybersecurity competition with real-world scenarios. Test your skills against the best hackers and security researchers. Prizes worth $100K!",
+            status: "OPEN",
+            visibility: "PUBLIC",
             createdAt: new Date(),
             updatedAt: new Date()
-          },
-          {
+          };
+          await db.collection('posts').insertOne({ ...post5, ...postFilterFields(post5) });
+        }
+
+        if (dummyUser.email === "lisa.wong.design@adobe.com") {
+          const post6 = {
             id: uuidv4(),
-            email: "lisa.wong.design@adobe.com",
-            name: "Lisa Wong",
-            username: "lisa_wong",
-            passwordHash: await bcrypt.hash("dummy123", 10),
-            imageUrl: 'https://images.unsplash.com/photo-1580489944761-15a19d654956?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2NzB8MHwxfHNlYXJjaHwxN3x8d29tYW4lMjBkZXZlbG9wZXJ8ZW58MHx8fHwxNzU5NjA4OTc2fDA&ixlib=rb-4.1.0&q=85',
-            roleHeadline: "Senior Product Designer & Design Systems Lead",
-            location: "Los Angeles, CA",
-            timezone: "PST",
+            type: "PROJECT",
+            leaderId: dummyUser.id,
+            title: "EduTech Innovation Platform",
+            location: "Los Angeles, CA (Remote)",
+            websiteUrl: "https://edutech-innovation.org",
+            skillsNeeded: ["React", "Node.js", "UI/UX Design", "Education Technology"],
+            notes: "Building the next generation of educational tools. Looking for developers and designers passionate about transforming education through technology.",
+            status: "OPEN",
+            visibility: "PUBLIC",
             createdAt: new Date(),
             updatedAt: new Date()
-          },
-          {
+          };
+          await db.collection('posts').insertOne({ ...post6, ...postFilterFields(post6) });
+
+          // Additional diverse hackathon
+          const post7 = {
             id: uuidv4(),
-            email: "fatima.al.zahra@mit.edu",
-            name: "Fatima Al-Zahra",
-            username: "fatima_alzahra",
-            passwordHash: await bcrypt.hash("dummy123", 10),
-            imageUrl: 'https://images.unsplash.com/photo-1593104547489-5cfb3839a3b5?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2Nzh8MHwxfHNlYXJjaHw5fHx3b21hbiUyMHRlY2h8ZW58MHx8fHwxNzU5NjA4OTc2fDA&ixlib=rb-4.1.0&q=85',
-            roleHeadline: "Full-Stack Engineer & Open Source Contributor",
-            location: "Cambridge, MA",
-            timezone: "EST",
+            type: "HACKATHON",
+            leaderId: dummyUser.id,
+            title: "Design Thinking Hackathon",
+            location: "Los Angeles, CA",
+            websiteUrl: "https://designthinking-hack.com",
+            skillsNeeded: ["UI/UX Design", "Figma", "User Research", "Prototyping"],
+            notes: "24-hour design-focused hackathon. Create user-centered solutions for real-world problems with design thinking methodology.",
+            status: "OPEN",
+            visibility: "PUBLIC",
             createdAt: new Date(),
             updatedAt: new Date()
-          },
-          {
+          };
+          await db.collection('posts').insertOne({ ...post7, ...postFilterFields(post7) });
+        }
+
+        if (dummyUser.email === "maya.patel.dev@proton.me") {
+          const post8 = {
             id: uuidv4(),
-            email: "raj.sharma.backend@google.com",
-            name: "Rajesh Sharma",
-            username: "raj_sharma",
-            passwordHash: await bcrypt.hash("dummy123", 10),
-            imageUrl: 'https://images.unsplash.com/photo-1519085360753-af0119f7cbe7?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2Nzh8MHwxfHNlYXJjaHwxMXx8bWFuJTIwZGV2ZWxvcGVyfGVufDB8fHx8MTc1OTYwODk3Nnww&ixlib=rb-4.1.0&q=85',
-            roleHeadline: "Backend Systems Architect & Microservices Expert",
-            location: "Mountain View, CA",
-            timezone: "PST",
+            type: "HACKATHON",
+            leaderId: dummyUser.id,
+            title: "Green Tech Innovation Challenge",
+            location: "Seattle, WA",
+            websiteUrl: "https://greentech-hack.org",
+            skillsNeeded: ["Python", "IoT", "Renewable Energy", "Data Analytics"],
+            notes: "3-day sustainability hackathon focusing on renewable energy solutions and environmental monitoring systems.",
+            status: "OPEN",
+            visibility: "PUBLIC",
             createdAt: new Date(),
             updatedAt: new Date()
-          },
-          {
+          };
+          await db.collection('posts').insertOne({ ...post8, ...postFilterFields(post8) });
+
+          const post9 = {
             id: uuidv4(),
-            email: "zoe.nakamura.game@unity3d.com",
-            name: "Zoe Nakamura",
-            username: "zoe_nakamura",
-            passwordHash: await bcrypt.hash("dummy123", 10),
-            imageUrl: 'https://images.unsplash.com/photo-1598300042247-d088f8ab3a91?crop=entropy&cs=srgb&fm=jpg&ixid=M3w3NTY2Nzh8MHwxfHNlYXJjaHwxM3x8d29tYW4lMjBnYW1lJTIwZGV2ZWxvcGVyfGVufDB8fHx8MTc1OTYwODk3Nnww&ixlib=rb-4.1.0&q=85',
-            roleHeadline: "Game Developer & AR/VR Enthusiast",
-            location: "San Jose, CA",
-            timezone: "PST",
+            type: "PROJECT",
+            leaderId: dummyUser.id,
+            title: "Smart City Infrastructure",
+            location: "Remote",
+            websiteUrl: "https://smart-city.dev",
+            skillsNeeded: ["IoT", "Docker", "Kubernetes", "Microservices"],
+            notes: "Building next-generation smart city infrastructure with IoT sensors and edge computing for sustainable urban living.",
+            status: "OPEN",
+            visibility: "PUBLIC",
             createdAt: new Date(),
             updatedAt: new Date()
-          }
-        ];
-
-        // Insert dummy users
-        for (const dummyUser of dummyUsers) {
-          const existingUser = await db.collection('users').findOne({ email: dummyUser.email });
-          if (!existingUser) {
-            await db.collection('users').insertOne(dummyUser);
-
-            // Create comprehensive profiles for dummy users
-            const profilesData = {
-              "aisha.kandhari@gmail.com": {
-                bio: "Senior AI/ML Engineer with 8+ years of experience at top tech companies. Passionate about building ethical AI systems that make a real-world impact. Previously led ML infrastructure at Meta and currently consulting for healthcare startups.",
-                looksToConnect: "Seeking passionate backend engineers and data scientists to revolutionize healthcare AI diagnostics",
-                skills: ["Python", "TensorFlow", "PyTorch", "React", "Node.js", "PostgreSQL", "AWS", "Docker", "Kubernetes", "MLOps", "Computer Vision", "NLP"],
-                interests: ["AI/ML", "Healthcare Tech", "Social Impact", "Computer Vision", "Ethics in AI", "MLOps"],
-                experience: [{
-                  title: "Senior AI/ML Engineer",
-                  org: "Meta (Facebook)",
-                  startDate: "2019-03-01",
-                  endDate: "2023-12-01",
-                  description: "Led computer vision team for Instagram content moderation, scaled ML models to billions of users"
-                }, {
-                  title: "ML Engineering Consultant",
-                  org: "HealthTech Ventures",
-                  startDate: "2024-01-01",
-                  endDate: null,
-                  description: "Building AI diagnostic tools for early disease detection"
-                }],
-                projects: [{
-                  name: "MediScan AI",
-                  description: "Deep learning platform for medical image analysis and early disease detection",
-                  tech: ["PyTorch", "FastAPI", "React", "Docker"],
-                  repoUrl: "https://github.com/aisha/mediscan",
-                  demoUrl: "https://mediscan.health"
-                }]
-              },
-              "alejandro.rivera@outlook.com": {
-                bio: "Senior React Native architect with 7+ years creating award-winning mobile experiences. Former lead developer at Uber and Airbnb. Passionate about cross-platform development and mobile performance optimization.",
-                looksToConnect: "Seeking talented UI/UX designers and frontend engineers to build the next generation social gaming platform",
-                skills: ["React Native", "Flutter", "Swift", "Kotlin", "Firebase", "JavaScript", "TypeScript", "Unity", "GraphQL", "Redux"],
-                interests: ["Mobile Development", "Gaming", "AR/VR", "UI/UX Design", "Performance Optimization", "Social Platforms"],
-                experience: [{
-                  title: "Senior Mobile Architect",
-                  org: "Uber Technologies",
-                  startDate: "2020-01-01",
-                  endDate: "2023-11-01",
-                  description: "Led mobile architecture for rider and driver apps, serving millions of users globally"
-                }, {
-                  title: "Mobile Lead",
-                  org: "Airbnb",
-                  startDate: "2018-03-01", 
-                  endDate: "2019-12-01",
-                  description: "Architected host app mobile experience and payment systems integration"
-                }],
-                projects: [{
-                  name: "SocialVR Gaming",
-                  description: "Cross-platform VR gaming social network with real-time multiplayer",
-                  tech: ["React Native", "Unity", "Firebase", "WebRTC"],
-                  repoUrl: "https://github.com/alejandro/socialvr",
-                  demoUrl: "https://socialvr.games"
-                }]
-              },
-              "maya.patel.dev@proton.me": {
-                bio: "Cloud-native DevOps engineer specializing in sustainable infrastructure. Former AWS Solutions Architect with 6+ years building carbon-efficient systems. Advocate for green technology and renewable energy in tech.",
-                looksToConnect: "Looking for passionate full-stack developers to build revolutionary climate action platform and carbon tracking solutions",
-                skills: ["Kubernetes", "Docker", "AWS", "Terraform", "Python", "Go", "Vue.js", "PostgreSQL", "Jenkins", "Prometheus", "Grafana", "Helm"],
-                interests: ["DevOps", "Climate Tech", "Sustainability", "Cloud Computing", "Green Infrastructure", "Renewable Energy"],
-                experience: [{
-                  title: "Senior DevOps Engineer", 
-                  org: "Stripe",
-                  startDate: "2021-06-01",
-                  endDate: null,
-                  description: "Building resilient payment infrastructure and optimizing carbon efficiency of global systems"
-                }, {
-                  title: "Cloud Solutions Architect",
-                  org: "Amazon Web Services",
-                  startDate: "2019-01-01",
-                  endDate: "2021-05-01", 
-                  description: "Designed sustainable cloud architectures for Fortune 500 companies"
-                }],
-                projects: [{
-                  name: "EcoCloud Monitor",
-                  description: "Real-time carbon footprint tracking for cloud infrastructure with AI-powered optimization",
-                  tech: ["Kubernetes", "Python", "Vue.js", "PostgreSQL"],
-                  repoUrl: "https://github.com/maya/ecocloud",
-                  demoUrl: "https://ecocloud.green"
-                }]
-              },
-              "james.kim.blockchain@yahoo.com": {
-                bio: "Lead Solidity developer and DeFi protocol architect with 5+ years in Web3. Built smart contracts handling $500M+ TVL. Former blockchain lead at Coinbase, passionate about decentralized finance and Web3 innovation.",
-                looksToConnect: "Seeking frontend wizards and smart contract auditors to revolutionize decentralized insurance and build next-gen DeFi protocols",
-                skills: ["Solidity", "Web3", "Ethereum", "Polygon", "React", "TypeScript", "Hardhat", "Foundry", "OpenZeppelin", "DeFi Protocols", "Smart Contract Security"],
-                interests: ["DeFi", "Web3", "Blockchain", "Smart Contracts", "Cryptocurrency", "Decentralized Insurance", "Layer 2 Solutions"],
-                experience: [{
-                  title: "Principal Blockchain Engineer",
-                  org: "Coinbase",
-                  startDate: "2021-09-01",
-                  endDate: null,
-                  description: "Leading DeFi integrations and smart contract development for institutional products"
-                }, {
-                  title: "Smart Contract Developer",
-                  org: "Aave",
-                  startDate: "2020-03-01",
-                  endDate: "2021-08-01",
-                  description: "Built lending protocol smart contracts and governance mechanisms"
-                }],
-                projects: [{
-                  name: "InsureDAO Protocol",
-                  description: "Decentralized insurance protocol with parametric coverage and automated claims processing",
-                  tech: ["Solidity", "TypeScript", "React", "The Graph"],
-                  repoUrl: "https://github.com/james/insuredao",
-                  demoUrl: "https://insuredao.finance"
-                }]
-              },
-              "emily.johnson.ai@stanford.edu": {
-                bio: "Principal AI researcher and computer vision expert with PhD from Stanford. 10+ years advancing state-of-the-art in medical AI. Published 50+ papers in top ML conferences. Leading breakthrough research in AI diagnostics.",
-                looksToConnect: "Recruiting brilliant software engineers and ML researchers for groundbreaking AI healthcare research that will save millions of lives",
-                skills: ["Python", "PyTorch", "TensorFlow", "JAX", "Computer Vision", "NLP", "MLOps", "Research", "Medical AI", "Deep Learning", "Transformers"],
-                interests: ["AI/ML Research", "Computer Vision", "Healthcare AI", "Medical Diagnostics", "Ethics in AI", "Research Publication"],
-                experience: [{
-                  title: "Principal Research Scientist",
-                  org: "Stanford AI Lab",
-                  startDate: "2020-01-01",
-                  endDate: null,
-                  description: "Leading AI research in medical diagnostics and computer vision applications"
-                }, {
-                  title: "Senior AI Researcher",
-                  org: "Google DeepMind",
-                  startDate: "2017-06-01",
-                  endDate: "2019-12-01",
-                  description: "Research on transformer architectures and multimodal AI systems"
-                }],
-                projects: [{
-                  name: "DiagnosticAI Platform",
-                  description: "AI-powered platform for early cancer detection using advanced computer vision and multi-modal analysis",
-                  tech: ["PyTorch", "JAX", "FastAPI", "React", "Docker"],
-                  repoUrl: "https://github.com/emily/diagnosticai",
-                  demoUrl: "https://diagnosticai.stanford.edu"
-                }]
-              },
-              "carlos.mendoza.security@gmail.com": {
-                bio: "Elite cybersecurity expert and certified ethical hacker with 10+ years protecting Fortune 500 companies. Former NSA contractor specializing in advanced persistent threats and zero-day research. CISSP and CEH certified.",
-                looksToConnect: "Seeking skilled developers to build next-generation security tools and automated threat detection systems",
-                skills: ["Penetration Testing", "Vulnerability Research", "Python", "Go", "Rust", "Reverse Engineering", "Malware Analysis", "Network Security", "Cloud Security", "Zero-day Research"],
-                interests: ["Cybersecurity", "Ethical Hacking", "Threat Intelligence", "Security Research", "Privacy", "Cryptography", "Incident Response"],
-                experience: [{
-                  title: "Principal Security Researcher",
-                  org: "CrowdStrike",
-                  startDate: "2021-01-01",
-                  endDate: null,
-                  description: "Leading advanced threat research and developing cutting-edge security solutions"
-                }, {
-                  title: "Senior Penetration Tester",
-                  org: "FireEye (Mandiant)",
-                  startDate: "2018-04-01",
-                  endDate: "2020-12-01",
-                  description: "Conducted red team operations and advanced threat hunting for global enterprises"
-                }],
-                projects: [{
-                  name: "ThreatHunter AI",
-                  description: "AI-powered threat detection system using machine learning for anomaly detection and attack prediction",
-                  tech: ["Python", "TensorFlow", "Go", "Elasticsearch"],
-                  repoUrl: "https://github.com/carlos/threathunter",
-                  demoUrl: "https://threathunter.security"
-                }]
-              },
-              "lisa.wong.design@adobe.com": {
-                bio: "Senior Product Designer and Design Systems Lead at Adobe with 8+ years crafting user-centered experiences. Expert in design thinking methodology and data-driven design. Passionate about accessibility and inclusive design.",
-                looksToConnect: "Looking for talented developers and researchers to create revolutionary accessibility-first design tools and inclusive user experiences",
-                skills: ["Figma", "Adobe Creative Suite", "Sketch", "Principle", "JavaScript", "React", "Design Systems", "User Research", "A/B Testing", "Accessibility", "Prototyping"],
-                interests: ["Product Design", "Design Systems", "Accessibility", "User Research", "EdTech", "Inclusive Design", "Design Tools"],
-                experience: [{
-                  title: "Senior Product Designer",
-                  org: "Adobe",
-                  startDate: "2020-02-01",
-                  endDate: null,
-                  description: "Leading design systems and accessibility initiatives for Creative Cloud products"
-                }, {
-                  title: "UX Design Lead",
-                  org: "Shopify",
-                  startDate: "2018-06-01",
-                  endDate: "2020-01-01",
-                  description: "Designed merchant experiences and led accessibility improvements across platform"
-                }],
-                projects: [{
-                  name: "AccessiDesign Toolkit",
-                  description: "Comprehensive design system and toolkit for creating accessible digital experiences",
-                  tech: ["Figma Plugin", "React", "TypeScript", "WCAG"],
-                  repoUrl: "https://github.com/lisa/accessidesign",
-                  demoUrl: "https://accessidesign.tools"
-                }]
-              },
-              "fatima.al.zahra@mit.edu": {
-                bio: "Full-stack engineer and open-source advocate with computer science background from MIT. 6+ years building scalable web applications. Active contributor to major open-source projects with 10k+ GitHub stars.",
-                looksToConnect: "Seeking passionate developers to contribute to open-source educational technology and democratize access to quality learning",
-                skills: ["JavaScript", "TypeScript", "React", "Node.js", "Python", "PostgreSQL", "MongoDB", "Docker", "AWS", "GraphQL", "Open Source"],
-                interests: ["Open Source", "EdTech", "Web Development", "Community Building", "Educational Equity", "Developer Tools"],
-                experience: [{
-                  title: "Senior Full-Stack Engineer",
-                  org: "Khan Academy",
-                  startDate: "2021-08-01",
-                  endDate: null,
-                  description: "Building educational tools and learning platforms to make quality education accessible globally"
-                }, {
-                  title: "Software Engineer",
-                  org: "GitHub",
-                  startDate: "2019-06-01",
-                  endDate: "2021-07-01",
-                  description: "Developed developer tools and improved platform accessibility"
-                }],
-                projects: [{
-                  name: "LearnOpen Platform",
-                  description: "Open-source learning management system with collaborative coding environments",
-                  tech: ["React", "Node.js", "PostgreSQL", "Docker"],
-                  repoUrl: "https://github.com/fatima/learnopen",
-                  demoUrl: "https://learnopen.org"
-                }]
-              },
-              "raj.sharma.backend@google.com": {
-                bio: "Backend systems architect at Google with 9+ years designing distributed systems at scale. Expert in microservices, event-driven architecture, and high-performance computing. Built systems serving billions of requests.",
-                looksToConnect: "Looking for frontend engineers and DevOps specialists to build next-generation developer tools and cloud-native platforms",
-                skills: ["Go", "Java", "Python", "Kubernetes", "gRPC", "Apache Kafka", "PostgreSQL", "Redis", "Google Cloud", "Microservices", "System Design"],
-                interests: ["Distributed Systems", "Microservices", "Cloud Computing", "Performance Engineering", "Developer Tools", "System Architecture"],
-                experience: [{
-                  title: "Staff Software Engineer",
-                  org: "Google", 
-                  startDate: "2020-01-01",
-                  endDate: null,
-                  description: "Architecting backend systems for Google Cloud Platform and developer tools"
-                }, {
-                  title: "Senior Backend Engineer",
-                  org: "Netflix",
-                  startDate: "2017-03-01",
-                  endDate: "2019-12-01",
-                  description: "Built recommendation engine backend systems serving 200M+ global users"
-                }],
-                projects: [{
-                  name: "CloudFlow Engine",
-                  description: "High-performance serverless computing platform with auto-scaling and edge distribution",
-                  tech: ["Go", "Kubernetes", "gRPC", "Apache Kafka"],
-                  repoUrl: "https://github.com/raj/cloudflow",
-                  demoUrl: "https://cloudflow.dev"
-                }]
-              },
-              "zoe.nakamura.game@unity3d.com": {
-                bio: "Creative technologist and game developer with 7+ years creating immersive AR/VR experiences. Unity Certified Expert specializing in mixed reality and interactive installations. Passionate about gamification and educational games.",
-                looksToConnect: "Seeking creative developers and 3D artists to build revolutionary AR/VR educational experiences and interactive art installations",
-                skills: ["Unity3D", "C#", "Unreal Engine", "AR/VR Development", "3D Modeling", "WebGL", "JavaScript", "Blender", "ARCore", "ARKit", "Oculus SDK"],
-                interests: ["Game Development", "AR/VR", "Interactive Art", "Educational Games", "3D Graphics", "Mixed Reality", "Creative Technology"],
-                experience: [{
-                  title: "Senior AR/VR Developer",
-                  org: "Unity Technologies",
-                  startDate: "2021-05-01",
-                  endDate: null,
-                  description: "Creating AR/VR development tools and immersive educational experiences"
-                }, {
-                  title: "Game Developer",
-                  org: "Oculus (Meta)",
-                  startDate: "2019-02-01",
-                  endDate: "2021-04-01",
-                  description: "Developed VR games and experiences for Oculus platform"
-                }],
-                projects: [{
-                  name: "EduVerse AR",
-                  description: "Augmented reality educational platform making learning interactive and immersive",
-                  tech: ["Unity3D", "ARCore", "C#", "Firebase"],
-                  repoUrl: "https://github.com/zoe/eduverse",
-                  demoUrl: "https://eduverse.ar"
-                }]
-              }
-            };
-
-            const profiles = {
-              [dummyUser.email]: {
-                id: uuidv4(),
-                userId: dummyUser.id,
-                bio: profilesData[dummyUser.email].bio,
-                looksToConnect: profilesData[dummyUser.email].looksToConnect,
-                skills: profilesData[dummyUser.email].skills,
-                interests: profilesData[dummyUser.email].interests,
-                experience: profilesData[dummyUser.email].experience,
-                projects: profilesData[dummyUser.email].projects,
-                awards: [],
-                socials: [{
-                  type: "GITHUB",
-                  url: `https://github.com/${dummyUser.username}`
-                }],
-                preferences: {
-                  desiredRoles: ["Developer", "Engineer"],
-                  techStack: [],
-                  interestTags: [],
-                  locationRadiusKm: 50,
-                  remoteOk: true,
-                  availabilityHrs: 20,
-                  searchPeople: true,
-                  searchProjects: true,
-                  searchHackathons: true
-                },
-                createdAt: new Date(),
-                updatedAt: new Date()
-              }
-            };
-
-            await db.collection('profiles').insertOne(profiles[dummyUser.email]);
-
-            // Clear existing posts from dummy users to prevent duplicates
-            await db.collection('posts').deleteMany({ leaderId: dummyUser.id });
-
-            // Create posts for some users
-            if (dummyUser.email === "aisha.kandhari@gmail.com") {
-              const post1 = {
-                id: uuidv4(),
-                type: "HACKATHON",
-                leaderId: dummyUser.id,
-                title: "AI4Earth: Global Climate Action Hackathon 2024",
-                location: "San Francisco, CA (Hybrid)",
-                websiteUrl: "https://ai4earth.stanford.edu",
-                skillsNeeded: ["Python", "PyTorch", "Computer Vision", "Satellite Data Analysis", "Climate Science", "React"],
-                notes: "Join Stanford AI Lab for a 72-hour intensive hackathon tackling climate change with cutting-edge AI. Build solutions using satellite imagery, climate data, and machine learning to create real impact. $150K in prizes, mentorship from top researchers at Google DeepMind, OpenAI, and leading climate scientists. Winners get fast-track interviews at leading climate tech companies and research labs.",
-                status: "OPEN",
-                visibility: "PUBLIC",
-                createdAt: new Date(),
-                updatedAt: new Date()
-              };
-              await db.collection('posts').insertOne(post1);
-            }
-
-            if (dummyUser.email === "alejandro.rivera@outlook.com") {
-              const post2 = {
-                id: uuidv4(),
-                type: "PROJECT",
-                leaderId: dummyUser.id,
-                title: "SocialVR: Next-Gen AR/VR Social Gaming Platform",
-                location: "Austin, TX (Remote Welcome)",
-                websiteUrl: "https://socialvr.games",
-                skillsNeeded: ["React Native", "Unity3D", "WebRTC", "AR/VR Development", "3D Graphics", "Multiplayer Networking"],
-                notes: "Building the future of social gaming with immersive AR/VR experiences. We're creating cross-platform social games that connect people in virtual worlds. Seeking passionate developers, 3D artists, and UX designers to join our funded startup. Equity compensation, flexible remote work, and opportunity to shape the future of social gaming. Recently secured $2M seed funding from top VR investors.",
-                status: "OPEN",
-                visibility: "PUBLIC",
-                createdAt: new Date(),
-                updatedAt: new Date()
-              };
-              await db.collection('posts').insertOne(post2);
-            }
-
-            if (dummyUser.email === "james.kim.blockchain@yahoo.com") {
-              const post3 = {
-                id: uuidv4(),
-                type: "HACKATHON",
-                leaderId: dummyUser.id,
-                title: "Web3 Social Impact Hackathon",
-                location: "New York, NY",
-                websiteUrl: "https://web3impact.org",
-                skillsNeeded: ["Solidity", "React", "Web3", "Smart Contracts"],
-                notes: "Revolutionary 3-day hackathon building decentralized applications for social good. Connect with Web3 pioneers and create the future!",
-                status: "OPEN",
-                visibility: "PUBLIC",
-                createdAt: new Date(),
-                updatedAt: new Date()
-              };
-              await db.collection('posts').insertOne(post3);
-            }
-
-            if (dummyUser.email === "emily.johnson.ai@stanford.edu") {
-              const post4 = {
-                id: uuidv4(),
-                type: "PROJECT",
-                leaderId: dummyUser.id,
-                title: "HealthAI - Medical Diagnosis Assistant",
-                location: "Boston, MA (Hybrid)",
-                websiteUrl: "https://health-ai.research.edu",
-                skillsNeeded: ["Python", "PyTorch", "Medical Data", "React", "API Development"],
-                notes: "Open-source AI project for medical diagnosis assistance. Collaborating with hospitals and research institutions. Join us in revolutionizing healthcare!",
-                status: "OPEN",
-                visibility: "PUBLIC",
-                createdAt: new Date(),
-                updatedAt: new Date()
-              };
-              await db.collection('posts').insertOne(post4);
-            }
-
-            if (dummyUser.email === "carlos.mendoza.security@gmail.com") {
-              const post5 = {
-                id: uuidv4(),
-                type: "HACKATHON",
-                leaderId: dummyUser.id,
-                title: "CyberSec Challenge 2024",
-                location: "Denver, CO",
-                websiteUrl: "https://cybersec-challenge.com",
-                skillsNeeded: ["Cybersecurity", "Python", "Penetration Testing", "Network Security"],
-                notes: "Elite cybersecurity competition with real-world scenarios. Test your skills against the best hackers and security researchers. Prizes worth $100K!",
-                status: "OPEN",
-                visibility: "PUBLIC",
-                createdAt: new Date(),
-                updatedAt: new Date()
-              };
-              await db.collection('posts').insertOne(post5);
-            }
-
-            if (dummyUser.email === "lisa.wong.design@adobe.com") {
-              const post6 = {
-                id: uuidv4(),
-                type: "PROJECT",
-                leaderId: dummyUser.id,
-                title: "EduTech Innovation Platform",
-                location: "Los Angeles, CA (Remote)",
-                websiteUrl: "https://edutech-innovation.org",
-                skillsNeeded: ["React", "Node.js", "UI/UX Design", "Education Technology"],
-                notes: "Building the next generation of educational tools. Looking for developers and designers passionate about transforming education through technology.",
-                status: "OPEN",
-                visibility: "PUBLIC",
-                createdAt: new Date(),
-                updatedAt: new Date()
-              };
-              await db.collection('posts').insertOne(post6);
-
-              // Additional diverse hackathon
-              const post7 = {
-                id: uuidv4(),
-                type: "HACKATHON",
-                leaderId: dummyUser.id,
-                title: "Design Thinking Hackathon",
-                location: "Los Angeles, CA",
-                websiteUrl: "https://designthinking-hack.com",
-                skillsNeeded: ["UI/UX Design", "Figma", "User Research", "Prototyping"],
-                notes: "24-hour design-focused hackathon. Create user-centered solutions for real-world problems with design thinking methodology.",
-                status: "OPEN",
-                visibility: "PUBLIC",
-                createdAt: new Date(),
-                updatedAt: new Date()
-              };
-              await db.collection('posts').insertOne(post7);
-            }
-
-            if (dummyUser.email === "maya.patel.dev@proton.me") {
-              const post8 = {
-                id: uuidv4(),
-                type: "HACKATHON",
-                leaderId: dummyUser.id,
-                title: "Green Tech Innovation Challenge",
-                location: "Seattle, WA",
-                websiteUrl: "https://greentech-hack.org",
-                skillsNeeded: ["Python", "IoT", "Renewable Energy", "Data Analytics"],
-                notes: "3-day sustainability hackathon focusing on renewable energy solutions and environmental monitoring systems.",
-                status: "OPEN",
-                visibility: "PUBLIC",
-                createdAt: new Date(),
-                updatedAt: new Date()
-              };
-              await db.collection('posts').insertOne(post8);
-
-              const post9 = {
-                id: uuidv4(),
-                type: "PROJECT",
-                leaderId: dummyUser.id,
-                title: "Smart City Infrastructure",
-                location: "Remote",
-                websiteUrl: "https://smart-city.dev",
-                skillsNeeded: ["IoT", "Docker", "Kubernetes", "Microservices"],
-                notes: "Building next-generation smart city infrastructure with IoT sensors and edge computing for sustainable urban living.",
-                status: "OPEN",
-                visibility: "PUBLIC",
-                createdAt: new Date(),
-                updatedAt: new Date()
-              };
-              await db.collection('posts').insertOne(post9);
-            }
-          }
-
-          // Additional standalone posts for variety
-          const additionalPosts = [
-            {
-              id: uuidv4(),
-              type: "HACKATHON",
-              leaderId: dummyUsers[0].id, // Sarah Chen
-              title: "Healthcare AI Hackathon",
-              location: "Boston, MA",
-              websiteUrl: "https://healthcare-ai-hack.org",
-              skillsNeeded: ["Python", "Healthcare", "Machine Learning", "HIPAA"],
-              notes: "48-hour medical AI hackathon with real healthcare datasets. Build solutions for patient care and medical diagnosis.",
-              status: "OPEN",
-              visibility: "PUBLIC",
-              createdAt: new Date(),
-              updatedAt: new Date()
-            },
-            {
-              id: uuidv4(),
-              type: "PROJECT",
-              leaderId: dummyUsers[3].id, // James Kim
-              title: "DeFi Insurance Protocol",
-              location: "New York, NY (Hybrid)",
-              websiteUrl: "https://defi-insurance.finance",
-              skillsNeeded: ["Solidity", "Smart Contracts", "React", "Insurance"],
-              notes: "Revolutionary decentralized insurance protocol. Join us in building the future of risk management on blockchain.",
-              status: "OPEN",
-              visibility: "PUBLIC",
-              createdAt: new Date(),
-              updatedAt: new Date()
-            },
-            {
-              id: uuidv4(),
-              type: "HACKATHON",
-              leaderId: dummyUsers[4].id, // Emily Johnson
-              title: "EdTech Innovation Summit",
-              location: "Austin, TX",
-              websiteUrl: "https://edtech-summit.edu",
-              skillsNeeded: ["Education", "React", "Learning Analytics", "Gamification"],
-              notes: "Education technology hackathon focusing on personalized learning and student engagement. Transform education through tech!",
-              status: "OPEN",
-              visibility: "PUBLIC",
-              createdAt: new Date(),
-              updatedAt: new Date()
-            },
-            {
-              id: uuidv4(),
-              type: "PROJECT",
-              leaderId: dummyUsers[5].id, // David Martinez
-              title: "CyberGuard Security Suite",
-              location: "Denver, CO",
-              websiteUrl: "https://cyberguard.security",
-              skillsNeeded: ["Cybersecurity", "Python", "Network Security", "Incident Response"],
-              notes: "Open-source enterprise security suite with automated threat detection and response capabilities.",
-              status: "OPEN",
-              visibility: "PUBLIC",
-              createdAt: new Date(),
-              updatedAt: new Date()
-            },
-            {
-              id: uuidv4(),
-              type: "HACKATHON",
-              leaderId: dummyUsers[1].id, // Alex Rodriguez
-              title: "Mobile Gaming Revolution",
-              location: "San Francisco, CA",
-              websiteUrl: "https://mobile-gaming-hack.com",
-              skillsNeeded: ["Unity", "React Native", "Game Design", "AR/VR"],
-              notes: "Mobile gaming hackathon with focus on AR/VR integration. Create the next breakthrough in mobile entertainment!",
-              status: "OPEN",
-              visibility: "PUBLIC",
-              createdAt: new Date(),
-              updatedAt: new Date()
-            },
-            {
-              id: uuidv4(),
-              type: "PROJECT",
-              leaderId: dummyUsers[6].id, // Lisa Wong
-              title: "Accessibility Web Platform",
-              location: "Remote",
-              websiteUrl: "https://accessible-web.org",
-              skillsNeeded: ["React", "Accessibility", "WCAG", "Screen Readers"],
-              notes: "Building inclusive web experiences for users with disabilities. Help us make the internet accessible for everyone.",
-              status: "OPEN",
-              visibility: "PUBLIC",
-              createdAt: new Date(),
-              updatedAt: new Date()
-            }
-          ];
-
-          for (const post of additionalPosts) {
-            await db.collection('posts').insertOne(post);
-          }
+          };
+          await db.collection('posts').insertOne({ ...post9, ...postFilterFields(post9) });
         }
-
-        return NextResponse.json({ success: true, message: 'Comprehensive dummy data created' });
-      } catch (error) {
-        console.error('Dummy data creation error:', error);
-        return NextResponse.json({ error: 'Failed to create dummy data' }, { status: 500 });
-      }
-    }
-
-    // Get login streak
-    if (path === 'streak' && method === 'GET') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
       }
 
-      // For demo purposes, generate a streak based on user creation date
-      const daysSinceJoin = Math.floor((new Date() - new Date(user.createdAt)) / (1000 * 60 * 60 * 24));
-      const streak = Math.min(daysSinceJoin + 1, 30); // Cap at 30 days
-
-      return NextResponse.json({ streak });
-    }
+      // Additional standalone posts for variety
+      const additionalPosts = [
+        {
+          id: uuidv4(),
+          type: "HACKATHON",
+          leaderId: dummyUsers[0].id, // Sarah Chen
+          title: "Healthcare AI Hackathon",
+          location: "Boston, MA",
+          websiteUrl: "https://healthcare-ai-hack.org",
+          skillsNeeded: ["Python", "Healthcare", "Machine Learning", "HIPAA"],
+          notes: "48-hour medical AI hackathon with real healthcare datasets. Build solutions for patient care and medical diagnosis.",
+          status: "OPEN",
+          visibility: "PUBLIC",
+          createdAt: new Date(),
+          updatedAt: new Date()
+        },
+        {
+          id: uuidv4(),
+          type: "PROJECT",
+          leaderId: dummyUsers[3].id, // James Kim
+          title: "DeFi Insurance Protocol",
+          location: "New York, NY (Hybrid)",
+          websiteUrl: "https://defi-insurance.finance",
+          skillsNeeded: ["Solidity", "Smart Contracts", "React", "Insurance"],
+          notes: "Revolutionary decentralized insurance protocol. Join us in building the future of risk management on blockchain.",
+          status: "OPEN",
+          visibility: "PUBLIC",
+          createdAt: new Date(),
+          updatedAt: new Date()
+        },
+        {
+          id: uuidv4(),
+          type: "HACKATHON",
+          leaderId: dummyUsers[4].id, // Emily Johnson
+          title: "EdTech Innovation Summit",
+          location: "Austin, TX",
+          websiteUrl: "https://edtech-summit.edu",
+          skillsNeeded: ["Education", "React", "Learning Analytics", "Gamification"],
+          notes: "Education technology hackathon focusing on personalized learning and student engagement. Transform education through tech!",
+          status: "OPEN",
+          visibility: "PUBLIC",
+          createdAt: new Date(),
+          updatedAt: new Date()
+        },
+        {
+          id: uuidv4(),
+          type: "PROJECT",
+          leaderId: dummyUsers[5].id, // David Martinez
+          title: "CyberGuard Security Suite",
+          location: "Denver, CO",
+          websiteUrl: "https://cyberguard.security",
+          skillsNeeded: ["Cybersecurity", "Python", "Network Security", "Incident Response"],
+          notes: "Open-source enterprise security suite with automated threat detection and response capabilities.",
+          status: "OPEN",
+          visibility: "PUBLIC",
+          createdAt: new Date(),
+          updatedAt: new Date()
+        },
+        {
+          id: uuidv4(),
+          type: "HACKATHON",
+          leaderId: dummyUsers[1].id, // Alex Rodriguez
+          title: "Mobile Gaming Revolution",
+          location: "San Francisco, CA",
+          websiteUrl: "https://mobile-gaming-hack.com",
+          skillsNeeded: ["Unity", "React Native", "Game Design", "AR/VR"],
+          notes: "Mobile gaming hackathon with focus on AR/VR integration. Create the next breakthrough in mobile entertainment!",
+          status: "OPEN",
+          visibility: "PUBLIC",
+          createdAt: new Date(),
+          updatedAt: new Date()
+        },
+        {
+          id: uuidv4(),
+          type: "PROJECT",
+          leaderId: dummyUsers[6].id, // Lisa Wong
+          title: "Accessibility Web Platform",
+          location: "Remote",
+          websiteUrl: "https://accessible-web.org",
+          skillsNeeded: ["React", "Accessibility", "WCAG", "Screen Readers"],
+          notes: "Building inclusive web experiences for users with disabilities. Help us make the internet accessible for everyone.",
+          status: "OPEN",
+          visibility: "PUBLIC",
+          createdAt: new Date(),
+          updatedAt: new Date()
+        }
+      ];
 
-    // Overview statistics
-    if (path === 'overview' && method === 'GET') {
-      const user = await getCurrentUser(request);
-      if (!user) {
-        return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
+      for (const post of additionalPosts) {
+        await db.collection('posts').insertOne({ ...post, ...postFilterFields(post) });
       }
+    }
 
-      // Get user's posts
-      const userPosts = await db.collection('posts').countDocuments({ leaderId: user.id });
-      
-      // Get user's matches
-      const matches = await db.collection('matches').countDocuments({
-        $or: [{ aId: user.id }, { bId: user.id }]
-      });
+    return json({ success: true, message: 'Comprehensive dummy data created' });
+  } catch (error) {
+    console.error('Dummy data creation error:', error);
+    return json({ error: 'Failed to create dummy data' }, { status: 500 });
+  }
+});
 
-      // Get user's swipes
-      const swipes = await db.collection('swipes').countDocuments({ swiperId: user.id });
+// Get login streak
+router.get('streak', requireUser, async ({ user }) => {
+  // For demo purposes, generate a streak based on user creation date
+  const daysSinceJoin = Math.floor((new Date() - new Date(user.createdAt)) / (1000 * 60 * 60 * 24));
+  const streak = Math.min(daysSinceJoin + 1, 30); // Cap at 30 days
 
-      // Get accepted inquiries (ongoing projects)
-      const acceptedInquiries = await db.collection('inquiries').countDocuments({
-        userId: user.id,
-        status: 'ACCEPTED'
-      });
+  return json({ streak });
+});
 
-      return NextResponse.json({
-        stats: {
-          totalPosts: userPosts,
-          totalMatches: matches,
-          totalSwipes: swipes,
-          ongoingProjects: acceptedInquiries
-        }
-      });
+// Overview statistics
+router.get('overview', requireUser, async ({ db, user }) => {
+  // Get user's posts
+  const userPosts = await db.collection('posts').countDocuments({ leaderId: user.id });
+  
+  // Get user's matches
+  const matches = await db.collection('matches').countDocuments({
+    $or: [{ aId: user.id }, { bId: user.id }]
+  });
+
+  // Get user's swipes, raw and compacted
+  const [rawSwipes, compactedSwipes] = await Promise.all([
+    db.collection('swipes').countDocuments({ swiperId: user.id }),
+    compactedSwipeCount(db, user.id)
+  ]);
+  const swipes = rawSwipes + compactedSwipes;
+
+  // Get accepted inquiries (ongoing projects)
+  const acceptedInquiries = await db.collection('inquiries').countDocuments({
+    userId: user.id,
+    status: 'ACCEPTED'
+  });
+
+  return json({
+    stats: {
+      totalPosts: userPosts,
+      totalMatches: matches,
+      totalSwipes: swipes,
+      ongoingProjects: acceptedInquiries
     }
+  });
+});
+
+// Streams everything the user owns as NDJSON; see lib/export.js
+router.get('export', requireUser, async ({ request, db, user }) => {
+  // Buffered swipes belong in the export too
+  await swipeBuffer?.flush();
+
+  let body = exportStream(db, user.id);
+  const headers = {
+    'Content-Type': 'application/x-ndjson',
+    'Content-Disposition': `attachment; filename="hackswipe-export-${user.id}.ndjson"`,
+    'Cache-Control': 'no-store'
+  };
+  if (/\bgzip\b/.test(request.headers.get('accept-encoding') || '')) {
+    body = body.pipeThrough(new CompressionStream('gzip'));
+    headers['Content-Encoding'] = 'gzip';
+  }
+  return new Response(body, { headers });
+});
+
+// Job queue depth and lag for the test harness
+router.get('metrics/queue', requireUser, async ({ db }) => {
+  return json({ queue: jobQueue ? await jobQueue.stats(db) : null });
+});
+
+// Card cache statistics for the test harness, plus process memory so
+// harnesses can watch it during long requests
+router.get('metrics/cache', requireUser, async () => {
+  const { rss, heapUsed } = process.memoryUsage();
+  return json({ cards: cardViews.stats(), memory: { rss, heapUsed } });
+});
+
+// Dispatches every /api request through the route table
+async function handleAuth(request, { params }) {
+  const metrics = createRequestMetrics();
 
-    return NextResponse.json({ error: 'Not found' }, { status: 404 });
+  return runWithMetrics(metrics, async () => {
+    const response = encodeResponse(request, await dispatch(request, params.path || []));
+    response.headers.set('Server-Timing', formatServerTiming(metrics));
+    return response;
+  });
+}
+
+async function dispatch(request, segments) {
+  const matched = router.match(request.method, segments);
+  if (!matched) {
+    return json({ error: 'Not found' }, { status: 404 });
+  }
 
+  try {
+    const db = await connectDB();
+    return await runRoute(matched.route, { request, db, params: matched.params });
   } catch (error) {
     console.error('API Error:', error);
-    return NextResponse.json({ error: 'Internal server error' }, { status: 500 });
+    return json({ error: 'Internal server error' }, { status: 500 });
   }
 }
 
-export { handleAuth as GET, handleAuth as POST, handleAuth as PUT, handleAuth as DELETE };
\ No newline at end of file
+export { handleAuth as GET, handleAuth as POST, handleAuth as PUT, handleAuth as PATCH, handleAuth as DELETE };
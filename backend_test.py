@@ -4,6 +4,7 @@ import requests
 import json
 import sys
 from datetime import datetime
+from harness_metrics import ServerTimingCollector
 
 # Configuration
 BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
@@ -14,6 +15,8 @@ TEST_USER_NAME = "Enhanced Test User"
 class BackendTester:
     def __init__(self):
         self.session = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session)
         self.auth_token = None
         self.test_results = []
         
@@ -434,6 +437,10 @@ class BackendTester:
             self.log_result("Enhanced Profile Fields", False, f"Enhanced profile fields error: {str(e)}")
             return False
     
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+    
     def run_all_tests(self):
         """Run all enhanced dummy data tests"""
         print("🚀 Starting Enhanced Dummy Data Backend Testing...")
@@ -451,7 +458,8 @@ class BackendTester:
             self.test_explore_projects_endpoint,
             self.test_explore_hackathons_endpoint,
             self.test_data_consistency,
-            self.test_enhanced_profile_fields
+            self.test_enhanced_profile_fields,
+            self.check_query_budgets
         ]
         
         passed_tests = 0
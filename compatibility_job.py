@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""Offline compatibility job: precomputes every user's explore/people deck.
+
+Reads users and profiles, interns skills/techStack, interests/interestTags
+and role words into vocabularies and stores each user's tokens as
+bit-packed NumPy rows. Pairwise compatibility is computed in row x column
+blocks: each block is unpacked to float32 so overlaps become matrix
+products, scored with the same weights as lib/ranking.js, and merged into a
+running top-K per row. Only one block pair is ever unpacked at a time, so
+memory stays bounded at 100k users.
+
+Each user's top-K lands in `candidateLists` ({userId, candidates, scores,
+computedAt}); explore/people serves decks from it and falls back to live
+ranking when a list is missing, stale or used up.
+
+Incremental runs only rescore what changed since the last run's watermark
+(stored in `jobState`): changed users get fresh rows, and every other list
+is patched with its scores against the changed users. A patched list can
+end up shorter than K when a changed user drops out of it; the next --full
+run refills it.
+
+    python compatibility_job.py                  # incremental; full on the first run
+    python compatibility_job.py --full
+    python compatibility_job.py --benchmark 10000 100000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pymongo
+except ImportError:
+    pymongo = None
+
+MONGO_URL = os.environ.get("MONGO_URL")
+DB_NAME = os.environ.get("DB_NAME", "hackathon_tinder")
+
+CANDIDATE_LIST_SIZE = int(os.environ.get("CANDIDATE_LIST_SIZE", "100"))
+ROW_BLOCK = int(os.environ.get("COMPAT_ROW_BLOCK", "256"))
+COLUMN_BLOCK = int(os.environ.get("COMPAT_COLUMN_BLOCK", "8192"))
+WRITE_BATCH = 1000
+JOB_ID = "compatibility"
+
+# Must match RANK_WEIGHTS in lib/ranking.js
+WEIGHTS = {
+    "wantedSkills": 3.0,
+    "wantedBack": 1.5,
+    "roles": 2.0,
+    "interests": 2.0,
+    "skills": 1.0,
+    "availability": 0.5,
+    "notLocal": -2.0,
+    "candidateNotLocal": -1.0,
+    "notSearching": -3.0,
+}
+
+# Segment -> vocabulary it is interned into
+SEGMENTS = {
+    "skills": "tech",
+    "wants": "tech",
+    "interests": "interest",
+    "roles": "role",
+    "wantRoles": "role",
+}
+
+ROLE_SPLIT = re.compile(r"[^a-z0-9+#]+")
+
+
+def normalize_token(token):
+    """Same normalization as normalizeToken in lib/ranking.js"""
+    return " ".join(str(token).strip().lower().split())
+
+
+def role_words(texts):
+    words = []
+    for text in texts:
+        words.extend(w for w in ROLE_SPLIT.split(normalize_token(text or "")) if len(w) > 1)
+    return words
+
+
+def profile_tokens(user, profile):
+    """Token lists per segment for one user"""
+    preferences = profile.get("preferences") or {}
+    return {
+        "skills": profile.get("skills") or [],
+        "wants": preferences.get("techStack") or [],
+        "interests": (profile.get("interests") or []) + (preferences.get("interestTags") or []),
+        "roles": role_words([user.get("roleHeadline")]),
+        "wantRoles": role_words(preferences.get("desiredRoles") or []),
+    }
+
+
+class Features:
+    """Bit-packed token rows plus scalar preferences for N users"""
+
+    def __init__(self, users, profiles):
+        self.user_ids = [user["id"] for user in users]
+        n = len(users)
+        vocabularies = {name: {} for name in set(SEGMENTS.values())}
+        rows = {segment: [] for segment in SEGMENTS}
+
+        self.availability = np.zeros(n, dtype=np.float32)
+        self.remote_ok = np.ones(n, dtype=bool)
+        self.searching = np.ones(n, dtype=bool)
+        self.location = np.full(n, -1, dtype=np.int32)
+        locations = {}
+
+        for i, (user, profile) in enumerate(zip(users, profiles)):
+            for segment, tokens in profile_tokens(user, profile).items():
+                vocabulary = vocabularies[SEGMENTS[segment]]
+                rows[segment].append({vocabulary.setdefault(normalize_token(t), len(vocabulary)) for t in tokens if t})
+            preferences = profile.get("preferences") or {}
+            self.availability[i] = float(preferences.get("availabilityHrs") or 0)
+            self.remote_ok[i] = preferences.get("remoteOk") is not False
+            self.searching[i] = preferences.get("searchPeople") is not False
+            if user.get("location"):
+                self.location[i] = locations.setdefault(normalize_token(user["location"]), len(locations))
+
+        self.width = {name: max(1, len(vocabulary)) for name, vocabulary in vocabularies.items()}
+        self.packed = {}
+        self.counts = {}
+        for segment, vocabulary in SEGMENTS.items():
+            dense = np.zeros((n, self.width[vocabulary]), dtype=bool)
+            for i, ids in enumerate(rows[segment]):
+                dense[i, list(ids)] = True
+            self.packed[segment] = np.packbits(dense, axis=1)
+            self.counts[segment] = dense.sum(axis=1).astype(np.float32)
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def unpack(self, segment, index):
+        """float32 0/1 matrix of a segment for the given rows"""
+        width = self.width[SEGMENTS[segment]]
+        return np.unpackbits(self.packed[segment][index], axis=1, count=width).astype(np.float32)
+
+    def viewer_block(self, index):
+        """Row-side matrices: directional segments pre-weighted by the viewer's counts"""
+        counts = self.counts
+        return {
+            "directional": np.hstack([
+                self.unpack("wants", index) * (WEIGHTS["wantedSkills"] / np.maximum(1, counts["wants"][index]))[:, None],
+                self.unpack("skills", index) * WEIGHTS["wantedBack"],
+                self.unpack("wantRoles", index) * (WEIGHTS["roles"] / np.maximum(1, counts["wantRoles"][index]))[:, None],
+            ]),
+            "interests": self.unpack("interests", index),
+            "skills": self.unpack("skills", index),
+        }
+
+    def candidate_block(self, index):
+        """Column-side matrices, laid out to pair with viewer_block"""
+        return {
+            "directional": np.hstack([
+                self.unpack("skills", index),
+                self.unpack("wants", index) / np.maximum(1, self.counts["wants"][index])[:, None],
+                self.unpack("roles", index),
+            ]),
+            "interests": self.unpack("interests", index),
+            "skills": self.unpack("skills", index),
+        }
+
+
+def jaccard(shared, row_counts, col_counts):
+    """shared / |union| in place, given the shared-token matrix"""
+    union = row_counts[:, None] + col_counts[None, :] - shared
+    np.maximum(union, 1, out=union)
+    return np.divide(shared, union, out=shared)
+
+
+def score_block(features, rows, cols, row_block=None, col_block=None):
+    """Scores of viewers `rows` (index array) against candidates `cols`.
+
+    Wanted skills, wanted-back and roles are one matrix product: each side's
+    segments are concatenated and pre-scaled by their weight and count."""
+    r = row_block or features.viewer_block(rows)
+    c = col_block or features.candidate_block(cols)
+    counts = features.counts
+
+    score = r["directional"] @ c["directional"].T
+    score += WEIGHTS["interests"] * jaccard(r["interests"] @ c["interests"].T,
+                                            counts["interests"][rows], counts["interests"][cols])
+    score += WEIGHTS["skills"] * jaccard(r["skills"] @ c["skills"].T,
+                                         counts["skills"][rows], counts["skills"][cols])
+
+    gap = np.abs(features.availability[rows][:, None] - features.availability[cols][None, :])
+    np.minimum(gap, 40, out=gap)
+    score += WEIGHTS["availability"] - gap * np.float32(WEIGHTS["availability"] / 40)
+
+    # Location penalties apply unless both are in the same place
+    penalty = (np.where(features.remote_ok[rows], 0, WEIGHTS["notLocal"]).astype(np.float32)[:, None]
+               + np.where(features.remote_ok[cols], 0, WEIGHTS["candidateNotLocal"]).astype(np.float32)[None, :])
+    location_r = features.location[rows]
+    if (location_r >= 0).any():
+        penalty[(location_r[:, None] == features.location[cols][None, :]) & (location_r >= 0)[:, None]] = 0
+    score += penalty
+    score += np.where(features.searching[cols], 0, WEIGHTS["notSearching"]).astype(np.float32)[None, :]
+
+    # Nobody is their own candidate
+    score[rows[:, None] == cols[None, :]] = -np.inf
+    return score
+
+
+def top_k(features, rows, k):
+    """(candidate indexes, scores) of each row's best k, best first"""
+    n = len(features)
+    k = min(k, n - 1)
+    best_idx = np.zeros((len(rows), 0), dtype=np.int64)
+    best_score = np.zeros((len(rows), 0), dtype=np.float32)
+    row_block = features.viewer_block(rows)
+
+    for start in range(0, n, COLUMN_BLOCK):
+        cols = np.arange(start, min(n, start + COLUMN_BLOCK))
+        scores = score_block(features, rows, cols, row_block=row_block)
+        merged_score = np.concatenate([best_score, scores], axis=1)
+        merged_idx = np.concatenate([best_idx, np.broadcast_to(cols, scores.shape)], axis=1)
+        if merged_score.shape[1] > k:
+            keep = np.argpartition(-merged_score, k - 1, axis=1)[:, :k]
+            merged_score = np.take_along_axis(merged_score, keep, axis=1)
+            merged_idx = np.take_along_axis(merged_idx, keep, axis=1)
+        best_score, best_idx = merged_score, merged_idx
+
+    order = np.argsort(-best_score, axis=1, kind="stable")
+    return np.take_along_axis(best_idx, order, axis=1), np.take_along_axis(best_score, order, axis=1)
+
+
+def compute_all(features, k):
+    """Top-K lists for every user, yielded per row block"""
+    n = len(features)
+    for start in range(0, n, ROW_BLOCK):
+        rows = np.arange(start, min(n, start + ROW_BLOCK))
+        yield rows, top_k(features, rows, k)
+
+
+def patch_lists(features, changed, lists, k):
+    """Merge scores against `changed` users into the other users' lists.
+
+    `lists` maps user index -> (candidate indexes, scores). Returns the
+    indexes of users whose list changed, with the new lists."""
+    changed_set = set(changed.tolist())
+    others = np.array([i for i in range(len(features)) if i not in changed_set], dtype=np.int64)
+    col_block = features.candidate_block(changed)
+    updated = {}
+
+    for start in range(0, len(others), ROW_BLOCK):
+        rows = others[start:start + ROW_BLOCK]
+        scores = score_block(features, rows, changed, col_block=col_block)
+        for offset, row in enumerate(rows.tolist()):
+            old_idx, old_score = lists.get(row, ((), ()))
+            kept = [(s, i) for i, s in zip(old_idx, old_score) if i not in changed_set]
+            merged = sorted(kept + list(zip(scores[offset].tolist(), changed.tolist())), reverse=True)[:k]
+            if [i for _, i in merged] != list(old_idx):
+                updated[row] = ([i for _, i in merged], [s for s, _ in merged])
+    return updated
+
+
+def load_dataset(db):
+    """(users, profiles) for every user with a profile, plus the max updatedAt"""
+    profiles = list(db["profiles"].find({}, {"_id": 0, "userId": 1, "skills": 1, "interests": 1,
+                                              "preferences": 1, "updatedAt": 1}))
+    users_by_id = {user["id"]: user for user in db["users"].find(
+        {}, {"_id": 0, "id": 1, "roleHeadline": 1, "location": 1, "updatedAt": 1})}
+    pairs = [(users_by_id[p["userId"]], p) for p in profiles if p.get("userId") in users_by_id]
+    stamps = [doc.get("updatedAt") for pair in pairs for doc in pair if doc.get("updatedAt")]
+    return [u for u, _ in pairs], [p for _, p in pairs], max(stamps, default=None)
+
+
+def write_lists(db, features, entries):
+    """Upsert candidate lists; `entries` yields (user index, candidate indexes, scores)"""
+    now = datetime.utcnow()
+    batch, written = [], 0
+    for row, idx, scores in entries:
+        valid = [(int(i), float(s)) for i, s in zip(idx, scores) if np.isfinite(s)]
+        batch.append(pymongo.UpdateOne(
+            {"userId": features.user_ids[row]},
+            {"$set": {"candidates": [features.user_ids[i] for i, _ in valid],
+                      "scores": [round(s, 4) for _, s in valid],
+                      "computedAt": now}},
+            upsert=True))
+        if len(batch) == WRITE_BATCH:
+            db["candidateLists"].bulk_write(batch, ordered=False)
+            written += len(batch)
+            batch = []
+    if batch:
+        db["candidateLists"].bulk_write(batch, ordered=False)
+        written += len(batch)
+    return written
+
+
+def run_full(db, features):
+    def entries():
+        for rows, (idx, scores) in compute_all(features, CANDIDATE_LIST_SIZE):
+            for offset, row in enumerate(rows.tolist()):
+                yield row, idx[offset], scores[offset]
+    return write_lists(db, features, entries())
+
+
+def run_incremental(db, features, users, profiles, watermark):
+    changed = np.array([i for i, (user, profile) in enumerate(zip(users, profiles))
+                        if any((doc.get("updatedAt") or watermark) > watermark for doc in (user, profile))],
+                       dtype=np.int64)
+    index_of = {user_id: i for i, user_id in enumerate(features.user_ids)}
+    listed = set()
+    lists = {}
+    for doc in db["candidateLists"].find({}, {"_id": 0, "userId": 1, "candidates": 1, "scores": 1}):
+        row = index_of.get(doc["userId"])
+        if row is None:
+            continue
+        listed.add(row)
+        lists[row] = ([index_of[c] for c in doc["candidates"] if c in index_of],
+                      [s for c, s in zip(doc["candidates"], doc["scores"]) if c in index_of])
+
+    # Users without a list yet are treated as changed
+    missing = np.array(sorted(set(range(len(features))) - listed - set(changed.tolist())), dtype=np.int64)
+    changed = np.concatenate([changed, missing])
+    if len(changed) == 0:
+        return 0, 0
+
+    fresh = []
+    for start in range(0, len(changed), ROW_BLOCK):
+        rows = changed[start:start + ROW_BLOCK]
+        idx, scores = top_k(features, rows, CANDIDATE_LIST_SIZE)
+        fresh.extend((row, idx[offset], scores[offset]) for offset, row in enumerate(rows.tolist()))
+
+    patched = patch_lists(features, changed, lists, CANDIDATE_LIST_SIZE)
+    written = write_lists(db, features, fresh + [(row, idx, scores) for row, (idx, scores) in patched.items()])
+    return len(changed), written
+
+
+def run_job(full=False):
+    if np is None or pymongo is None:
+        print("❌ compatibility_job.py needs numpy and pymongo")
+        return False
+    if not MONGO_URL:
+        print("❌ MONGO_URL is not set")
+        return False
+
+    db = pymongo.MongoClient(MONGO_URL)[DB_NAME]
+    db["candidateLists"].create_index("userId", unique=True)
+    state = db["jobState"].find_one({"_id": JOB_ID}) or {}
+    watermark = None if full else state.get("watermark")
+
+    started = time.perf_counter()
+    users, profiles, max_updated = load_dataset(db)
+    if not users:
+        print("ℹ️  No profiles to score")
+        return True
+    features = Features(users, profiles)
+    loaded = time.perf_counter()
+    print(f"📥 Loaded and encoded {len(users)} users in {loaded - started:.1f}s")
+
+    if watermark is None:
+        written = run_full(db, features)
+        print(f"✅ Full run: {written} lists written in {time.perf_counter() - loaded:.1f}s")
+    else:
+        changed, written = run_incremental(db, features, users, profiles, watermark)
+        print(f"✅ Incremental run: {changed} changed users, {written} lists written "
+              f"in {time.perf_counter() - loaded:.1f}s")
+
+    db["jobState"].update_one({"_id": JOB_ID}, {"$set": {
+        "watermark": max_updated,
+        "finishedAt": datetime.utcnow(),
+        "users": len(users),
+        "mode": "full" if watermark is None else "incremental"
+    }}, upsert=True)
+    return True
+
+
+SKILLS = ["JavaScript", "TypeScript", "React", "Vue", "Svelte", "Node.js", "Python", "Django", "FastAPI", "Go",
+          "Rust", "Java", "Kotlin", "Swift", "C++", "PostgreSQL", "MongoDB", "Redis", "AWS", "GCP", "Docker",
+          "Kubernetes", "PyTorch", "TensorFlow", "Figma", "GraphQL", "Solidity", "Unity", "Flutter", "WebAssembly"]
+INTERESTS = ["AI/ML", "Web3", "FinTech", "HealthTech", "EdTech", "Climate", "Gaming", "Open Source", "DevTools",
+             "Social Impact", "Robotics", "AR/VR", "Security", "Data Science", "Hardware", "Music"]
+ROLES = ["Frontend Developer", "Backend Engineer", "Full Stack Developer", "ML Engineer", "Product Designer",
+         "Data Scientist", "Mobile Developer", "DevOps Engineer", "Product Manager", "Blockchain Developer"]
+CITIES = ["San Francisco, CA", "New York, NY", "Austin, TX", "Seattle, WA", "London, UK", "Berlin, Germany"]
+
+
+def generate_dataset(n, seed=42):
+    """Synthetic users/profiles shaped like scripts/bench-ranking.mjs"""
+    rng = random.Random(seed)
+    users, profiles = [], []
+    for i in range(n):
+        users.append({"id": f"user-{i}", "roleHeadline": rng.choice(ROLES), "location": rng.choice(CITIES)})
+        profiles.append({
+            "userId": f"user-{i}",
+            "skills": rng.sample(SKILLS, rng.randint(3, 10)),
+            "interests": rng.sample(INTERESTS, rng.randint(2, 5)),
+            "preferences": {
+                "desiredRoles": rng.sample(ROLES, rng.randint(1, 3)),
+                "techStack": rng.sample(SKILLS, rng.randint(2, 5)),
+                "interestTags": rng.sample(INTERESTS, rng.randint(1, 3)),
+                "remoteOk": rng.random() < 0.7,
+                "availabilityHrs": rng.randint(0, 39),
+                "searchPeople": rng.random() < 0.9,
+            },
+        })
+    return users, profiles
+
+
+def benchmark(sizes):
+    """Time encoding, a full top-K pass and a 1% incremental pass, without Mongo"""
+    if np is None:
+        print("❌ The benchmark needs numpy")
+        return False
+
+    print(f"{'users':>8}{'encode s':>10}{'full s':>9}{'pairs/s':>12}{'changed':>9}{'incr s':>9}")
+    for n in sizes:
+        users, profiles = generate_dataset(n)
+        started = time.perf_counter()
+        features = Features(users, profiles)
+        encoded = time.perf_counter()
+
+        lists = {}
+        for rows, (idx, scores) in compute_all(features, CANDIDATE_LIST_SIZE):
+            for offset, row in enumerate(rows.tolist()):
+                lists[row] = (idx[offset].tolist(), scores[offset].tolist())
+        full = time.perf_counter()
+
+        changed = np.arange(0, n, 100, dtype=np.int64)
+        for start in range(0, len(changed), ROW_BLOCK):
+            top_k(features, changed[start:start + ROW_BLOCK], CANDIDATE_LIST_SIZE)
+        patch_lists(features, changed, lists, CANDIDATE_LIST_SIZE)
+        incremental = time.perf_counter()
+
+        print(f"{n:>8}{encoded - started:>10.2f}{full - encoded:>9.1f}{n * n / (full - encoded):>12.3g}"
+              f"{len(changed):>9}{incremental - full:>9.1f}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--full", action="store_true", help="rescore every user instead of only changed ones")
+    parser.add_argument("--benchmark", type=int, nargs="*", metavar="USERS",
+                        help="time the job on generated datasets (default 10000 100000)")
+    args = parser.parse_args()
+
+    if args.benchmark is not None:
+        return benchmark(args.benchmark or [10000, 100000])
+    return run_job(full=args.full)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
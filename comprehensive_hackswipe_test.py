@@ -3,15 +3,30 @@
 import requests
 import json
 import sys
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from harness_metrics import ServerTimingCollector
 
 # Configuration
 BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
 
+# "Liked you" scenario: simulated users, likes each seeds, chance of a right swipe per deck card
+ADMIRER_USERS = int(os.environ.get("ADMIRER_USERS", "1000"))
+ADMIRER_SEED_LIKES = int(os.environ.get("ADMIRER_SEED_LIKES", "5"))
+ADMIRER_RIGHT_RATE = float(os.environ.get("ADMIRER_RIGHT_RATE", "0.3"))
+ADMIRER_WORKERS = int(os.environ.get("ADMIRER_WORKERS", "16"))
+
 class ComprehensiveHackSwipeTest:
     def __init__(self):
         self.session1 = requests.Session()
         self.session2 = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session1)
+        self.server_timing.attach(self.session2)
         self.user1_token = None
         self.user2_token = None
         self.user1_id = None
@@ -440,6 +455,116 @@ class ComprehensiveHackSwipeTest:
             self.log_result("Data Integrity", False, f"Error: {str(e)}")
             return False
     
+    def simulation_session(self):
+        """One keep-alive HTTP session per worker thread, reporting Server-Timing"""
+        if not hasattr(self.local, "session"):
+            self.local.session = requests.Session()
+            self.server_timing.attach(self.local.session)
+        return self.local.session
+
+    def simulated_user(self, i):
+        """Register or log in simulated user `i`; returns (id, auth headers)"""
+        http = self.simulation_session()
+        credentials = {"email": f"admirer.sim.{i}@test.com", "password": "test123"}
+        response = http.post(f"{BASE_URL}/auth/register", json={**credentials, "name": f"Admirer Sim {i}"})
+        if response.status_code == 400:
+            response = http.post(f"{BASE_URL}/auth/login", json=credentials)
+        body = response.json()
+        return body["user"]["id"], {"Authorization": f"Bearer {body['token']}"}
+
+    def swipe_right(self, headers, target_id):
+        """Right swipe; returns True on a new match, False otherwise, None if already swiped"""
+        response = self.simulation_session().post(f"{BASE_URL}/swipe", headers=headers, json={
+            "targetType": "PERSON", "targetId": target_id, "direction": "RIGHT"
+        })
+        if response.status_code == 400:
+            return None
+        return bool(response.json().get("match"))
+
+    def test_liked_you_queue(self):
+        """Simulate ADMIRER_USERS users and compare match rates with and without admirer interleaving"""
+        try:
+            print(f"\n🔄 Testing Liked-You Queue ({ADMIRER_USERS} users, {ADMIRER_WORKERS} workers)...")
+            self.local = threading.local()
+            rng = random.Random(40)
+
+            with ThreadPoolExecutor(max_workers=ADMIRER_WORKERS) as pool:
+                users = list(pool.map(self.simulated_user, range(ADMIRER_USERS)))
+                ids = [user_id for user_id, _ in users]
+
+                # Seed likes: everyone right-swipes a few random others
+                likers = {user_id: set() for user_id in ids}
+                seeds = []
+                for user_id, headers in users:
+                    for target in rng.sample([other for other in ids if other != user_id], ADMIRER_SEED_LIKES):
+                        seeds.append((headers, target))
+                        likers[target].add(user_id)
+                list(pool.map(lambda seed: self.swipe_right(*seed), seeds))
+
+                # The likes feed only lists people who actually liked the user
+                likes_latencies, strangers = [], []
+                for user_id, headers in users[:20]:
+                    started = time.perf_counter()
+                    response = self.simulation_session().get(f"{BASE_URL}/likes", headers=headers, params={"view": "card"})
+                    likes_latencies.append((time.perf_counter() - started) * 1000)
+                    strangers.extend(a["id"] for a in response.json().get("admirers", []) if a["id"] not in likers[user_id])
+                if strangers:
+                    self.log_result("Liked-You Queue", False, f"{len(strangers)} listed admirers never liked the user",
+                                  strangers[:5])
+                    return False
+
+                # Half the users swipe plain decks, half decks with admirers interleaved
+                def play(index):
+                    user_id, headers = users[index]
+                    interleave = index % 2 == 1
+                    params = {"view": "card", **({"admirers": "interleave"} if interleave else {})}
+                    player_rng = random.Random(index)
+                    started = time.perf_counter()
+                    response = self.simulation_session().get(f"{BASE_URL}/explore/people", headers=headers, params=params)
+                    latency = (time.perf_counter() - started) * 1000
+                    rights = matches = 0
+                    for person in response.json().get("people", []):
+                        if player_rng.random() < ADMIRER_RIGHT_RATE:
+                            matched = self.swipe_right(headers, person["id"])
+                            if matched is not None:
+                                rights += 1
+                                matches += matched
+                    return interleave, latency, rights, matches
+
+                outcomes = list(pool.map(play, range(ADMIRER_USERS)))
+
+            def percentile(values, p):
+                values = sorted(values)
+                return values[min(len(values) - 1, int(len(values) * p))] if values else 0
+
+            print(f"{'deck':<13}{'users':>7}{'p50 ms':>9}{'p95 ms':>9}{'rights':>8}{'matches':>9}{'rate':>8}")
+            rates = {}
+            for interleave, label in ((False, "plain"), (True, "interleaved")):
+                group = [o for o in outcomes if o[0] == interleave]
+                rights = sum(o[2] for o in group)
+                matches = sum(o[3] for o in group)
+                rates[interleave] = matches / rights if rights else 0
+                latencies = [o[1] for o in group]
+                print(f"{label:<13}{len(group):>7}{percentile(latencies, 0.5):>9.1f}{percentile(latencies, 0.95):>9.1f}"
+                      f"{rights:>8}{matches:>9}{rates[interleave]:>8.1%}")
+            print(f"likes feed p50 {percentile(likes_latencies, 0.5):.1f}ms")
+
+            if rates[True] <= rates[False]:
+                self.log_result("Liked-You Queue", False,
+                              f"Interleaving did not raise the match rate ({rates[True]:.1%} vs {rates[False]:.1%})")
+                return False
+            self.log_result("Liked-You Queue", True,
+                          f"Match rate {rates[True]:.1%} with admirers interleaved vs {rates[False]:.1%} without")
+            return True
+
+        except Exception as e:
+            self.log_result("Liked-You Queue", False, f"Error: {str(e)}")
+            return False
+
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+    
     def run_comprehensive_tests(self):
         """Run comprehensive HackSwipe animation and backend integration tests"""
         print("🚀 Starting Comprehensive HackSwipe Animation & Backend Integration Testing...")
@@ -460,7 +585,9 @@ class ComprehensiveHackSwipeTest:
             self.test_swipe_animation_states,
             self.test_mutual_matching_system,
             self.test_animation_timing_integration,
-            self.test_post_animation_data_integrity
+            self.test_post_animation_data_integrity,
+            self.test_liked_you_queue,
+            self.check_query_budgets
         ]
         
         passed_tests = 0
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+
+import requests
+import json
+import sys
+import os
+from datetime import datetime
+from harness_metrics import ServerTimingCollector
+from harness_encoding import available_encodings, available_formats, fetch
+
+# Configuration
+BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
+TEST_USER_EMAIL = "encoding.test.user@example.com"
+TEST_USER_PASSWORD = "testpass123"
+TEST_USER_NAME = "Encoding Test User"
+
+# Must match the server's COMPRESSION_THRESHOLD_BYTES
+COMPRESSION_THRESHOLD_BYTES = int(os.environ.get("COMPRESSION_THRESHOLD_BYTES", "1024"))
+ENCODING_ROUNDS = int(os.environ.get("ENCODING_ROUNDS", "10"))
+
+ENDPOINTS = ["auth/me", "profile", "explore/people", "explore/projects", "matches", "conversations", "notifications"]
+
+class EncodingTester:
+    def __init__(self):
+        self.session = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session)
+        self.auth_token = None
+        self.test_results = []
+
+    def log_result(self, test_name, success, message, details=None):
+        """Log test result"""
+        status = "✅ PASS" if success else "❌ FAIL"
+        result = {
+            "test": test_name,
+            "status": status,
+            "message": message,
+            "details": details,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.test_results.append(result)
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+
+    def fetch(self, endpoint, fmt="json", encoding="identity"):
+        """Fetch an endpoint as the test user in one format/encoding"""
+        return fetch(f"{BASE_URL}/{endpoint}", {'Authorization': f'Bearer {self.auth_token}'}, fmt, encoding)
+
+    def setup_test_user(self):
+        """Register and login test user"""
+        try:
+            response = self.session.post(f"{BASE_URL}/auth/register", json={
+                "email": TEST_USER_EMAIL,
+                "password": TEST_USER_PASSWORD,
+                "name": TEST_USER_NAME
+            })
+
+            if response.status_code == 400 and "already exists" in response.text:
+                response = self.session.post(f"{BASE_URL}/auth/login", json={
+                    "email": TEST_USER_EMAIL,
+                    "password": TEST_USER_PASSWORD
+                })
+
+            if response.status_code != 200:
+                self.log_result("User Setup", False, f"Authentication failed: {response.status_code}")
+                return False
+
+            self.auth_token = response.json().get('token')
+            self.session.headers.update({'Authorization': f'Bearer {self.auth_token}'})
+            self.log_result("User Setup", True,
+                          f"Test user authenticated; formats {available_formats()}, encodings {available_encodings()}")
+            return True
+
+        except Exception as e:
+            self.log_result("User Setup", False, f"Setup error: {str(e)}")
+            return False
+
+    def test_format_equivalence(self):
+        """Test that every format decodes to the same data as JSON"""
+        try:
+            print("\n🔄 Testing Format Equivalence...")
+
+            reference = self.fetch("profile").data
+            all_passed = True
+            for fmt in available_formats():
+                for encoding in available_encodings():
+                    sample = self.fetch("profile", fmt, encoding)
+                    expected_type = "application/json" if fmt == "json" else f"application/{fmt}"
+                    if sample.status != 200 or sample.content_type != expected_type or sample.data != reference:
+                        self.log_result(f"Format Equivalence - {fmt}/{encoding}", False,
+                                      f"Got {sample.status} {sample.content_type}, data matches JSON: {sample.data == reference}")
+                        all_passed = False
+
+            if all_passed:
+                self.log_result("Format Equivalence", True,
+                              f"{len(available_formats())} formats x {len(available_encodings())} encodings decode identically")
+            return all_passed
+
+        except Exception as e:
+            self.log_result("Format Equivalence", False, f"Error: {str(e)}")
+            return False
+
+    def test_compression_threshold(self):
+        """Test that only bodies at or above the threshold are compressed"""
+        try:
+            print(f"\n🔄 Testing Compression Threshold ({COMPRESSION_THRESHOLD_BYTES} bytes)...")
+
+            all_passed = True
+            for endpoint in ENDPOINTS:
+                sample = self.fetch(endpoint, "json", "gzip")
+                should_compress = sample.body_bytes >= COMPRESSION_THRESHOLD_BYTES
+                if sample.status != 200 or (sample.content_encoding == "gzip") != should_compress:
+                    self.log_result(f"Compression Threshold - {endpoint}", False,
+                                  f"{sample.body_bytes} byte body sent with Content-Encoding {sample.content_encoding}")
+                    all_passed = False
+
+            uncompressed = self.fetch("explore/people", "json", "identity")
+            if uncompressed.content_encoding:
+                self.log_result("Compression Threshold - identity", False,
+                              f"Compressed with {uncompressed.content_encoding} although the client refused")
+                all_passed = False
+
+            if all_passed:
+                self.log_result("Compression Threshold", True, f"{len(ENDPOINTS)} endpoints respect the threshold")
+            return all_passed
+
+        except Exception as e:
+            self.log_result("Compression Threshold", False, f"Error: {str(e)}")
+            return False
+
+    def test_frontend_compression(self):
+        """Test that pages are still gzipped by Next while API responses are left to the API"""
+        try:
+            print("\n🔄 Testing Frontend Compression...")
+
+            page = requests.get(BASE_URL.rsplit("/api", 1)[0] + "/", headers={"Accept-Encoding": "gzip"}, stream=True)
+            api = self.fetch("explore/people", "json", "gzip")
+            api_cache_control = self.session.get(f"{BASE_URL}/explore/people").headers.get("Cache-Control", "")
+            page_encoding = page.headers.get("Content-Encoding")
+            page.close()
+
+            if page_encoding != "gzip":
+                self.log_result("Frontend Compression", False, f"Page sent with Content-Encoding {page_encoding}")
+                return False
+            if "no-transform" not in api_cache_control:
+                self.log_result("Frontend Compression", False,
+                              f"API response open to Next's compression: Cache-Control {api_cache_control!r}")
+                return False
+            self.log_result("Frontend Compression", True,
+                          f"Page gzipped by Next; API body sent with Content-Encoding {api.content_encoding} by the API")
+            return True
+
+        except Exception as e:
+            self.log_result("Frontend Compression", False, f"Error: {str(e)}")
+            return False
+
+    def test_wire_report(self):
+        """Report bytes on the wire and encode/decode time per endpoint"""
+        try:
+            print(f"\n🔄 Measuring Wire Size ({ENCODING_ROUNDS} rounds)...")
+
+            print(f"   {'endpoint':<20}{'format':<9}{'encoding':<10}{'wire B':>9}{'body B':>9}{'vs json':>9}"
+                  f"{'encode ms':>11}{'decode ms':>11}")
+            for endpoint in ENDPOINTS:
+                baseline = None
+                for fmt in available_formats():
+                    for encoding in available_encodings():
+                        samples = [self.fetch(endpoint, fmt, encoding) for _ in range(ENCODING_ROUNDS)]
+                        if any(s.status != 200 for s in samples):
+                            self.log_result("Wire Report", False, f"{endpoint} {fmt}/{encoding} failed")
+                            return False
+                        wire = sum(s.wire_bytes for s in samples) / len(samples)
+                        body = sum(s.body_bytes for s in samples) / len(samples)
+                        encode = sum(s.encode_ms for s in samples) / len(samples)
+                        decode = sum(s.decode_ms for s in samples) / len(samples)
+                        baseline = baseline or wire
+                        print(f"   {endpoint:<20}{fmt:<9}{encoding:<10}{wire:>9.0f}{body:>9.0f}{wire / baseline:>9.0%}"
+                              f"{encode:>11.2f}{decode:>11.2f}")
+
+            self.log_result("Wire Report", True, f"Measured {len(ENDPOINTS)} endpoints")
+            return True
+
+        except Exception as e:
+            self.log_result("Wire Report", False, f"Error: {str(e)}")
+            return False
+
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+
+    def run_all_tests(self):
+        """Run all encoding tests"""
+        print("🚀 Starting Response Encoding Testing...")
+        print("=" * 60)
+
+        if not self.setup_test_user():
+            print("❌ Cannot proceed without authentication")
+            return False
+
+        tests = [
+            self.test_format_equivalence,
+            self.test_compression_threshold,
+            self.test_frontend_compression,
+            self.test_wire_report,
+            self.check_query_budgets
+        ]
+
+        passed_tests = 0
+        total_tests = len(tests)
+
+        for test in tests:
+            try:
+                if test():
+                    passed_tests += 1
+            except Exception as e:
+                print(f"❌ Test {test.__name__} failed with exception: {str(e)}")
+
+        # Summary
+        print("\n" + "=" * 60)
+        print(f"📊 RESPONSE ENCODING TEST SUMMARY")
+        print(f"Passed: {passed_tests}/{total_tests}")
+        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+
+        if passed_tests == total_tests:
+            print("🎉 All response encoding tests passed!")
+            return True
+        else:
+            print(f"⚠️  {total_tests - passed_tests} test(s) failed")
+            return False
+
+if __name__ == "__main__":
+    tester = EncodingTester()
+    success = tester.run_all_tests()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+
+import requests
+import json
+import sys
+import os
+import time
+import uuid
+import tracemalloc
+from datetime import datetime
+from harness_metrics import ServerTimingCollector
+
+# Configuration
+BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
+TEST_USER_PASSWORD = "testpass123"
+
+# Swipes seeded directly when MONGO_URL and pymongo are available, else through the API
+EXPORT_SWIPES = int(os.environ.get("EXPORT_SWIPES", "1000000"))
+EXPORT_API_SWIPES = int(os.environ.get("EXPORT_API_SWIPES", "300"))
+# Lines between memory samples, and a stall that must not make the server buffer
+SAMPLE_EVERY = int(os.environ.get("EXPORT_SAMPLE_EVERY", "100000"))
+PAUSE_SECONDS = float(os.environ.get("EXPORT_PAUSE_SECONDS", "3"))
+# Allowed growth over the first sample
+CLIENT_GROWTH_MB = float(os.environ.get("EXPORT_CLIENT_GROWTH_MB", "16"))
+SERVER_GROWTH_MB = float(os.environ.get("EXPORT_SERVER_GROWTH_MB", "128"))
+
+MONGO_URL = os.environ.get("MONGO_URL")
+DB_NAME = os.environ.get("DB_NAME", "hackathon_tinder")
+
+try:
+    import pymongo
+except ImportError:
+    pymongo = None
+
+class ExportTester:
+    def __init__(self):
+        self.session = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session)
+        self.user_id = None
+        self.seeded_swipes = 0
+        self.db = None
+        self.test_results = []
+
+    def log_result(self, test_name, success, message, details=None):
+        """Log test result"""
+        status = "✅ PASS" if success else "❌ FAIL"
+        result = {
+            "test": test_name,
+            "status": status,
+            "message": message,
+            "details": details,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.test_results.append(result)
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+
+    def setup_test_user(self):
+        """Register a fresh user to export"""
+        try:
+            response = self.session.post(f"{BASE_URL}/auth/register", json={
+                "email": f"export.{uuid.uuid4().hex[:12]}@example.com",
+                "password": TEST_USER_PASSWORD,
+                "name": "Export Test User"
+            })
+            if response.status_code != 200:
+                self.log_result("User Setup", False, f"Registration failed: {response.status_code}")
+                return False
+            body = response.json()
+            self.user_id = body["user"]["id"]
+            self.session.headers.update({'Authorization': f"Bearer {body['token']}"})
+            if MONGO_URL and pymongo:
+                self.db = pymongo.MongoClient(MONGO_URL)[DB_NAME]
+            self.log_result("User Setup", True, "Export user registered")
+            return True
+
+        except Exception as e:
+            self.log_result("User Setup", False, f"Setup error: {str(e)}")
+            return False
+
+    def seed_swipes(self):
+        """EXPORT_SWIPES swipes in MongoDB, or EXPORT_API_SWIPES via the API"""
+        try:
+            print("\n🔄 Seeding Swipes...")
+            started = time.perf_counter()
+            if self.db is None:
+                for i in range(EXPORT_API_SWIPES):
+                    self.session.post(f"{BASE_URL}/swipe", json={
+                        "targetType": "PERSON", "targetId": str(uuid.uuid4()), "direction": "LEFT" if i % 4 else "RIGHT"
+                    })
+                self.seeded_swipes = EXPORT_API_SWIPES
+                self.log_result("Seed Swipes", True, f"No database access: {EXPORT_API_SWIPES} swipes via the API")
+                return True
+
+            now = datetime.utcnow()
+            batch = []
+            for i in range(EXPORT_SWIPES):
+                batch.append({
+                    "id": str(uuid.uuid4()),
+                    "swiperId": self.user_id,
+                    "targetType": "PERSON" if i % 3 else "PROJECT",
+                    "targetId": str(uuid.uuid4()),
+                    "direction": "LEFT" if i % 4 else "RIGHT",
+                    "createdAt": now
+                })
+                if len(batch) == 5000:
+                    self.db['swipes'].insert_many(batch, ordered=False)
+                    batch = []
+            if batch:
+                self.db['swipes'].insert_many(batch, ordered=False)
+            self.seeded_swipes = EXPORT_SWIPES
+            self.log_result("Seed Swipes", True,
+                          f"{EXPORT_SWIPES} swipes inserted in {time.perf_counter() - started:.1f}s")
+            return True
+
+        except Exception as e:
+            self.log_result("Seed Swipes", False, f"Error: {str(e)}")
+            return False
+
+    def server_memory_mb(self):
+        memory = requests.get(f"{BASE_URL}/metrics/cache", headers=dict(self.session.headers)).json().get("memory", {})
+        return memory.get("rss", 0) / 1e6
+
+    def test_streaming_export(self):
+        """Consume the export line by line and check both sides' memory stays flat"""
+        try:
+            print("\n🔄 Testing Streaming Export...")
+            tracemalloc.start()
+            counts, samples = {}, []
+            end = None
+            lines = 0
+            paused = False
+            started = time.perf_counter()
+            first_line_at = None
+
+            with self.session.get(f"{BASE_URL}/export", stream=True) as response:
+                if response.status_code != 200:
+                    self.log_result("Streaming Export", False, f"Export failed: {response.status_code}")
+                    return False
+                for raw in response.iter_lines(chunk_size=64 * 1024):
+                    if not raw:
+                        continue
+                    entry = json.loads(raw)
+                    if first_line_at is None:
+                        first_line_at = time.perf_counter() - started
+                    lines += 1
+                    counts[entry["type"]] = counts.get(entry["type"], 0) + 1
+                    if entry["type"] == "end":
+                        end = entry["data"]
+                    if lines % SAMPLE_EVERY == 1:
+                        current, _ = tracemalloc.get_traced_memory()
+                        samples.append((lines, current / 1e6, self.server_memory_mb()))
+                    # Stop reading for a while: the server must wait, not buffer
+                    if not paused and lines >= self.seeded_swipes // 2:
+                        paused = True
+                        time.sleep(PAUSE_SECONDS)
+                        current, _ = tracemalloc.get_traced_memory()
+                        samples.append((lines, current / 1e6, self.server_memory_mb()))
+            elapsed = time.perf_counter() - started
+            _, client_peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(f"{'lines':>10}{'client MB':>11}{'server RSS MB':>15}")
+            for at, client_mb, server_mb in samples:
+                print(f"{at:>10}{client_mb:>11.1f}{server_mb:>15.0f}")
+            client_growth = max(s[1] for s in samples) - samples[0][1]
+            server_growth = max(s[2] for s in samples) - samples[0][2]
+            print(f"   {lines} lines in {elapsed:.1f}s ({lines / elapsed:.0f}/s), first line after {first_line_at * 1000:.0f}ms")
+
+            details = {"counts": counts, "end": end, "client_growth_mb": round(client_growth, 1),
+                       "client_peak_mb": round(client_peak / 1e6, 1), "server_growth_mb": round(server_growth, 1)}
+            if end is None or end["counts"].get("swipe") != self.seeded_swipes or counts.get("swipe") != self.seeded_swipes:
+                self.log_result("Streaming Export", False, "Export incomplete", details)
+                return False
+            if client_growth > CLIENT_GROWTH_MB or server_growth > SERVER_GROWTH_MB:
+                self.log_result("Streaming Export", False, "Memory grew with the export", details)
+                return False
+            self.log_result("Streaming Export", True,
+                          f"{counts['swipe']} swipes streamed; client +{client_growth:.1f}MB, server +{server_growth:.0f}MB")
+            return True
+
+        except Exception as e:
+            self.log_result("Streaming Export", False, f"Error: {str(e)}")
+            return False
+
+    def cleanup(self):
+        """Remove the seeded swipes"""
+        if self.db is not None:
+            self.db['swipes'].delete_many({"swiperId": self.user_id})
+        return True
+
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+
+    def run_all_tests(self):
+        """Run all export tests"""
+        print("🚀 Starting Export Testing...")
+        print("=" * 60)
+
+        if not self.setup_test_user():
+            print("❌ Cannot proceed without authentication")
+            return False
+
+        tests = [
+            self.seed_swipes,
+            self.test_streaming_export,
+            self.cleanup,
+            self.check_query_budgets
+        ]
+
+        passed_tests = 0
+        total_tests = len(tests)
+
+        for test in tests:
+            try:
+                if test():
+                    passed_tests += 1
+            except Exception as e:
+                print(f"❌ Test {test.__name__} failed with exception: {str(e)}")
+
+        # Summary
+        print("\n" + "=" * 60)
+        print(f"📊 EXPORT TEST SUMMARY")
+        print(f"Passed: {passed_tests}/{total_tests}")
+        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+
+        if passed_tests == total_tests:
+            print("🎉 All export tests passed!")
+            return True
+        else:
+            print(f"⚠️  {total_tests - passed_tests} test(s) failed")
+            return False
+
+if __name__ == "__main__":
+    tester = ExportTester()
+    success = tester.run_all_tests()
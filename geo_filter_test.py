@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+
+import requests
+import json
+import sys
+import os
+import math
+import time
+import random
+import uuid
+from datetime import datetime
+from harness_metrics import ServerTimingCollector, parse_server_timing
+
+# Configuration
+BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
+TEST_USER_EMAIL = "geo.test.user@example.com"
+TEST_USER_PASSWORD = "testpass123"
+TEST_USER_NAME = "Geo Test User"
+
+# Generated users, inserted directly when MONGO_URL and pymongo are available
+GEO_USERS = int(os.environ.get("GEO_USERS", "100000"))
+GEO_RUNS = int(os.environ.get("GEO_RUNS", "20"))
+GENERATED_PREFIX = "geo-gen-"
+EARTH_RADIUS_KM = 6378.1
+
+MONGO_URL = os.environ.get("MONGO_URL")
+DB_NAME = os.environ.get("DB_NAME", "hackathon_tinder")
+
+try:
+    import pymongo
+except ImportError:
+    pymongo = None
+
+# name -> (lng, lat), as lib/gazetteer.js resolves them
+CITIES = {
+    "Austin, TX": (-97.7431, 30.2672),
+    "San Francisco, CA": (-122.4194, 37.7749),
+    "New York, NY": (-74.0060, 40.7128),
+    "Seattle, WA": (-122.3321, 47.6062),
+    "London, UK": (-0.1278, 51.5074),
+    "Berlin, Germany": (13.4050, 52.5200),
+    "Bangalore, India": (77.5946, 12.9716),
+    "Singapore": (103.8198, 1.3521),
+}
+VIEWER_CITY = "Austin, TX"
+VIEWER_RADIUS_KM = 100
+
+
+def distance_km(a, b):
+    """Great-circle distance between two (lng, lat) points"""
+    lng1, lat1, lng2, lat2 = map(math.radians, (*a, *b))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(h))
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+class GeoFilterTester:
+    def __init__(self):
+        self.session = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session)
+        self.auth_token = None
+        self.db = None
+        self.test_results = []
+
+    def log_result(self, test_name, success, message, details=None):
+        """Log test result"""
+        status = "✅ PASS" if success else "❌ FAIL"
+        result = {
+            "test": test_name,
+            "status": status,
+            "message": message,
+            "details": details,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.test_results.append(result)
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+
+    def setup_test_user(self):
+        """Register or log in the viewer"""
+        try:
+            response = self.session.post(f"{BASE_URL}/auth/register", json={
+                "email": TEST_USER_EMAIL,
+                "password": TEST_USER_PASSWORD,
+                "name": TEST_USER_NAME
+            })
+            if response.status_code == 400 and "already exists" in response.text:
+                response = self.session.post(f"{BASE_URL}/auth/login", json={
+                    "email": TEST_USER_EMAIL,
+                    "password": TEST_USER_PASSWORD
+                })
+            if response.status_code != 200:
+                self.log_result("User Setup", False, f"Authentication failed: {response.status_code}")
+                return False
+
+            self.auth_token = response.json().get('token')
+            self.session.headers.update({'Authorization': f'Bearer {self.auth_token}'})
+            if MONGO_URL and pymongo:
+                self.db = pymongo.MongoClient(MONGO_URL)[DB_NAME]
+            self.log_result("User Setup", True, "Viewer authenticated")
+            return True
+
+        except Exception as e:
+            self.log_result("User Setup", False, f"Setup error: {str(e)}")
+            return False
+
+    def put_location(self, location):
+        return self.session.put(f"{BASE_URL}/profile", json={
+            "bio": "Geo filter viewer",
+            "location": location,
+            "skills": ["Python"],
+            "preferences": {"locationRadiusKm": VIEWER_RADIUS_KM, "remoteOk": False, "searchPeople": True}
+        })
+
+    def test_geocoding(self):
+        """Test that profile updates geocode the location from the offline gazetteer"""
+        try:
+            print("\n🔄 Testing Geocoding at Profile Update...")
+            cases = [
+                ("Austin, TX (Remote Welcome)", CITIES["Austin, TX"]),
+                ("Bengaluru, India", CITIES["Bangalore, India"]),
+                ("Berlin, Germany", CITIES["Berlin, Germany"]),
+                ("London, United Kingdom", CITIES["London, UK"]),
+                # A qualifier that contradicts the city must not fall back to it
+                ("Paris, TX", None),
+                ("Portland, ME", None),
+                ("Berlin, NH", None),
+                ("Remote", None),
+                ("Atlantis", None),
+                (VIEWER_CITY, CITIES[VIEWER_CITY]),
+            ]
+            failed = []
+            for location, expected in cases:
+                response = self.put_location(location)
+                if response.status_code != 200:
+                    failed.append(f"{location}: HTTP {response.status_code}")
+                    continue
+                geo = response.json()['profile'].get('geo')
+                got = tuple(geo['coordinates']) if geo else None
+                if (got is None) != (expected is None) or (got and distance_km(got, expected) > 1):
+                    failed.append(f"{location}: {got}")
+
+            if failed:
+                self.log_result("Geocoding", False, f"Unexpected points: {'; '.join(failed)}")
+                return False
+            self.log_result("Geocoding", True, f"{len(cases)} locations resolved offline (unknown ones stay null)")
+            return True
+
+        except Exception as e:
+            self.log_result("Geocoding", False, f"Error: {str(e)}")
+            return False
+
+    def seed_users(self):
+        """Generate GEO_USERS users spread around CITIES"""
+        try:
+            print("\n🔄 Seeding Located Users...")
+            if self.db is None:
+                self.log_result("Seed Users", True, "No database access: skipped")
+                return True
+
+            rng = random.Random(7)
+            existing = self.db['users'].count_documents({"id": {"$regex": f"^{GENERATED_PREFIX}"}})
+            started = time.perf_counter()
+            now = datetime.utcnow()
+            users, profiles = [], []
+            for i in range(existing, GEO_USERS):
+                city = rng.choice(list(CITIES))
+                lng, lat = CITIES[city]
+                user_id = f"{GENERATED_PREFIX}{i}"
+                users.append({
+                    "id": user_id, "email": f"geo.gen.{i}@example.com", "name": f"Located Candidate {i}",
+                    "username": f"geo_gen_{i}", "passwordHash": "!", "imageUrl": None, "roleHeadline": None,
+                    "location": city, "timezone": None, "createdAt": now, "updatedAt": now
+                })
+                profiles.append({
+                    "id": str(uuid.uuid4()), "userId": user_id, "bio": "Generated for geo benchmarks",
+                    "skills": [], "interests": [], "experience": [], "projects": [], "awards": [], "socials": [],
+                    "preferences": {"locationRadiusKm": 50, "remoteOk": rng.random() < 0.5, "searchPeople": True},
+                    # Up to ~150km from the city center
+                    "geo": {"type": "Point", "coordinates": [lng + rng.uniform(-1.5, 1.5), lat + rng.uniform(-1, 1)]},
+                    "revision": 1, "createdAt": now, "updatedAt": now
+                })
+                if len(users) == 5000:
+                    self.db['users'].insert_many(users, ordered=False)
+                    self.db['profiles'].insert_many(profiles, ordered=False)
+                    users, profiles = [], []
+            if users:
+                self.db['users'].insert_many(users, ordered=False)
+                self.db['profiles'].insert_many(profiles, ordered=False)
+
+            self.log_result("Seed Users", True, f"{GEO_USERS} located users ({GEO_USERS - existing} inserted in "
+                                                f"{time.perf_counter() - started:.1f}s)")
+            return True
+
+        except Exception as e:
+            self.log_result("Seed Users", False, f"Seeding error: {str(e)}")
+            return False
+
+    def test_radius_deck(self):
+        """Test that radiusKm decks only hold people within the radius"""
+        try:
+            print("\n🔄 Testing Radius-Filtered Decks...")
+            center = CITIES[VIEWER_CITY]
+            report = []
+            for label, params, radius in [("unfiltered", {}, None),
+                                          ("preferred", {"radiusKm": "preferred"}, VIEWER_RADIUS_KM),
+                                          ("25km", {"radiusKm": "25"}, 25)]:
+                latencies, outside, cards = [], [], 0
+                for _ in range(GEO_RUNS):
+                    started = time.perf_counter()
+                    response = self.session.get(f"{BASE_URL}/explore/people", params={**params, "view": "full"})
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    if response.status_code != 200:
+                        self.log_result("Radius Deck", False, f"{label}: explore/people returned {response.status_code}")
+                        return False
+                    people = response.json().get('people', [])
+                    cards = len(people)
+                    if radius:
+                        for person in people:
+                            geo = (person.get('profile') or {}).get('geo')
+                            if not geo or distance_km(center, geo['coordinates']) > radius + 0.5:
+                                outside.append(person['id'])
+                report.append(f"{label} p50 {percentile(latencies, 0.5):.1f}ms ({cards} cards)")
+                if outside:
+                    self.log_result("Radius Deck", False, f"{label}: {len(outside)} cards outside {radius}km",
+                                  outside[:5])
+                    return False
+
+            bad = self.session.get(f"{BASE_URL}/explore/projects", params={"radiusKm": "-1"})
+            if bad.status_code != 400:
+                self.log_result("Radius Deck", False, f"Invalid radius returned {bad.status_code}")
+                return False
+
+            self.log_result("Radius Deck", True, "; ".join(report))
+            return True
+
+        except Exception as e:
+            self.log_result("Radius Deck", False, f"Error: {str(e)}")
+            return False
+
+    def test_index_vs_post_filter(self):
+        """Compare the 2dsphere query with a collection scan and client-side post-filtering"""
+        try:
+            print(f"\n🔄 Benchmarking Indexed Geo Query vs Post-Filtering ({GEO_RUNS} runs)...")
+            if self.db is None:
+                self.log_result("Geo Benchmark", True, "No database access: skipped")
+                return True
+
+            profiles = self.db['profiles']
+            profiles.create_index([("geo", pymongo.GEOSPHERE)])
+            center = list(CITIES[VIEWER_CITY])
+            print(f"{'radius':>8}{'matches':>9}{'index ms':>10}{'scan ms':>10}{'client ms':>11}{'plan':>8}")
+
+            for radius in (10, 50, VIEWER_RADIUS_KM, 500):
+                query = {"geo": {"$geoWithin": {"$centerSphere": [center, radius / EARTH_RADIUS_KM]}}}
+                projection = {"_id": 0, "userId": 1}
+                timings = {"index": [], "scan": [], "client": []}
+                matches = 0
+                for _ in range(GEO_RUNS):
+                    started = time.perf_counter()
+                    matches = len(list(profiles.find(query, projection)))
+                    timings["index"].append((time.perf_counter() - started) * 1000)
+
+                    started = time.perf_counter()
+                    list(profiles.find(query, projection).hint([("$natural", 1)]))
+                    timings["scan"].append((time.perf_counter() - started) * 1000)
+
+                    # What the endpoint would do without a geo filter: load every point, filter here
+                    started = time.perf_counter()
+                    [p["userId"] for p in profiles.find({"geo": {"$ne": None}}, {"_id": 0, "userId": 1, "geo": 1})
+                     if distance_km(center, p["geo"]["coordinates"]) <= radius]
+                    timings["client"].append((time.perf_counter() - started) * 1000)
+
+                plan = json.dumps(profiles.find(query, projection).explain().get("queryPlanner", {}).get("winningPlan", {}))
+                print(f"{radius:>6}km{matches:>9}{percentile(timings['index'], 0.5):>10.1f}"
+                      f"{percentile(timings['scan'], 0.5):>10.1f}{percentile(timings['client'], 0.5):>11.1f}"
+                      f"{'IXSCAN' if 'IXSCAN' in plan else 'other':>8}")
+
+            self.log_result("Geo Benchmark", True, f"Indexed vs scan vs client post-filter over "
+                                                   f"{profiles.estimated_document_count()} profiles")
+            return True
+
+        except Exception as e:
+            self.log_result("Geo Benchmark", False, f"Error: {str(e)}")
+            return False
+
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+
+    def run_all_tests(self):
+        """Run all geo filter tests"""
+        print("🚀 Starting Geo Filter Testing...")
+        print("=" * 60)
+
+        if not self.setup_test_user():
+            print("❌ Cannot proceed without authentication")
+            return False
+
+        tests = [
+            self.test_geocoding,
+            self.seed_users,
+            self.test_radius_deck,
+            self.test_index_vs_post_filter,
+            self.check_query_budgets
+        ]
+
+        passed_tests = 0
+        total_tests = len(tests)
+
+        for test in tests:
+            try:
+                if test():
+                    passed_tests += 1
+            except Exception as e:
+                print(f"❌ Test {test.__name__} failed with exception: {str(e)}")
+
+        # Summary
+        print("\n" + "=" * 60)
+        print(f"📊 GEO FILTER TEST SUMMARY")
+        print(f"Passed: {passed_tests}/{total_tests}")
+        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+
+        if passed_tests == total_tests:
+            print("🎉 All geo filter tests passed!")
+            return True
+        else:
+            print(f"⚠️  {total_tests - passed_tests} test(s) failed")
+            return False
+
+if __name__ == "__main__":
+    tester = GeoFilterTester()
+    success = tester.run_all_tests()
@@ -4,6 +4,7 @@ import requests
 import json
 import sys
 from datetime import datetime
+from harness_metrics import ServerTimingCollector
 
 # Configuration
 BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
@@ -14,6 +15,8 @@ TEST_USER_NAME = "HackSwipe Test User"
 class HackSwipeAnimationTester:
     def __init__(self):
         self.session = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session)
         self.auth_token = None
         self.test_results = []
         self.test_user_id = None
@@ -395,6 +398,10 @@ class HackSwipeAnimationTester:
             self.log_result("Animation Timing Compatibility", False, f"Timing test error: {str(e)}")
             return False
     
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+    
     def run_hackswipe_tests(self):
         """Run all HackSwipe animation and backend integration tests"""
         print("🚀 Starting HackSwipe Animation & Backend Integration Testing...")
@@ -414,7 +421,8 @@ class HackSwipeAnimationTester:
             self.test_explore_endpoints_data_retrieval,
             self.test_swipe_api_functionality,
             self.test_match_system,
-            self.test_animation_timing_compatibility
+            self.test_animation_timing_compatibility,
+            self.check_query_budgets
         ]
         
         passed_tests = 0
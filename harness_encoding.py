@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Content negotiation client shared by the test suites.
+
+The API picks a body format from `Accept` (JSON, MessagePack or CBOR) and
+compresses bodies above a size threshold with brotli or gzip according to
+`Accept-Encoding`. fetch() requests one format/encoding pair, reads the raw
+bytes off the wire, then decompresses and decodes them itself so each step
+can be measured:
+
+- wire bytes: what crossed the network
+- body bytes: the encoded body after decompression
+- encode ms: the server's serialize + compress phases from Server-Timing
+- decode ms: client-side decompression + parsing
+
+MessagePack, CBOR and brotli need the optional `msgpack`, `cbor2` and
+`brotli` packages (see requirements-test.txt); formats whose decoder is
+missing are skipped.
+"""
+
+import json
+import time
+import zlib
+
+import requests
+
+from harness_metrics import parse_server_timing
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:
+    cbor2 = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "msgpack": "application/msgpack",
+    "cbor": "application/cbor",
+}
+
+DECODERS = {
+    "application/json": lambda body: json.loads(body),
+    "application/msgpack": lambda body: msgpack.unpackb(body),
+    "application/cbor": lambda body: cbor2.loads(body),
+}
+
+DECOMPRESSORS = {
+    "gzip": lambda wire: zlib.decompress(wire, 16 + zlib.MAX_WBITS),
+    "br": lambda wire: brotli.decompress(wire),
+}
+
+
+def available_formats():
+    """Body formats this client can decode"""
+    formats = ["json"]
+    if msgpack:
+        formats.append("msgpack")
+    if cbor2:
+        formats.append("cbor")
+    return formats
+
+
+def available_encodings():
+    """Content codings this client can decompress"""
+    encodings = ["identity", "gzip"]
+    if brotli:
+        encodings.append("br")
+    return encodings
+
+
+class WireSample:
+    def __init__(self, status, content_type, content_encoding, wire_bytes, body_bytes, data, encode_ms, decode_ms):
+        self.status = status
+        self.content_type = content_type
+        self.content_encoding = content_encoding
+        self.wire_bytes = wire_bytes
+        self.body_bytes = body_bytes
+        self.data = data
+        self.encode_ms = encode_ms
+        self.decode_ms = decode_ms
+
+
+def fetch(url, headers=None, fmt="json", encoding="identity", http=None):
+    """GET url in one format/encoding and return a WireSample"""
+    request_headers = dict(headers or {})
+    request_headers["Accept"] = MEDIA_TYPES[fmt]
+    request_headers["Accept-Encoding"] = encoding
+
+    response = (http or requests).get(url, headers=request_headers, stream=True)
+    wire = response.raw.read(decode_content=False)
+    content_type = response.headers.get("Content-Type", "").split(";")[0]
+    content_encoding = response.headers.get("Content-Encoding")
+
+    started = time.perf_counter()
+    body = DECOMPRESSORS[content_encoding](wire) if content_encoding else wire
+    decoder = DECODERS.get(content_type)
+    data = decoder(body) if decoder and body else None
+    decode_ms = (time.perf_counter() - started) * 1000
+
+    durations, _, _ = parse_server_timing(response.headers.get("Server-Timing", ""))
+    encode_ms = durations.get("serialize", 0.0) + durations.get("compress", 0.0)
+
+    return WireSample(response.status_code, content_type, content_encoding,
+                      len(wire), len(body), data, encode_ms, decode_ms)
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""Server-Timing collection shared by the test suites.
+
+Every API response carries a Server-Timing header like
+
+    auth;dur=1.2, db;dur=4.8;desc="6 queries", serialize;dur=0.1, total;dur=7.5
+
+ServerTimingCollector hooks into a requests.Session, records those numbers
+per endpoint, prints a queries-per-request report and checks each endpoint
+against a query budget of `base + per_item * items`, where `items` is the
+length of the list the endpoint returns. An endpoint that starts issuing
+more queries per returned item than budgeted has regressed into N+1.
+
+Counters such as `card-hits;desc="3"` are collected too; the report shows
+the per-endpoint card cache hit rate next to the server-wide figures from
+`GET metrics/cache`.
+"""
+
+import os
+import re
+from collections import defaultdict
+
+# (base queries, queries per returned item). Session auth costs up to 3
+# queries: the session lookup plus a users/profiles card load on a cache miss.
+# Every card load is one users + one profiles query, however many cards.
+QUERY_BUDGETS = {
+    "POST auth/register": (10, 0),
+    "POST auth/login": (10, 0),
+    "POST auth/logout": (3, 0),
+    "GET auth/me": (3, 0),
+    "GET profile": (3, 0),
+    # Plus the users write when the body carries a location
+    "PUT profile": (5, 0),
+    # One conditional update, plus a revision lookup on conflict or the
+    # skill id write when skills/interests changed
+    "PATCH profile": (5, 0),
+    # Every swiped-exclusion list reads raw swipes plus compacted swipe sets.
+    # Plus the precomputed candidate list, the feature index sync (profiles +
+    # users), the unranked fill and the admirer lookup when interleaving
+    "GET explore/people": (13, 0),
+    "GET explore/hackathons": (8, 0),
+    "GET explore/projects": (8, 0),
+    "GET random-project": (8, 0),
+    # Posts, profiles and users text queries, the missing half of people's
+    # scores, plus one card load for the page
+    "GET search": (10, 0),
+    # The duplicate check reads raw swipes and compacted swipe sets
+    "POST swipe": (8, 0),
+    # Viewer's swipes and swipe sets, pending admirers and their count, one card load
+    "GET likes": (9, 0),
+    "POST posts": (4, 0),
+    # One bulkWrite per 1000 valid rows, 10000 rows per request at most
+    "POST posts/import": (14, 0),
+    "GET matches": (6, 0),
+    "GET inquiries": (7, 0),
+    "PATCH inquiries/:id": (7, 0),
+    # Inquiries and their posts read once, one bulkWrite each for statuses and matches
+    "PATCH inquiries": (6, 0),
+    # Latest message of every conversation from one aggregation
+    "GET conversations": (9, 0),
+    # Existing-DM lookup, participants and conversation inserts; a lost
+    # creation race adds a participants cleanup and a re-read
+    "POST conversations": (8, 0),
+    "GET conversations/:id/messages": (7, 0),
+    # Participant check, message seq reservation, insert, sender read cursor
+    "POST messages": (7, 0),
+    # Participant and conversation reads, the cursor message, the cursor write
+    "POST conversations/:id/read": (7, 0),
+    # Inquiry and accepted counts of every post from one aggregation
+    "GET posts/my-posts": (5, 0),
+    "PUT posts/:id": (6, 0),
+    # Ownership check, post delete, job insert; dependents go in the background
+    "DELETE posts/:id": (6, 0),
+    # User, profile and sessions deletes plus the job insert
+    "DELETE account": (8, 0),
+    # Session user (unless read by status token) plus the job lookup
+    "GET deletions/:id": (4, 0),
+    "GET notifications": (19, 0),
+    "GET streak": (3, 0),
+    "GET overview": (8, 0),
+    "GET metrics/cache": (3, 0),
+    # Oldest due job plus one count per status
+    "GET metrics/queue": (8, 0),
+    # The export cursors run while the body streams, after Server-Timing is sent
+    "GET export": (3, 0),
+    # Seeds demo data with one query per document; not a request-path endpoint
+    "POST dummy-data": None,
+}
+DEFAULT_BUDGET = (10, 0)
+
+# Set QUERY_BUDGET_ENFORCE=0 to report without failing
+ENFORCE_BUDGETS = os.environ.get("QUERY_BUDGET_ENFORCE", "1") != "0"
+
+ID_SEGMENT = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.I)
+TIMING_ENTRY = re.compile(r"\s*([\w-]+)((?:;[^,]*)?)")
+QUERY_COUNT = re.compile(r'desc="?(\d+) quer')
+DURATION = re.compile(r"dur=([\d.]+)")
+COUNTER = re.compile(r'desc="?(\d+)"?')
+
+
+def parse_server_timing(header):
+    """Parse a Server-Timing header into ({metric: ms}, query count, {counter: n})"""
+    durations = {}
+    counters = {}
+    queries = None
+    for entry in header.split(","):
+        match = TIMING_ENTRY.match(entry)
+        if not match:
+            continue
+        name, params = match.group(1), match.group(2)
+        duration = DURATION.search(params)
+        if duration:
+            durations[name] = float(duration.group(1))
+        count = QUERY_COUNT.search(params)
+        if count:
+            queries = int(count.group(1))
+            continue
+        counter = COUNTER.search(params)
+        if counter and not duration:
+            counters[name] = int(counter.group(1))
+    return durations, queries, counters
+
+
+def endpoint_key(method, url, base_url):
+    """Normalize a request into 'METHOD path' with ids replaced by :id"""
+    path = url.split("?", 1)[0]
+    if path.startswith(base_url):
+        path = path[len(base_url):]
+    segments = [":id" if ID_SEGMENT.match(s) else s for s in path.strip("/").split("/")]
+    return f"{method} {'/'.join(segments)}"
+
+
+def count_items(response):
+    """Length of the first list in a JSON object response, or 0"""
+    # Never read a streamed body (NDJSON export) here; the test consumes it
+    if not response.headers.get("content-type", "").startswith("application/json"):
+        return 0
+    try:
+        body = response.json()
+    except ValueError:
+        return 0
+    if isinstance(body, dict):
+        for value in body.values():
+            if isinstance(value, list):
+                return len(value)
+    return 0
+
+
+class ServerTimingCollector:
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.samples = defaultdict(list)
+        self.missing_header = 0
+        self.session = None
+
+    def attach(self, session):
+        """Record every response made through a requests.Session"""
+        session.hooks["response"].append(self.record)
+        self.session = self.session or session
+        return session
+
+    def record(self, response, *args, **kwargs):
+        header = response.headers.get("Server-Timing")
+        if not header:
+            self.missing_header += 1
+            return
+        durations, queries, counters = parse_server_timing(header)
+        if queries is None:
+            self.missing_header += 1
+            return
+        key = endpoint_key(response.request.method, response.request.url, self.base_url)
+        self.samples[key].append({
+            "queries": queries,
+            "items": count_items(response),
+            "db": durations.get("db", 0.0),
+            "total": durations.get("total", 0.0),
+            "card_hits": counters.get("card-hits", 0),
+            "card_misses": counters.get("card-misses", 0),
+        })
+
+    def cache_stats(self):
+        """Server-wide card cache statistics, or None if unavailable"""
+        if self.session is None:
+            return None
+        try:
+            response = self.session.get(f"{self.base_url}/metrics/cache")
+            return response.json().get("cards") if response.status_code == 200 else None
+        except Exception:
+            return None
+
+    def report(self):
+        """Print per-endpoint queries-per-request and timing"""
+        print("\n📈 Server-Timing per endpoint")
+        print(f"   {'endpoint':<36}{'calls':>6}{'avg q':>8}{'max q':>7}{'q/item':>8}{'db ms':>8}{'total ms':>10}{'cache':>8}")
+        for key in sorted(self.samples):
+            samples = self.samples[key]
+            calls = len(samples)
+            queries = [s["queries"] for s in samples]
+            items = sum(s["items"] for s in samples)
+            per_item = f"{sum(queries) / items:.2f}" if items else "-"
+            hits = sum(s["card_hits"] for s in samples)
+            lookups = hits + sum(s["card_misses"] for s in samples)
+            hit_rate = f"{hits / lookups:.0%}" if lookups else "-"
+            print(f"   {key:<36}{calls:>6}{sum(queries) / calls:>8.1f}{max(queries):>7}{per_item:>8}"
+                  f"{sum(s['db'] for s in samples) / calls:>8.1f}{sum(s['total'] for s in samples) / calls:>10.1f}"
+                  f"{hit_rate:>8}")
+        if self.missing_header:
+            print(f"   ({self.missing_header} responses without Server-Timing)")
+
+        stats = self.cache_stats()
+        if stats:
+            print(f"   card cache: {stats['hitRate']:.1%} hit rate, {stats['size']}/{stats['maxEntries']} entries, "
+                  f"{stats['hits']} hits, {stats['coalesced']} coalesced, {stats['misses']} misses, "
+                  f"{stats['evictions']} evictions, {stats['invalidations']} invalidations")
+
+    def budget_violations(self):
+        """List (endpoint, queries, items, allowed) for requests over budget"""
+        violations = []
+        for key, samples in self.samples.items():
+            budget = QUERY_BUDGETS.get(key, DEFAULT_BUDGET)
+            if budget is None:
+                continue
+            base, per_item = budget
+            for sample in samples:
+                allowed = base + per_item * sample["items"]
+                if sample["queries"] > allowed:
+                    violations.append((key, sample["queries"], sample["items"], allowed))
+        return violations
+
+    def check_budgets(self, log_result):
+        """Report, then log a pass/fail result for the query budgets"""
+        self.report()
+
+        if not self.samples:
+            log_result("Query Budgets", True, "Skipped: server did not send Server-Timing headers")
+            return True
+
+        violations = self.budget_violations()
+        if not violations:
+            total = sum(len(samples) for samples in self.samples.values())
+            log_result("Query Budgets", True, f"{total} requests across {len(self.samples)} endpoints within budget")
+            return True
+
+        details = "; ".join(f"{key}: {queries} queries for {items} items (budget {allowed})"
+                            for key, queries, items, allowed in violations[:10])
+        log_result("Query Budgets", not ENFORCE_BUDGETS,
+                   f"{len(violations)} requests over their query budget", details)
+        return not ENFORCE_BUDGETS
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""Hackathon feed importer: bulk creates or updates posts through POST posts/import.
+
+Reads a feed of hackathons (or projects) as CSV with a header row, NDJSON
+(.ndjson/.jsonl) or a JSON array (.json), one row at a time, and streams
+it to the API in batches of IMPORT_BATCH rows as NDJSON. The server
+validates every row and upserts the valid ones keyed by `externalId`, so
+running the same feed twice updates the posts from the first run instead
+of creating duplicates.
+
+Columns / keys: externalId and title and location (required), type
+(HACKATHON or PROJECT, default HACKATHON), websiteUrl, skillsNeeded
+(a list, or `;`-separated in CSV) and notes. Rejected rows are printed
+with their row number in the file.
+
+    python import_hackathons.py feed.csv --token TOKEN
+    python import_hackathons.py feed.json --email me@example.com --password ...
+    python import_hackathons.py --generate 50000 feed.csv
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+import uuid
+
+import requests
+
+BASE_URL = os.environ.get("HACKSWIPE_API", "https://projectswipe.preview.emergentagent.com/api")
+# Rows per request; the server reads at most 10000
+IMPORT_BATCH = int(os.environ.get("IMPORT_BATCH", "5000"))
+# Rejected rows printed before the rest are only counted
+SHOW_ERRORS = int(os.environ.get("IMPORT_SHOW_ERRORS", "20"))
+
+FIELDS = ["externalId", "type", "title", "location", "websiteUrl", "skillsNeeded", "notes"]
+CITIES = ["San Francisco", "New York", "London", "Berlin", "Bangalore", "Toronto", "Singapore", "Remote"]
+SKILLS = ["React", "Python", "Machine Learning", "Node.js", "Design", "Solidity", "Go", "Data Science"]
+
+
+def iter_json_array(handle, chunk_size=64 * 1024):
+    """Objects of a top-level JSON array, decoded one at a time"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = False
+    eof = False
+    while True:
+        buffer = buffer.lstrip()
+        if not started:
+            if buffer:
+                if buffer[0] != "[":
+                    raise ValueError("A .json feed must be a JSON array")
+                buffer = buffer[1:]
+                started = True
+                continue
+        elif buffer.startswith("]"):
+            return
+        elif buffer.startswith(","):
+            buffer = buffer[1:]
+            continue
+        elif buffer:
+            try:
+                value, end = decoder.raw_decode(buffer)
+            except ValueError:
+                if eof:
+                    raise
+            else:
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(buffer) or eof:
+                    yield value
+                    buffer = buffer[end:]
+                    continue
+        if eof:
+            raise ValueError("Unterminated JSON array")
+        chunk = handle.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+
+def read_feed(path):
+    """Rows of a CSV, NDJSON or JSON array feed"""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, newline="", encoding="utf-8") as handle:
+        if extension == ".csv":
+            for row in csv.DictReader(handle):
+                yield {key: value for key, value in row.items() if key is not None}
+        elif extension in (".ndjson", ".jsonl"):
+            for line in handle:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # Still sent, so the server reports it in place
+                        yield line.strip()
+        elif extension == ".json":
+            yield from iter_json_array(handle)
+        else:
+            raise ValueError(f"Unknown feed format: {extension} (use .csv, .ndjson, .jsonl or .json)")
+
+
+def batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def ndjson_body(batch):
+    for row in batch:
+        yield ((row if isinstance(row, str) else json.dumps(row)) + "\n").encode()
+
+
+def import_feed(session, path, batch_size=IMPORT_BATCH, show_errors=SHOW_ERRORS, quiet=False):
+    """Imports a feed and returns the totals, with errors renumbered to file rows"""
+    totals = {"received": 0, "inserted": 0, "updated": 0, "failed": 0, "errors": []}
+    started = time.perf_counter()
+    for batch in batches(read_feed(path), batch_size):
+        response = session.post(f"{BASE_URL}/posts/import", data=ndjson_body(batch),
+                                headers={"Content-Type": "application/x-ndjson"})
+        if response.status_code != 200:
+            raise RuntimeError(f"Import failed after {totals['received']} rows: "
+                               f"{response.status_code} {response.text[:200]}")
+        result = response.json()
+        for error in result["errors"]:
+            totals["errors"].append({**error, "row": error["row"] + totals["received"]})
+        for key in ("received", "inserted", "updated", "failed"):
+            totals[key] += result[key]
+        if not quiet:
+            rate = totals["received"] / (time.perf_counter() - started)
+            print(f"  {totals['received']} rows, {totals['failed']} rejected ({rate:.0f} rows/s)")
+    totals["seconds"] = time.perf_counter() - started
+    totals["rowsPerSecond"] = totals["received"] / totals["seconds"] if totals["seconds"] else 0
+
+    if not quiet:
+        for error in totals["errors"][:show_errors]:
+            print(f"  row {error['row']} ({error.get('externalId') or 'no externalId'}): {error['error']}")
+        if totals["failed"] > show_errors:
+            print(f"  ... {totals['failed'] - show_errors} more rejected rows")
+        print(f"Imported {totals['received']} rows in {totals['seconds']:.1f}s "
+              f"({totals['rowsPerSecond']:.0f} rows/s): {totals['inserted']} created, "
+              f"{totals['updated']} updated, {totals['failed']} rejected")
+    return totals
+
+
+def generate_feed(count, path, invalid_every=100, seed=7):
+    """Writes a sample feed of `count` rows, every `invalid_every`-th one invalid; returns the invalid count"""
+    rng = random.Random(seed)
+    run = uuid.uuid4().hex[:8]
+    invalid = 0
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = None
+        if extension == ".csv":
+            writer = csv.DictWriter(handle, fieldnames=FIELDS)
+            writer.writeheader()
+        elif extension == ".json":
+            handle.write("[\n")
+        for i in range(count):
+            skills = rng.sample(SKILLS, 3)
+            row = {
+                "externalId": f"feed-{run}-{i}",
+                "type": "HACKATHON" if i % 5 else "PROJECT",
+                "title": f"Hack {run} #{i}",
+                "location": rng.choice(CITIES),
+                "websiteUrl": f"https://hack.example.com/{run}/{i}",
+                "skillsNeeded": "; ".join(skills) if writer else skills,
+                "notes": f"Generated row {i}"
+            }
+            if i % invalid_every == invalid_every - 1:
+                invalid += 1
+                # Cycle through the kinds of rows the server rejects
+                kind = (i // invalid_every) % 3
+                if kind == 0:
+                    row["title"] = ""
+                elif kind == 1:
+                    row["websiteUrl"] = "ftp://hack.example.com"
+                else:
+                    row["type"] = "MEETUP"
+            if writer:
+                writer.writerow(row)
+            elif extension == ".json":
+                handle.write(("," if i else "") + json.dumps(row) + "\n")
+            else:
+                handle.write(json.dumps(row) + "\n")
+        if extension == ".json":
+            handle.write("]\n")
+    return invalid
+
+
+def login(args):
+    session = requests.Session()
+    if args.token:
+        session.headers.update({"Authorization": f"Bearer {args.token}"})
+        return session
+    response = session.post(f"{BASE_URL}/auth/login", json={"email": args.email, "password": args.password})
+    if response.status_code != 200:
+        raise RuntimeError(f"Login failed: {response.status_code}")
+    session.headers.update({"Authorization": f"Bearer {response.json()['token']}"})
+    return session
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("feed", nargs="?", help="CSV, NDJSON or JSON array file")
+    parser.add_argument("--token", default=os.environ.get("HACKSWIPE_TOKEN"), help="API bearer token")
+    parser.add_argument("--email", help="log in with email and password instead of a token")
+    parser.add_argument("--password")
+    parser.add_argument("--batch", type=int, default=IMPORT_BATCH, help="rows per request")
+    parser.add_argument("--generate", type=int, metavar="ROWS", help="write a sample feed to FEED instead of importing")
+    args = parser.parse_args()
+
+    if not args.feed:
+        parser.error("a feed path is required")
+    if args.generate:
+        invalid = generate_feed(args.generate, args.feed)
+        print(f"Wrote {args.generate} rows ({invalid} invalid) to {args.feed}")
+        return True
+    if not args.token and not (args.email and args.password):
+        parser.error("pass --token (or HACKSWIPE_TOKEN) or --email and --password")
+
+    try:
+        totals = import_feed(login(args), args.feed, batch_size=args.batch)
+    except (RuntimeError, ValueError, OSError) as e:
+        print(f"❌ {e}")
+        return False
+    return totals["failed"] == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+
+import requests
+import json
+import sys
+import os
+import tempfile
+import uuid
+from datetime import datetime
+from harness_metrics import ServerTimingCollector
+from import_hackathons import generate_feed, import_feed
+
+# Configuration
+BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
+TEST_USER_PASSWORD = "testpass123"
+
+# Rows in the generated feed; every IMPORT_INVALID_EVERY-th row is invalid
+IMPORT_ROWS = int(os.environ.get("IMPORT_ROWS", "50000"))
+IMPORT_INVALID_EVERY = int(os.environ.get("IMPORT_INVALID_EVERY", "100"))
+# Rows per second the first import must sustain
+IMPORT_MIN_ROWS_PER_SECOND = float(os.environ.get("IMPORT_MIN_ROWS_PER_SECOND", "1000"))
+
+MONGO_URL = os.environ.get("MONGO_URL")
+DB_NAME = os.environ.get("DB_NAME", "hackathon_tinder")
+
+try:
+    import pymongo
+except ImportError:
+    pymongo = None
+
+class ImportTester:
+    def __init__(self):
+        self.session = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session)
+        self.user_id = None
+        self.feed_path = None
+        self.invalid_rows = 0
+        self.db = None
+        self.test_results = []
+
+    def log_result(self, test_name, success, message, details=None):
+        """Log test result"""
+        status = "✅ PASS" if success else "❌ FAIL"
+        result = {
+            "test": test_name,
+            "status": status,
+            "message": message,
+            "details": details,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.test_results.append(result)
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+
+    def setup_test_user(self):
+        """Register a fresh organizer and write the feed"""
+        try:
+            response = self.session.post(f"{BASE_URL}/auth/register", json={
+                "email": f"import.{uuid.uuid4().hex[:12]}@example.com",
+                "password": TEST_USER_PASSWORD,
+                "name": "Import Test Organizer"
+            })
+            if response.status_code != 200:
+                self.log_result("User Setup", False, f"Registration failed: {response.status_code}")
+                return False
+            body = response.json()
+            self.user_id = body["user"]["id"]
+            self.session.headers.update({'Authorization': f"Bearer {body['token']}"})
+            if MONGO_URL and pymongo:
+                self.db = pymongo.MongoClient(MONGO_URL)[DB_NAME]
+
+            handle, self.feed_path = tempfile.mkstemp(suffix=".csv")
+            os.close(handle)
+            self.invalid_rows = generate_feed(IMPORT_ROWS, self.feed_path, invalid_every=IMPORT_INVALID_EVERY)
+            self.log_result("User Setup", True,
+                          f"Organizer registered, {IMPORT_ROWS}-row feed with {self.invalid_rows} invalid rows written")
+            return True
+
+        except Exception as e:
+            self.log_result("User Setup", False, f"Setup error: {str(e)}")
+            return False
+
+    def test_bulk_import(self):
+        """Import the feed: every valid row created, every invalid row reported by its file row"""
+        try:
+            print("\n🔄 Testing Bulk Import...")
+            totals = import_feed(self.session, self.feed_path, show_errors=5)
+            valid = IMPORT_ROWS - self.invalid_rows
+            expected_rows = {i + 1 for i in range(IMPORT_ROWS) if i % IMPORT_INVALID_EVERY == IMPORT_INVALID_EVERY - 1}
+            reported_rows = {error["row"] for error in totals["errors"]}
+
+            details = {key: totals[key] for key in ("received", "inserted", "updated", "failed")}
+            if totals["received"] != IMPORT_ROWS or totals["inserted"] != valid or totals["failed"] != self.invalid_rows:
+                self.log_result("Bulk Import", False, "Import totals are off", details)
+                return False
+            if reported_rows != expected_rows:
+                self.log_result("Bulk Import", False, "Rejected rows do not match the invalid rows", {
+                    "unexpected": sorted(reported_rows - expected_rows)[:10],
+                    "missing": sorted(expected_rows - reported_rows)[:10]
+                })
+                return False
+            if self.db is not None:
+                stored = self.db['posts'].count_documents({"leaderId": self.user_id})
+                if stored != valid:
+                    self.log_result("Bulk Import", False, f"{stored} posts stored, expected {valid}")
+                    return False
+            if totals["rowsPerSecond"] < IMPORT_MIN_ROWS_PER_SECOND:
+                self.log_result("Bulk Import", False,
+                              f"{totals['rowsPerSecond']:.0f} rows/s, expected at least {IMPORT_MIN_ROWS_PER_SECOND:.0f}", details)
+                return False
+            self.log_result("Bulk Import", True,
+                          f"{valid} posts created, {self.invalid_rows} rows rejected in {totals['seconds']:.1f}s "
+                          f"({totals['rowsPerSecond']:.0f} rows/s)")
+            return True
+
+        except Exception as e:
+            self.log_result("Bulk Import", False, f"Error: {str(e)}")
+            return False
+
+    def test_reimport_is_idempotent(self):
+        """Importing the same feed again creates nothing"""
+        try:
+            print("\n🔄 Testing Re-import...")
+            totals = import_feed(self.session, self.feed_path, quiet=True)
+            valid = IMPORT_ROWS - self.invalid_rows
+            if totals["inserted"] != 0 or totals["updated"] != valid:
+                self.log_result("Re-import", False, "Re-import created or lost posts",
+                              {key: totals[key] for key in ("inserted", "updated", "failed")})
+                return False
+            if self.db is not None and self.db['posts'].count_documents({"leaderId": self.user_id}) != valid:
+                self.log_result("Re-import", False, "Post count changed on re-import")
+                return False
+            self.log_result("Re-import", True,
+                          f"No duplicates; {totals['updated']} posts matched by externalId "
+                          f"({totals['rowsPerSecond']:.0f} rows/s)")
+            return True
+
+        except Exception as e:
+            self.log_result("Re-import", False, f"Error: {str(e)}")
+            return False
+
+    def test_import_updates_fields(self):
+        """A changed row updates the existing post and keeps its id"""
+        try:
+            print("\n🔄 Testing Import Updates...")
+            row = {"externalId": "update-check", "title": "Before", "location": "Berlin", "skillsNeeded": ["Go"]}
+            first = self.post_rows([row])
+            row.update(title="After", skillsNeeded=["Go", "Rust"])
+            second = self.post_rows([row])
+            if first.get("inserted") != 1 or second.get("updated") != 1:
+                self.log_result("Import Updates", False, "Expected one insert then one update", {"first": first, "second": second})
+                return False
+            if self.db is not None:
+                posts = list(self.db['posts'].find({"leaderId": self.user_id, "externalId": "update-check"}))
+                if len(posts) != 1 or posts[0]["title"] != "After" or posts[0]["skillsNeeded"] != ["Go", "Rust"]:
+                    self.log_result("Import Updates", False, f"Expected one updated post, found {len(posts)}")
+                    return False
+            self.log_result("Import Updates", True, "Changed row updated the post in place")
+            return True
+
+        except Exception as e:
+            self.log_result("Import Updates", False, f"Error: {str(e)}")
+            return False
+
+    def test_unsupported_content_type(self):
+        """A body that is neither NDJSON nor CSV is refused"""
+        try:
+            print("\n🔄 Testing Unsupported Content-Type...")
+            response = self.session.post(f"{BASE_URL}/posts/import", json=[{"externalId": "x", "title": "x"}])
+            if response.status_code != 415:
+                self.log_result("Unsupported Content-Type", False, f"Expected 415, got {response.status_code}")
+                return False
+            self.log_result("Unsupported Content-Type", True, "JSON body refused with 415")
+            return True
+
+        except Exception as e:
+            self.log_result("Unsupported Content-Type", False, f"Error: {str(e)}")
+            return False
+
+    def post_rows(self, rows):
+        body = "".join(json.dumps(row) + "\n" for row in rows)
+        response = self.session.post(f"{BASE_URL}/posts/import", data=body,
+                                     headers={"Content-Type": "application/x-ndjson"})
+        return response.json() if response.status_code == 200 else {"status": response.status_code}
+
+    def cleanup(self):
+        """Remove the imported posts and the feed file"""
+        if self.db is not None:
+            self.db['posts'].delete_many({"leaderId": self.user_id})
+        if self.feed_path:
+            os.unlink(self.feed_path)
+        return True
+
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+
+    def run_all_tests(self):
+        """Run all import tests"""
+        print("🚀 Starting Import Testing...")
+        print("=" * 60)
+
+        if not self.setup_test_user():
+            print("❌ Cannot proceed without authentication")
+            return False
+
+        tests = [
+            self.test_bulk_import,
+            self.test_reimport_is_idempotent,
+            self.test_import_updates_fields,
+            self.test_unsupported_content_type,
+            self.cleanup,
+            self.check_query_budgets
+        ]
+
+        passed_tests = 0
+        total_tests = len(tests)
+
+        for test in tests:
+            try:
+                if test():
+                    passed_tests += 1
+            except Exception as e:
+                print(f"❌ Test {test.__name__} failed with exception: {str(e)}")
+
+        # Summary
+        print("\n" + "=" * 60)
+        print(f"📊 IMPORT TEST SUMMARY")
+        print(f"Passed: {passed_tests}/{total_tests}")
+        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+
+        if passed_tests == total_tests:
+            print("🎉 All import tests passed!")
+            return True
+        else:
+            print(f"⚠️  {total_tests - passed_tests} test(s) failed")
+            return False
+
+if __name__ == "__main__":
+    tester = ImportTester()
+    success = tester.run_all_tests()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+
+import requests
+import json
+import sys
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from harness_metrics import ServerTimingCollector
+
+# Configuration
+BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
+TEST_USER_PASSWORD = "testpass123"
+
+# Inquiries triaged by each path; seeded directly when MONGO_URL and pymongo
+# are available, otherwise BULK_API_APPLICANTS applicants swipe through the API
+BULK_INQUIRIES = int(os.environ.get("BULK_INQUIRIES", "200"))
+BULK_API_APPLICANTS = int(os.environ.get("BULK_API_APPLICANTS", "50"))
+BULK_POSTS = int(os.environ.get("BULK_POSTS", "5"))
+BULK_WORKERS = int(os.environ.get("BULK_WORKERS", "8"))
+MAX_DECISIONS = 500
+
+MONGO_URL = os.environ.get("MONGO_URL")
+DB_NAME = os.environ.get("DB_NAME", "hackathon_tinder")
+
+try:
+    import pymongo
+except ImportError:
+    pymongo = None
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+class InquiryBulkTester:
+    def __init__(self):
+        self.session = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session)
+        self.user_id = None
+        self.post_ids = []
+        self.inquiries = []
+        self.db = None
+        self.test_results = []
+
+    def log_result(self, test_name, success, message, details=None):
+        """Log test result"""
+        status = "✅ PASS" if success else "❌ FAIL"
+        result = {
+            "test": test_name,
+            "status": status,
+            "message": message,
+            "details": details,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.test_results.append(result)
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+
+    def register(self, label):
+        """Fresh user; returns (id, auth headers)"""
+        body = requests.post(f"{BASE_URL}/auth/register", json={
+            "email": f"bulk.{label}.{uuid.uuid4().hex[:12]}@example.com",
+            "password": TEST_USER_PASSWORD,
+            "name": f"Bulk {label.title()}"
+        }).json()
+        return body["user"]["id"], {"Authorization": f"Bearer {body['token']}"}
+
+    def create_post(self, headers, i):
+        return requests.post(f"{BASE_URL}/posts", headers=headers, json={
+            "type": "PROJECT", "title": f"Bulk project {i}", "location": "Remote", "skillsNeeded": ["Go"]
+        }).json()["post"]["id"]
+
+    def leader_inquiries(self):
+        return self.session.get(f"{BASE_URL}/inquiries").json()["inquiries"]
+
+    def wait_for_queue(self, timeout=30):
+        """Waits until queued side effects (inquiries, matches) have run"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            queue = self.session.get(f"{BASE_URL}/metrics/queue").json()["queue"]
+            if queue is None or queue["depth"]["queued"] + queue["depth"]["running"] == 0:
+                return
+            time.sleep(0.2)
+
+    def setup_test_user(self):
+        """Register the leader, create posts and collect inquiries for both paths"""
+        try:
+            self.user_id, headers = self.register("leader")
+            self.session.headers.update(headers)
+            self.post_ids = [self.create_post(headers, i) for i in range(BULK_POSTS)]
+            if MONGO_URL and pymongo:
+                self.db = pymongo.MongoClient(MONGO_URL)[DB_NAME]
+
+            total = 2 * (BULK_INQUIRIES if self.db is not None else BULK_API_APPLICANTS)
+            if self.db is not None:
+                now = datetime.utcnow()
+                self.db["inquiries"].insert_many([{
+                    "id": str(uuid.uuid4()), "postId": self.post_ids[i % BULK_POSTS], "userId": str(uuid.uuid4()),
+                    "message": None, "status": "PENDING", "createdAt": now
+                } for i in range(total)], ordered=False)
+            else:
+                def apply(i):
+                    _, applicant_headers = self.register(f"applicant{i}")
+                    requests.post(f"{BASE_URL}/swipe", headers=applicant_headers, json={
+                        "targetType": "PROJECT", "targetId": self.post_ids[i % BULK_POSTS], "direction": "RIGHT"
+                    })
+
+                with ThreadPoolExecutor(max_workers=BULK_WORKERS) as pool:
+                    list(pool.map(apply, range(total)))
+                self.wait_for_queue()
+
+            self.inquiries = [i for i in self.leader_inquiries() if i["postId"] in self.post_ids]
+            if len(self.inquiries) != total:
+                self.log_result("User Setup", False, f"{len(self.inquiries)} inquiries, expected {total}")
+                return False
+            self.log_result("User Setup", True, f"Leader has {total} pending inquiries on {BULK_POSTS} posts")
+            return True
+
+        except Exception as e:
+            self.log_result("User Setup", False, f"Setup error: {str(e)}")
+            return False
+
+    def decision(self, i):
+        return "ACCEPTED" if i % 3 == 0 else "DECLINED"
+
+    def test_bulk_vs_per_item(self):
+        """Triage half the inquiries one PATCH at a time and half in bulk, then compare"""
+        try:
+            print("\n🔄 Benchmarking Bulk vs Per-Item Triage...")
+            half = len(self.inquiries) // 2
+            per_item, bulk = self.inquiries[:half], self.inquiries[half:2 * half]
+
+            latencies = []
+            started = time.perf_counter()
+            for i, inquiry in enumerate(per_item):
+                request_started = time.perf_counter()
+                response = self.session.patch(f"{BASE_URL}/inquiries/{inquiry['id']}", json={"status": self.decision(i)})
+                latencies.append((time.perf_counter() - request_started) * 1000)
+                if response.status_code != 200:
+                    self.log_result("Bulk vs Per-Item", False, f"Per-item PATCH failed: {response.status_code}")
+                    return False
+            per_item_seconds = time.perf_counter() - started
+
+            results = []
+            started = time.perf_counter()
+            for start in range(0, len(bulk), MAX_DECISIONS):
+                chunk = bulk[start:start + MAX_DECISIONS]
+                response = self.session.patch(f"{BASE_URL}/inquiries", json={"decisions": [
+                    {"id": inquiry["id"], "status": self.decision(start + i)} for i, inquiry in enumerate(chunk)
+                ]})
+                if response.status_code != 200:
+                    self.log_result("Bulk vs Per-Item", False, f"Bulk PATCH failed: {response.status_code}")
+                    return False
+                results.extend(response.json()["results"])
+            bulk_seconds = time.perf_counter() - started
+
+            not_updated = [r for r in results if r["outcome"] != "UPDATED"]
+            if len(results) != len(bulk) or not_updated:
+                self.log_result("Bulk vs Per-Item", False, f"{len(not_updated)} bulk decisions not applied", not_updated[:5])
+                return False
+
+            # Both paths must leave the same state behind
+            self.wait_for_queue()
+            expected = {inquiry["id"]: self.decision(i) for i, inquiry in enumerate(per_item)}
+            expected.update({inquiry["id"]: self.decision(i) for i, inquiry in enumerate(bulk)})
+            stored = {i["id"]: i["status"] for i in self.leader_inquiries() if i["id"] in expected}
+            wrong = [inquiry_id for inquiry_id, status in expected.items() if stored.get(inquiry_id) != status]
+            if wrong:
+                self.log_result("Bulk vs Per-Item", False, f"{len(wrong)} inquiries have the wrong status", wrong[:5])
+                return False
+            if self.db is not None:
+                accepted = sum(1 for status in expected.values() if status == "ACCEPTED")
+                matches = self.db["matches"].count_documents({"aId": self.user_id, "postId": {"$in": self.post_ids}})
+                if matches != accepted:
+                    self.log_result("Bulk vs Per-Item", False, f"{matches} matches for {accepted} accepts")
+                    return False
+
+            speedup = per_item_seconds / bulk_seconds if bulk_seconds else float("inf")
+            print(f"{'path':<10}{'inquiries':>10}{'requests':>10}{'total ms':>10}")
+            print(f"{'per-item':<10}{len(per_item):>10}{len(per_item):>10}{per_item_seconds * 1000:>10.0f}")
+            print(f"{'bulk':<10}{len(bulk):>10}{-(-len(bulk) // MAX_DECISIONS):>10}{bulk_seconds * 1000:>10.0f}")
+            print(f"   per-item PATCH p50 {percentile(latencies, 0.5):.0f}ms p95 {percentile(latencies, 0.95):.0f}ms")
+            if bulk_seconds >= per_item_seconds:
+                self.log_result("Bulk vs Per-Item", False,
+                              f"Bulk took {bulk_seconds:.2f}s, per-item {per_item_seconds:.2f}s")
+                return False
+            self.log_result("Bulk vs Per-Item", True,
+                          f"{len(bulk)} decisions in {bulk_seconds * 1000:.0f}ms vs {per_item_seconds * 1000:.0f}ms "
+                          f"one by one ({speedup:.0f}x)")
+            return True
+
+        except Exception as e:
+            self.log_result("Bulk vs Per-Item", False, f"Error: {str(e)}")
+            return False
+
+    def test_bulk_outcomes(self):
+        """Unknown, foreign, duplicate and invalid decisions are reported per item"""
+        try:
+            print("\n🔄 Testing Bulk Outcomes...")
+            _, other_headers = self.register("other")
+            other_post = self.create_post(other_headers, 0)
+            _, applicant_headers = self.register("foreign")
+            requests.post(f"{BASE_URL}/swipe", headers=applicant_headers, json={
+                "targetType": "PROJECT", "targetId": other_post, "direction": "RIGHT"
+            })
+            self.wait_for_queue()
+            foreign = requests.get(f"{BASE_URL}/inquiries", headers=other_headers).json()["inquiries"][0]["id"]
+            own = self.inquiries[0]["id"]
+
+            response = self.session.patch(f"{BASE_URL}/inquiries", json={"decisions": [
+                {"id": own, "status": "DECLINED"},
+                {"id": own, "status": "ACCEPTED"},
+                {"id": foreign, "status": "ACCEPTED"},
+                {"id": str(uuid.uuid4()), "status": "ACCEPTED"},
+                {"id": self.inquiries[1]["id"], "status": "MAYBE"}
+            ]})
+            outcomes = [r["outcome"] for r in response.json().get("results", [])]
+            expected = ["UPDATED", "DUPLICATE", "FORBIDDEN", "NOT_FOUND", "INVALID_STATUS"]
+            if outcomes != expected:
+                self.log_result("Bulk Outcomes", False, f"Outcomes {outcomes}, expected {expected}")
+                return False
+
+            foreign_status = next(i["status"] for i in requests.get(f"{BASE_URL}/inquiries", headers=other_headers)
+                                  .json()["inquiries"] if i["id"] == foreign)
+            if foreign_status != "PENDING":
+                self.log_result("Bulk Outcomes", False, f"Foreign inquiry changed to {foreign_status}")
+                return False
+
+            too_many = self.session.patch(f"{BASE_URL}/inquiries", json={"decisions": [
+                {"id": own, "status": "DECLINED"}
+            ] * (MAX_DECISIONS + 1)})
+            empty = self.session.patch(f"{BASE_URL}/inquiries", json={"decisions": []})
+            if too_many.status_code != 400 or empty.status_code != 400:
+                self.log_result("Bulk Outcomes", False,
+                              f"Expected 400 for oversized and empty requests, got {too_many.status_code}/{empty.status_code}")
+                return False
+            self.log_result("Bulk Outcomes", True, "Per-item outcomes reported; foreign inquiry untouched")
+            return True
+
+        except Exception as e:
+            self.log_result("Bulk Outcomes", False, f"Error: {str(e)}")
+            return False
+
+    def cleanup(self):
+        """Remove the seeded inquiries and their matches"""
+        if self.db is not None:
+            self.db["inquiries"].delete_many({"postId": {"$in": self.post_ids}})
+            self.db["matches"].delete_many({"postId": {"$in": self.post_ids}})
+        return True
+
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+
+    def run_all_tests(self):
+        """Run all bulk inquiry tests"""
+        print("🚀 Starting Bulk Inquiry Testing...")
+        print("=" * 60)
+
+        if not self.setup_test_user():
+            print("❌ Cannot proceed without authentication")
+            return False
+
+        tests = [
+            self.test_bulk_vs_per_item,
+            self.test_bulk_outcomes,
+            self.cleanup,
+            self.check_query_budgets
+        ]
+
+        passed_tests = 0
+        total_tests = len(tests)
+
+        for test in tests:
+            try:
+                if test():
+                    passed_tests += 1
+            except Exception as e:
+                print(f"❌ Test {test.__name__} failed with exception: {str(e)}")
+
+        # Summary
+        print("\n" + "=" * 60)
+        print(f"📊 BULK INQUIRY TEST SUMMARY")
+        print(f"Passed: {passed_tests}/{total_tests}")
+        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+
+        if passed_tests == total_tests:
+            print("🎉 All bulk inquiry tests passed!")
+            return True
+        else:
+            print(f"⚠️  {total_tests - passed_tests} test(s) failed")
+            return False
+
+if __name__ == "__main__":
+    tester = InquiryBulkTester()
+    success = tester.run_all_tests()
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+
+import requests
+import json
+import sys
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from harness_metrics import ServerTimingCollector
+
+# Configuration
+BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
+TEST_USER_PASSWORD = "testpass123"
+
+# Posts the applicant swipes right on (one queued inquiry each), client threads
+QUEUE_POSTS = int(os.environ.get("QUEUE_POSTS", "200"))
+QUEUE_WORKERS = int(os.environ.get("QUEUE_WORKERS", "8"))
+# Every queued side effect must be visible within this long of its request
+QUEUE_SETTLE_SECONDS = float(os.environ.get("QUEUE_SETTLE_SECONDS", "30"))
+# Allowed p95 start lag (ms) reported by metrics/queue
+QUEUE_MAX_LAG_MS = float(os.environ.get("QUEUE_MAX_LAG_MS", "2000"))
+
+MONGO_URL = os.environ.get("MONGO_URL")
+DB_NAME = os.environ.get("DB_NAME", "hackathon_tinder")
+
+try:
+    import pymongo
+except ImportError:
+    pymongo = None
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+class JobQueueTester:
+    def __init__(self):
+        self.session = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session)
+        self.user_id = None
+        self.post_ids = []
+        self.db = None
+        self.test_results = []
+
+    def log_result(self, test_name, success, message, details=None):
+        """Log test result"""
+        status = "✅ PASS" if success else "❌ FAIL"
+        result = {
+            "test": test_name,
+            "status": status,
+            "message": message,
+            "details": details,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.test_results.append(result)
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+
+    def register(self, label):
+        """Fresh user; returns (id, auth headers)"""
+        body = requests.post(f"{BASE_URL}/auth/register", json={
+            "email": f"queue.{label}.{uuid.uuid4().hex[:12]}@example.com",
+            "password": TEST_USER_PASSWORD,
+            "name": f"Queue {label.title()}"
+        }).json()
+        return body["user"]["id"], {"Authorization": f"Bearer {body['token']}"}
+
+    def setup_test_user(self):
+        """Register the leader and create QUEUE_POSTS posts"""
+        try:
+            self.user_id, headers = self.register("leader")
+            self.session.headers.update(headers)
+            if MONGO_URL and pymongo:
+                self.db = pymongo.MongoClient(MONGO_URL)[DB_NAME]
+
+            def create(i):
+                return requests.post(f"{BASE_URL}/posts", headers=headers, json={
+                    "type": "PROJECT", "title": f"Queue project {i}", "location": "Remote", "skillsNeeded": ["Go"]
+                }).json()["post"]["id"]
+
+            with ThreadPoolExecutor(max_workers=QUEUE_WORKERS) as pool:
+                self.post_ids = list(pool.map(create, range(QUEUE_POSTS)))
+            self.log_result("User Setup", True, f"Leader registered with {len(self.post_ids)} posts")
+            return True
+
+        except Exception as e:
+            self.log_result("User Setup", False, f"Setup error: {str(e)}")
+            return False
+
+    def queue_stats(self):
+        return self.session.get(f"{BASE_URL}/metrics/queue").json()["queue"]
+
+    def leader_inquiries(self):
+        return self.session.get(f"{BASE_URL}/inquiries").json()["inquiries"]
+
+    def wait_until(self, predicate):
+        """Polls `predicate` until it returns truthy or QUEUE_SETTLE_SECONDS pass; returns (value, seconds)"""
+        started = time.perf_counter()
+        while True:
+            value = predicate()
+            elapsed = time.perf_counter() - started
+            if value or elapsed > QUEUE_SETTLE_SECONDS:
+                return value, elapsed
+            time.sleep(0.2)
+
+    def test_swipes_enqueue_inquiries(self):
+        """RIGHT swipes on posts return before their inquiries exist, and every inquiry arrives"""
+        try:
+            print("\n🔄 Testing Queued Inquiries...")
+            if self.queue_stats() is None:
+                self.log_result("Queued Inquiries", True, "Skipped: server runs side effects inline (JOB_QUEUE=off)")
+                return True
+            applicant_id, headers = self.register("applicant")
+            local = threading.local()
+
+            def swipe(post_id):
+                if not hasattr(local, "session"):
+                    local.session = requests.Session()
+                    local.session.headers.update(headers)
+                started = time.perf_counter()
+                response = local.session.post(f"{BASE_URL}/swipe", json={
+                    "targetType": "PROJECT", "targetId": post_id, "direction": "RIGHT"
+                })
+                return response.status_code, (time.perf_counter() - started) * 1000
+
+            with ThreadPoolExecutor(max_workers=QUEUE_WORKERS) as pool:
+                results = list(pool.map(swipe, self.post_ids))
+            failed = [status for status, _ in results if status != 200]
+            latencies = [ms for _, ms in results]
+            if failed:
+                self.log_result("Queued Inquiries", False, f"{len(failed)} swipes failed", failed[:5])
+                return False
+
+            def all_arrived():
+                mine = [i for i in self.leader_inquiries() if i["userId"] == applicant_id]
+                return mine if len(mine) >= len(self.post_ids) else None
+
+            inquiries, settle = self.wait_until(all_arrived)
+            if not inquiries:
+                self.log_result("Queued Inquiries", False,
+                              f"Not every inquiry arrived within {QUEUE_SETTLE_SECONDS:.0f}s")
+                return False
+            if len(inquiries) != len(self.post_ids) or len({i["postId"] for i in inquiries}) != len(self.post_ids):
+                self.log_result("Queued Inquiries", False, f"{len(inquiries)} inquiries for {len(self.post_ids)} swipes")
+                return False
+            self.log_result("Queued Inquiries", True,
+                          f"{len(self.post_ids)} swipes p50 {percentile(latencies, 0.5):.0f}ms "
+                          f"p95 {percentile(latencies, 0.95):.0f}ms; all inquiries visible {settle:.1f}s after the last")
+            return True
+
+        except Exception as e:
+            self.log_result("Queued Inquiries", False, f"Error: {str(e)}")
+            return False
+
+    def test_accept_is_idempotent(self):
+        """Accepting an inquiry several times at once queues exactly one match"""
+        try:
+            print("\n🔄 Testing Idempotent Accept...")
+            applicant_id, headers = self.register("accepted")
+            post_id = self.post_ids[0]
+            requests.post(f"{BASE_URL}/swipe", headers=headers, json={
+                "targetType": "PROJECT", "targetId": post_id, "direction": "RIGHT"
+            })
+            inquiry, _ = self.wait_until(lambda: next(
+                (i for i in self.leader_inquiries() if i["userId"] == applicant_id), None))
+            if not inquiry:
+                self.log_result("Idempotent Accept", False, "Inquiry never arrived")
+                return False
+
+            with ThreadPoolExecutor(max_workers=5) as pool:
+                statuses = list(pool.map(lambda _: requests.patch(
+                    f"{BASE_URL}/inquiries/{inquiry['id']}", headers=dict(self.session.headers),
+                    json={"status": "ACCEPTED"}).status_code, range(5)))
+            if any(status != 200 for status in statuses):
+                self.log_result("Idempotent Accept", False, f"Accept failed: {statuses}")
+                return False
+
+            # GET matches only lists people matches, so post matches are counted in Mongo
+            if self.db is None:
+                self.log_result("Idempotent Accept", True, "5 concurrent accepts succeeded; set MONGO_URL to count the matches")
+                return True
+
+            def applicant_matches():
+                return self.db["matches"].count_documents({"bId": applicant_id, "postId": post_id})
+
+            _, settle = self.wait_until(applicant_matches)
+            time.sleep(1)  # a duplicate would land right after the first
+            count = applicant_matches()
+            if count != 1:
+                self.log_result("Idempotent Accept", False, f"{count} matches after 5 accepts")
+                return False
+            self.log_result("Idempotent Accept", True, f"5 concurrent accepts, one match after {settle:.1f}s")
+            return True
+
+        except Exception as e:
+            self.log_result("Idempotent Accept", False, f"Error: {str(e)}")
+            return False
+
+    def test_failed_key_requeued(self):
+        """A keyed job that ran out of attempts is queued again when its key comes back"""
+        try:
+            print("\n🔄 Testing Failed Key Retry...")
+            if self.db is None:
+                self.log_result("Failed Key Retry", True, "Skipped: set MONGO_URL to plant the failed job")
+                return True
+            applicant_id, headers = self.register("retried")
+            post_id = self.post_ids[1]
+            requests.post(f"{BASE_URL}/swipe", headers=headers, json={
+                "targetType": "PROJECT", "targetId": post_id, "direction": "RIGHT"
+            })
+            inquiry, _ = self.wait_until(lambda: next(
+                (i for i in self.leader_inquiries() if i["userId"] == applicant_id), None))
+            if not inquiry:
+                self.log_result("Failed Key Retry", False, "Inquiry never arrived")
+                return False
+
+            # What an accept during a Mongo outage leaves behind once every retry failed
+            key = f"match:inquiry:{inquiry['id']}"
+            now = datetime.utcnow()
+            self.db["jobs"].insert_one({
+                "id": str(uuid.uuid4()), "type": "match.create", "key": key, "payload": {},
+                "status": "FAILED", "attempts": 5, "runAt": now, "createdAt": now, "finishedAt": now,
+                "lastError": "connection reset"
+            })
+
+            response = self.session.patch(f"{BASE_URL}/inquiries/{inquiry['id']}", json={"status": "ACCEPTED"})
+            if response.status_code != 200:
+                self.log_result("Failed Key Retry", False, f"Accept failed: {response.status_code}")
+                return False
+
+            matched, settle = self.wait_until(lambda: self.db["matches"].count_documents(
+                {"bId": applicant_id, "postId": post_id}))
+            job = self.db["jobs"].find_one({"key": key}, {"_id": 0, "status": 1, "attempts": 1})
+            if not matched or job["status"] != "DONE":
+                self.log_result("Failed Key Retry", False, "Accept got the failed job back instead of a retry",
+                              {"matches": matched, "job": job})
+                return False
+            self.log_result("Failed Key Retry", True,
+                          f"Failed job queued again on re-accept; match after {settle:.1f}s in attempt {job['attempts']}")
+            return True
+
+        except Exception as e:
+            self.log_result("Failed Key Retry", False, f"Error: {str(e)}")
+            return False
+
+    def test_queue_lag(self):
+        """The queue drains and its reported start lag stays low"""
+        try:
+            print("\n🔄 Testing Queue Lag...")
+
+            def drained():
+                stats = self.queue_stats()
+                return stats is None or stats["depth"]["queued"] == 0
+
+            self.wait_until(drained)
+            stats = self.queue_stats()
+            if stats is None:
+                self.log_result("Queue Lag", True, "Skipped: server runs side effects inline (JOB_QUEUE=off)")
+                return True
+            print(f"   depth {stats['depth']}, lag p50 {stats['lagMs']['p50']}ms p95 {stats['lagMs']['p95']}ms "
+                  f"max {stats['lagMs']['max']}ms, totals {stats['totals']}")
+            if stats["depth"]["queued"] > 0:
+                self.log_result("Queue Lag", False, f"{stats['depth']['queued']} jobs still queued", stats)
+                return False
+            if stats["lagMs"]["p95"] > QUEUE_MAX_LAG_MS:
+                self.log_result("Queue Lag", False,
+                              f"p95 start lag {stats['lagMs']['p95']}ms, expected under {QUEUE_MAX_LAG_MS:.0f}ms", stats)
+                return False
+            self.log_result("Queue Lag", True,
+                          f"Queue drained; start lag p95 {stats['lagMs']['p95']}ms, {stats['depth']['failed']} failed jobs")
+            return True
+
+        except Exception as e:
+            self.log_result("Queue Lag", False, f"Error: {str(e)}")
+            return False
+
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+
+    def run_all_tests(self):
+        """Run all job queue tests"""
+        print("🚀 Starting Job Queue Testing...")
+        print("=" * 60)
+
+        if not self.setup_test_user():
+            print("❌ Cannot proceed without authentication")
+            return False
+
+        tests = [
+            self.test_swipes_enqueue_inquiries,
+            self.test_accept_is_idempotent,
+            self.test_failed_key_requeued,
+            self.test_queue_lag,
+            self.check_query_budgets
+        ]
+
+        passed_tests = 0
+        total_tests = len(tests)
+
+        for test in tests:
+            try:
+                if test():
+                    passed_tests += 1
+            except Exception as e:
+                print(f"❌ Test {test.__name__} failed with exception: {str(e)}")
+
+        # Summary
+        print("\n" + "=" * 60)
+        print(f"📊 JOB QUEUE TEST SUMMARY")
+        print(f"Passed: {passed_tests}/{total_tests}")
+        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+
+        if passed_tests == total_tests:
+            print("🎉 All job queue tests passed!")
+            return True
+        else:
+            print(f"⚠️  {total_tests - passed_tests} test(s) failed")
+            return False
+
+if __name__ == "__main__":
+    tester = JobQueueTester()
+    success = tester.run_all_tests()
@@ -0,0 +1,63 @@
+// "Liked you": people who swiped RIGHT on the viewer that the viewer has
+// not swiped on yet.
+//
+// The lookup runs the swipes collection backwards (by target instead of by
+// swiper), so it gets its own index on (targetType, targetId, direction),
+// with createdAt last so the newest admirers come first without a sort
+// stage. The reciprocal-swipe check in POST swipe uses the same index.
+
+export const ADMIRER_SLOT_INTERVAL = 3; // an admirer every third deck card
+export const MAX_ADMIRERS_PER_DECK = 3;
+
+let indexesReady = null;
+
+export function ensureAdmirerIndexes(db) {
+  if (!indexesReady) {
+    indexesReady = db.collection('swipes')
+      .createIndex({ targetType: 1, targetId: 1, direction: 1, createdAt: -1 })
+      .catch((error) => {
+        indexesReady = null;
+        throw error;
+      });
+  }
+  return indexesReady;
+}
+
+function admirerFilter(userId, exclude) {
+  return { targetType: 'PERSON', targetId: userId, direction: 'RIGHT', swiperId: { $nin: [...exclude] } };
+}
+
+// Newest pending admirers first, as { userId, likedAt }
+export async function pendingAdmirers(db, userId, exclude, limit) {
+  await ensureAdmirerIndexes(db);
+  const swipes = await db.collection('swipes')
+    .find(admirerFilter(userId, exclude), { projection: { _id: 0, swiperId: 1, createdAt: 1 } })
+    .sort({ createdAt: -1 })
+    .limit(limit)
+    .toArray();
+  return swipes.map((swipe) => ({ userId: swipe.swiperId, likedAt: swipe.createdAt }));
+}
+
+export async function countPendingAdmirers(db, userId, exclude) {
+  await ensureAdmirerIndexes(db);
+  return db.collection('swipes').countDocuments(admirerFilter(userId, exclude));
+}
+
+// Places `admirers` at every ADMIRER_SLOT_INTERVAL-th slot of `deck`
+// (starting with the first), keeping `size` ids
+export function interleaveAdmirers(deck, admirers, size) {
+  const queued = new Set(admirers);
+  const rest = deck.filter((id) => !queued.has(id));
+  const result = [];
+  let a = 0;
+  let r = 0;
+  while (result.length < size && (a < admirers.length || r < rest.length)) {
+    const admirerSlot = result.length % ADMIRER_SLOT_INTERVAL === 0;
+    if ((admirerSlot && a < admirers.length) || r >= rest.length) {
+      result.push(admirers[a++]);
+    } else {
+      result.push(rest[r++]);
+    }
+  }
+  return result;
+}
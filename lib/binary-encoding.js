@@ -0,0 +1,174 @@
+// MessagePack and CBOR encoders for API responses.
+//
+// Both follow JSON.stringify semantics so every encoding of a response
+// carries the same data: `toJSON` is honoured (Dates become ISO strings,
+// ObjectIds hex strings), undefined and function properties are dropped,
+// and non-finite numbers become null. Integers use the smallest integer
+// encoding; every other number is a float64.
+
+class Writer {
+  constructor(size = 1024) {
+    this.buffer = Buffer.allocUnsafe(size);
+    this.length = 0;
+  }
+
+  reserve(bytes) {
+    if (this.length + bytes <= this.buffer.length) return;
+    const grown = Buffer.allocUnsafe(Math.max(this.buffer.length * 2, this.length + bytes));
+    this.buffer.copy(grown, 0, 0, this.length);
+    this.buffer = grown;
+  }
+
+  u8(value) {
+    this.reserve(1);
+    this.buffer[this.length++] = value;
+  }
+
+  u16(value) {
+    this.reserve(2);
+    this.length = this.buffer.writeUInt16BE(value, this.length);
+  }
+
+  u32(value) {
+    this.reserve(4);
+    this.length = this.buffer.writeUInt32BE(value, this.length);
+  }
+
+  u64(value) {
+    this.reserve(8);
+    this.length = this.buffer.writeBigUInt64BE(BigInt(value), this.length);
+  }
+
+  i64(value) {
+    this.reserve(8);
+    this.length = this.buffer.writeBigInt64BE(BigInt(value), this.length);
+  }
+
+  f64(value) {
+    this.reserve(8);
+    this.length = this.buffer.writeDoubleBE(value, this.length);
+  }
+
+  utf8(value, bytes) {
+    this.reserve(bytes);
+    this.length += this.buffer.write(value, this.length, bytes, 'utf8');
+  }
+
+  result() {
+    return this.buffer.subarray(0, this.length);
+  }
+}
+
+function isEncodable(value) {
+  return value !== undefined && typeof value !== 'function' && typeof value !== 'symbol';
+}
+
+// Walks a value the way JSON.stringify does and emits it through `format`
+function createEncoder(format) {
+  function write(writer, value, key) {
+    if (value !== null && typeof value === 'object' && typeof value.toJSON === 'function') {
+      value = value.toJSON(key);
+    }
+
+    switch (typeof value) {
+      case 'string':
+        format.string(writer, value, Buffer.byteLength(value, 'utf8'));
+        return;
+      case 'number':
+        if (!Number.isFinite(value)) format.nil(writer);
+        else if (Number.isSafeInteger(value)) format.integer(writer, value);
+        else format.float(writer, value);
+        return;
+      case 'boolean':
+        format.boolean(writer, value);
+        return;
+      case 'object':
+        break;
+      default:
+        format.nil(writer);
+        return;
+    }
+
+    if (value === null) {
+      format.nil(writer);
+    } else if (Array.isArray(value)) {
+      format.arrayHeader(writer, value.length);
+      for (let i = 0; i < value.length; i++) {
+        write(writer, isEncodable(value[i]) ? value[i] : null, String(i));
+      }
+    } else {
+      const keys = Object.keys(value).filter((k) => isEncodable(value[k]));
+      format.mapHeader(writer, keys.length);
+      for (const k of keys) {
+        format.string(writer, k, Buffer.byteLength(k, 'utf8'));
+        write(writer, value[k], k);
+      }
+    }
+  }
+
+  return (value) => {
+    const writer = new Writer();
+    write(writer, value, '');
+    return writer.result();
+  };
+}
+
+function msgpackLength(writer, length, fix, fixMax, [op8, op16, op32]) {
+  if (length <= fixMax) writer.u8(fix | length);
+  else if (op8 && length < 0x100) { writer.u8(op8); writer.u8(length); }
+  else if (length < 0x10000) { writer.u8(op16); writer.u16(length); }
+  else { writer.u8(op32); writer.u32(length); }
+}
+
+export const encodeMsgpack = createEncoder({
+  nil: (writer) => writer.u8(0xc0),
+  boolean: (writer, value) => writer.u8(value ? 0xc3 : 0xc2),
+  float: (writer, value) => { writer.u8(0xcb); writer.f64(value); },
+  integer(writer, value) {
+    if (value >= 0) {
+      if (value < 0x80) writer.u8(value);
+      else if (value < 0x100) { writer.u8(0xcc); writer.u8(value); }
+      else if (value < 0x10000) { writer.u8(0xcd); writer.u16(value); }
+      else if (value < 0x100000000) { writer.u8(0xce); writer.u32(value); }
+      else { writer.u8(0xcf); writer.u64(value); }
+    } else if (value >= -32) {
+      writer.u8(value & 0xff);
+    } else if (value >= -0x80) {
+      writer.u8(0xd0); writer.u8(value & 0xff);
+    } else if (value >= -0x8000) {
+      writer.u8(0xd1); writer.u16(value & 0xffff);
+    } else if (value >= -0x80000000) {
+      writer.u8(0xd2); writer.u32(value >>> 0);
+    } else {
+      writer.u8(0xd3); writer.i64(value);
+    }
+  },
+  string(writer, value, bytes) {
+    msgpackLength(writer, bytes, 0xa0, 31, [0xd9, 0xda, 0xdb]);
+    writer.utf8(value, bytes);
+  },
+  arrayHeader: (writer, length) => msgpackLength(writer, length, 0x90, 15, [null, 0xdc, 0xdd]),
+  mapHeader: (writer, length) => msgpackLength(writer, length, 0x80, 15, [null, 0xde, 0xdf])
+});
+
+function cborHead(writer, major, value) {
+  const type = major << 5;
+  if (value < 24) writer.u8(type | value);
+  else if (value < 0x100) { writer.u8(type | 24); writer.u8(value); }
+  else if (value < 0x10000) { writer.u8(type | 25); writer.u16(value); }
+  else if (value < 0x100000000) { writer.u8(type | 26); writer.u32(value); }
+  else { writer.u8(type | 27); writer.u64(value); }
+}
+
+export const encodeCbor = createEncoder({
+  nil: (writer) => writer.u8(0xf6),
+  boolean: (writer, value) => writer.u8(value ? 0xf5 : 0xf4),
+  float: (writer, value) => { writer.u8(0xfb); writer.f64(value); },
+  integer: (writer, value) => (value >= 0 ? cborHead(writer, 0, value) : cborHead(writer, 1, -1 - value)),
+  string(writer, value, bytes) {
+    cborHead(writer, 3, bytes);
+    writer.utf8(value, bytes);
+  },
+  arrayHeader: (writer, length) => cborHead(writer, 4, length),
+  mapHeader: (writer, length) => cborHead(writer, 5, length)
+});
@@ -0,0 +1,131 @@
+import { increment } from './request-metrics';
+
+// In-process read-through cache of user cards.
+//
+// A card is `{ user, profile }` for one user id, with the password hash
+// already stripped from `user`. Cards are shared between requests, so
+// callers must copy rather than mutate them.
+//
+// - Bounded: least recently used cards are evicted past `maxEntries`.
+// - TTL: a card is reloaded after `ttlMs`, which bounds how stale another
+//   process's writes can look here.
+// - Batched: `getMany` loads every miss with one `load(userIds)` call.
+// - Singleflight: concurrent misses for the same id share one load, and a
+//   load that races an `invalidate` is not written back.
+
+export function createCardCache({ load, maxEntries = 5000, ttlMs = 30 * 1000 }) {
+  const entries = new Map();
+  const pending = new Map();
+  const stats = { hits: 0, misses: 0, coalesced: 0, evictions: 0, invalidations: 0 };
+
+  function read(userId) {
+    const entry = entries.get(userId);
+    if (!entry) return undefined;
+
+    entries.delete(userId);
+    if (entry.expiresAt <= Date.now()) return undefined;
+
+    // Re-insert so Map order tracks recency
+    entries.set(userId, entry);
+    return entry.card;
+  }
+
+  function write(userId, card) {
+    entries.set(userId, { card, expiresAt: Date.now() + ttlMs });
+    while (entries.size > maxEntries) {
+      entries.delete(entries.keys().next().value);
+      stats.evictions += 1;
+    }
+  }
+
+  function startLoad(userIds) {
+    const loading = load(userIds);
+
+    for (const userId of userIds) {
+      const flight = loading.then(
+        (cards) => {
+          const card = cards.get(userId) || null;
+          if (pending.get(userId) === flight) {
+            pending.delete(userId);
+            write(userId, card);
+          }
+          return card;
+        },
+        (error) => {
+          if (pending.get(userId) === flight) pending.delete(userId);
+          throw error;
+        }
+      );
+      pending.set(userId, flight);
+    }
+  }
+
+  // Resolves to a Map of userId -> card (null for unknown users)
+  async function getMany(userIds) {
+    const result = new Map();
+    const missing = [];
+    let hits = 0;
+    let coalesced = 0;
+
+    for (const userId of new Set(userIds)) {
+      const card = read(userId);
+      if (card !== undefined) {
+        hits += 1;
+        result.set(userId, card);
+      } else if (pending.has(userId)) {
+        coalesced += 1;
+      } else {
+        missing.push(userId);
+      }
+    }
+
+    stats.hits += hits;
+    stats.coalesced += coalesced;
+    stats.misses += missing.length;
+    increment('card-hits', hits + coalesced);
+    increment('card-misses', missing.length);
+
+    if (missing.length > 0) {
+      startLoad(missing);
+    }
+
+    const waiting = [];
+    for (const userId of new Set(userIds)) {
+      if (!result.has(userId)) {
+        waiting.push(pending.get(userId).then((card) => result.set(userId, card)));
+      }
+    }
+    await Promise.all(waiting);
+
+    return result;
+  }
+
+  async function get(userId) {
+    const cards = await getMany([userId]);
+    return cards.get(userId);
+  }
+
+  function invalidate(userId) {
+    entries.delete(userId);
+    pending.delete(userId);
+    stats.invalidations += 1;
+  }
+
+  function snapshot() {
+    const lookups = stats.hits + stats.coalesced + stats.misses;
+    return {
+      ...stats,
+      size: entries.size,
+      maxEntries,
+      ttlMs,
+      hitRate: lookups ? (stats.hits + stats.coalesced) / lookups : 0
+    };
+  }
+
+  return { get, getMany, invalidate, stats: snapshot };
+}
+
+// A card in the `{ ...user, profile }` shape the API returns
+export function cardWithProfile(card) {
+  return { ...card.user, profile: card.profile };
+}
@@ -0,0 +1,87 @@
+import { createCardCache } from './card-cache';
+import { json } from './respond';
+
+// Named field selections for user cards, chosen with `?view=`.
+//
+// - card: what the swipe deck renders
+// - detail: the card plus the history shown on an expanded profile
+// - full: every stored field except the password hash (the default, and
+//   what the endpoints returned before views existed)
+//
+// Each view is a set of Mongo projections applied when cards are loaded,
+// so slimmer views also read less from the database. `post` and `match`
+// project the documents a card is attached to. No view returns the fields
+// posts carry for filtering and imports (skillIds, geo, externalId, ...).
+
+// updatedAt is kept in every view because ETags are derived from it
+const CARD_USER_FIELDS = { _id: 0, id: 1, name: 1, username: 1, imageUrl: 1, roleHeadline: 1, location: 1, updatedAt: 1 };
+const CARD_PROFILE_FIELDS = { _id: 0, userId: 1, bio: 1, looksToConnect: 1, skills: 1, interests: 1, updatedAt: 1 };
+const CARD_POST_FIELDS = {
+  _id: 0, id: 1, type: 1, leaderId: 1, title: 1, location: 1, skillsNeeded: 1, status: 1, createdAt: 1, updatedAt: 1
+};
+const MATCH_FIELDS = { _id: 0, id: 1, aId: 1, bId: 1, context: 1, postId: 1, createdAt: 1 };
+const INTERNAL_POST_FIELDS = { _id: 0, skillIds: 0, interestIds: 0, geo: 0, externalId: 0, revision: 0 };
+
+export const CARD_VIEWS = {
+  card: {
+    user: CARD_USER_FIELDS,
+    profile: CARD_PROFILE_FIELDS,
+    post: CARD_POST_FIELDS,
+    match: MATCH_FIELDS
+  },
+  detail: {
+    user: { ...CARD_USER_FIELDS, timezone: 1 },
+    profile: { ...CARD_PROFILE_FIELDS, experience: 1, projects: 1, awards: 1, socials: 1 },
+    post: { ...CARD_POST_FIELDS, websiteUrl: 1, notes: 1, visibility: 1 },
+    match: MATCH_FIELDS
+  },
+  full: {
+    user: { passwordHash: 0 },
+    profile: undefined,
+    post: INTERNAL_POST_FIELDS,
+    match: undefined
+  }
+};
+
+export const DEFAULT_CARD_VIEW = 'full';
+
+// Route middleware: reads `?view=` into ctx.view or rejects unknown views
+export async function selectView(ctx) {
+  const view = new URL(ctx.request.url).searchParams.get('view') || DEFAULT_CARD_VIEW;
+  if (!Object.hasOwn(CARD_VIEWS, view)) {
+    return json({ error: `Unknown view: ${view}` }, { status: 400 });
+  }
+  ctx.view = view;
+}
+
+// One card cache per view. `load(userIds, projection)` receives the view's
+// projections; a profile write invalidates the user in every view.
+export function createCardViews({ load, ...options }) {
+  const caches = new Map(Object.entries(CARD_VIEWS).map(([view, projection]) => [
+    view,
+    createCardCache({ ...options, load: (userIds) => load(userIds, projection) })
+  ]));
+
+  function invalidate(userId) {
+    for (const cache of caches.values()) cache.invalidate(userId);
+  }
+
+  // Totals across views in the shape of a single cache's stats
+  function stats() {
+    const views = {};
+    const total = { hits: 0, misses: 0, coalesced: 0, evictions: 0, invalidations: 0, size: 0, maxEntries: 0 };
+    for (const [view, cache] of caches) {
+      views[view] = cache.stats();
+      for (const key of Object.keys(total)) total[key] += views[view][key];
+    }
+    const lookups = total.hits + total.coalesced + total.misses;
+    return {
+      ...total,
+      ttlMs: views[DEFAULT_CARD_VIEW].ttlMs,
+      hitRate: lookups ? (total.hits + total.coalesced) / lookups : 0,
+      views
+    };
+  }
+
+  return { view: (name) => caches.get(name), invalidate, stats };
+}
@@ -0,0 +1,245 @@
+import crypto from 'crypto';
+import { v4 as uuidv4 } from 'uuid';
+import { detached } from './request-metrics';
+
+// Background cascade deletion for posts and accounts.
+//
+// Deleting a post or an account only removes what readers look up directly
+// (the post; the user, profile and sessions) inside the request, and
+// records a `deletions` job. The job then removes the dependent data in the
+// background, `batchSize` documents at a time with a `pauseMs` breather
+// between batches, so a post with 100k inquiries neither blocks its DELETE
+// nor saturates Mongo for concurrent traffic. Jobs run one at a time per
+// process.
+//
+// Job documents carry the progress, readable through `status`:
+//
+//   { id, kind: 'POST' | 'ACCOUNT', targetId, requestedBy, statusTokenHash,
+//     status: 'PENDING' | 'RUNNING' | 'DONE' | 'FAILED',
+//     step, deleted: { inquiries: n, swipes: n, ... },
+//     updated: { candidateLists: n }, attempts,
+//     createdAt, startedAt, heartbeatAt, finishedAt, error }
+//
+// Only the requester reads a job's progress. An account's sessions are
+// gone by the time its job runs, so an ACCOUNT job also gets a random
+// status token, returned once by `request` and stored hashed.
+//
+// Every step deletes by filter, so running a job again is harmless. A
+// RUNNING job whose heartbeat is older than `staleMs` belongs to a process
+// that died; `resume` (run once per process, on first use) picks those up
+// along with PENDING ones. An account's posts are deleted only after their
+// dependents, so an interrupted job can still find them. Compacted swipe
+// sets may keep ids of deleted posts; they are never shown.
+
+const POST_TYPES = ['HACKATHON', 'PROJECT'];
+const MAX_ATTEMPTS = 3;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Dependents of a batch of posts
+function postSteps(postIds) {
+  const postId = { $in: postIds };
+  return [
+    { collection: 'inquiries', filter: { postId } },
+    { collection: 'swipes', filter: { targetType: { $in: POST_TYPES }, targetId: postId } },
+    { collection: 'matches', filter: { postId } },
+    {
+      collection: 'conversations',
+      filter: { postId },
+      dependents: (conversations) => conversationSteps(conversations.map((c) => c.id))
+    }
+  ];
+}
+
+function conversationSteps(conversationIds) {
+  const conversationId = { $in: conversationIds };
+  return [
+    { collection: 'messages', filter: { conversationId } },
+    { collection: 'conversationParticipants', filter: { conversationId } }
+  ];
+}
+
+function accountSteps(userId) {
+  return [
+    {
+      collection: 'posts',
+      filter: { leaderId: userId },
+      dependents: (posts) => postSteps(posts.map((p) => p.id))
+    },
+    { collection: 'swipes', filter: { swiperId: userId } },
+    { collection: 'swipes', filter: { targetType: 'PERSON', targetId: userId } },
+    { collection: 'swipeSets', filter: { swiperId: userId } },
+    { collection: 'matches', filter: { $or: [{ aId: userId }, { bId: userId }] } },
+    { collection: 'inquiries', filter: { userId } },
+    { collection: 'messages', filter: { senderId: userId } },
+    { collection: 'conversationParticipants', filter: { userId } },
+    { collection: 'candidateLists', filter: { userId } },
+    // Other users' precomputed decks would keep serving the account
+    { collection: 'candidateLists', filter: { candidates: userId }, pull: { candidates: userId } }
+  ];
+}
+
+const JOB_STEPS = {
+  POST: (targetId) => postSteps([targetId]),
+  ACCOUNT: accountSteps
+};
+
+const STATUS_PROJECTION = {
+  _id: 0, id: 1, kind: 1, targetId: 1, status: 1, step: 1, deleted: 1, updated: 1, attempts: 1,
+  createdAt: 1, startedAt: 1, finishedAt: 1, error: 1
+};
+
+function hashToken(token) {
+  return crypto.createHash('sha256').update(token).digest('hex');
+}
+
+export function createCascadeDeleter({ batchSize = 1000, pauseMs = 10, staleMs = 60 * 1000 } = {}) {
+  let indexesReady = null;
+  let resumed = null;
+  let queue = Promise.resolve();
+  const queued = new Set();
+
+  function ensureIndexes(db) {
+    if (!indexesReady) {
+      indexesReady = Promise.all([
+        db.collection('deletions').createIndex({ id: 1 }, { unique: true }),
+        db.collection('deletions').createIndex({ status: 1, heartbeatAt: 1 })
+      ]).catch((error) => {
+        indexesReady = null;
+        throw error;
+      });
+    }
+    return indexesReady;
+  }
+
+  // Deletes everything `step.filter` matches, dependents of each batch
+  // first; a `pull` step instead removes the target from what it matches
+  async function runStep(db, job, step) {
+    const collection = db.collection(step.collection);
+    for (;;) {
+      const docs = await collection.find(step.filter, { projection: { _id: 1, id: 1 } })
+        .limit(batchSize).toArray();
+      if (docs.length === 0) return;
+
+      if (step.dependents) {
+        for (const dependent of step.dependents(docs)) await runStep(db, job, dependent);
+      }
+      const batch = { _id: { $in: docs.map((doc) => doc._id) } };
+      const counter = step.pull
+        ? `updated.${step.collection}`
+        : `deleted.${step.collection}`;
+      const count = step.pull
+        ? (await collection.updateMany(batch, { $pull: step.pull })).modifiedCount
+        : (await collection.deleteMany(batch)).deletedCount;
+      await db.collection('deletions').updateOne(
+        { id: job.id },
+        { $inc: { [counter]: count }, $set: { step: step.collection, heartbeatAt: new Date() } }
+      );
+      if (pauseMs > 0) await sleep(pauseMs);
+    }
+  }
+
+  async function run(db, jobId) {
+    const now = new Date();
+    const job = await db.collection('deletions').findOneAndUpdate(
+      {
+        id: jobId,
+        $or: [
+          { status: 'PENDING' },
+          { status: 'RUNNING', heartbeatAt: { $lt: new Date(now.getTime() - staleMs) } }
+        ]
+      },
+      { $set: { status: 'RUNNING', heartbeatAt: now }, $min: { startedAt: now }, $inc: { attempts: 1 } },
+      { returnDocument: 'after' }
+    );
+    // Finished, or another process holds it
+    if (!job) return;
+
+    try {
+      for (const step of JOB_STEPS[job.kind](job.targetId)) await runStep(db, job, step);
+      await db.collection('deletions').updateOne(
+        { id: job.id },
+        { $set: { status: 'DONE', step: null, finishedAt: new Date() } }
+      );
+    } catch (error) {
+      // PENDING jobs are retried by the next process start
+      await db.collection('deletions').updateOne(
+        { id: job.id },
+        { $set: { status: job.attempts < MAX_ATTEMPTS ? 'PENDING' : 'FAILED', error: error.message } }
+      );
+    }
+  }
+
+  function schedule(db, jobId) {
+    if (queued.has(jobId)) return;
+    queued.add(jobId);
+    detached(() => {
+      queue = queue
+        .then(() => run(db, jobId))
+        .catch((error) => console.error('Cascade deletion failed', jobId, error))
+        .finally(() => queued.delete(jobId));
+    });
+  }
+
+  // Schedules the jobs a previous process left unfinished
+  function resume(db) {
+    if (!resumed) {
+      resumed = db.collection('deletions')
+        .find(
+          {
+            $or: [
+              { status: 'PENDING' },
+              { status: 'RUNNING', heartbeatAt: { $lt: new Date(Date.now() - staleMs) } }
+            ]
+          },
+          { projection: { _id: 0, id: 1 } }
+        )
+        .sort({ createdAt: 1 })
+        .toArray()
+        .then((jobs) => jobs.forEach((job) => schedule(db, job.id)))
+        .catch((error) => {
+          resumed = null;
+          throw error;
+        });
+    }
+    return resumed;
+  }
+
+  // Records a deletion job and starts it in the background; the caller has
+  // already removed the directly visible documents
+  async function request(db, kind, targetId, requestedBy) {
+    await ensureIndexes(db);
+    await resume(db);
+    const statusToken = kind === 'ACCOUNT' ? crypto.randomBytes(24).toString('base64url') : null;
+    const job = {
+      id: uuidv4(),
+      kind,
+      targetId,
+      requestedBy,
+      status: 'PENDING',
+      step: null,
+      deleted: {},
+      updated: {},
+      attempts: 0,
+      createdAt: new Date()
+    };
+    if (statusToken) job.statusTokenHash = hashToken(statusToken);
+    await db.collection('deletions').insertOne(job);
+    schedule(db, job.id);
+    return statusToken
+      ? { id: job.id, kind, status: job.status, statusToken }
+      : { id: job.id, kind, status: job.status };
+  }
+
+  // The job if `userId` requested it or `statusToken` is its token, else null
+  async function status(db, jobId, { userId = null, statusToken = null } = {}) {
+    await resume(db);
+    const owners = [];
+    if (userId) owners.push({ requestedBy: userId });
+    if (statusToken) owners.push({ statusTokenHash: hashToken(statusToken) });
+    if (owners.length === 0) return null;
+    return db.collection('deletions').findOne({ id: jobId, $or: owners }, { projection: STATUS_PROJECTION });
+  }
+
+  return { request, resume, status };
+}
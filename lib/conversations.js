@@ -0,0 +1,92 @@
+import crypto from 'crypto';
+
+// Get-or-create for direct and post-scoped conversations.
+//
+// A 1:1 conversation, or any conversation about a post, is identified by
+// its participant set (plus the post): `participantKey` is a SHA-256 of the
+// sorted, de-duplicated user ids and the post id, and a unique index on it
+// makes Mongo the arbiter when the same DM is opened twice at once. Other
+// group conversations carry no key and are always created.
+//
+// The participant docs are written before the conversation, so a
+// conversation is never visible without its participants. A creator that
+// loses the race removes the participant docs it wrote and returns the
+// winner's conversation.
+
+let indexesReady = null;
+
+export function ensureConversationIndexes(db) {
+  if (!indexesReady) {
+    indexesReady = db.collection('conversations')
+      .createIndex(
+        { participantKey: 1 },
+        { unique: true, partialFilterExpression: { participantKey: { $type: 'string' } } }
+      )
+      .catch((error) => {
+        indexesReady = null;
+        throw error;
+      });
+  }
+  return indexesReady;
+}
+
+// Canonical key for a participant set, or null when the conversation is a
+// plain group that should always be created
+export function participantKey(userIds, { isGroup, postId }) {
+  const members = [...new Set(userIds)].sort();
+  if (!postId && (isGroup || members.length !== 2)) return null;
+  return crypto.createHash('sha256').update(`${postId || ''}|${members.join(',')}`).digest('hex');
+}
+
+// Returns { conversation, created }. `participantDocs` must belong to
+// `conversation.id`.
+export async function getOrCreateConversation(db, conversation, participantDocs) {
+  const conversations = db.collection('conversations');
+  if (conversation.participantKey) {
+    await ensureConversationIndexes(db);
+    const existing = await conversations.findOne({ participantKey: conversation.participantKey });
+    if (existing) return { conversation: existing, created: false };
+  }
+
+  await db.collection('conversationParticipants').insertMany(participantDocs);
+  try {
+    await conversations.insertOne(conversation);
+    return { conversation, created: true };
+  } catch (error) {
+    if (error.code !== 11000 || !conversation.participantKey) throw error;
+    await db.collection('conversationParticipants').deleteMany({ conversationId: conversation.id });
+    const winner = await conversations.findOne({ participantKey: conversation.participantKey });
+    return { conversation: winner, created: false };
+  }
+}
+
+// Unread state.
+//
+// Each conversation counts its messages in `messageSeq`; sending a message
+// $incs it, so every message gets a unique, increasing `seq`. Each
+// participant doc keeps `readSeq`, the seq of the newest message that
+// participant has read, only ever raised with $max. Sending a message reads
+// everything up to it. The unread count is then the difference of the two
+// and needs no scan of messages; a message sent while a "mark read" is in
+// flight has a higher seq than the one being marked, so it stays unread.
+
+// Reserves the next message seq of a conversation
+export async function nextMessageSeq(db, conversationId) {
+  const conversation = await db.collection('conversations').findOneAndUpdate(
+    { id: conversationId },
+    { $inc: { messageSeq: 1 } },
+    { returnDocument: 'after', projection: { _id: 0, messageSeq: 1 } }
+  );
+  return conversation?.messageSeq ?? null;
+}
+
+export function advanceReadCursor(db, conversationId, userId, seq) {
+  return db.collection('conversationParticipants').updateOne(
+    { conversationId, userId },
+    { $max: { readSeq: seq }, $set: { lastReadAt: new Date() } }
+  );
+}
+
+export function unreadCount(conversation, participant) {
+  return Math.max(0, (conversation?.messageSeq || 0) - (participant?.readSeq || 0));
+}
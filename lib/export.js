@@ -0,0 +1,99 @@
+import { decodeSwipeSet } from './swipe-sets';
+
+// Streaming NDJSON export of everything a user owns.
+//
+// One JSON object per line: an `export` header, then `user` and `profile`,
+// then every swipe (compacted LEFT swipes included), match, message the
+// user sent, post and inquiry, each as {"type": ..., "data": {...}}, and
+// finally an `end` line with the count per type. A client that sees no
+// `end` line got a truncated export.
+//
+// Lines are read from Mongo cursors only when the response stream pulls,
+// so a slow client pauses the cursors instead of the server buffering the
+// export; memory stays at one cursor batch plus one output chunk however
+// many swipes the user has.
+
+const CHUNK_BYTES = 64 * 1024;
+const CURSOR_BATCH = 1000;
+
+const SECTIONS = [
+  { type: 'swipe', collection: 'swipes', filter: (userId) => ({ swiperId: userId }) },
+  { type: 'match', collection: 'matches', filter: (userId) => ({ $or: [{ aId: userId }, { bId: userId }] }) },
+  { type: 'message', collection: 'messages', filter: (userId) => ({ senderId: userId }) },
+  { type: 'post', collection: 'posts', filter: (userId) => ({ leaderId: userId }) },
+  { type: 'inquiry', collection: 'inquiries', filter: (userId) => ({ userId }) }
+];
+
+function line(type, data) {
+  return `${JSON.stringify({ type, data })}\n`;
+}
+
+async function* exportLines(db, userId, cursors) {
+  const counts = {};
+  const count = (type) => {
+    counts[type] = (counts[type] || 0) + 1;
+  };
+
+  yield line('export', { userId, exportedAt: new Date(), version: 1 });
+
+  const user = await db.collection('users').findOne({ id: userId }, { projection: { _id: 0, passwordHash: 0 } });
+  const profile = await db.collection('profiles').findOne({ userId }, { projection: { _id: 0 } });
+  yield line('user', user);
+  yield line('profile', profile);
+
+  for (const section of SECTIONS) {
+    const cursor = db.collection(section.collection)
+      .find(section.filter(userId), { projection: { _id: 0 }, batchSize: CURSOR_BATCH });
+    cursors.add(cursor);
+    for await (const doc of cursor) {
+      count(section.type);
+      yield line(section.type, doc);
+    }
+    cursors.delete(cursor);
+
+    if (section.type === 'swipe') {
+      // LEFT swipes folded into swipe sets come back one line per target
+      const sets = db.collection('swipeSets')
+        .find({ swiperId: userId }, { projection: { _id: 0, targetType: 1, ids: 1, updatedAt: 1 }, batchSize: 1 });
+      cursors.add(sets);
+      for await (const set of sets) {
+        for (const targetId of decodeSwipeSet(set.ids)) {
+          count('swipe');
+          yield line('swipe', {
+            swiperId: userId, targetType: set.targetType, targetId, direction: 'LEFT', compacted: true
+          });
+        }
+      }
+      cursors.delete(sets);
+    }
+  }
+
+  yield line('end', { counts });
+}
+
+// ReadableStream of the user's export, pulled chunk by chunk
+export function exportStream(db, userId) {
+  const encoder = new TextEncoder();
+  const cursors = new Set();
+  const lines = exportLines(db, userId, cursors);
+
+  return new ReadableStream({
+    async pull(controller) {
+      let chunk = '';
+      while (chunk.length < CHUNK_BYTES) {
+        const { value, done } = await lines.next();
+        if (done) {
+          if (chunk) controller.enqueue(encoder.encode(chunk));
+          controller.close();
+          return;
+        }
+        chunk += value;
+      }
+      controller.enqueue(encoder.encode(chunk));
+    },
+    async cancel() {
+      await Promise.all([...cursors].map((cursor) => cursor.close()));
+      await lines.return();
+    }
+  }, { highWaterMark: 1 });
+}
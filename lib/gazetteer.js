@@ -0,0 +1,163 @@
+// Offline gazetteer for free-text locations.
+//
+// Resolves strings like "San Francisco, CA (Hybrid)" to a GeoJSON point
+// without calling out to a geocoding service: parenthesised notes are
+// dropped, then "city, region" or "city, country" is looked up. The city
+// alone is only tried when there is no qualifier, so "Paris, TX" has no
+// point rather than the one in France. Entries are
+// `name|region|country|lat|lng|aliases`, one per city; aliases are
+// comma-separated. Anything unknown, including "Remote", has no point.
+
+const PLACES = [
+  'San Francisco|CA|US|37.7749|-122.4194|SF,San Fran,Bay Area',
+  'San Jose|CA|US|37.3382|-121.8863|',
+  'Palo Alto|CA|US|37.4419|-122.1430|',
+  'Mountain View|CA|US|37.3861|-122.0839|',
+  'Oakland|CA|US|37.8044|-122.2712|',
+  'Berkeley|CA|US|37.8716|-122.2727|',
+  'Los Angeles|CA|US|34.0522|-118.2437|LA',
+  'San Diego|CA|US|32.7157|-117.1611|',
+  'Irvine|CA|US|33.6846|-117.8265|',
+  'Sacramento|CA|US|38.5816|-121.4944|',
+  'Seattle|WA|US|47.6062|-122.3321|',
+  'Redmond|WA|US|47.6740|-122.1215|',
+  'Portland|OR|US|45.5152|-122.6784|',
+  'Boise|ID|US|43.6150|-116.2023|',
+  'Salt Lake City|UT|US|40.7608|-111.8910|SLC',
+  'Denver|CO|US|39.7392|-104.9903|',
+  'Boulder|CO|US|40.0150|-105.2705|',
+  'Phoenix|AZ|US|33.4484|-112.0740|',
+  'Las Vegas|NV|US|36.1699|-115.1398|',
+  'Austin|TX|US|30.2672|-97.7431|',
+  'Dallas|TX|US|32.7767|-96.7970|',
+  'Houston|TX|US|29.7604|-95.3698|',
+  'San Antonio|TX|US|29.4241|-98.4936|',
+  'Chicago|IL|US|41.8781|-87.6298|',
+  'Minneapolis|MN|US|44.9778|-93.2650|',
+  'Madison|WI|US|43.0731|-89.4012|',
+  'Detroit|MI|US|42.3314|-83.0458|',
+  'Ann Arbor|MI|US|42.2808|-83.7430|',
+  'Pittsburgh|PA|US|40.4406|-79.9959|',
+  'Philadelphia|PA|US|39.9526|-75.1652|Philly',
+  'Columbus|OH|US|39.9612|-82.9988|',
+  'Atlanta|GA|US|33.7490|-84.3880|',
+  'Miami|FL|US|25.7617|-80.1918|',
+  'Orlando|FL|US|28.5383|-81.3792|',
+  'Tampa|FL|US|27.9506|-82.4572|',
+  'Raleigh|NC|US|35.7796|-78.6382|',
+  'Durham|NC|US|35.9940|-78.8986|',
+  'Nashville|TN|US|36.1627|-86.7816|',
+  'Washington|DC|US|38.9072|-77.0369|Washington DC,DC',
+  'Baltimore|MD|US|39.2904|-76.6122|',
+  'New York|NY|US|40.7128|-74.0060|NYC,New York City,Manhattan,Brooklyn',
+  'Boston|MA|US|42.3601|-71.0589|',
+  'Cambridge|MA|US|42.3736|-71.1097|',
+  'Providence|RI|US|41.8240|-71.4128|',
+  'New Haven|CT|US|41.3083|-72.9279|',
+  'Toronto|ON|CA|43.6532|-79.3832|',
+  'Waterloo|ON|CA|43.4643|-80.5204|',
+  'Montreal|QC|CA|45.5017|-73.5673|',
+  'Vancouver|BC|CA|49.2827|-123.1207|',
+  'Mexico City||MX|19.4326|-99.1332|CDMX',
+  'Sao Paulo||BR|-23.5505|-46.6333|São Paulo',
+  'Buenos Aires||AR|-34.6037|-58.3816|',
+  'Bogota||CO|4.7110|-74.0721|Bogotá',
+  'London||UK|51.5074|-0.1278|',
+  'Cambridge||UK|52.2053|0.1218|',
+  'Oxford||UK|51.7520|-1.2577|',
+  'Manchester||UK|53.4808|-2.2426|',
+  'Edinburgh||UK|55.9533|-3.1883|',
+  'Dublin||IE|53.3498|-6.2603|',
+  'Paris||FR|48.8566|2.3522|',
+  'Amsterdam||NL|52.3676|4.9041|',
+  'Berlin||DE|52.5200|13.4050|',
+  'Munich||DE|48.1351|11.5820|München',
+  'Zurich||CH|47.3769|8.5417|Zürich',
+  'Stockholm||SE|59.3293|18.0686|',
+  'Copenhagen||DK|55.6761|12.5683|',
+  'Helsinki||FI|60.1699|24.9384|',
+  'Madrid||ES|40.4168|-3.7038|',
+  'Barcelona||ES|41.3874|2.1686|',
+  'Lisbon||PT|38.7223|-9.1393|',
+  'Milan||IT|45.4642|9.1900|',
+  'Warsaw||PL|52.2297|21.0122|',
+  'Tel Aviv||IL|32.0853|34.7818|',
+  'Dubai||AE|25.2048|55.2708|',
+  'Lagos||NG|6.5244|3.3792|',
+  'Nairobi||KE|-1.2921|36.8219|',
+  'Cape Town||ZA|-33.9249|18.4241|',
+  'Bangalore||IN|12.9716|77.5946|Bengaluru',
+  'Mumbai||IN|19.0760|72.8777|',
+  'Delhi||IN|28.7041|77.1025|New Delhi',
+  'Hyderabad||IN|17.3850|78.4867|',
+  'Pune||IN|18.5204|73.8567|',
+  'Singapore||SG|1.3521|103.8198|',
+  'Hong Kong||HK|22.3193|114.1694|',
+  'Shanghai||CN|31.2304|121.4737|',
+  'Beijing||CN|39.9042|116.4074|',
+  'Shenzhen||CN|22.5431|114.0579|',
+  'Seoul||KR|37.5665|126.9780|',
+  'Tokyo||JP|35.6762|139.6503|',
+  'Taipei||TW|25.0330|121.5654|',
+  'Jakarta||ID|-6.2088|106.8456|',
+  'Sydney||AU|-33.8688|151.2093|',
+  'Melbourne||AU|-37.8136|144.9631|',
+  'Auckland||NZ|-36.8485|174.7633|'
+];
+
+// Spelled-out names accepted as qualifiers next to the codes in PLACES
+const REGION_NAMES = {
+  CA: 'California', WA: 'Washington', OR: 'Oregon', ID: 'Idaho', UT: 'Utah', CO: 'Colorado',
+  AZ: 'Arizona', NV: 'Nevada', TX: 'Texas', IL: 'Illinois', MN: 'Minnesota', WI: 'Wisconsin',
+  MI: 'Michigan', PA: 'Pennsylvania', OH: 'Ohio', GA: 'Georgia', FL: 'Florida',
+  NC: 'North Carolina', TN: 'Tennessee', DC: 'District of Columbia', MD: 'Maryland',
+  NY: 'New York', MA: 'Massachusetts', RI: 'Rhode Island', CT: 'Connecticut',
+  ON: 'Ontario', QC: 'Quebec', BC: 'British Columbia'
+};
+const COUNTRY_NAMES = {
+  US: 'USA,United States,United States of America', CA: 'Canada', MX: 'Mexico', BR: 'Brazil',
+  AR: 'Argentina', CO: 'Colombia', UK: 'United Kingdom,GB,Great Britain,England,Scotland',
+  IE: 'Ireland', FR: 'France', NL: 'Netherlands,The Netherlands', DE: 'Germany,Deutschland',
+  CH: 'Switzerland', SE: 'Sweden', DK: 'Denmark', FI: 'Finland', ES: 'Spain', PT: 'Portugal',
+  IT: 'Italy', PL: 'Poland', IL: 'Israel', AE: 'UAE,United Arab Emirates', NG: 'Nigeria',
+  KE: 'Kenya', ZA: 'South Africa', IN: 'India', SG: 'Singapore', HK: 'Hong Kong', CN: 'China',
+  KR: 'South Korea,Korea', JP: 'Japan', TW: 'Taiwan', ID: 'Indonesia', AU: 'Australia',
+  NZ: 'New Zealand'
+};
+
+function placeKey(text) {
+  return String(text).normalize('NFKD').replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase().replace(/\./g, '').replace(/\s+/g, ' ').trim();
+}
+
+// "city, region" and "city, country" keys are exact; a bare city key only
+// resolves when no other city shares the name
+const QUALIFIED = new Map();
+const BARE = new Map();
+for (const entry of PLACES) {
+  const [name, region, country, lat, lng, aliases] = entry.split('|');
+  const point = { type: 'Point', coordinates: [Number(lng), Number(lat)] };
+  for (const city of [name, ...aliases.split(',').filter(Boolean)]) {
+    const qualifiers = [
+      region, REGION_NAMES[region], country, ...(COUNTRY_NAMES[country] || '').split(',')
+    ].filter(Boolean);
+    for (const qualifier of qualifiers) {
+      QUALIFIED.set(placeKey(`${city}, ${qualifier}`), point);
+    }
+    const key = placeKey(city);
+    BARE.set(key, BARE.has(key) && BARE.get(key) !== point ? null : point);
+  }
+}
+
+// GeoJSON point for a free-text location, or null
+export function geocode(location) {
+  if (!location) return null;
+  const text = placeKey(String(location).replace(/\([^)]*\)/g, ''));
+  if (!text) return null;
+
+  // Postal codes ("Austin, TX 78701") do not change the qualifier
+  const parts = text.split(',').map((part) => part.replace(/\s+[\d-]+$/, '').trim()).filter(Boolean);
+  if (parts.length === 1) return BARE.get(parts[0]) || null;
+  // A qualifier that names no known place for this city contradicts it
+  return QUALIFIED.get(`${parts[0]}, ${parts[1]}`) || QUALIFIED.get(`${parts[0]}, ${parts[parts.length - 1]}`) || null;
+}
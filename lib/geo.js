@@ -0,0 +1,62 @@
+import { json } from './respond';
+
+// Distance filters for explore/*.
+//
+// Profiles and posts store a GeoJSON `geo` point geocoded from their
+// location text (lib/gazetteer.js) when they are written, and 2dsphere
+// indexes over it turn `radiusKm=` into an index scan. `radiusKm=preferred`
+// uses the viewer's own preferences.locationRadiusKm; either way the
+// center is the viewer's profile point.
+
+const EARTH_RADIUS_KM = 6378.1;
+const MAX_RADIUS_KM = 20000;
+const DEFAULT_RADIUS_KM = 50;
+
+let indexesReady = null;
+
+// 2dsphere indexes behind the filter, created once per process
+export function ensureGeoIndexes(db) {
+  if (!indexesReady) {
+    indexesReady = Promise.all([
+      db.collection('profiles').createIndex({ geo: '2dsphere' }),
+      db.collection('posts').createIndex({ type: 1, geo: '2dsphere' })
+    ]).catch((error) => {
+      indexesReady = null;
+      throw error;
+    });
+  }
+  return indexesReady;
+}
+
+// Middleware: reads `radiusKm` into ctx.radiusKm (a number, 'preferred' or
+// null when no distance filter was asked for)
+export async function selectRadius(ctx) {
+  const value = new URL(ctx.request.url).searchParams.get('radiusKm');
+  ctx.radiusKm = null;
+  if (value === null || value === '') return;
+
+  if (value !== 'preferred') {
+    const km = Number(value);
+    if (!Number.isFinite(km) || km <= 0 || km > MAX_RADIUS_KM) {
+      return json({ error: `radiusKm must be between 0 and ${MAX_RADIUS_KM}, or "preferred"` }, { status: 400 });
+    }
+    ctx.radiusKm = km;
+  } else {
+    ctx.radiusKm = value;
+  }
+  await ensureGeoIndexes(ctx.db);
+}
+
+// Mongo filter for documents within the radius of the viewer's point, or
+// an error response when the viewer's location could not be geocoded
+export function radiusQuery(radiusKm, viewerProfile) {
+  if (!viewerProfile?.geo) {
+    return { error: json({ error: 'Set a recognised location on your profile to filter by distance' }, { status: 400 }) };
+  }
+  const km = radiusKm === 'preferred'
+    ? Number(viewerProfile.preferences?.locationRadiusKm) || DEFAULT_RADIUS_KM
+    : radiusKm;
+  return {
+    query: { geo: { $geoWithin: { $centerSphere: [viewerProfile.geo.coordinates, km / EARTH_RADIUS_KM] } } }
+  };
+}
@@ -0,0 +1,60 @@
+import crypto from 'crypto';
+
+// Time-ordered document ids.
+//
+// uuidv7() returns an RFC 9562 version 7 UUID: 48 bits of Unix milliseconds,
+// then a 12-bit counter, then random bits. Ids minted later sort later, so
+// inserts land on the right-hand edge of a unique `id` index instead of on
+// random pages, and an id doubles as a keyset pagination cursor. Within one
+// millisecond the counter keeps ids from this process increasing; it starts
+// at a random value below 0x800 so a burst cannot run out of room.
+//
+// Session tokens and other secrets stay uuidv4: a v7 id leaks its creation
+// time and has fewer random bits.
+
+const RANDOM_POOL_SIZE = 4096;
+let pool = crypto.randomBytes(RANDOM_POOL_SIZE);
+let poolOffset = 0;
+let lastMs = -1;
+let counter = 0;
+
+function randomBytes(n) {
+  if (poolOffset + n > RANDOM_POOL_SIZE) {
+    pool = crypto.randomBytes(RANDOM_POOL_SIZE);
+    poolOffset = 0;
+  }
+  poolOffset += n;
+  return pool.subarray(poolOffset - n, poolOffset);
+}
+
+export function uuidv7(ms = Date.now()) {
+  const random = randomBytes(10);
+  if (ms > lastMs) {
+    lastMs = ms;
+    counter = ((random[0] << 8) | random[1]) & 0x7ff;
+  } else if (++counter > 0xfff) {
+    // Counter exhausted: borrow the next millisecond
+    lastMs += 1;
+    counter = 0;
+  }
+
+  const bytes = Buffer.allocUnsafe(16);
+  bytes.writeUIntBE(lastMs, 0, 6);
+  bytes[6] = 0x70 | (counter >> 8);
+  bytes[7] = counter & 0xff;
+  random.copy(bytes, 8, 2, 10);
+  bytes[8] = 0x80 | (bytes[8] & 0x3f);
+
+  const hex = bytes.toString('hex');
+  return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+}
+
+export function isUuidv7(id) {
+  return typeof id === 'string' && /^[0-9a-f]{8}-[0-9a-f]{4}-7[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$/.test(id);
+}
+
+// Creation time embedded in a v7 id, or null for any other id
+export function idTimestamp(id) {
+  if (!isUuidv7(id)) return null;
+  return new Date(parseInt(id.slice(0, 8) + id.slice(9, 13), 16));
+}
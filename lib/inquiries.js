@@ -0,0 +1,156 @@
+import { uuidv7 } from './ids';
+
+// Bulk accept/decline (PATCH inquiries).
+//
+// A leader triaging applicants sends every decision in one request:
+// { decisions: [{ id, status }, ...] }. The inquiries are read in one query
+// and their posts in another, so ownership is checked once per post, not
+// once per inquiry. All status changes then go out in one unordered
+// bulkWrite, and the matches for accepted inquiries in a second one.
+//
+// Each decision gets its own outcome, in request order:
+//   UPDATED          the status was written (`matched` set for an accept)
+//   NOT_FOUND        no such inquiry
+//   FORBIDDEN        the inquiry is on someone else's post
+//   INVALID_STATUS   status is not PENDING, ACCEPTED or DECLINED
+//   DUPLICATE        the same inquiry appeared earlier in the request
+//   FAILED           the status write failed (`error` set)
+//
+// An UPDATED accept whose match write failed carries `error` and
+// `matched: false`; accepting it again retries the match.
+//
+// Matches are upserted on (aId, bId, postId), so accepting an inquiry again
+// never creates a second match; the single-inquiry PATCH uses the same
+// upsert through the job queue. A unique index on those fields keeps two
+// concurrent upserts from both inserting; the loser's duplicate key error
+// means the match exists.
+
+export const MAX_DECISIONS = 500;
+const STATUSES = ['PENDING', 'ACCEPTED', 'DECLINED'];
+const DUPLICATE_KEY = 11000;
+
+let indexesReady = null;
+
+export function ensureMatchIndexes(db) {
+  if (!indexesReady) {
+    indexesReady = db.collection('matches')
+      .createIndex(
+        { aId: 1, bId: 1, postId: 1 },
+        { unique: true, partialFilterExpression: { context: 'POST' } }
+      )
+      .catch((error) => {
+        // Duplicates written before the index existed block its build; the
+        // upserts still work without it, so log them instead of failing
+        if (error.code === DUPLICATE_KEY) {
+          console.error('Duplicate POST matches prevent the unique match index', error.message);
+          return;
+        }
+        indexesReady = null;
+        throw error;
+      });
+  }
+  return indexesReady;
+}
+
+// Upsert of a POST match; safe to repeat
+export function matchUpsert(match) {
+  return {
+    updateOne: {
+      filter: { aId: match.aId, bId: match.bId, postId: match.postId },
+      update: { $setOnInsert: match },
+      upsert: true
+    }
+  };
+}
+
+// The decisions of a request body, or { error }
+export function parseDecisions(body) {
+  const decisions = body?.decisions;
+  if (!Array.isArray(decisions) || decisions.length === 0) {
+    return { error: 'decisions must be a non-empty array of { id, status }' };
+  }
+  if (decisions.length > MAX_DECISIONS) {
+    return { error: `At most ${MAX_DECISIONS} decisions per request` };
+  }
+  return { decisions: decisions.map((d) => ({ id: String(d?.id ?? ''), status: d?.status })) };
+}
+
+// Writes one POST match; a lost race with another writer is not an error
+export async function upsertMatch(db, match) {
+  await ensureMatchIndexes(db);
+  try {
+    await db.collection('matches').bulkWrite([matchUpsert(match)]);
+  } catch (error) {
+    const writeErrors = [].concat(error.writeErrors || []);
+    if (error.code !== DUPLICATE_KEY && !(writeErrors.length && writeErrors.every((e) => e.code === DUPLICATE_KEY))) {
+      throw error;
+    }
+  }
+}
+
+// Applies `decisions` for leader `leaderId`; returns the outcome per decision
+export async function applyDecisions(db, leaderId, decisions) {
+  await ensureMatchIndexes(db);
+  const inquiries = await db.collection('inquiries').find(
+    { id: { $in: [...new Set(decisions.map((d) => d.id))] } },
+    { projection: { _id: 0, id: 1, postId: 1, userId: 1 } }
+  ).toArray();
+  const inquiriesById = new Map(inquiries.map((inquiry) => [inquiry.id, inquiry]));
+
+  const posts = await db.collection('posts').find(
+    { id: { $in: [...new Set(inquiries.map((inquiry) => inquiry.postId))] }, leaderId },
+    { projection: { _id: 0, id: 1 } }
+  ).toArray();
+  const ownedPosts = new Set(posts.map((post) => post.id));
+
+  const seen = new Set();
+  const updates = []; // [result index, bulkWrite operation]
+  const matches = [];
+  const results = decisions.map(({ id, status }, index) => {
+    const inquiry = inquiriesById.get(id);
+    if (seen.has(id)) return { id, outcome: 'DUPLICATE' };
+    seen.add(id);
+    if (!STATUSES.includes(status)) return { id, outcome: 'INVALID_STATUS' };
+    if (!inquiry) return { id, outcome: 'NOT_FOUND' };
+    if (!ownedPosts.has(inquiry.postId)) return { id, outcome: 'FORBIDDEN' };
+
+    updates.push([index, { updateOne: { filter: { id }, update: { $set: { status } } } }]);
+    const result = { id, outcome: 'UPDATED', status };
+    if (status === 'ACCEPTED') {
+      const match = {
+        id: uuidv7(),
+        aId: leaderId,
+        bId: inquiry.userId,
+        context: 'POST',
+        postId: inquiry.postId,
+        createdAt: new Date()
+      };
+      matches.push([index, matchUpsert(match)]);
+      result.matched = true;
+    }
+    return result;
+  });
+
+  const write = async (collection, operations, onError) => {
+    if (operations.length === 0) return;
+    try {
+      await db.collection(collection).bulkWrite(operations.map(([, operation]) => operation), { ordered: false });
+    } catch (error) {
+      if (!error.writeErrors) throw error;
+      for (const writeError of [].concat(error.writeErrors)) {
+        onError(operations[writeError.index][0], writeError.errmsg, writeError.code);
+      }
+    }
+  };
+  await write('inquiries', updates, (index, error) => {
+    results[index] = { id: results[index].id, outcome: 'FAILED', error };
+  });
+  // Matches only for inquiries whose status was written
+  await write('matches', matches.filter(([index]) => results[index].outcome === 'UPDATED'), (index, error, code) => {
+    if (code === DUPLICATE_KEY) return;
+    results[index].matched = false;
+    results[index].error = error;
+  });
+
+  return results;
+}
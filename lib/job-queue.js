@@ -0,0 +1,233 @@
+import { v4 as uuidv4 } from 'uuid';
+import { detached } from './request-metrics';
+
+// Durable queue for side effects a handler does not need to wait for.
+//
+// `enqueue` inserts a job document into `jobs` and returns; the insert is
+// the durability point, so a job survives a crash of the process that
+// queued it. Workers in every server process claim due jobs with
+// findOneAndUpdate, at most `concurrency` at a time per process, and run
+// the handler registered for the job's type.
+//
+//   { id, type, key, payload, status: 'QUEUED' | 'RUNNING' | 'DONE' | 'FAILED',
+//     attempts, runAt, lockedUntil, createdAt, startedAt, finishedAt, lastError }
+//
+// A handler that throws is retried with exponential backoff up to
+// `maxAttempts` times, then the job is FAILED. A claim expires after
+// `lockMs`, so the job of a worker that died is claimed again; handlers
+// therefore run at least once and must be idempotent (upserts, not
+// inserts). A job may carry an idempotency `key`: enqueueing a key that is
+// already known (queued, running, or done within the last day) returns the
+// existing job instead of queueing another. A FAILED job with the key is
+// queued again with the new payload and a fresh set of attempts, so one
+// outage does not block its key for good. DONE and FAILED jobs expire a day
+// after they finish.
+//
+// Workers poll every `pollMs` and are also woken by each local enqueue, so
+// a job normally starts within a few milliseconds. `stats` reports queue
+// depth and lag (the time a job waited between becoming due and starting).
+
+const DONE_TTL_SECONDS = 24 * 60 * 60;
+const LAG_SAMPLES = 1000;
+
+// Unref'd, so an idle poller never keeps the process alive
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms).unref());
+
+function percentile(sorted, p) {
+  return sorted.length === 0 ? 0 : sorted[Math.min(sorted.length - 1, Math.floor(sorted.length * p))];
+}
+
+export function createJobQueue({
+  getDb, handlers, concurrency = 4, pollMs = 500, lockMs = 30 * 1000, maxAttempts = 5, backoffMs = 1000
+}) {
+  let indexesReady = null;
+  let started = false;
+  let inFlight = 0;
+  let draining = false;
+  let wakeAgain = false;
+  const lags = []; // ms, most recent LAG_SAMPLES job starts
+  const totals = { started: 0, done: 0, retried: 0, failed: 0 };
+
+  function ensureIndexes(db) {
+    if (!indexesReady) {
+      // One createIndexes command, so the first enqueue stays within its
+      // handler's query budget
+      indexesReady = db.collection('jobs').createIndexes([
+        { key: { id: 1 }, unique: true },
+        { key: { key: 1 }, unique: true, partialFilterExpression: { key: { $type: 'string' } } },
+        { key: { status: 1, runAt: 1 } },
+        { key: { status: 1, lockedUntil: 1 } },
+        { key: { finishedAt: 1 }, expireAfterSeconds: DONE_TTL_SECONDS }
+      ]).catch((error) => {
+        indexesReady = null;
+        throw error;
+      });
+    }
+    return indexesReady;
+  }
+
+  async function claim(db) {
+    const now = new Date();
+    return db.collection('jobs').findOneAndUpdate(
+      {
+        $or: [
+          { status: 'QUEUED', runAt: { $lte: now } },
+          { status: 'RUNNING', lockedUntil: { $lt: now } }
+        ]
+      },
+      {
+        $set: { status: 'RUNNING', lockedUntil: new Date(now.getTime() + lockMs), startedAt: now },
+        $inc: { attempts: 1 }
+      },
+      { sort: { runAt: 1 }, returnDocument: 'after', projection: { _id: 0 } }
+    );
+  }
+
+  async function runJob(db, job) {
+    lags.push(Math.max(0, job.startedAt - job.runAt));
+    if (lags.length > LAG_SAMPLES) lags.shift();
+    totals.started++;
+
+    const jobs = db.collection('jobs');
+    try {
+      const handler = handlers[job.type];
+      if (!handler) throw new Error(`No handler for job type ${job.type}`);
+      await handler(db, job.payload);
+      // Keyed on attempts: a worker whose claim expired must not overwrite
+      // the outcome of the worker that claimed the job after it
+      await jobs.updateOne(
+        { id: job.id, attempts: job.attempts },
+        { $set: { status: 'DONE', finishedAt: new Date() }, $unset: { lockedUntil: '' } }
+      );
+      totals.done++;
+    } catch (error) {
+      const retry = job.attempts < maxAttempts;
+      await jobs.updateOne(
+        { id: job.id, attempts: job.attempts },
+        retry
+          ? {
+            $set: {
+              status: 'QUEUED',
+              runAt: new Date(Date.now() + backoffMs * 2 ** (job.attempts - 1)),
+              lastError: error.message
+            },
+            $unset: { lockedUntil: '' }
+          }
+          : { $set: { status: 'FAILED', finishedAt: new Date(), lastError: error.message }, $unset: { lockedUntil: '' } }
+      );
+      totals[retry ? 'retried' : 'failed']++;
+    }
+  }
+
+  // Claims and runs due jobs until none are left or all slots are busy
+  async function drain() {
+    if (draining) {
+      wakeAgain = true;
+      return;
+    }
+    draining = true;
+    try {
+      const db = await getDb();
+      await ensureIndexes(db);
+      do {
+        wakeAgain = false;
+        while (inFlight < concurrency) {
+          const job = await claim(db);
+          if (!job) break;
+          inFlight++;
+          runJob(db, job)
+            .catch((error) => console.error('Job failed', job.id, error))
+            .finally(() => {
+              inFlight--;
+              wake();
+            });
+        }
+      } while (wakeAgain);
+    } catch (error) {
+      console.error('Job queue poll failed', error);
+    } finally {
+      draining = false;
+    }
+  }
+
+  function wake() {
+    detached(() => {
+      drain();
+    });
+  }
+
+  function start() {
+    if (started) return;
+    started = true;
+    detached(() => {
+      (async () => {
+        for (;;) {
+          await drain();
+          await sleep(pollMs);
+        }
+      })();
+    });
+  }
+
+  // Queues a job and returns it; with a `key` that is already known, the
+  // existing job instead, queued again if it had failed
+  async function enqueue(db, type, payload, { key = null, delayMs = 0 } = {}) {
+    await ensureIndexes(db);
+    start();
+    const now = new Date();
+    const job = {
+      id: uuidv4(),
+      type,
+      payload,
+      status: 'QUEUED',
+      attempts: 0,
+      runAt: new Date(now.getTime() + delayMs),
+      createdAt: now
+    };
+    if (key) job.key = key;
+    try {
+      await db.collection('jobs').insertOne(job);
+    } catch (error) {
+      if (error.code !== 11000 || !key) throw error;
+      const retried = await db.collection('jobs').findOneAndUpdate(
+        { key, status: 'FAILED' },
+        {
+          $set: { type, payload, status: 'QUEUED', attempts: 0, runAt: job.runAt },
+          $unset: { finishedAt: '', startedAt: '' }
+        },
+        { returnDocument: 'after', projection: { _id: 0 } }
+      );
+      if (!retried) return db.collection('jobs').findOne({ key }, { projection: { _id: 0 } });
+      wake();
+      return retried;
+    }
+    wake();
+    return job;
+  }
+
+  // Queue depth by status, the lag of the oldest due job and recent start lag
+  async function stats(db) {
+    await ensureIndexes(db);
+    start();
+    const now = new Date();
+    const statuses = ['QUEUED', 'RUNNING', 'DONE', 'FAILED'];
+    const [oldest, ...counts] = await Promise.all([
+      db.collection('jobs').findOne(
+        { status: 'QUEUED', runAt: { $lte: now } },
+        { sort: { runAt: 1 }, projection: { _id: 0, runAt: 1 } }
+      ),
+      ...statuses.map((status) => db.collection('jobs').countDocuments({ status }))
+    ]);
+    const sorted = [...lags].sort((a, b) => a - b);
+    return {
+      depth: Object.fromEntries(statuses.map((status, i) => [status.toLowerCase(), counts[i]])),
+      oldestDueMs: oldest ? now - oldest.runAt : 0,
+      lagMs: { p50: percentile(sorted, 0.5), p95: percentile(sorted, 0.95), max: sorted[sorted.length - 1] || 0 },
+      inFlight,
+      concurrency,
+      totals: { ...totals }
+    };
+  }
+
+  return { enqueue, stats, start };
+}
@@ -0,0 +1,62 @@
+import { idTimestamp } from './ids';
+import { json } from './respond';
+
+// Message history paging.
+//
+// GET conversations/:id/messages returns the whole history unless the
+// client asks for a page with ?limit and/or ?before. Pages run newest
+// first on (createdAt, id) and `before` is the id of the oldest message the
+// client already has. New message ids are UUIDv7 with createdAt taken from
+// the id, so the cursor's position comes straight out of the id; older v4
+// ids cost one lookup of the cursor message.
+
+export const DEFAULT_MESSAGE_PAGE = 50;
+export const MAX_MESSAGE_PAGE = 100;
+
+let indexesReady = null;
+
+export function ensureMessageIndexes(db) {
+  if (!indexesReady) {
+    indexesReady = Promise.all([
+      db.collection('messages').createIndex({ id: 1 }, { unique: true }),
+      db.collection('messages').createIndex({ conversationId: 1, createdAt: -1, id: -1 })
+    ]).catch((error) => {
+      indexesReady = null;
+      throw error;
+    });
+  }
+  return indexesReady;
+}
+
+// Middleware: ?limit and ?before into ctx.messagePage, or null for the
+// whole history
+export async function selectMessagePage(ctx) {
+  const { searchParams } = new URL(ctx.request.url);
+  const before = searchParams.get('before');
+  const limitParam = searchParams.get('limit');
+  if (before === null && limitParam === null) {
+    ctx.messagePage = null;
+    return;
+  }
+
+  const limit = limitParam === null ? DEFAULT_MESSAGE_PAGE : Number(limitParam);
+  if (!Number.isInteger(limit) || limit < 1 || limit > MAX_MESSAGE_PAGE) {
+    return json({ error: `limit must be between 1 and ${MAX_MESSAGE_PAGE}` }, { status: 400 });
+  }
+  ctx.messagePage = { before: before || null, limit };
+}
+
+// Filter for messages older than the cursor message, or null if the cursor
+// is not a message of the conversation
+export async function olderThanCursor(db, conversationId, before) {
+  let createdAt = idTimestamp(before);
+  if (!createdAt) {
+    const cursor = await db.collection('messages').findOne(
+      { conversationId, id: before },
+      { projection: { _id: 0, createdAt: 1 } }
+    );
+    if (!cursor) return null;
+    createdAt = cursor.createdAt;
+  }
+  return { $or: [{ createdAt: { $lt: createdAt } }, { createdAt, id: { $lt: before } }] };
+}
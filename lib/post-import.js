@@ -0,0 +1,224 @@
+import { v4 as uuidv4 } from 'uuid';
+
+// Bulk post import (POST posts/import).
+//
+// The request body is NDJSON (one post per line) or CSV with a header row,
+// parsed as it streams in. Each row is validated on its own and valid rows
+// are upserted with bulkWrite, IMPORT_BATCH at a time, keyed by the
+// organizer's own `externalId`: importing the same feed again updates the
+// posts it created instead of duplicating them. Invalid rows and failed
+// writes come back as per-row errors ({row, externalId, error}, rows
+// counted from 1 after any CSV header) and never fail the rest of the
+// import.
+
+export const IMPORT_BATCH = 1000;
+export const MAX_IMPORT_ROWS = 10000;
+const MAX_ERRORS = 1000;
+const POST_TYPES = ['HACKATHON', 'PROJECT'];
+const TEXT_LIMITS = { externalId: 200, title: 200, location: 200, websiteUrl: 500, notes: 5000 };
+
+let indexesReady = null;
+
+export function ensureImportIndexes(db) {
+  if (!indexesReady) {
+    indexesReady = db.collection('posts')
+      .createIndex(
+        { leaderId: 1, externalId: 1 },
+        { unique: true, partialFilterExpression: { externalId: { $type: 'string' } } }
+      )
+      .catch((error) => {
+        indexesReady = null;
+        throw error;
+      });
+  }
+  return indexesReady;
+}
+
+async function* textLines(stream) {
+  const decoder = new TextDecoder();
+  let pending = '';
+  for await (const chunk of stream) {
+    pending += decoder.decode(chunk, { stream: true });
+    const lines = pending.split('\n');
+    pending = lines.pop();
+    yield* lines;
+  }
+  pending += decoder.decode();
+  if (pending) yield pending;
+}
+
+// NDJSON rows; a line that is not a JSON object is yielded as { error }
+export async function* ndjsonRows(stream) {
+  for await (const line of textLines(stream)) {
+    if (!line.trim()) continue;
+    try {
+      const row = JSON.parse(line);
+      yield row && typeof row === 'object' && !Array.isArray(row) ? row : { error: 'Row is not a JSON object' };
+    } catch {
+      yield { error: 'Invalid JSON' };
+    }
+  }
+}
+
+// CSV rows as objects keyed by the header row (RFC 4180 quoting; quoted
+// fields may span lines)
+export async function* csvRows(stream) {
+  let header = null;
+  let fields = [];
+  let field = '';
+  let quoted = false;
+
+  for await (const line of textLines(stream)) {
+    const text = line.endsWith('\r') ? line.slice(0, -1) : line;
+    for (let i = 0; i < text.length; i++) {
+      const c = text[i];
+      if (quoted) {
+        if (c === '"' && text[i + 1] === '"') {
+          field += '"';
+          i++;
+        } else if (c === '"') {
+          quoted = false;
+        } else {
+          field += c;
+        }
+      } else if (c === '"' && field === '') {
+        quoted = true;
+      } else if (c === ',') {
+        fields.push(field);
+        field = '';
+      } else {
+        field += c;
+      }
+    }
+    if (quoted) {
+      field += '\n';
+      continue;
+    }
+    fields.push(field);
+    field = '';
+    const record = fields;
+    fields = [];
+
+    if (!header) {
+      header = record.map((name) => name.trim());
+    } else if (record.length > 1 || record[0] !== '') {
+      if (record.length !== header.length) {
+        yield { error: `Expected ${header.length} columns, got ${record.length}` };
+      } else {
+        yield Object.fromEntries(header.map((name, i) => [name, record[i]]));
+      }
+    }
+  }
+  if (quoted) yield { error: 'Unterminated quoted field' };
+}
+
+function text(value) {
+  if (value === undefined || value === null) return null;
+  const trimmed = String(value).trim();
+  return trimmed || null;
+}
+
+// CSV carries lists as `a; b; c`
+function list(value) {
+  if (value === undefined || value === null || value === '') return [];
+  const items = Array.isArray(value) ? value : String(value).split(/[;|]/);
+  return items.map((item) => String(item).trim()).filter(Boolean);
+}
+
+// The post fields of one row, or { error }
+export function validateRow(row) {
+  if (row.error) return { error: row.error };
+
+  const fields = {
+    externalId: text(row.externalId),
+    type: (text(row.type) || 'HACKATHON').toUpperCase(),
+    title: text(row.title),
+    location: text(row.location),
+    websiteUrl: text(row.websiteUrl),
+    skillsNeeded: list(row.skillsNeeded),
+    notes: text(row.notes)
+  };
+
+  if (!fields.externalId) return { error: 'externalId is required' };
+  if (!fields.title) return { error: 'Title is required' };
+  if (!fields.location) return { error: 'Location is required' };
+  if (!POST_TYPES.includes(fields.type)) return { error: `Unknown type: ${fields.type}` };
+  if (fields.websiteUrl && !/^https?:\/\/\S+$/i.test(fields.websiteUrl)) return { error: 'websiteUrl must be an http(s) URL' };
+  for (const [name, limit] of Object.entries(TEXT_LIMITS)) {
+    if (fields[name] && fields[name].length > limit) return { error: `${name} is limited to ${limit} characters` };
+  }
+  return { fields };
+}
+
+// Upserts every valid row of `rows` for `leaderId`. `deriveFields(post)`
+// adds the fields other features index (skill ids, geo point).
+export async function importPosts(db, leaderId, rows, deriveFields) {
+  await ensureImportIndexes(db);
+  const summary = { received: 0, inserted: 0, updated: 0, failed: 0, errors: [] };
+  const fail = (row, externalId, error) => {
+    summary.failed++;
+    if (summary.errors.length < MAX_ERRORS) summary.errors.push({ row, externalId: externalId || null, error });
+  };
+
+  let batch = [];
+  const flush = async () => {
+    if (batch.length === 0) return;
+    const operations = batch.map(({ fields }) => {
+      const now = new Date();
+      return {
+        updateOne: {
+          filter: { leaderId, externalId: fields.externalId },
+          update: {
+            $set: { ...fields, ...deriveFields(fields), updatedAt: now },
+            $setOnInsert: { id: uuidv4(), leaderId, status: 'OPEN', visibility: 'PUBLIC', createdAt: now }
+          },
+          upsert: true
+        }
+      };
+    });
+
+    let result;
+    try {
+      result = await db.collection('posts').bulkWrite(operations, { ordered: false });
+    } catch (error) {
+      if (!error.writeErrors) throw error;
+      result = error.result;
+      for (const writeError of [].concat(error.writeErrors)) {
+        const { row, fields } = batch[writeError.index];
+        fail(row, fields.externalId, writeError.code === 11000 ? 'Duplicate externalId' : writeError.errmsg);
+      }
+    }
+    summary.inserted += result.upsertedCount;
+    // updatedAt is always set, so every matched post counts as updated
+    summary.updated += result.matchedCount;
+    batch = [];
+  };
+
+  // The same externalId twice in one batch would race its own upsert
+  let batchIds = new Set();
+  for await (const raw of rows) {
+    summary.received++;
+    if (summary.received > MAX_IMPORT_ROWS) {
+      summary.received--;
+      summary.truncated = true;
+      break;
+    }
+    const { fields, error } = validateRow(raw);
+    if (error) {
+      fail(summary.received, text(raw.externalId), error);
+      continue;
+    }
+    if (batchIds.has(fields.externalId)) {
+      await flush();
+      batchIds = new Set();
+    }
+    batch.push({ row: summary.received, fields });
+    batchIds.add(fields.externalId);
+    if (batch.length === IMPORT_BATCH) {
+      await flush();
+      batchIds = new Set();
+    }
+  }
+  await flush();
+  return summary;
+}
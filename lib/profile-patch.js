@@ -0,0 +1,118 @@
+// Partial profile updates.
+//
+// A PATCH body names the revision it was based on and the changes to make:
+//
+//   {
+//     "revision": 4,
+//     "set": { "bio": "...", "experience.1.title": "Lead", "preferences.remoteOk": false },
+//     "unset": ["looksToConnect"],
+//     "push": { "skills": ["Rust", "Go"] },
+//     "pull": { "interests": "EdTech" }
+//   }
+//
+// Paths are dotted, with numeric segments addressing array elements, and
+// map straight onto $set / $unset / $push / $pull so Mongo only rewrites
+// the touched fields. `revision` makes the update conditional on the
+// stored profile still being at that revision.
+
+const ARRAY_FIELDS = ['skills', 'interests', 'experience', 'projects', 'awards', 'socials'];
+const TEXT_FIELDS = ['bio', 'looksToConnect'];
+export const PROFILE_FIELDS = [...TEXT_FIELDS, ...ARRAY_FIELDS, 'preferences'];
+
+const FIELD_SEGMENT = /^[A-Za-z][A-Za-z0-9_]*$/;
+const INDEX_SEGMENT = /^\d+$/;
+
+function checkPath(path) {
+  const segments = path.split('.');
+  if (!PROFILE_FIELDS.includes(segments[0])) {
+    return `Unknown profile field: ${segments[0]}`;
+  }
+  if (!segments.slice(1).every((s) => FIELD_SEGMENT.test(s) || INDEX_SEGMENT.test(s))) {
+    return `Invalid path: ${path}`;
+  }
+  return null;
+}
+
+// Whole-field writes must keep the field's type
+function checkValue(path, value) {
+  if (path.includes('.')) return null;
+  if (ARRAY_FIELDS.includes(path) && !Array.isArray(value)) return `${path} must be an array`;
+  if (TEXT_FIELDS.includes(path) && value !== null && typeof value !== 'string') return `${path} must be a string`;
+  if (path === 'preferences' && (value === null || typeof value !== 'object' || Array.isArray(value))) {
+    return 'preferences must be an object';
+  }
+  return null;
+}
+
+function asList(value) {
+  return Array.isArray(value) ? value : [value];
+}
+
+// Returns { update, fields } for updateOne, or { error } for a bad patch.
+// `fields` are the top-level fields the patch touches.
+export function buildProfilePatch(patch) {
+  if (!patch || typeof patch !== 'object') {
+    return { error: 'Invalid patch' };
+  }
+  if (!Number.isInteger(patch.revision) || patch.revision < 0) {
+    return { error: 'revision is required' };
+  }
+
+  const $set = {};
+  const $unset = {};
+  const $push = {};
+  const $pull = {};
+  const paths = [];
+
+  for (const [path, value] of Object.entries(patch.set || {})) {
+    const error = checkPath(path) || checkValue(path, value);
+    if (error) return { error };
+    $set[path] = value;
+    paths.push(path);
+  }
+
+  for (const path of patch.unset || []) {
+    const error = checkPath(path);
+    if (error) return { error };
+    $unset[path] = '';
+    paths.push(path);
+  }
+
+  for (const [field, values] of Object.entries(patch.push || {})) {
+    if (!ARRAY_FIELDS.includes(field)) return { error: `Cannot push to ${field}` };
+    $push[field] = { $each: asList(values) };
+    paths.push(field);
+  }
+
+  for (const [field, values] of Object.entries(patch.pull || {})) {
+    if (!ARRAY_FIELDS.includes(field)) return { error: `Cannot pull from ${field}` };
+    $pull[field] = { $in: asList(values) };
+    paths.push(field);
+  }
+
+  if (paths.length === 0) {
+    return { error: 'Patch has no changes' };
+  }
+
+  // Mongo rejects one update touching a path and its parent or itself twice
+  const sorted = [...paths].sort();
+  for (let i = 1; i < sorted.length; i++) {
+    if (sorted[i] === sorted[i - 1] || sorted[i].startsWith(`${sorted[i - 1]}.`)) {
+      return { error: `Conflicting changes to ${sorted[i - 1]}` };
+    }
+  }
+
+  const update = { $set: { ...$set, updatedAt: new Date() }, $inc: { revision: 1 } };
+  if (Object.keys($unset).length > 0) update.$unset = $unset;
+  if (Object.keys($push).length > 0) update.$push = $push;
+  if (Object.keys($pull).length > 0) update.$pull = $pull;
+
+  const fields = [...new Set(paths.map((path) => path.split('.')[0]))];
+  return { update, fields };
+}
+
+// Matches a profile still at `revision`; profiles written before revisions
+// existed count as revision 0
+export function revisionFilter(userId, revision) {
+  return { userId, revision: revision === 0 ? { $in: [0, null] } : revision };
+}
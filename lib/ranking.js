@@ -0,0 +1,351 @@
+// Preference-aware candidate ranking for explore/people.
+//
+// Every profile is encoded into a compact feature vector: five 256-bit sets
+// of hashed tokens (skills, interests, wanted tech stack, role words and
+// wanted role words) plus a few scalar preferences. Vectors live in one
+// in-process index laid out as flat typed arrays, so scoring a candidate is
+// a handful of AND + popcount operations and a deck is ranked from tens of
+// thousands of candidates in a few milliseconds.
+//
+// The index follows `profiles` incrementally: each sync loads only profiles
+// whose updatedAt is at or past the last one seen, at most every
+// FEATURE_SYNC_MS, so another process's edits show up within that window.
+//
+// compatibility_job.py precomputes each user's top candidates offline into
+// `candidateLists`; decks are served from those lists first and ranked live
+// only when a list is missing, older than CANDIDATE_LIST_MAX_AGE_MS or used
+// up by the viewer's swipes.
+
+const WORDS = 8; // 256 bits per token set
+const BITS = WORDS * 32;
+const SKILLS = 0;
+const INTERESTS = 1;
+const WANTS = 2;
+const ROLES = 3;
+const WANT_ROLES = 4;
+const SEGMENTS = 5;
+const STRIDE = WORDS * SEGMENTS;
+
+const FEATURE_SYNC_MS = Number(process.env.FEATURE_SYNC_SECONDS || 15) * 1000;
+const CANDIDATE_LIST_MAX_AGE_MS = Number(process.env.CANDIDATE_LIST_MAX_AGE_HOURS || 24) * 3600 * 1000;
+
+export const RANK_WEIGHTS = {
+  wantedSkills: 3, // candidate has the viewer's techStack
+  wantedBack: 1.5, // viewer has the candidate's techStack
+  roles: 2, // candidate's headline matches the viewer's desiredRoles
+  interests: 2, // Jaccard of interests + interestTags
+  skills: 1, // Jaccard of skills
+  availability: 0.5, // similar weekly hours
+  notLocal: -2, // viewer is not remoteOk and the candidate is elsewhere
+  candidateNotLocal: -1, // candidate is not remoteOk and the viewer is elsewhere
+  notSearching: -3 // candidate turned searchPeople off
+};
+
+// FNV-1a over the UTF-8 bytes of a token
+function fnv1a(text) {
+  let hash = 0x811c9dc5;
+  const bytes = /^[\x00-\x7f]*$/.test(text) ? text : Buffer.from(text, 'utf8');
+  for (let i = 0; i < bytes.length; i++) {
+    hash ^= typeof bytes === 'string' ? bytes.charCodeAt(i) : bytes[i];
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return hash >>> 0;
+}
+
+function popcount(x) {
+  x -= (x >>> 1) & 0x55555555;
+  x = (x & 0x33333333) + ((x >>> 2) & 0x33333333);
+  return (((x + (x >>> 4)) & 0x0f0f0f0f) * 0x01010101) >>> 24;
+}
+
+export function normalizeToken(token) {
+  return String(token).trim().toLowerCase().replace(/\s+/g, ' ');
+}
+
+function roleWords(texts) {
+  return texts.flatMap((text) => normalizeToken(text || '').split(/[^a-z0-9+#]+/)).filter((w) => w.length > 1);
+}
+
+function setBits(vector, segment, tokens) {
+  const base = segment * WORDS;
+  for (const token of tokens) {
+    if (!token) continue;
+    const bit = fnv1a(normalizeToken(token)) % BITS;
+    vector[base + (bit >>> 5)] |= 1 << (bit & 31);
+  }
+}
+
+// Features for one user from their user document and profile
+export function encodeFeatures(user, profile) {
+  const preferences = profile?.preferences || {};
+  const vector = new Uint32Array(STRIDE);
+  setBits(vector, SKILLS, profile?.skills || []);
+  setBits(vector, INTERESTS, [...(profile?.interests || []), ...(preferences.interestTags || [])]);
+  setBits(vector, WANTS, preferences.techStack || []);
+  setBits(vector, ROLES, roleWords([user?.roleHeadline]));
+  setBits(vector, WANT_ROLES, roleWords(preferences.desiredRoles || []));
+
+  return {
+    userId: user?.id || profile?.userId,
+    vector,
+    remoteOk: preferences.remoteOk !== false,
+    searchPeople: preferences.searchPeople !== false,
+    availabilityHrs: Number(preferences.availabilityHrs) || 0,
+    location: user?.location ? normalizeToken(user.location) : null
+  };
+}
+
+// Viewer/candidate segment pairs compared when scoring
+const COMPARISONS = [[WANTS, SKILLS], [SKILLS, WANTS], [WANT_ROLES, ROLES], [INTERESTS, INTERESTS], [SKILLS, SKILLS]];
+
+// Flattens the viewer's non-zero words per comparison, so scoring skips
+// words that cannot share a bit. Pairs for comparison k are
+// words[bounds[k]..bounds[k + 1]), ANDed with the candidate word at offsets[i].
+function comparisonPlan(viewer) {
+  const words = [];
+  const offsets = [];
+  const bounds = [0];
+  for (const [a, b] of COMPARISONS) {
+    for (let w = 0; w < WORDS; w++) {
+      if (viewer[a * WORDS + w] !== 0) {
+        words.push(viewer[a * WORDS + w]);
+        offsets.push(b * WORDS + w);
+      }
+    }
+    bounds.push(words.length);
+  }
+  return { words: Uint32Array.from(words), offsets: Uint8Array.from(offsets), bounds };
+}
+
+function shared(plan, k, vectors, base) {
+  const { words, offsets, bounds } = plan;
+  let bits = 0;
+  for (let i = bounds[k]; i < bounds[k + 1]; i++) {
+    bits += popcount(words[i] & vectors[base + offsets[i]]);
+  }
+  return bits;
+}
+
+function segmentCounts(vector, offset) {
+  const counts = new Uint16Array(SEGMENTS);
+  for (let s = 0; s < SEGMENTS; s++) {
+    for (let w = 0; w < WORDS; w++) counts[s] += popcount(vector[offset + s * WORDS + w]);
+  }
+  return counts;
+}
+
+export function createFeatureIndex(initialCapacity = 1024) {
+  let capacity = initialCapacity;
+  let size = 0;
+  let vectors = new Uint32Array(capacity * STRIDE);
+  let counts = new Uint16Array(capacity * SEGMENTS);
+  let flags = new Uint8Array(capacity); // bit 0 remoteOk, bit 1 searchPeople
+  let availability = new Float32Array(capacity);
+  const locations = [];
+  const ids = [];
+  const slots = new Map();
+
+  function grow() {
+    capacity *= 2;
+    const resize = (array, width) => {
+      const next = new array.constructor(capacity * width);
+      next.set(array);
+      return next;
+    };
+    vectors = resize(vectors, STRIDE);
+    counts = resize(counts, SEGMENTS);
+    flags = resize(flags, 1);
+    availability = resize(availability, 1);
+  }
+
+  function upsert(features) {
+    let slot = slots.get(features.userId);
+    if (slot === undefined) {
+      if (size === capacity) grow();
+      slot = size++;
+      slots.set(features.userId, slot);
+      ids[slot] = features.userId;
+    }
+    vectors.set(features.vector, slot * STRIDE);
+    counts.set(segmentCounts(features.vector, 0), slot * SEGMENTS);
+    flags[slot] = (features.remoteOk ? 1 : 0) | (features.searchPeople ? 2 : 0);
+    availability[slot] = features.availabilityHrs;
+    locations[slot] = features.location;
+  }
+
+  // Drops a user; the last slot moves into the freed one so scans stay dense
+  function remove(userId) {
+    const slot = slots.get(userId);
+    if (slot === undefined) return;
+    const last = --size;
+    if (slot !== last) {
+      vectors.copyWithin(slot * STRIDE, last * STRIDE, (last + 1) * STRIDE);
+      counts.copyWithin(slot * SEGMENTS, last * SEGMENTS, (last + 1) * SEGMENTS);
+      flags[slot] = flags[last];
+      availability[slot] = availability[last];
+      locations[slot] = locations[last];
+      ids[slot] = ids[last];
+      slots.set(ids[slot], slot);
+    }
+    slots.delete(userId);
+    ids.length = size;
+    locations.length = size;
+  }
+
+  // Top `limit` user ids for the viewer, best first, skipping `exclude`;
+  // `include`, when given, limits candidates to those user ids
+  function rank(viewer, exclude, limit, include = null) {
+    const v = viewer.vector;
+    const candidates = vectors;
+    const plan = comparisonPlan(v);
+    const viewerCounts = segmentCounts(v, 0);
+    const viewerLocation = viewer.location;
+    const viewerAvailability = viewer.availabilityHrs;
+    const wantsNorm = 1 / Math.max(1, viewerCounts[WANTS]);
+    const rolesNorm = 1 / Math.max(1, viewerCounts[WANT_ROLES]);
+
+    // Excluded ids become a slot bitmap so the scan does no hashing
+    const skip = new Uint8Array(size);
+    if (include) {
+      skip.fill(1);
+      for (const userId of include) {
+        const slot = slots.get(userId);
+        if (slot !== undefined) skip[slot] = 0;
+      }
+    }
+    for (const userId of exclude) {
+      const slot = slots.get(userId);
+      if (slot !== undefined) skip[slot] = 1;
+    }
+
+    const topSlots = [];
+    const topScores = [];
+    let floor = -Infinity;
+
+    for (let slot = 0; slot < size; slot++) {
+      if (skip[slot]) continue;
+      const base = slot * STRIDE;
+      const c = slot * SEGMENTS;
+
+      const sharedInterests = shared(plan, 3, candidates, base);
+      const sharedSkills = shared(plan, 4, candidates, base);
+      const local = viewerLocation !== null && viewerLocation === locations[slot];
+      const flag = flags[slot];
+
+      let score =
+        RANK_WEIGHTS.wantedSkills * shared(plan, 0, candidates, base) * wantsNorm +
+        RANK_WEIGHTS.wantedBack * shared(plan, 1, candidates, base) / Math.max(1, counts[c + WANTS]) +
+        RANK_WEIGHTS.roles * shared(plan, 2, candidates, base) * rolesNorm +
+        RANK_WEIGHTS.interests * sharedInterests /
+          Math.max(1, viewerCounts[INTERESTS] + counts[c + INTERESTS] - sharedInterests) +
+        RANK_WEIGHTS.skills * sharedSkills / Math.max(1, viewerCounts[SKILLS] + counts[c + SKILLS] - sharedSkills) +
+        RANK_WEIGHTS.availability * (1 - Math.min(1, Math.abs(viewerAvailability - availability[slot]) / 40));
+
+      if (!viewer.remoteOk && !local) score += RANK_WEIGHTS.notLocal;
+      if (!(flag & 1) && !local) score += RANK_WEIGHTS.candidateNotLocal;
+      if (!(flag & 2)) score += RANK_WEIGHTS.notSearching;
+
+      if (score <= floor) continue;
+
+      // Insertion into the small sorted top list
+      let i = topScores.length === limit ? limit - 1 : topScores.length;
+      while (i > 0 && topScores[i - 1] < score) {
+        topScores[i] = topScores[i - 1];
+        topSlots[i] = topSlots[i - 1];
+        i--;
+      }
+      topScores[i] = score;
+      topSlots[i] = slot;
+      if (topScores.length === limit) floor = topScores[limit - 1];
+    }
+
+    return topSlots.map((slot, i) => ({ userId: ids[slot], score: topScores[i] }));
+  }
+
+  return { upsert, remove, rank, has: (userId) => slots.has(userId), size: () => size };
+}
+
+const featureIndex = createFeatureIndex();
+let syncedUpTo = null;
+let syncedAt = 0;
+let staleMarks = 0;
+let syncing = null;
+let indexesReady = null;
+
+function ensureRankingIndexes(db) {
+  if (!indexesReady) {
+    indexesReady = db.collection('profiles').createIndex({ updatedAt: 1 }).catch((error) => {
+      indexesReady = null;
+      throw error;
+    });
+  }
+  return indexesReady;
+}
+
+async function loadChangedProfiles(db) {
+  await ensureRankingIndexes(db);
+
+  const filter = syncedUpTo ? { updatedAt: { $gte: syncedUpTo } } : {};
+  const profiles = await db.collection('profiles')
+    .find(filter, { projection: { _id: 0, userId: 1, skills: 1, interests: 1, preferences: 1, updatedAt: 1 } })
+    .toArray();
+  if (profiles.length === 0) return;
+
+  const users = await db.collection('users')
+    .find({ id: { $in: profiles.map((p) => p.userId) } }, { projection: { _id: 0, id: 1, roleHeadline: 1, location: 1 } })
+    .toArray();
+  const usersById = new Map(users.map((u) => [u.id, u]));
+
+  for (const profile of profiles) {
+    const user = usersById.get(profile.userId);
+    if (user) featureIndex.upsert(encodeFeatures(user, profile));
+    if (profile.updatedAt && (!syncedUpTo || profile.updatedAt > syncedUpTo)) {
+      syncedUpTo = profile.updatedAt;
+    }
+  }
+}
+
+// Brings the shared index up to date (at most every FEATURE_SYNC_MS)
+export async function syncFeatureIndex(db) {
+  if (Date.now() - syncedAt >= FEATURE_SYNC_MS) {
+    if (!syncing) {
+      const started = Date.now();
+      const marks = staleMarks;
+      syncing = loadChangedProfiles(db)
+        .then(() => {
+          // A write marked stale mid-sync may not have been read yet
+          if (marks === staleMarks) syncedAt = started;
+        })
+        .finally(() => { syncing = null; });
+    }
+    await syncing;
+  }
+  return featureIndex;
+}
+
+// Applies a profile written by this process without waiting for a sync
+export function updateFeatures(user, profile) {
+  featureIndex.upsert(encodeFeatures(user, profile));
+}
+
+// Stops ranking a deleted user. Profile syncs never see a deletion, so
+// other processes drop the user when a deck fails to hydrate them.
+export function removeFeatures(userId) {
+  featureIndex.remove(userId);
+}
+
+// Makes the next request sync, for writes that did not return the profile
+export function markFeaturesStale() {
+  staleMarks += 1;
+  syncedAt = 0;
+}
+
+// Up to `limit` precomputed candidates for the user, skipping `exclude`
+export async function precomputedCandidates(db, userId, exclude, limit) {
+  const list = await db.collection('candidateLists').findOne(
+    { userId },
+    { projection: { _id: 0, candidates: 1, computedAt: 1 } }
+  );
+  if (!list || Date.now() - list.computedAt > CANDIDATE_LIST_MAX_AGE_MS) return [];
+  return list.candidates.filter((id) => !exclude.has(id)).slice(0, limit);
+}
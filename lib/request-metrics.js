@@ -0,0 +1,116 @@
+import { AsyncLocalStorage } from 'async_hooks';
+
+// Per-request instrumentation.
+//
+// Each API request runs inside an AsyncLocalStorage scope holding its
+// metrics. Mongo driver command monitoring attributes every command to the
+// request that issued it, and handlers time named phases (auth, serialize)
+// with `timed` / `recordPhase`. The totals go out in a Server-Timing
+// header, e.g.
+//
+//   Server-Timing: auth;dur=1.2, db;dur=4.8;desc="6 queries", serialize;dur=0.1, total;dur=7.5
+//
+// `db` is the summed duration of all commands, so it can exceed `total`
+// when a handler runs queries concurrently. Counters recorded with
+// `increment` (cache hits, etc.) are appended as `name;desc="n"` entries.
+
+const storage = new AsyncLocalStorage();
+
+// Driver requestId -> metrics of the request that started the command
+const inflight = new Map();
+
+// Connection handshakes and heartbeats are not the handler's queries
+const IGNORED_COMMANDS = new Set(['hello', 'ismaster', 'isMaster', 'ping', 'saslStart', 'saslContinue', 'endSessions']);
+
+export function createRequestMetrics() {
+  return {
+    startedAt: performance.now(),
+    queries: 0,
+    commands: {},
+    phases: { auth: 0, db: 0, serialize: 0 },
+    counters: {}
+  };
+}
+
+export function runWithMetrics(metrics, fn) {
+  return storage.run(metrics, fn);
+}
+
+export function currentMetrics() {
+  return storage.getStore();
+}
+
+// Runs `fn` outside the current request, so background work a handler
+// starts is not counted against it
+export function detached(fn) {
+  return storage.exit(fn);
+}
+
+export function recordPhase(phase, ms) {
+  const metrics = storage.getStore();
+  if (metrics) {
+    metrics.phases[phase] = (metrics.phases[phase] || 0) + ms;
+  }
+}
+
+export function increment(counter, n = 1) {
+  const metrics = storage.getStore();
+  if (metrics && n) {
+    metrics.counters[counter] = (metrics.counters[counter] || 0) + n;
+  }
+}
+
+// Runs `fn` and adds its wall time to the named phase
+export async function timed(phase, fn) {
+  const started = performance.now();
+  try {
+    return await fn();
+  } finally {
+    recordPhase(phase, performance.now() - started);
+  }
+}
+
+// Subscribes to driver command events. The client must be created with
+// `monitorCommands: true`.
+export function trackCommands(client) {
+  client.on('commandStarted', (event) => {
+    const metrics = storage.getStore();
+    if (!metrics || IGNORED_COMMANDS.has(event.commandName)) return;
+
+    metrics.queries += 1;
+    metrics.commands[event.commandName] = (metrics.commands[event.commandName] || 0) + 1;
+    inflight.set(event.requestId, metrics);
+  });
+
+  const finish = (event) => {
+    const metrics = inflight.get(event.requestId);
+    if (!metrics) return;
+
+    inflight.delete(event.requestId);
+    metrics.phases.db += event.duration;
+  };
+
+  client.on('commandSucceeded', finish);
+  client.on('commandFailed', finish);
+}
+
+export function formatServerTiming(metrics) {
+  const total = performance.now() - metrics.startedAt;
+  const { auth, db, serialize, ...rest } = metrics.phases;
+  const entries = [
+    `auth;dur=${auth.toFixed(1)}`,
+    `db;dur=${db.toFixed(1)};desc="${metrics.queries} queries"`,
+    `serialize;dur=${serialize.toFixed(1)}`
+  ];
+
+  for (const [phase, ms] of Object.entries(rest)) {
+    entries.push(`${phase};dur=${ms.toFixed(1)}`);
+  }
+
+  for (const [counter, value] of Object.entries(metrics.counters)) {
+    entries.push(`${counter};desc="${value}"`);
+  }
+
+  entries.push(`total;dur=${total.toFixed(1)}`);
+  return entries.join(', ');
+}
@@ -0,0 +1,164 @@
+import crypto from 'crypto';
+import zlib from 'zlib';
+import { NextResponse } from 'next/server';
+import { encodeCbor, encodeMsgpack } from './binary-encoding';
+import { recordPhase } from './request-metrics';
+
+// Response bodies are negotiated per request.
+//
+// Handlers return json(body) (or conditionalJson), which only describes the
+// response. encodeResponse() then picks the encoding from `Accept`
+// (JSON by default, or MessagePack/CBOR), compresses bodies of at least
+// COMPRESSION_THRESHOLD_BYTES with brotli or gzip per `Accept-Encoding`,
+// and answers If-None-Match with 304 before anything is serialized.
+//
+// Next's own `compress` stays on for pages and static assets. It would gzip
+// API responses a second time round, below this threshold and regardless
+// of the ETag suffix, so every API response carries `no-transform`, which
+// Next's compression (like any proxy) leaves alone.
+
+const COMPRESSION_THRESHOLD = Number(process.env.COMPRESSION_THRESHOLD_BYTES || 1024);
+// Brotli's default quality (11) is meant for static assets and far too slow per request
+const BROTLI_OPTIONS = { params: { [zlib.constants.BROTLI_PARAM_QUALITY]: 4 } };
+
+const FORMATS = {
+  json: { type: 'application/json', encode: (body) => Buffer.from(JSON.stringify(body)) },
+  msgpack: { type: 'application/msgpack', encode: encodeMsgpack },
+  cbor: { type: 'application/cbor', encode: encodeCbor }
+};
+
+const MEDIA_TYPES = {
+  'application/json': 'json',
+  'application/msgpack': 'msgpack',
+  'application/x-msgpack': 'msgpack',
+  'application/vnd.msgpack': 'msgpack',
+  'application/cbor': 'cbor'
+};
+
+const ENCODINGS = { br: 'br', gzip: 'gzip' };
+
+const COMPRESSORS = {
+  br: (payload) => zlib.brotliCompressSync(payload, BROTLI_OPTIONS),
+  gzip: (payload) => zlib.gzipSync(payload)
+};
+
+class JsonResult {
+  constructor(build, init, etag) {
+    this.build = build;
+    this.init = init;
+    this.etag = etag;
+  }
+}
+
+// Describes a JSON-shaped response; encoded by encodeResponse()
+export function json(body, init = {}) {
+  return new JsonResult(() => body, init, null);
+}
+
+// `id:timestamp` for a stored document, from its updatedAt or createdAt
+export function documentVersion(doc) {
+  if (!doc) return 'none';
+  const stamp = doc.updatedAt || doc.createdAt;
+  return `${doc.id || doc.userId}:${stamp instanceof Date ? stamp.getTime() : stamp}`;
+}
+
+// Strong ETag over the versions a response is built from. Responses built
+// from the same document versions are identical, so no body is hashed.
+export function versionTag(...versions) {
+  const hash = crypto.createHash('sha1');
+  for (const version of versions) {
+    hash.update(String(version)).update('\0');
+  }
+  return `"${hash.digest('base64url')}"`;
+}
+
+// json() with an ETag. The body is only built when the client's
+// If-None-Match does not already hold the tag.
+export function conditionalJson(etag, build, init = {}) {
+  return new JsonResult(build, init, etag);
+}
+
+// Parses `type;q=0.5, other` into [[type, q]] in header order
+function parseQualities(header) {
+  if (!header) return [];
+  return header.split(',').map((entry) => {
+    const [name, ...params] = entry.split(';');
+    const q = params.map((p) => p.trim()).find((p) => p.startsWith('q='));
+    return [name.trim().toLowerCase(), q ? Number(q.slice(2)) : 1];
+  });
+}
+
+// Highest-quality supported entry of an Accept-style header, else
+// fallback. Ties go to the value listed first in `preference`.
+function negotiate(header, supported, preference, fallback) {
+  let best = fallback;
+  let bestQ = 0;
+  for (const [name, q] of parseQualities(header)) {
+    const value = supported[name];
+    if (!value || q <= 0) continue;
+    if (q > bestQ || (q === bestQ && preference.indexOf(value) < preference.indexOf(best))) {
+      best = value;
+      bestQ = q;
+    }
+  }
+  return best;
+}
+
+// Keeps Next's compression off an API response
+function markEncoded(headers) {
+  const cacheControl = headers.get('Cache-Control');
+  if (!/\bno-transform\b/i.test(cacheControl || '')) {
+    headers.set('Cache-Control', cacheControl ? `${cacheControl}, no-transform` : 'no-transform');
+  }
+}
+
+function matchesTag(ifNoneMatch, etag) {
+  if (!ifNoneMatch) return false;
+  if (ifNoneMatch.trim() === '*') return true;
+  // If-None-Match uses the weak comparison
+  return ifNoneMatch.split(',').some((tag) => tag.trim().replace(/^W\//, '') === etag);
+}
+
+// Turns a handler's result into the Response sent to this client
+export function encodeResponse(request, result) {
+  if (!(result instanceof JsonResult)) {
+    markEncoded(result.headers);
+    return result;
+  }
+
+  const format = negotiate(request.headers.get('accept'), MEDIA_TYPES, ['msgpack', 'cbor', 'json'], 'json');
+  const encoding = negotiate(request.headers.get('accept-encoding'), ENCODINGS, ['br', 'gzip'], null);
+
+  const headers = new Headers(result.init.headers);
+  headers.set('Vary', 'Accept, Accept-Encoding');
+
+  // Each representation of a version gets its own strong tag. Whether the
+  // body gets compressed depends on its size, which is unknown until it is
+  // built, so the tag names the encoding the client would get.
+  let etag = null;
+  if (result.etag) {
+    const suffix = [format !== 'json' && format, encoding].filter(Boolean).join('-');
+    etag = suffix ? `${result.etag.slice(0, -1)}-${suffix}"` : result.etag;
+    headers.set('ETag', etag);
+    headers.set('Cache-Control', 'private, no-cache');
+  }
+  markEncoded(headers);
+  if (etag && matchesTag(request.headers.get('if-none-match'), etag)) {
+    return new NextResponse(null, { status: 304, headers });
+  }
+
+  const started = performance.now();
+  let payload = FORMATS[format].encode(result.build());
+  recordPhase('serialize', performance.now() - started);
+  headers.set('content-type', FORMATS[format].type);
+
+  if (encoding && payload.length >= COMPRESSION_THRESHOLD) {
+    const compressStarted = performance.now();
+    payload = COMPRESSORS[encoding](payload);
+    recordPhase('compress', performance.now() - compressStarted);
+    headers.set('Content-Encoding', encoding);
+  }
+  headers.set('Content-Length', String(payload.length));
+
+  return new NextResponse(payload, { ...result.init, headers });
+}
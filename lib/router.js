@@ -0,0 +1,137 @@
+// Route table for the catch-all API handler.
+//
+// Routes are registered as method + pattern pairs, where a pattern is a
+// path relative to /api such as `conversations/:id/messages`. Patterns are
+// compiled into one segment trie per method, and dispatch walks the
+// `params.path` array Next.js already split for us, so no path string is
+// ever rebuilt. Static segments always win over parameter segments, so
+// registration order does not matter.
+
+const PARAM_TYPES = {
+  string: (value) => value,
+  int: (value) => (/^-?\d+$/.test(value) ? Number(value) : undefined)
+};
+
+const SEGMENT_PATTERN = /^:([A-Za-z_][A-Za-z0-9_]*)(?:\((\w+)\))?$/;
+
+function createNode() {
+  return { children: new Map(), param: null, route: null };
+}
+
+// `:id` matches any segment, `:page(int)` only matches integers and hands
+// the handler a number.
+function compileSegment(segment) {
+  if (!segment.startsWith(':')) {
+    return { static: true, value: segment };
+  }
+
+  const parsed = SEGMENT_PATTERN.exec(segment);
+  if (!parsed) {
+    throw new Error(`Invalid route segment: ${segment}`);
+  }
+
+  const type = parsed[2] || 'string';
+  if (!PARAM_TYPES[type]) {
+    throw new Error(`Unknown route parameter type: ${type}`);
+  }
+
+  return { static: false, name: parsed[1], type, parse: PARAM_TYPES[type] };
+}
+
+function walk(node, segments, index) {
+  if (index === segments.length) {
+    return node.route ? { route: node.route, params: {} } : null;
+  }
+
+  const segment = segments[index];
+  const child = node.children.get(segment);
+  if (child) {
+    const found = walk(child, segments, index + 1);
+    if (found) return found;
+  }
+
+  if (node.param) {
+    const value = node.param.parse(segment);
+    if (value !== undefined) {
+      const found = walk(node.param.node, segments, index + 1);
+      if (found) {
+        found.params[node.param.name] = value;
+        return found;
+      }
+    }
+  }
+
+  return null;
+}
+
+export function createRouter() {
+  const tries = new Map();
+
+  // add(method, pattern, ...middleware, handler)
+  function add(method, pattern, ...stack) {
+    const handler = stack.pop();
+    if (typeof handler !== 'function') {
+      throw new Error(`Missing handler for ${method} ${pattern}`);
+    }
+
+    const route = { method, pattern, middleware: stack, handler };
+    const segments = pattern.split('/').filter(Boolean);
+    const compiled = segments.map(compileSegment);
+
+    if (!tries.has(method)) {
+      tries.set(method, createNode());
+    }
+
+    let node = tries.get(method);
+    for (const segment of compiled) {
+      if (segment.static) {
+        if (!node.children.has(segment.value)) {
+          node.children.set(segment.value, createNode());
+        }
+        node = node.children.get(segment.value);
+        continue;
+      }
+
+      if (!node.param) {
+        node.param = { name: segment.name, type: segment.type, parse: segment.parse, node: createNode() };
+      } else if (node.param.name !== segment.name || node.param.type !== segment.type) {
+        throw new Error(`Conflicting parameter :${segment.name} in ${method} ${pattern}`);
+      }
+      node = node.param.node;
+    }
+
+    if (node.route) {
+      throw new Error(`Duplicate route: ${method} ${pattern}`);
+    }
+    node.route = route;
+    return route;
+  }
+
+  // Resolves a request to `{ route, params }`, or null when nothing matches.
+  // `segments` is the catch-all `params.path` array Next.js hands us.
+  function match(method, segments) {
+    const root = tries.get(method);
+    return root ? walk(root, segments, 0) : null;
+  }
+
+  return {
+    add,
+    match,
+    get: (pattern, ...stack) => add('GET', pattern, ...stack),
+    post: (pattern, ...stack) => add('POST', pattern, ...stack),
+    put: (pattern, ...stack) => add('PUT', pattern, ...stack),
+    patch: (pattern, ...stack) => add('PATCH', pattern, ...stack),
+    delete: (pattern, ...stack) => add('DELETE', pattern, ...stack)
+  };
+}
+
+// Runs a matched route. Middleware receives the shared context object and
+// may attach to it (e.g. `ctx.user`); returning a response short-circuits
+// the remaining middleware and the handler.
+export async function runRoute(route, ctx) {
+  for (const middleware of route.middleware) {
+    const response = await middleware(ctx);
+    if (response) return response;
+  }
+  return route.handler(ctx);
+}
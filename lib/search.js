@@ -0,0 +1,168 @@
+import { json } from './respond';
+
+// Full-text search over posts and people.
+//
+// Mongo text indexes do the matching and relevance: posts index title,
+// skillsNeeded and notes, profiles index bio and skills, users index name
+// and roleHeadline. A person's score is their profile score plus their
+// user score. Results are ordered by textScore and paged with page/limit;
+// `all` merges posts and people by score.
+//
+// Each text query is capped at the depth the requested page needs, so
+// results are approximate beyond it: a person ranked just below the cap in
+// both profiles and users is not seen even if their summed score would
+// place them on the page. People seen in only one of the two queries get
+// their other score filled in, so everyone returned is ranked by their
+// full score. `hasMore` only says that more results were seen.
+//
+// Highlights are computed here rather than by Mongo: each matched field
+// comes back as a short snippet plus [start, end) offsets of the words that
+// matched a query term, so clients can mark them up however they like.
+
+export const SEARCH_TYPES = ['all', 'posts', 'people'];
+const MAX_QUERY_LENGTH = 200;
+const MAX_LIMIT = 50;
+const DEFAULT_LIMIT = 20;
+const MAX_PAGE = 50;
+const SNIPPET_CHARS = 160;
+
+const TEXT_INDEXES = {
+  posts: { fields: { title: 'text', skillsNeeded: 'text', notes: 'text' }, weights: { title: 5, skillsNeeded: 3, notes: 1 } },
+  profiles: { fields: { skills: 'text', bio: 'text' }, weights: { skills: 3, bio: 1 } },
+  users: { fields: { name: 'text', roleHeadline: 'text' }, weights: { name: 4, roleHeadline: 2 } }
+};
+
+let indexesReady = null;
+
+// Text indexes, created once per process
+export function ensureSearchIndexes(db) {
+  if (!indexesReady) {
+    indexesReady = Promise.all(Object.entries(TEXT_INDEXES).map(([collection, { fields, weights }]) =>
+      db.collection(collection).createIndex(fields, { weights, name: `${collection}_search` })
+    )).catch((error) => {
+      indexesReady = null;
+      throw error;
+    });
+  }
+  return indexesReady;
+}
+
+function positiveInt(value, fallback) {
+  if (value === null) return fallback;
+  return /^\d+$/.test(value) && Number(value) > 0 ? Number(value) : NaN;
+}
+
+// Middleware: validates q, type, page and limit into ctx.search
+export async function selectSearch(ctx) {
+  const { searchParams } = new URL(ctx.request.url);
+  const q = (searchParams.get('q') || '').trim();
+  const type = searchParams.get('type') || 'all';
+  const page = positiveInt(searchParams.get('page'), 1);
+  const limit = positiveInt(searchParams.get('limit'), DEFAULT_LIMIT);
+
+  if (!q) return json({ error: 'q is required' }, { status: 400 });
+  if (q.length > MAX_QUERY_LENGTH) return json({ error: `q is limited to ${MAX_QUERY_LENGTH} characters` }, { status: 400 });
+  if (!SEARCH_TYPES.includes(type)) return json({ error: `Unknown type: ${type}` }, { status: 400 });
+  if (!(page <= MAX_PAGE)) return json({ error: `page must be between 1 and ${MAX_PAGE}` }, { status: 400 });
+  if (!(limit <= MAX_LIMIT)) return json({ error: `limit must be between 1 and ${MAX_LIMIT}` }, { status: 400 });
+
+  await ensureSearchIndexes(ctx.db);
+  ctx.search = { q, type, page, limit, terms: queryTerms(q) };
+}
+
+// Lowercased words of the query, without negated terms. Text search stems
+// words, so highlighting matches longer terms on a shared prefix (a crude
+// stem) and short ones exactly.
+export function queryTerms(q) {
+  const terms = new Set();
+  for (const match of q.toLowerCase().matchAll(/(^|\s)(-?)"?([\p{L}\p{N}+#.]+)/gu)) {
+    if (match[2] !== '-') {
+      for (const word of match[3].split('.').filter((w) => w.length > 1)) terms.add(word);
+    }
+  }
+  return [...terms];
+}
+
+function stem(word) {
+  return word.length > 4 ? word.slice(0, Math.max(4, word.length - 3)) : word;
+}
+
+// [start, end) offsets of words in `text` that match a query term
+function matchRanges(text, stems) {
+  const ranges = [];
+  for (const match of text.matchAll(/[\p{L}\p{N}+#]+/gu)) {
+    const word = match[0].toLowerCase();
+    if (stems.some((s) => (s.length < 4 ? word === s : word.startsWith(s)))) {
+      ranges.push([match.index, match.index + match[0].length]);
+    }
+  }
+  return ranges;
+}
+
+// Snippet of each field that matched, with match offsets relative to it
+export function highlight(doc, fields, terms) {
+  const stems = terms.map(stem);
+  const highlights = [];
+  for (const field of fields) {
+    const value = doc?.[field];
+    const text = Array.isArray(value) ? value.join(', ') : value;
+    if (typeof text !== 'string' || !text) continue;
+
+    const ranges = matchRanges(text, stems);
+    if (ranges.length === 0) continue;
+
+    // Center the snippet on the first match
+    let start = 0;
+    if (text.length > SNIPPET_CHARS) {
+      start = Math.max(0, Math.min(ranges[0][0] - SNIPPET_CHARS / 4, text.length - SNIPPET_CHARS));
+      const space = text.lastIndexOf(' ', start);
+      start = space > 0 && start - space < 20 ? space + 1 : Math.floor(start);
+    }
+    const end = Math.min(text.length, start + SNIPPET_CHARS);
+    highlights.push({
+      field,
+      text: text.slice(start, end),
+      truncated: start > 0 || end < text.length,
+      matches: ranges.filter(([s, e]) => s >= start && e <= end).map(([s, e]) => [s - start, e - start])
+    });
+  }
+  return highlights;
+}
+
+// Top `count` documents of a collection for the query, best first
+export function textSearch(db, collection, q, filter, projection, count) {
+  return db.collection(collection)
+    .find({ $text: { $search: q }, ...filter }, { projection: { ...projection, score: { $meta: 'textScore' } } })
+    .sort({ score: { $meta: 'textScore' } })
+    .limit(count)
+    .toArray();
+}
+
+// People ranked by profile score plus user score, best first
+export async function searchPeople(db, q, count) {
+  const [profiles, users] = await Promise.all([
+    textSearch(db, 'profiles', q, {}, { _id: 0, userId: 1 }, count),
+    textSearch(db, 'users', q, {}, { _id: 0, id: 1 }, count)
+  ]);
+  const profileIds = new Set(profiles.map((profile) => profile.userId));
+  const userIds = new Set(users.map((user) => user.id));
+  const onlyUsers = [...userIds].filter((id) => !profileIds.has(id));
+  const onlyProfiles = [...profileIds].filter((id) => !userIds.has(id));
+
+  // The other half of the score for people only one query returned
+  const [moreProfiles, moreUsers] = await Promise.all([
+    onlyUsers.length === 0 ? [] : textSearch(
+      db, 'profiles', q, { userId: { $in: onlyUsers } }, { _id: 0, userId: 1 }, onlyUsers.length
+    ),
+    onlyProfiles.length === 0 ? [] : textSearch(
+      db, 'users', q, { id: { $in: onlyProfiles } }, { _id: 0, id: 1 }, onlyProfiles.length
+    )
+  ]);
+
+  const scores = new Map();
+  for (const profile of [...profiles, ...moreProfiles]) {
+    scores.set(profile.userId, (scores.get(profile.userId) || 0) + profile.score);
+  }
+  for (const user of [...users, ...moreUsers]) scores.set(user.id, (scores.get(user.id) || 0) + user.score);
+  return [...scores].map(([userId, score]) => ({ userId, score })).sort((a, b) => b.score - a.score);
+}
@@ -0,0 +1,207 @@
+import crypto from 'crypto';
+import { v4 as uuidv4 } from 'uuid';
+import { uuidv7 } from './ids';
+
+// Session tokens.
+//
+// SESSION_MODE=database (default) keeps the original behaviour: the token
+// is a random UUID looked up in the `sessions` collection on every request.
+//
+// SESSION_MODE=signed issues self-contained tokens instead:
+//
+//   s1.<kid>.<base64url payload>.<base64url HMAC-SHA256>
+//
+// The payload carries the user id, expiry and a token id (jti), so
+// resolving a token is a signature check with no Mongo round trip.
+// SESSION_SIGNING_KEYS is a comma-separated list of `kid:secret` pairs;
+// the first key signs new tokens and every listed key still verifies, so a
+// key is rotated by prepending the new one and dropping the old one once
+// its tokens have expired. Logout records the jti in `revokedTokens`,
+// which each process mirrors in memory and refreshes periodically.
+//
+// Both collections carry a TTL index on `expiresAt`, so Mongo drops expired
+// entries on its own, and database sessions are capped per user at
+// SESSION_MAX_PER_USER: issuing one more evicts the oldest.
+
+const SESSION_TTL_MS = Number(process.env.SESSION_TTL_SECONDS || 30 * 24 * 60 * 60) * 1000;
+const SESSION_MAX_PER_USER = Number(process.env.SESSION_MAX_PER_USER || 10);
+const REVOCATION_REFRESH_MS = 30 * 1000;
+const TOKEN_VERSION = 's1';
+
+function parseSigningKeys(value) {
+  const keys = new Map();
+  for (const entry of (value || '').split(',')) {
+    const separator = entry.indexOf(':');
+    if (separator <= 0) continue;
+    keys.set(entry.slice(0, separator).trim(), entry.slice(separator + 1).trim());
+  }
+  return keys;
+}
+
+const signingKeys = parseSigningKeys(process.env.SESSION_SIGNING_KEYS);
+const activeKeyId = signingKeys.keys().next().value;
+
+let sessionMode = process.env.SESSION_MODE === 'signed' ? 'signed' : 'database';
+if (sessionMode === 'signed' && !activeKeyId) {
+  console.error('SESSION_MODE=signed requires SESSION_SIGNING_KEYS; falling back to database sessions');
+  sessionMode = 'database';
+}
+
+export const SESSION_MODE = sessionMode;
+
+// jti -> expiry (ms). Mirrors the `revokedTokens` collection.
+const revokedTokens = new Map();
+let revocationsLoadedAt = 0;
+let indexesReady = null;
+
+// Creates the lifecycle indexes once per process
+function ensureSessionIndexes(db) {
+  if (!indexesReady) {
+    indexesReady = Promise.all([
+      db.collection('sessions').createIndex({ expiresAt: 1 }, { expireAfterSeconds: 0 }),
+      db.collection('sessions').createIndex({ token: 1 }, { unique: true }),
+      db.collection('sessions').createIndex({ userId: 1, createdAt: -1 }),
+      db.collection('revokedTokens').createIndex({ expiresAt: 1 }, { expireAfterSeconds: 0 }),
+      db.collection('revokedTokens').createIndex({ jti: 1 }, { unique: true })
+    ]).catch((error) => {
+      indexesReady = null;
+      throw error;
+    });
+  }
+  return indexesReady;
+}
+
+// Deletes everything but the user's newest SESSION_MAX_PER_USER sessions
+async function evictOldestSessions(db, userId) {
+  const stale = await db.collection('sessions')
+    .find({ userId }, { projection: { _id: 1 } })
+    .sort({ createdAt: -1 })
+    .skip(SESSION_MAX_PER_USER)
+    .toArray();
+
+  if (stale.length > 0) {
+    await db.collection('sessions').deleteMany({ _id: { $in: stale.map((s) => s._id) } });
+  }
+}
+
+function sign(keyId, body) {
+  return crypto.createHmac('sha256', signingKeys.get(keyId)).update(body).digest('base64url');
+}
+
+function createSignedToken(userId, expiresAt) {
+  const payload = Buffer.from(JSON.stringify({
+    uid: userId,
+    exp: expiresAt.getTime(),
+    jti: uuidv4()
+  })).toString('base64url');
+  const body = `${TOKEN_VERSION}.${activeKeyId}.${payload}`;
+  return `${body}.${sign(activeKeyId, body)}`;
+}
+
+// Returns the decoded payload of a well-formed, correctly signed token, or
+// null. Expiry and revocation are checked by the caller.
+function verifySignedToken(token) {
+  const parts = token.split('.');
+  if (parts.length !== 4 || parts[0] !== TOKEN_VERSION || !signingKeys.has(parts[1])) {
+    return null;
+  }
+
+  const expected = Buffer.from(sign(parts[1], `${parts[0]}.${parts[1]}.${parts[2]}`));
+  const actual = Buffer.from(parts[3]);
+  if (expected.length !== actual.length || !crypto.timingSafeEqual(expected, actual)) {
+    return null;
+  }
+
+  try {
+    const payload = JSON.parse(Buffer.from(parts[2], 'base64url').toString('utf8'));
+    if (typeof payload.uid !== 'string' || typeof payload.exp !== 'number') return null;
+    return payload;
+  } catch {
+    return null;
+  }
+}
+
+export function isSignedToken(token) {
+  return token.startsWith(`${TOKEN_VERSION}.`);
+}
+
+async function refreshRevocations(db) {
+  const now = Date.now();
+  if (now - revocationsLoadedAt < REVOCATION_REFRESH_MS) return;
+  revocationsLoadedAt = now;
+
+  const revoked = await db.collection('revokedTokens')
+    .find({ expiresAt: { $gt: new Date(now) } }, { projection: { _id: 0, jti: 1, expiresAt: 1 } })
+    .toArray();
+
+  revokedTokens.clear();
+  for (const entry of revoked) {
+    revokedTokens.set(entry.jti, entry.expiresAt.getTime());
+  }
+}
+
+// Creates a session for the user and returns its bearer token
+export async function issueSession(db, userId) {
+  const expiresAt = new Date(Date.now() + SESSION_TTL_MS);
+
+  if (SESSION_MODE === 'signed') {
+    return createSignedToken(userId, expiresAt);
+  }
+
+  await ensureSessionIndexes(db);
+
+  const sessionToken = uuidv4();
+  await db.collection('sessions').insertOne({
+    id: uuidv7(),
+    token: sessionToken,
+    userId,
+    expiresAt,
+    createdAt: new Date()
+  });
+  await evictOldestSessions(db, userId);
+  return sessionToken;
+}
+
+// Resolves a bearer token to a user id, or null if it is invalid, expired
+// or revoked. Database tokens are still honoured in signed mode so existing
+// sessions survive switching modes.
+export async function resolveSession(db, token) {
+  if (isSignedToken(token)) {
+    if (SESSION_MODE !== 'signed') return null;
+
+    const payload = verifySignedToken(token);
+    if (!payload || payload.exp < Date.now()) return null;
+
+    await refreshRevocations(db);
+    if (revokedTokens.has(payload.jti)) return null;
+
+    return payload.uid;
+  }
+
+  const session = await db.collection('sessions').findOne({ token });
+  if (!session || session.expiresAt < new Date()) {
+    return null;
+  }
+  return session.userId;
+}
+
+// Ends the session behind a bearer token
+export async function revokeSession(db, token) {
+  if (!isSignedToken(token)) {
+    await db.collection('sessions').deleteOne({ token });
+    return;
+  }
+
+  const payload = verifySignedToken(token);
+  if (!payload || payload.exp < Date.now()) return;
+
+  await ensureSessionIndexes(db);
+
+  const expiresAt = new Date(payload.exp);
+  await db.collection('revokedTokens').updateOne(
+    { jti: payload.jti },
+    { $setOnInsert: { jti: payload.jti, userId: payload.uid, expiresAt, createdAt: new Date() } },
+    { upsert: true }
+  );
+  revokedTokens.set(payload.jti, payload.exp);
+}
@@ -0,0 +1,100 @@
+// Skill and interest taxonomy.
+//
+// Free-text skills ("React", "react.js", "ReactJS") are folded into one
+// interned id before they are stored or queried. A token's key is its
+// lowercased text with spaces, dots, dashes and underscores removed; known
+// keys map to a canonical id through TAXONOMY, anything else uses the key
+// itself, so unknown skills still match their own spelling variants.
+//
+// Posts store `skillIds` next to `skillsNeeded` and profiles store
+// `skillIds` and `interestIds` next to `skills` / `interests`; lib/skills.js
+// queries them. Documents written before the ids existed are filled in by
+// scripts/backfill-skill-ids.mjs, which is why this module has no imports.
+
+// Canonical id -> spellings that mean the same thing. Abbreviations that
+// name more than one skill ("TF": TensorFlow or Terraform, "CV": computer
+// vision or a résumé), plain words ("Next", "Containers") and broad fields
+// ("Security", "AI", "Blockchain", "Education", "Healthcare") are left out;
+// they match only their own spelling, not one specific skill.
+const TAXONOMY = {
+  javascript: ['JavaScript', 'JS', 'ECMAScript', 'ES6'],
+  typescript: ['TypeScript', 'TS'],
+  react: ['React', 'React.js', 'ReactJS'],
+  reactnative: ['React Native', 'RN'],
+  vue: ['Vue', 'Vue.js', 'VueJS'],
+  angular: ['Angular', 'AngularJS', 'Angular.js'],
+  svelte: ['Svelte', 'SvelteKit'],
+  nextjs: ['Next.js', 'NextJS'],
+  nodejs: ['Node.js', 'Node', 'NodeJS'],
+  python: ['Python', 'Python3', 'py'],
+  go: ['Go', 'Golang'],
+  rust: ['Rust', 'Rustlang'],
+  cpp: ['C++', 'CPP'],
+  csharp: ['C#', 'CSharp', 'C Sharp'],
+  java: ['Java'],
+  kotlin: ['Kotlin'],
+  swift: ['Swift', 'SwiftUI'],
+  postgresql: ['PostgreSQL', 'Postgres', 'psql'],
+  mongodb: ['MongoDB', 'Mongo'],
+  redis: ['Redis'],
+  graphql: ['GraphQL', 'GQL'],
+  aws: ['AWS', 'Amazon Web Services'],
+  gcp: ['GCP', 'Google Cloud', 'Google Cloud Platform'],
+  azure: ['Azure', 'Microsoft Azure'],
+  docker: ['Docker'],
+  kubernetes: ['Kubernetes', 'K8s'],
+  terraform: ['Terraform'],
+  pytorch: ['PyTorch', 'Torch'],
+  tensorflow: ['TensorFlow'],
+  ml: ['Machine Learning', 'ML', 'AI/ML'],
+  deeplearning: ['Deep Learning', 'DL'],
+  nlp: ['NLP', 'Natural Language Processing'],
+  computervision: ['Computer Vision'],
+  unity: ['Unity', 'Unity3D'],
+  arvr: ['AR/VR', 'AR/VR Development', 'VR', 'AR', 'XR', 'Mixed Reality'],
+  solidity: ['Solidity'],
+  web3: ['Web3'],
+  uiux: ['UI/UX', 'UI/UX Design', 'UX', 'UI Design', 'UX Design'],
+  figma: ['Figma'],
+  iot: ['IoT', 'Internet of Things'],
+  cybersecurity: ['Cybersecurity', 'Cyber Security', 'Network Security', 'InfoSec'],
+  edtech: ['EdTech', 'Education Technology'],
+  healthtech: ['HealthTech', 'Healthcare Tech', 'Health Tech'],
+  climate: ['Climate', 'Climate Tech']
+};
+
+export function skillKey(text) {
+  return String(text).trim().toLowerCase().replace(/[\s._-]+/g, '');
+}
+
+const CANONICAL = new Map();
+for (const [id, spellings] of Object.entries(TAXONOMY)) {
+  CANONICAL.set(id, id);
+  for (const spelling of spellings) CANONICAL.set(skillKey(spelling), id);
+}
+
+// Interned id for one skill or interest, or null for blank input
+export function skillId(text) {
+  if (text === null || text === undefined) return null;
+  const key = skillKey(text);
+  if (!key) return null;
+  return CANONICAL.get(key) || key;
+}
+
+// Distinct ids for a list of skills, in first-seen order
+export function skillIds(list) {
+  const ids = new Set();
+  for (const text of Array.isArray(list) ? list : []) {
+    const id = skillId(text);
+    if (id) ids.add(id);
+  }
+  return [...ids];
+}
+
+export function postSkillFields(post) {
+  return { skillIds: skillIds(post.skillsNeeded) };
+}
+
+export function profileSkillFields(profile) {
+  return { skillIds: skillIds(profile.skills), interestIds: skillIds(profile.interests) };
+}
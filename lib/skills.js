@@ -0,0 +1,66 @@
+import { json } from './respond';
+import { skillIds } from './skill-taxonomy';
+
+// Skill and interest filters for explore/*.
+//
+// `skills=` and `interests=` take comma-separated or repeated terms, which
+// are interned through lib/skill-taxonomy.js exactly like stored skills, so
+// `skills=react.js` finds posts that asked for "React". Multikey indexes
+// over the stored `skillIds` / `interestIds` arrays keep a filtered deck an
+// index range scan rather than a collection scan.
+
+const MAX_FILTER_TERMS = 10;
+
+let indexesReady = null;
+
+// Multikey indexes behind the filters, created once per process
+export function ensureSkillIndexes(db) {
+  if (!indexesReady) {
+    indexesReady = Promise.all([
+      db.collection('posts').createIndex({ type: 1, skillIds: 1 }),
+      db.collection('profiles').createIndex({ skillIds: 1 }),
+      db.collection('profiles').createIndex({ interestIds: 1 })
+    ]).catch((error) => {
+      indexesReady = null;
+      throw error;
+    });
+  }
+  return indexesReady;
+}
+
+function parseTerms(searchParams, name) {
+  const terms = searchParams.getAll(name).flatMap((value) => value.split(','));
+  return skillIds(terms);
+}
+
+// Middleware: reads `skills`, `interests` and `match` (any | all) into
+// ctx.skillFilter, or leaves it null when no filter was asked for
+export async function selectSkillFilter(ctx) {
+  const { searchParams } = new URL(ctx.request.url);
+  const skills = parseTerms(searchParams, 'skills');
+  const interests = parseTerms(searchParams, 'interests');
+  const match = searchParams.get('match') || 'any';
+
+  if (match !== 'any' && match !== 'all') {
+    return json({ error: `Unknown match: ${match}` }, { status: 400 });
+  }
+  if (skills.length + interests.length > MAX_FILTER_TERMS) {
+    return json({ error: `At most ${MAX_FILTER_TERMS} filter terms` }, { status: 400 });
+  }
+
+  ctx.skillFilter = null;
+  if (skills.length > 0 || interests.length > 0) {
+    await ensureSkillIndexes(ctx.db);
+    ctx.skillFilter = { skills, interests, match };
+  }
+}
+
+// Mongo filter for the requested ids; `any` matches documents sharing one
+// id per listed dimension, `all` requires every id
+export function skillFilterQuery(filter) {
+  const operator = filter.match === 'all' ? '$all' : '$in';
+  const query = {};
+  if (filter.skills.length > 0) query.skillIds = { [operator]: filter.skills };
+  if (filter.interests.length > 0) query.interestIds = { [operator]: filter.interests };
+  return query;
+}
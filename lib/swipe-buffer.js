@@ -0,0 +1,286 @@
+import { randomBytes } from 'crypto';
+import { mkdir, open, readdir, readFile, rename, rm, unlink } from 'fs/promises';
+import path from 'path';
+
+// Write-behind buffer for swipes without side effects (LEFT swipes).
+//
+// A buffered swipe is acknowledged once it is durable in a local journal,
+// not once it is in Mongo. Appends are group-committed: every swipe that
+// arrives while a write is in flight joins the next write, and each write
+// ends with one fsync. Journaled swipes are then inserted with insertMany
+// every `flushMs` milliseconds, or as soon as `maxBatch` are waiting.
+//
+// The journal is a directory of NDJSON segments. A flush seals the current
+// segment, so every swipe of a sealed segment is in the flushed batch, and
+// the segment is deleted only after the batch is in Mongo. A write that
+// fails is cut off the segment, which is then sealed as well, so a rejected
+// swipe is never replayed.
+//
+// Every buffer journals into a directory of its own, `<pid>-<random>` under
+// `dir`, so worker processes and a buffer re-created by a reload never
+// share segments. Creating a buffer replays the journals of instances that
+// are gone, without waiting for the next swipe: a journal is claimed by
+// renaming it into the new buffer's directory, so of two buffers starting
+// together only one replays it. Instances of other processes count as gone
+// once their pid is, so `dir` must be local to the host. Readers await
+// `ready()` so they never miss a replayed swipe. Swipe ids are unique, so
+// replaying a batch that was partly inserted is harmless.
+//
+// Until a swipe is flushed only this buffer knows about it, so duplicate
+// checks and swiped-exclusion lists consult `pending` / `pendingTargets`.
+
+const SEGMENT_NAME = /^swipes-(\d+)\.ndjson$/;
+const INSTANCE_NAME = /^(\d+)-[0-9a-f]+$/;
+
+// Journal directories of the buffers created by this process
+const ownInstances = new Set();
+
+function isRunning(instance, pid) {
+  if (pid === process.pid) return ownInstances.has(instance);
+  try {
+    process.kill(pid, 0);
+    return true;
+  } catch (error) {
+    return error.code === 'EPERM';
+  }
+}
+
+function isDuplicateKeyError(error) {
+  const writeErrors = [].concat(error.writeErrors || []);
+  if (writeErrors.length > 0) return writeErrors.every((writeError) => writeError.code === 11000);
+  return error.code === 11000;
+}
+
+// insertMany in chunks, skipping swipes that are already stored
+async function insertAll(collection, swipes, maxBatch) {
+  for (let start = 0; start < swipes.length; start += maxBatch) {
+    try {
+      await collection.insertMany(swipes.slice(start, start + maxBatch), { ordered: false });
+    } catch (error) {
+      if (!isDuplicateKeyError(error)) throw error;
+    }
+  }
+}
+
+function parseSegment(text) {
+  const swipes = [];
+  for (const line of text.split('\n')) {
+    if (!line) continue;
+    try {
+      const swipe = JSON.parse(line);
+      swipes.push({ ...swipe, createdAt: new Date(swipe.createdAt) });
+    } catch {
+      // A torn final line was never fsynced, so it was never acknowledged
+    }
+  }
+  return swipes;
+}
+
+// Inserts the swipes of a claimed journal, and of the journals it had claimed
+// itself, then removes it; resolves to the number of swipes
+async function replayJournal(journal, collection, maxBatch) {
+  const entries = await readdir(journal, { withFileTypes: true });
+  let recovered = 0;
+  for (const entry of entries.filter((entry) => entry.isDirectory())) {
+    recovered += await replayJournal(path.join(journal, entry.name), collection, maxBatch);
+  }
+
+  const segments = entries
+    .map((entry) => [entry.name, SEGMENT_NAME.exec(entry.name)])
+    .filter(([, match]) => match)
+    .map(([name, match]) => ({ file: path.join(journal, name), seq: Number(match[1]) }))
+    .sort((a, b) => a.seq - b.seq);
+  for (const { file } of segments) {
+    const swipes = parseSegment(await readFile(file, 'utf8'));
+    await insertAll(collection, swipes, maxBatch);
+    await unlink(file);
+    recovered += swipes.length;
+  }
+  await rm(journal, { recursive: true, force: true });
+  return recovered;
+}
+
+export function createSwipeBuffer({ dir, getCollection, flushMs = 5, maxBatch = 500, onFlush = () => {} }) {
+  const buffered = []; // journaled, not yet in Mongo
+  const pendingKeys = new Map(); // `${swiperId}|${targetType}` -> Set of targetIds
+  const sealed = []; // segment paths whose swipes are all in `buffered`
+  let appends = [];
+  let segment = null;
+  let segmentSeq = 0;
+  let writing = null;
+  let flushing = null;
+  let timer = null;
+  let ready = null;
+  const instance = `${process.pid}-${randomBytes(4).toString('hex')}`;
+  const journal = path.join(dir, instance);
+  ownInstances.add(instance);
+
+  function remember(swipe) {
+    const key = `${swipe.swiperId}|${swipe.targetType}`;
+    if (!pendingKeys.has(key)) pendingKeys.set(key, new Set());
+    pendingKeys.get(key).add(swipe.targetId);
+  }
+
+  function forget(swipe) {
+    const key = `${swipe.swiperId}|${swipe.targetType}`;
+    const targets = pendingKeys.get(key);
+    if (!targets) return;
+    targets.delete(swipe.targetId);
+    if (targets.size === 0) pendingKeys.delete(key);
+  }
+
+  async function recover() {
+    await mkdir(journal, { recursive: true });
+    const collection = await getCollection();
+    await collection.createIndex({ id: 1 }, { unique: true });
+
+    let recovered = 0;
+    for (const name of await readdir(dir)) {
+      const match = INSTANCE_NAME.exec(name);
+      if (!match || isRunning(name, Number(match[1]))) continue;
+      const claimed = path.join(journal, name);
+      try {
+        await rename(path.join(dir, name), claimed);
+      } catch (error) {
+        // Another buffer claimed it first
+        if (error.code === 'ENOENT') continue;
+        throw error;
+      }
+      recovered += await replayJournal(claimed, collection, maxBatch);
+    }
+    return recovered;
+  }
+
+  async function writeAppends() {
+    while (appends.length > 0) {
+      const group = appends;
+      appends = [];
+      try {
+        if (!segment) {
+          const file = path.join(journal, `swipes-${segmentSeq++}.ndjson`);
+          segment = { file, handle: await open(file, 'a'), size: 0 };
+        }
+        const text = group.map((append) => append.line).join('');
+        await segment.handle.write(text);
+        await segment.handle.sync();
+        segment.size += Buffer.byteLength(text);
+        for (const append of group) {
+          buffered.push(append.swipe);
+          append.resolve();
+        }
+      } catch (error) {
+        if (segment) {
+          // Cut whatever part of the group reached the file and seal the
+          // segment; its earlier swipes are still in `buffered`
+          const failed = segment;
+          segment = null;
+          await failed.handle.truncate(failed.size).catch(() => {});
+          await failed.handle.close().catch(() => {});
+          sealed.push(failed.file);
+        }
+        for (const append of group) {
+          forget(append.swipe);
+          append.reject(error);
+        }
+      }
+    }
+    writing = null;
+    scheduleFlush();
+  }
+
+  function scheduleFlush() {
+    if (buffered.length >= maxBatch) {
+      flush().catch(() => {});
+    } else if (buffered.length > 0 && !timer) {
+      timer = setTimeout(() => {
+        timer = null;
+        flush().catch(() => {});
+      }, flushMs);
+    }
+  }
+
+  async function flushOnce() {
+    while (writing) await writing;
+    if (buffered.length === 0 && sealed.length === 0) return 0;
+
+    // Seal the segment so new appends go to the next one
+    const sealing = segment;
+    segment = null;
+    if (sealing) sealed.push(sealing.file);
+    const batch = buffered.splice(0);
+    const files = sealed.splice(0);
+    if (sealing) await sealing.handle.close();
+
+    try {
+      await insertAll(await getCollection(), batch, maxBatch);
+    } catch (error) {
+      // Keep the swipes and their segments for the next flush
+      buffered.unshift(...batch);
+      sealed.unshift(...files);
+      scheduleFlush();
+      throw error;
+    }
+    await Promise.all(files.map((file) => unlink(file)));
+    batch.forEach(forget);
+    onFlush(batch.length);
+    return batch.length;
+  }
+
+  // Inserts everything journaled so far; resolves to the number of swipes
+  function flush() {
+    if (timer) {
+      clearTimeout(timer);
+      timer = null;
+    }
+    const previous = flushing || Promise.resolve();
+    const current = previous.catch(() => {}).then(flushOnce);
+    flushing = current.finally(() => {
+      if (flushing === current) flushing = null;
+    });
+    return current;
+  }
+
+  const buffer = {
+    // Replays the journals of buffers that are gone; resolves to how many
+    // swipes it recovered. Starts when the buffer is created; runs again
+    // only if that attempt failed.
+    ready() {
+      if (!ready) {
+        ready = recover().catch((error) => {
+          ready = null;
+          throw error;
+        });
+      }
+      return ready;
+    },
+
+    // Resolves once the swipe is durable in the journal
+    async enqueue(swipe) {
+      await this.ready();
+      remember(swipe);
+      const acknowledged = new Promise((resolve, reject) => {
+        appends.push({ line: `${JSON.stringify(swipe)}\n`, swipe, resolve, reject });
+      });
+      if (!writing) writing = writeAppends();
+      return acknowledged;
+    },
+
+    flush,
+
+    // Whether a swipe on this target is buffered and not yet in Mongo
+    pending(swiperId, targetType, targetId) {
+      return pendingKeys.get(`${swiperId}|${targetType}`)?.has(targetId) || false;
+    },
+
+    pendingTargets(swiperId, targetType) {
+      return [...(pendingKeys.get(`${swiperId}|${targetType}`) || [])];
+    },
+
+    get size() {
+      return buffered.length + appends.length;
+    }
+  };
+
+  buffer.ready().catch((error) => console.error('Swipe journal replay failed', error));
+  return buffer;
+}
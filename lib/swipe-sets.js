@@ -0,0 +1,74 @@
+import { createHash } from 'crypto';
+import { inflateSync } from 'zlib';
+
+// Compacted swipe history.
+//
+// swipe_compaction_job.py folds LEFT swipes older than the raw window into
+// `swipeSets`: one document per (swiperId, targetType, bucket, chunk)
+// holding the swiped target ids sorted, newline-joined and zlib-deflated,
+// plus their count. A target id always lands in the same one of
+// SWIPE_SET_BUCKETS buckets (the high nibble of its MD5), so the repeat
+// swipe check inflates one bucket rather than the user's whole history.
+// Raw swipe documents are deleted once their ids are in a set, so the set
+// ids are only ever read here to exclude targets from decks and reject
+// repeat swipes. RIGHT swipes are never compacted; matches and the admirer
+// lookup keep reading them raw.
+
+export const SWIPE_SET_BUCKETS = 16;
+
+let indexesReady = null;
+
+export function ensureSwipeSetIndexes(db) {
+  if (!indexesReady) {
+    indexesReady = db.collection('swipeSets')
+      .createIndex({ swiperId: 1, targetType: 1, bucket: 1, chunk: 1 }, { unique: true })
+      .catch((error) => {
+        indexesReady = null;
+        throw error;
+      });
+  }
+  return indexesReady;
+}
+
+// Target ids of one set document's `ids` (a BSON Binary or a Buffer)
+export function decodeSwipeSet(ids) {
+  const bytes = ids.buffer && typeof ids.position === 'number' ? ids.buffer.subarray(0, ids.position) : ids;
+  return inflateSync(bytes).toString('utf8').split('\n').filter(Boolean);
+}
+
+// Bucket of a target id; swipe_compaction_job.py computes the same
+export function swipeSetBucket(targetId) {
+  return createHash('md5').update(String(targetId)).digest()[0] >> 4;
+}
+
+// Whether the swiper has compacted a swipe on `targetId`: reads only the
+// target's bucket, and nothing at all for a user without swipe sets
+export async function hasCompactedSwipe(db, swiperId, targetType, targetId) {
+  await ensureSwipeSetIndexes(db);
+  const sets = await db.collection('swipeSets')
+    .find(
+      { swiperId, targetType, bucket: swipeSetBucket(targetId) },
+      { projection: { _id: 0, ids: 1 } }
+    )
+    .toArray();
+  return sets.some((set) => decodeSwipeSet(set.ids).includes(targetId));
+}
+
+// Every compacted target id of the swiper for one target type
+export async function compactedTargetIds(db, swiperId, targetType) {
+  await ensureSwipeSetIndexes(db);
+  const sets = await db.collection('swipeSets')
+    .find({ swiperId, targetType }, { projection: { _id: 0, ids: 1 } })
+    .toArray();
+  return sets.flatMap((set) => decodeSwipeSet(set.ids));
+}
+
+// Number of compacted swipes across every target type
+export async function compactedSwipeCount(db, swiperId) {
+  await ensureSwipeSetIndexes(db);
+  const [total] = await db.collection('swipeSets').aggregate([
+    { $match: { swiperId } },
+    { $group: { _id: null, count: { $sum: '$count' } } }
+  ]).toArray();
+  return total?.count || 0;
+}
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+
+import requests
+import json
+import sys
+import os
+import re
+import random
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from harness_metrics import ServerTimingCollector
+
+# Configuration
+BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
+TEST_USER_PASSWORD = "testpass123"
+PAGE_MESSAGES = 25
+PAGE_LIMIT = 10
+PARALLEL_OPENS = 20
+# Unread counters: conversations, largest message burst per conversation, client threads
+UNREAD_CONVERSATIONS = int(os.environ.get("UNREAD_CONVERSATIONS", "500"))
+UNREAD_MAX_BURST = int(os.environ.get("UNREAD_MAX_BURST", "8"))
+UNREAD_WORKERS = int(os.environ.get("UNREAD_WORKERS", "16"))
+
+UUIDV7 = re.compile(r"^[0-9a-f]{8}-[0-9a-f]{4}-7[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$")
+
+class MessagingTester:
+    def __init__(self):
+        self.session = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session)
+        self.user_id = None
+        self.test_results = []
+
+    def log_result(self, test_name, success, message, details=None):
+        """Log test result"""
+        status = "✅ PASS" if success else "❌ FAIL"
+        result = {
+            "test": test_name,
+            "status": status,
+            "message": message,
+            "details": details,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.test_results.append(result)
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+
+    def register(self, label):
+        """Fresh user; returns (id, auth headers)"""
+        body = requests.post(f"{BASE_URL}/auth/register", json={
+            "email": f"messaging.{label}.{uuid.uuid4().hex[:12]}@example.com",
+            "password": TEST_USER_PASSWORD,
+            "name": f"Messaging {label.title()}"
+        }).json()
+        return body["user"]["id"], {"Authorization": f"Bearer {body['token']}"}
+
+    def setup_test_user(self):
+        """Register the tester"""
+        try:
+            self.user_id, headers = self.register("tester")
+            self.session.headers.update(headers)
+            self.log_result("User Setup", True, "Tester registered")
+            return True
+
+        except Exception as e:
+            self.log_result("User Setup", False, f"Setup error: {str(e)}")
+            return False
+
+    def start_conversation(self):
+        """DM with a fresh peer, so the conversation starts empty"""
+        peer_id, _ = self.register("peer")
+        response = self.session.post(f"{BASE_URL}/conversations", json={"participantIds": [peer_id]})
+        return response.json()["conversation"]["id"]
+
+    def test_time_ordered_ids(self):
+        """Swipes and messages get UUIDv7 ids that increase with creation time"""
+        try:
+            print("\n🔄 Testing Time-Ordered IDs...")
+            swipe_ids = [self.session.post(f"{BASE_URL}/swipe", json={
+                "targetType": "PERSON", "targetId": str(uuid.uuid4()), "direction": direction
+            }).json()["swipe"]["id"] for direction in ("LEFT", "RIGHT", "LEFT")]
+
+            conversation_id = self.start_conversation()
+            message_ids = [self.session.post(f"{BASE_URL}/messages", json={
+                "conversationId": conversation_id, "content": f"ordered {i}"
+            }).json()["message"]["id"] for i in range(3)]
+
+            ids = swipe_ids + message_ids
+            not_v7 = [i for i in ids if not UUIDV7.match(i)]
+            if not_v7 or message_ids != sorted(message_ids) or swipe_ids != sorted(swipe_ids):
+                self.log_result("Time-Ordered IDs", False, "Ids are not increasing UUIDv7s",
+                              {"swipes": swipe_ids, "messages": message_ids})
+                return False
+            self.log_result("Time-Ordered IDs", True, f"{len(ids)} new ids are UUIDv7 and increase in creation order")
+            return True
+
+        except Exception as e:
+            self.log_result("Time-Ordered IDs", False, f"Error: {str(e)}")
+            return False
+
+    def test_message_pagination(self):
+        """Keyset pages walked with ?before match the full history"""
+        try:
+            print("\n🔄 Testing Message Pagination...")
+            conversation_id = self.start_conversation()
+            for i in range(PAGE_MESSAGES):
+                self.session.post(f"{BASE_URL}/messages", json={"conversationId": conversation_id, "content": f"page {i}"})
+            url = f"{BASE_URL}/conversations/{conversation_id}/messages"
+            full = [m["id"] for m in self.session.get(url).json()["messages"]]
+
+            pages, cursor = [], None
+            while True:
+                params = {"limit": PAGE_LIMIT, **({"before": cursor} if cursor else {})}
+                body = self.session.get(url, params=params).json()
+                pages.insert(0, [m["id"] for m in body["messages"]])
+                cursor = body["nextCursor"]
+                if not cursor or len(pages) > PAGE_MESSAGES:
+                    break
+            walked = [message_id for page in pages for message_id in page]
+
+            unknown = self.session.get(url, params={"limit": PAGE_LIMIT, "before": str(uuid.uuid4())})
+            too_big = self.session.get(url, params={"limit": 1000})
+
+            details = {"pages": [len(p) for p in pages], "full": len(full), "walked": len(walked),
+                       "unknown_cursor_status": unknown.status_code, "oversized_limit_status": too_big.status_code}
+            if walked != full or len(full) != PAGE_MESSAGES or unknown.status_code != 400 or too_big.status_code != 400:
+                self.log_result("Message Pagination", False, "Paged history differs from the full history", details)
+                return False
+            self.log_result("Message Pagination", True,
+                          f"{len(pages)} pages of up to {PAGE_LIMIT} reproduce all {len(full)} messages in order")
+            return True
+
+        except Exception as e:
+            self.log_result("Message Pagination", False, f"Error: {str(e)}")
+            return False
+
+    def test_dm_get_or_create(self):
+        """Opening the same DM PARALLEL_OPENS times at once yields one conversation"""
+        try:
+            print(f"\n🔄 Testing DM Get-or-Create ({PARALLEL_OPENS} parallel opens)...")
+            peer_id, peer_headers = self.register("peer")
+            headers = dict(self.session.headers)
+
+            def open_dm(_):
+                return requests.post(f"{BASE_URL}/conversations", headers=headers,
+                                     json={"participantIds": [peer_id]}).json()
+
+            with ThreadPoolExecutor(max_workers=PARALLEL_OPENS) as pool:
+                results = list(pool.map(open_dm, range(PARALLEL_OPENS)))
+            ids = {result["conversation"]["id"] for result in results}
+            created = sum(1 for result in results if result.get("created"))
+
+            # The peer opening it back, and a post-scoped one, resolve separately
+            from_peer = requests.post(f"{BASE_URL}/conversations", headers=peer_headers,
+                                      json={"participantIds": [self.user_id]}).json()
+            post_scoped = self.session.post(f"{BASE_URL}/conversations", json={
+                "participantIds": [peer_id], "postId": str(uuid.uuid4())
+            }).json()
+            listed = [c for c in requests.get(f"{BASE_URL}/conversations", headers=peer_headers).json()["conversations"]
+                      if c["id"] in ids]
+
+            details = {"distinct_ids": len(ids), "created": created, "peer_id": from_peer["conversation"]["id"],
+                       "post_scoped_id": post_scoped["conversation"]["id"], "listed_for_peer": len(listed)}
+            if (len(ids) != 1 or created != 1 or from_peer["conversation"]["id"] not in ids
+                    or post_scoped["conversation"]["id"] in ids or len(listed) != 1):
+                self.log_result("DM Get-or-Create", False, "Duplicate or mismatched conversations", details)
+                return False
+            self.log_result("DM Get-or-Create", True,
+                          f"{PARALLEL_OPENS} parallel opens and the peer's open share one conversation")
+            return True
+
+        except Exception as e:
+            self.log_result("DM Get-or-Create", False, f"Error: {str(e)}")
+            return False
+
+    def percentiles(self, latencies):
+        ordered = sorted(latencies)
+        return ordered[len(ordered) // 2], ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def test_unread_counts(self):
+        """Message bursts across UNREAD_CONVERSATIONS conversations keep exact unread counts"""
+        try:
+            print(f"\n🔄 Testing Unread Counts ({UNREAD_CONVERSATIONS} conversations)...")
+            rng = random.Random(45)
+            peer_id, peer_headers = self.register("peer")
+            headers = dict(self.session.headers)
+
+            # Post-scoped conversations give one peer many distinct conversations
+            def open_conversation(_):
+                return requests.post(f"{BASE_URL}/conversations", headers=headers, json={
+                    "participantIds": [peer_id], "postId": str(uuid.uuid4())
+                }).json()["conversation"]["id"]
+
+            def send(args):
+                conversation_id, sender_headers, count = args
+                ids = []
+                for i in range(count):
+                    ids.append(requests.post(f"{BASE_URL}/messages", headers=sender_headers, json={
+                        "conversationId": conversation_id, "content": f"burst {i}"
+                    }).json()["message"]["id"])
+                return ids
+
+            def mark_read(args):
+                conversation_id, message_id = args
+                started = time.perf_counter()
+                response = requests.post(f"{BASE_URL}/conversations/{conversation_id}/read", headers=headers,
+                                         json={"messageId": message_id} if message_id else {})
+                return (time.perf_counter() - started) * 1000, response.json().get("unreadCount")
+
+            with ThreadPoolExecutor(max_workers=UNREAD_WORKERS) as pool:
+                conversation_ids = list(pool.map(open_conversation, range(UNREAD_CONVERSATIONS)))
+
+                # Peer bursts; the tester replies in some (reading everything so far),
+                # then the peer sends a second burst
+                first = {c: rng.randint(0, UNREAD_MAX_BURST) for c in conversation_ids}
+                replied = set(rng.sample(conversation_ids, len(conversation_ids) // 4))
+                second = {c: rng.randint(0, UNREAD_MAX_BURST // 2) for c in conversation_ids}
+                sent = dict(zip(conversation_ids, pool.map(send, [(c, peer_headers, first[c]) for c in conversation_ids])))
+                list(pool.map(send, [(c, headers, 1) for c in replied]))
+                for c, ids in zip(conversation_ids, pool.map(send, [(c, peer_headers, second[c]) for c in conversation_ids])):
+                    sent[c] += ids
+                expected = {c: second[c] if c in replied else first[c] + second[c] for c in conversation_ids}
+
+                def inbox():
+                    started = time.perf_counter()
+                    body = self.session.get(f"{BASE_URL}/conversations").json()
+                    latency = (time.perf_counter() - started) * 1000
+                    counts = {c["id"]: c["unreadCount"] for c in body["conversations"] if c["id"] in expected}
+                    return latency, counts, body["unreadTotal"]
+
+                inbox_latency, counts, total = inbox()
+                wrong = {c: (counts.get(c), n) for c, n in expected.items() if counts.get(c) != n}
+
+                # Read half completely and some partially, up to their first message
+                fully = conversation_ids[::2]
+                partially = [c for c in conversation_ids[1::2] if c not in replied and len(sent[c]) > 1][:50]
+                reads = list(pool.map(mark_read, [(c, None) for c in fully] + [(c, sent[c][0]) for c in partially]))
+                for c in fully:
+                    expected[c] = 0
+                for c in partially:
+                    expected[c] -= 1
+
+            after_latency, counts_after, total_after = inbox()
+            wrong_after = {c: (counts_after.get(c), n) for c, n in expected.items() if counts_after.get(c) != n}
+            read_p50, read_p95 = self.percentiles([latency for latency, _ in reads])
+
+            print(f"   inbox of {len(conversation_ids)}: {inbox_latency:.0f}ms before reads, {after_latency:.0f}ms after")
+            print(f"   mark read: p50 {read_p50:.1f}ms, p95 {read_p95:.1f}ms over {len(reads)} calls")
+            details = {"wrong_before": dict(list(wrong.items())[:5]), "wrong_after": dict(list(wrong_after.items())[:5]),
+                       "unread_total_after": total_after}
+            if wrong or wrong_after:
+                self.log_result("Unread Counts", False, f"{len(wrong) + len(wrong_after)} conversations miscounted", details)
+                return False
+            self.log_result("Unread Counts", True,
+                          f"Unread exact across {len(conversation_ids)} conversations "
+                          f"({total} unread before reads, {total_after} after)")
+            return True
+
+        except Exception as e:
+            self.log_result("Unread Counts", False, f"Error: {str(e)}")
+            return False
+
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+
+    def run_all_tests(self):
+        """Run all messaging tests"""
+        print("🚀 Starting Messaging Testing...")
+        print("=" * 60)
+
+        if not self.setup_test_user():
+            print("❌ Cannot proceed without authentication")
+            return False
+
+        tests = [
+            self.test_time_ordered_ids,
+            self.test_message_pagination,
+            self.test_dm_get_or_create,
+            self.test_unread_counts,
+            self.check_query_budgets
+        ]
+
+        passed_tests = 0
+        total_tests = len(tests)
+
+        for test in tests:
+            try:
+                if test():
+                    passed_tests += 1
+            except Exception as e:
+                print(f"❌ Test {test.__name__} failed with exception: {str(e)}")
+
+        # Summary
+        print("\n" + "=" * 60)
+        print(f"📊 MESSAGING TEST SUMMARY")
+        print(f"Passed: {passed_tests}/{total_tests}")
+        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+        print("ℹ️  Insert throughput and index size by id scheme: node scripts/bench-ids.mjs 10000000")
+
+        if passed_tests == total_tests:
+            print("🎉 All messaging tests passed!")
+            return True
+        else:
+            print(f"⚠️  {total_tests - passed_tests} test(s) failed")
+            return False
+
+if __name__ == "__main__":
+    tester = MessagingTester()
+    success = tester.run_all_tests()
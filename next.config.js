@@ -30,8 +30,10 @@ const nextConfig = {
           { key: "X-Frame-Options", value: "ALLOWALL" },
           { key: "Content-Security-Policy", value: "frame-ancestors *;" },
           { key: "Access-Control-Allow-Origin", value: process.env.CORS_ORIGINS || "*" },
-          { key: "Access-Control-Allow-Methods", value: "GET, POST, PUT, DELETE, OPTIONS" },
+          { key: "Access-Control-Allow-Methods", value: "GET, POST, PUT, PATCH, DELETE, OPTIONS" },
           { key: "Access-Control-Allow-Headers", value: "*" },
+          // Request timings and conditional-request tags for browser clients
+          { key: "Access-Control-Expose-Headers", value: "Server-Timing, ETag" },
         ],
       },
     ];
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+
+import requests
+import json
+import sys
+import os
+import time
+from datetime import datetime
+from harness_metrics import ServerTimingCollector
+from profile_editing_test import ENHANCED_PROFILE
+
+# Configuration
+BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
+TEST_USER_EMAIL = "payload.test.user@example.com"
+TEST_USER_PASSWORD = "testpass123"
+TEST_USER_NAME = "Payload Test User"
+
+# Peers get the large profile and are matched with the test user
+PAYLOAD_PEERS = int(os.environ.get("PAYLOAD_PEERS", "10"))
+PAYLOAD_ROUNDS = int(os.environ.get("PAYLOAD_ROUNDS", "20"))
+
+VIEWS = ["card", "detail", "full"]
+ENDPOINTS = ["matches", "explore/people", "explore/hackathons", "explore/projects"]
+
+class PayloadSizeTester:
+    def __init__(self):
+        self.session = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session)
+        self.auth_token = None
+        self.user_id = None
+        self.test_results = []
+
+    def log_result(self, test_name, success, message, details=None):
+        """Log test result"""
+        status = "✅ PASS" if success else "❌ FAIL"
+        result = {
+            "test": test_name,
+            "status": status,
+            "message": message,
+            "details": details,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.test_results.append(result)
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+
+    def authenticate(self, email, name):
+        """Register or login a user and return (token, user id)"""
+        response = requests.post(f"{BASE_URL}/auth/register", json={
+            "email": email,
+            "password": TEST_USER_PASSWORD,
+            "name": name
+        })
+        if response.status_code == 400 and "already exists" in response.text:
+            response = requests.post(f"{BASE_URL}/auth/login", json={
+                "email": email,
+                "password": TEST_USER_PASSWORD
+            })
+        if response.status_code != 200:
+            return None, None
+        data = response.json()
+        return data.get('token'), data.get('user', {}).get('id')
+
+    def swipe_right(self, token, target_id):
+        """Swipe right on a person; repeat swipes are rejected and ignored"""
+        requests.post(f"{BASE_URL}/swipe", headers={'Authorization': f'Bearer {token}'}, json={
+            "targetType": "PERSON",
+            "targetId": target_id,
+            "direction": "RIGHT"
+        })
+
+    def setup_test_user(self):
+        """Register the test user and match it with PAYLOAD_PEERS large profiles"""
+        try:
+            self.auth_token, self.user_id = self.authenticate(TEST_USER_EMAIL, TEST_USER_NAME)
+            if not self.auth_token:
+                self.log_result("User Setup", False, "Could not authenticate the test user")
+                return False
+            self.session.headers.update({'Authorization': f'Bearer {self.auth_token}'})
+
+            for i in range(PAYLOAD_PEERS):
+                token, peer_id = self.authenticate(f"payload.peer.{i}@example.com", f"Payload Peer {i}")
+                if not token:
+                    self.log_result("User Setup", False, f"Could not authenticate peer {i}")
+                    return False
+                requests.put(f"{BASE_URL}/profile", headers={'Authorization': f'Bearer {token}'},
+                             json=ENHANCED_PROFILE)
+                self.swipe_right(token, self.user_id)
+                self.swipe_right(self.auth_token, peer_id)
+
+            self.log_result("User Setup", True, f"Test user matched with {PAYLOAD_PEERS} large profiles")
+            return True
+
+        except Exception as e:
+            self.log_result("User Setup", False, f"Setup error: {str(e)}")
+            return False
+
+    def test_view_shapes(self):
+        """Test that each view returns only its fields"""
+        try:
+            print("\n🔄 Testing Card View Shapes...")
+
+            bodies = {}
+            for view in VIEWS:
+                response = self.session.get(f"{BASE_URL}/matches", params={"view": view})
+                if response.status_code != 200:
+                    self.log_result("View Shapes", False, f"matches?view={view} returned {response.status_code}")
+                    return False
+                bodies[view] = response.json().get('matches', [])
+
+            cards = {view: [m['otherUser'] for m in matches if m.get('otherUser', {}).get('profile')]
+                     for view, matches in bodies.items()}
+            if not all(cards.values()):
+                self.log_result("View Shapes", False, "No matches with profiles to inspect")
+                return False
+
+            posts = {view: self.session.get(f"{BASE_URL}/explore/hackathons", params={"view": view}).json().get('posts', [])
+                     for view in VIEWS}
+            internal = ('_id', 'skillIds', 'interestIds', 'geo', 'externalId')
+
+            card, detail, full = cards["card"][0], cards["detail"][0], cards["full"][0]
+            checks = [
+                ("card has name and skills", bool(card.get('name')) and 'skills' in card['profile']),
+                ("card omits email and _id", 'email' not in card and '_id' not in card['profile']),
+                ("card omits experience and preferences",
+                 'experience' not in card['profile'] and 'preferences' not in card['profile']),
+                ("card match omits _id", '_id' not in bodies["card"][0]),
+                ("detail has experience", 'experience' in detail['profile']),
+                ("detail omits preferences", 'preferences' not in detail['profile']),
+                ("full has preferences", 'preferences' in full['profile']),
+                ("no view exposes passwordHash",
+                 all('passwordHash' not in c for view_cards in cards.values() for c in view_cards)),
+                ("card match has only match fields",
+                 set(bodies["card"][0]) - {'otherUser'} <= {'id', 'aId', 'bId', 'context', 'postId', 'createdAt'}),
+                ("card post omits notes and websiteUrl",
+                 all('notes' not in p and 'websiteUrl' not in p for p in posts["card"])),
+                ("detail post has notes", not posts["detail"] or any('notes' in p for p in posts["detail"])),
+                ("no view exposes internal post fields",
+                 all(field not in p for view_posts in posts.values() for p in view_posts for field in internal))
+            ]
+
+            failed = [name for name, ok in checks if not ok]
+            if failed:
+                self.log_result("View Shapes", False, f"{len(failed)} shape checks failed", "; ".join(failed))
+                return False
+
+            self.log_result("View Shapes", True, f"{len(checks)} shape checks passed")
+            return True
+
+        except Exception as e:
+            self.log_result("View Shapes", False, f"Error: {str(e)}")
+            return False
+
+    def test_unknown_view_rejected(self):
+        """Test that an unknown view is rejected with 400"""
+        try:
+            print("\n🔄 Testing Unknown View...")
+
+            response = self.session.get(f"{BASE_URL}/explore/people", params={"view": "everything"})
+            if response.status_code == 400:
+                self.log_result("Unknown View", True, "Rejected with 400")
+                return True
+
+            self.log_result("Unknown View", False, f"Expected 400, got {response.status_code}")
+            return False
+
+        except Exception as e:
+            self.log_result("Unknown View", False, f"Error: {str(e)}")
+            return False
+
+    def test_payload_sizes(self):
+        """Measure response bytes and latency per endpoint and view"""
+        try:
+            print(f"\n🔄 Measuring Payload Sizes ({PAYLOAD_ROUNDS} rounds)...")
+
+            results = {}
+            for endpoint in ENDPOINTS:
+                for view in VIEWS:
+                    sizes, items, latencies = [], [], []
+                    for _ in range(PAYLOAD_ROUNDS):
+                        started = time.perf_counter()
+                        response = self.session.get(f"{BASE_URL}/{endpoint}", params={"view": view})
+                        latencies.append((time.perf_counter() - started) * 1000)
+                        if response.status_code != 200:
+                            self.log_result("Payload Sizes", False,
+                                          f"{endpoint}?view={view} returned {response.status_code}")
+                            return False
+                        body = response.json()
+                        sizes.append(len(response.content))
+                        items.append(sum(len(v) for v in body.values() if isinstance(v, list)))
+                    results[(endpoint, view)] = (sum(sizes) / len(sizes), sum(items) / len(items),
+                                                 sum(latencies) / len(latencies))
+
+            print(f"   {'endpoint':<22}{'view':<8}{'bytes':>10}{'items':>7}{'bytes/item':>12}{'ms':>8}{'vs full':>9}")
+            for endpoint in ENDPOINTS:
+                full_bytes = results[(endpoint, "full")][0]
+                for view in VIEWS:
+                    size, count, latency = results[(endpoint, view)]
+                    per_item = f"{size / count:.0f}" if count else "-"
+                    ratio = f"{size / full_bytes:.0%}" if full_bytes else "-"
+                    print(f"   {endpoint:<22}{view:<8}{size:>10.0f}{count:>7.1f}{per_item:>12}{latency:>8.1f}{ratio:>9}")
+
+            card_bytes = results[("matches", "card")][0]
+            full_bytes = results[("matches", "full")][0]
+            if card_bytes < full_bytes:
+                self.log_result("Payload Sizes", True,
+                              f"matches: card view {card_bytes:.0f} bytes vs full {full_bytes:.0f} bytes "
+                              f"({1 - card_bytes / full_bytes:.0%} smaller)")
+                return True
+
+            self.log_result("Payload Sizes", False,
+                          f"matches: card view {card_bytes:.0f} bytes is not smaller than full {full_bytes:.0f} bytes")
+            return False
+
+        except Exception as e:
+            self.log_result("Payload Sizes", False, f"Error: {str(e)}")
+            return False
+
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+
+    def run_all_tests(self):
+        """Run all payload size tests"""
+        print("🚀 Starting Payload Size Testing...")
+        print("=" * 60)
+
+        if not self.setup_test_user():
+            print("❌ Cannot proceed without authentication")
+            return False
+
+        tests = [
+            self.test_view_shapes,
+            self.test_unknown_view_rejected,
+            self.test_payload_sizes,
+            self.check_query_budgets
+        ]
+
+        passed_tests = 0
+        total_tests = len(tests)
+
+        for test in tests:
+            try:
+                if test():
+                    passed_tests += 1
+            except Exception as e:
+                print(f"❌ Test {test.__name__} failed with exception: {str(e)}")
+
+        # Summary
+        print("\n" + "=" * 60)
+        print(f"📊 PAYLOAD SIZE TEST SUMMARY")
+        print(f"Passed: {passed_tests}/{total_tests}")
+        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+
+        if passed_tests == total_tests:
+            print("🎉 All payload size tests passed!")
+            return True
+        else:
+            print(f"⚠️  {total_tests - passed_tests} test(s) failed")
+            return False
+
+if __name__ == "__main__":
+    tester = PayloadSizeTester()
+    success = tester.run_all_tests()
@@ -3,17 +3,104 @@
 import requests
 import json
 import sys
+import os
+import time
 from datetime import datetime
+from harness_metrics import ServerTimingCollector
 
 # Configuration
 BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
 TEST_USER_EMAIL = "profile.test.user@example.com"
 TEST_USER_PASSWORD = "testpass123"
 TEST_USER_NAME = "Profile Test User"
+PATCH_ROUNDS = int(os.environ.get("PATCH_ROUNDS", "20"))
+
+# Large profile with every enhanced field, shared with payload_size_test.py
+ENHANCED_PROFILE = {
+    "bio": "Senior Software Engineer with 8+ years of experience building scalable web applications and leading cross-functional teams. Passionate about clean code, system architecture, and mentoring junior developers.",
+    "looksToConnect": "Seeking talented frontend developers and UX designers to build the next generation of developer tools and educational platforms",
+    "skills": [
+        "JavaScript", "TypeScript", "React", "Node.js", "Python", 
+        "PostgreSQL", "MongoDB", "AWS", "Docker", "Kubernetes", 
+        "GraphQL", "REST APIs", "System Design", "Microservices"
+    ],
+    "interests": [
+        "Web Development", "System Architecture", "Developer Tools", 
+        "EdTech", "Open Source", "Mentoring", "Tech Leadership"
+    ],
+    "experience": [
+        {
+            "title": "Senior Software Engineer",
+            "org": "TechCorp Inc",
+            "startDate": "2020-01-01",
+            "endDate": None,
+            "description": "Leading development of microservices architecture serving 1M+ users. Built CI/CD pipelines and mentored team of 5 junior developers."
+        },
+        {
+            "title": "Full Stack Developer",
+            "org": "StartupXYZ",
+            "startDate": "2018-06-01",
+            "endDate": "2019-12-01",
+            "description": "Developed MVP from scratch using React and Node.js. Implemented real-time features with WebSocket and optimized database queries."
+        },
+        {
+            "title": "Junior Developer",
+            "org": "WebSolutions Ltd",
+            "startDate": "2016-03-01",
+            "endDate": "2018-05-01",
+            "description": "Built responsive web applications and learned modern development practices. Contributed to open-source projects."
+        }
+    ],
+    "projects": [
+        {
+            "name": "DevTools Pro",
+            "description": "Comprehensive developer productivity suite with code analysis, performance monitoring, and team collaboration features",
+            "repoUrl": "https://github.com/profiletest/devtools-pro",
+            "demoUrl": "https://devtools-pro.demo.com"
+        },
+        {
+            "name": "EduPlatform",
+            "description": "Interactive learning platform for programming courses with real-time code execution and peer review system",
+            "repoUrl": "https://github.com/profiletest/eduplatform",
+            "demoUrl": "https://eduplatform.demo.com"
+        }
+    ],
+    "socials": [
+        {
+            "type": "LINKEDIN",
+            "url": "https://linkedin.com/in/profiletestuser"
+        },
+        {
+            "type": "GITHUB",
+            "url": "https://github.com/profiletestuser"
+        },
+        {
+            "type": "TWITTER",
+            "url": "https://twitter.com/profiletestuser"
+        }
+    ],
+    "awards": [
+        "Best Innovation Award 2023",
+        "Top Contributor Open Source 2022"
+    ],
+    "preferences": {
+        "desiredRoles": ["Senior Engineer", "Tech Lead", "Architect"],
+        "techStack": ["React", "Node.js", "Python", "AWS"],
+        "interestTags": ["Web Development", "System Design", "EdTech"],
+        "locationRadiusKm": 100,
+        "remoteOk": True,
+        "availabilityHrs": 25,
+        "searchPeople": True,
+        "searchProjects": True,
+        "searchHackathons": True
+    }
+}
 
 class ProfileEditingTester:
     def __init__(self):
         self.session = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session)
         self.auth_token = None
         self.test_results = []
         
@@ -77,86 +164,7 @@ class ProfileEditingTester:
         try:
             print("\n🔄 Testing Enhanced Profile Creation...")
             
-            # Create comprehensive profile data with all enhanced fields
-            profile_data = {
-                "bio": "Senior Software Engineer with 8+ years of experience building scalable web applications and leading cross-functional teams. Passionate about clean code, system architecture, and mentoring junior developers.",
-                "looksToConnect": "Seeking talented frontend developers and UX designers to build the next generation of developer tools and educational platforms",
-                "skills": [
-                    "JavaScript", "TypeScript", "React", "Node.js", "Python", 
-                    "PostgreSQL", "MongoDB", "AWS", "Docker", "Kubernetes", 
-                    "GraphQL", "REST APIs", "System Design", "Microservices"
-                ],
-                "interests": [
-                    "Web Development", "System Architecture", "Developer Tools", 
-                    "EdTech", "Open Source", "Mentoring", "Tech Leadership"
-                ],
-                "experience": [
-                    {
-                        "title": "Senior Software Engineer",
-                        "org": "TechCorp Inc",
-                        "startDate": "2020-01-01",
-                        "endDate": None,
-                        "description": "Leading development of microservices architecture serving 1M+ users. Built CI/CD pipelines and mentored team of 5 junior developers."
-                    },
-                    {
-                        "title": "Full Stack Developer",
-                        "org": "StartupXYZ",
-                        "startDate": "2018-06-01",
-                        "endDate": "2019-12-01",
-                        "description": "Developed MVP from scratch using React and Node.js. Implemented real-time features with WebSocket and optimized database queries."
-                    },
-                    {
-                        "title": "Junior Developer",
-                        "org": "WebSolutions Ltd",
-                        "startDate": "2016-03-01",
-                        "endDate": "2018-05-01",
-                        "description": "Built responsive web applications and learned modern development practices. Contributed to open-source projects."
-                    }
-                ],
-                "projects": [
-                    {
-                        "name": "DevTools Pro",
-                        "description": "Comprehensive developer productivity suite with code analysis, performance monitoring, and team collaboration features",
-                        "repoUrl": "https://github.com/profiletest/devtools-pro",
-                        "demoUrl": "https://devtools-pro.demo.com"
-                    },
-                    {
-                        "name": "EduPlatform",
-                        "description": "Interactive learning platform for programming courses with real-time code execution and peer review system",
-                        "repoUrl": "https://github.com/profiletest/eduplatform",
-                        "demoUrl": "https://eduplatform.demo.com"
-                    }
-                ],
-                "socials": [
-                    {
-                        "type": "LINKEDIN",
-                        "url": "https://linkedin.com/in/profiletestuser"
-                    },
-                    {
-                        "type": "GITHUB",
-                        "url": "https://github.com/profiletestuser"
-                    },
-                    {
-                        "type": "TWITTER",
-                        "url": "https://twitter.com/profiletestuser"
-                    }
-                ],
-                "awards": [
-                    "Best Innovation Award 2023",
-                    "Top Contributor Open Source 2022"
-                ],
-                "preferences": {
-                    "desiredRoles": ["Senior Engineer", "Tech Lead", "Architect"],
-                    "techStack": ["React", "Node.js", "Python", "AWS"],
-                    "interestTags": ["Web Development", "System Design", "EdTech"],
-                    "locationRadiusKm": 100,
-                    "remoteOk": True,
-                    "availabilityHrs": 25,
-                    "searchPeople": True,
-                    "searchProjects": True,
-                    "searchHackathons": True
-                }
-            }
+            profile_data = ENHANCED_PROFILE
             
             response = self.session.put(f"{BASE_URL}/profile", json=profile_data)
             
@@ -559,6 +567,87 @@ class ProfileEditingTester:
             self.log_result("Enhanced Profile Structure Validation", False, f"Structure validation error: {str(e)}")
             return False
     
+    def test_one_field_patch(self):
+        """Measure bytes and latency of a one-field edit via PATCH versus PUT"""
+        try:
+            print(f"\n🔄 Testing One-Field Edit: PATCH vs PUT ({PATCH_ROUNDS} rounds)...")
+            
+            response = self.session.get(f"{BASE_URL}/profile")
+            profile = response.json().get('profile') if response.status_code == 200 else None
+            if not profile:
+                self.log_result("One-Field Patch", False, f"Could not load profile: {response.status_code}")
+                return False
+            
+            editable = ['bio', 'looksToConnect', 'skills', 'interests', 'experience',
+                        'projects', 'awards', 'socials', 'preferences']
+            full_body = {key: profile.get(key) for key in editable}
+            revision = profile.get('revision', 0)
+            profile_id, created_at = profile.get('id'), profile.get('createdAt')
+            
+            results = {}
+            for method in ["PUT", "PATCH"]:
+                sent, received, latencies = 0, 0, []
+                for i in range(PATCH_ROUNDS):
+                    title = f"Senior Software Engineer ({method} {i})"
+                    if method == "PUT":
+                        full_body['experience'][0]['title'] = title
+                        body = json.dumps(full_body)
+                    else:
+                        body = json.dumps({"revision": revision, "set": {"experience.0.title": title}})
+                    
+                    started = time.perf_counter()
+                    response = self.session.request(method, f"{BASE_URL}/profile", data=body,
+                                                    headers={'Content-Type': 'application/json'})
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    if response.status_code != 200:
+                        self.log_result("One-Field Patch", False,
+                                      f"{method} returned {response.status_code}", response.text)
+                        return False
+                    
+                    revision = response.json()['profile']['revision']
+                    sent += len(body)
+                    received += len(response.content)
+                
+                latencies.sort()
+                results[method] = (sent / PATCH_ROUNDS, received / PATCH_ROUNDS,
+                                   latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.95) - 1])
+            
+            for method, (sent, received, p50, p95) in results.items():
+                print(f"   {method:<6} {sent:>8.0f} bytes sent {received:>8.0f} bytes received "
+                      f"p50 {p50:>6.1f}ms p95 {p95:>6.1f}ms")
+            
+            # The edit landed, nothing else moved, and PUT kept the profile identity
+            stored = self.session.get(f"{BASE_URL}/profile").json().get('profile', {})
+            checks = [
+                ("Edit Applied", stored.get('experience', [{}])[0].get('title') == f"Senior Software Engineer (PATCH {PATCH_ROUNDS - 1})"),
+                ("Other Fields Unchanged", stored.get('skills') == profile.get('skills')
+                 and stored.get('experience', [])[1:] == profile.get('experience', [])[1:]),
+                ("Identity Preserved", stored.get('id') == profile_id and stored.get('createdAt') == created_at),
+                ("Revision Advanced", stored.get('revision') == revision)
+            ]
+            
+            stale = self.session.patch(f"{BASE_URL}/profile", json={"revision": revision - 1, "set": {"bio": "stale"}})
+            checks.append(("Stale Revision Rejected", stale.status_code == 409 and stale.json().get('revision') == revision))
+            
+            failed = [name for name, ok in checks if not ok]
+            if failed:
+                self.log_result("One-Field Patch", False, f"{len(failed)} checks failed", "; ".join(failed))
+                return False
+            
+            put_sent, patch_sent = results["PUT"][0], results["PATCH"][0]
+            self.log_result("One-Field Patch", True,
+                          f"PATCH sends {patch_sent:.0f} bytes vs {put_sent:.0f} for PUT "
+                          f"({1 - patch_sent / put_sent:.0%} less), p50 {results['PATCH'][2]:.1f}ms vs {results['PUT'][2]:.1f}ms")
+            return True
+                
+        except Exception as e:
+            self.log_result("One-Field Patch", False, f"Patch measurement error: {str(e)}")
+            return False
+    
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+    
     def run_all_tests(self):
         """Run all enhanced profile editing tests"""
         print("🚀 Starting Enhanced Profile Editing Backend Testing...")
@@ -575,7 +664,9 @@ class ProfileEditingTester:
             self.test_profile_retrieval_via_auth_me,
             self.test_profile_update_workflow,
             self.test_profile_data_persistence,
-            self.test_enhanced_profile_structure_validation
+            self.test_enhanced_profile_structure_validation,
+            self.test_one_field_patch,
+            self.check_query_budgets
         ]
         
         passed_tests = 0
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+
+import requests
+import json
+import sys
+import os
+import time
+import random
+import uuid
+from datetime import datetime
+from harness_metrics import ServerTimingCollector, parse_server_timing
+
+# Configuration
+BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
+TEST_USER_EMAIL = "ranking.test.user@example.com"
+TEST_USER_PASSWORD = "testpass123"
+TEST_USER_NAME = "Ranking Test User"
+
+# Generated dataset, inserted directly when MONGO_URL and pymongo are available
+RANK_USERS = int(os.environ.get("RANK_USERS", "50000"))
+RANK_DECKS = int(os.environ.get("RANK_DECKS", "50"))
+# Users registered through the API when there is no database access
+RANK_API_USERS = int(os.environ.get("RANK_API_USERS", "20"))
+GENERATED_PREFIX = "rank-gen-"
+
+MONGO_URL = os.environ.get("MONGO_URL")
+DB_NAME = os.environ.get("DB_NAME", "hackathon_tinder")
+
+try:
+    import pymongo
+except ImportError:
+    pymongo = None
+
+SKILLS = ["JavaScript", "TypeScript", "React", "Vue", "Svelte", "Node.js", "Python", "Django", "FastAPI", "Go",
+          "Java", "Kotlin", "Swift", "C++", "PostgreSQL", "MongoDB", "Redis", "AWS", "GCP", "Docker",
+          "Kubernetes", "PyTorch", "TensorFlow", "Figma", "GraphQL", "Solidity", "Unity", "Flutter"]
+INTERESTS = ["AI/ML", "Web3", "FinTech", "HealthTech", "EdTech", "Climate", "Gaming", "Open Source",
+             "DevTools", "Social Impact", "Robotics", "AR/VR", "Security", "Data Science"]
+ROLES = ["Frontend Developer", "Backend Engineer", "Full Stack Developer", "ML Engineer", "Product Designer",
+         "Data Scientist", "Mobile Developer", "DevOps Engineer", "Product Manager"]
+
+# What the viewer is looking for; rare in the generated data on purpose
+WANTED_SKILLS = ["Rust", "WebAssembly"]
+VIEWER_PROFILE = {
+    "bio": "Building a WebAssembly runtime for edge functions",
+    "looksToConnect": "Rust and WebAssembly engineers",
+    "skills": ["Rust", "C++", "Go"],
+    "interests": ["DevTools", "Open Source"],
+    "preferences": {
+        "desiredRoles": ["Systems Engineer"],
+        "techStack": WANTED_SKILLS,
+        "interestTags": ["DevTools"],
+        "locationRadiusKm": 50,
+        "remoteOk": True,
+        "availabilityHrs": 20,
+        "searchPeople": True,
+        "searchProjects": True,
+        "searchHackathons": True
+    }
+}
+
+def generate_profile(rng, user_id, wanted=False):
+    """Random profile; `wanted` ones include one of WANTED_SKILLS"""
+    skills = rng.sample(SKILLS, rng.randint(3, 8))
+    if wanted:
+        skills.append(rng.choice(WANTED_SKILLS))
+    return {
+        "userId": user_id,
+        "bio": "Generated for ranking benchmarks",
+        "looksToConnect": None,
+        "skills": skills,
+        "interests": rng.sample(INTERESTS, rng.randint(2, 5)),
+        "experience": [],
+        "projects": [],
+        "awards": [],
+        "socials": [],
+        "preferences": {
+            "desiredRoles": rng.sample(ROLES, rng.randint(1, 3)),
+            "techStack": rng.sample(SKILLS, rng.randint(2, 5)),
+            "interestTags": rng.sample(INTERESTS, rng.randint(1, 3)),
+            "locationRadiusKm": 50,
+            "remoteOk": rng.random() < 0.7,
+            "availabilityHrs": rng.randint(5, 40),
+            "searchPeople": rng.random() < 0.9,
+            "searchProjects": True,
+            "searchHackathons": True
+        }
+    }
+
+class RankingTester:
+    def __init__(self):
+        self.session = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session)
+        self.auth_token = None
+        self.db = None
+        self.wanted_candidates = 0
+        self.test_results = []
+
+    def log_result(self, test_name, success, message, details=None):
+        """Log test result"""
+        status = "✅ PASS" if success else "❌ FAIL"
+        result = {
+            "test": test_name,
+            "status": status,
+            "message": message,
+            "details": details,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.test_results.append(result)
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+
+    def setup_test_user(self):
+        """Register the viewer and give it a profile looking for WANTED_SKILLS"""
+        try:
+            response = self.session.post(f"{BASE_URL}/auth/register", json={
+                "email": TEST_USER_EMAIL,
+                "password": TEST_USER_PASSWORD,
+                "name": TEST_USER_NAME
+            })
+            if response.status_code == 400 and "already exists" in response.text:
+                response = self.session.post(f"{BASE_URL}/auth/login", json={
+                    "email": TEST_USER_EMAIL,
+                    "password": TEST_USER_PASSWORD
+                })
+            if response.status_code != 200:
+                self.log_result("User Setup", False, f"Authentication failed: {response.status_code}")
+                return False
+
+            self.auth_token = response.json().get('token')
+            self.session.headers.update({'Authorization': f'Bearer {self.auth_token}'})
+
+            profile_response = self.session.put(f"{BASE_URL}/profile", json=VIEWER_PROFILE)
+            if profile_response.status_code != 200:
+                self.log_result("User Setup", False, f"Profile update failed: {profile_response.status_code}")
+                return False
+
+            if MONGO_URL and pymongo:
+                self.db = pymongo.MongoClient(MONGO_URL)[DB_NAME]
+            self.log_result("User Setup", True, "Viewer authenticated with a Rust/WebAssembly profile")
+            return True
+
+        except Exception as e:
+            self.log_result("User Setup", False, f"Setup error: {str(e)}")
+            return False
+
+    def seed_candidates(self):
+        """Generate RANK_USERS candidates in MongoDB, or RANK_API_USERS via the API"""
+        try:
+            print("\n🔄 Seeding Ranking Candidates...")
+            rng = random.Random(42)
+
+            if self.db is None:
+                for i in range(RANK_API_USERS):
+                    response = requests.post(f"{BASE_URL}/auth/register", json={
+                        "email": f"rank.api.{i}@example.com",
+                        "password": TEST_USER_PASSWORD,
+                        "name": f"Ranking Candidate {i}"
+                    })
+                    if response.status_code == 400:
+                        response = requests.post(f"{BASE_URL}/auth/login", json={
+                            "email": f"rank.api.{i}@example.com",
+                            "password": TEST_USER_PASSWORD
+                        })
+                    token = response.json().get('token')
+                    profile = generate_profile(rng, None, wanted=i % 4 == 0)
+                    requests.put(f"{BASE_URL}/profile", headers={'Authorization': f'Bearer {token}'}, json=profile)
+                self.wanted_candidates = (RANK_API_USERS + 3) // 4
+                self.log_result("Seed Candidates", True, f"No database access: {RANK_API_USERS} candidates via the API")
+                return True
+
+            existing = self.db['users'].count_documents({"id": {"$regex": f"^{GENERATED_PREFIX}"}})
+            started = time.perf_counter()
+            batch_users, batch_profiles = [], []
+            now = datetime.utcnow()
+            for i in range(existing, RANK_USERS):
+                user_id = f"{GENERATED_PREFIX}{i}"
+                batch_users.append({
+                    "id": user_id,
+                    "email": f"rank.gen.{i}@example.com",
+                    "name": f"Generated Candidate {i}",
+                    "username": f"rank_gen_{i}",
+                    "passwordHash": "!",
+                    "imageUrl": None,
+                    "roleHeadline": rng.choice(ROLES),
+                    "location": None,
+                    "timezone": None,
+                    "createdAt": now,
+                    "updatedAt": now
+                })
+                profile = generate_profile(rng, user_id, wanted=i % 100 == 0)
+                profile.update({"id": str(uuid.uuid4()), "revision": 1, "createdAt": now, "updatedAt": now})
+                batch_profiles.append(profile)
+                if len(batch_users) == 5000:
+                    self.db['users'].insert_many(batch_users, ordered=False)
+                    self.db['profiles'].insert_many(batch_profiles, ordered=False)
+                    batch_users, batch_profiles = [], []
+            if batch_users:
+                self.db['users'].insert_many(batch_users, ordered=False)
+                self.db['profiles'].insert_many(batch_profiles, ordered=False)
+
+            self.wanted_candidates = (RANK_USERS + 99) // 100
+            self.log_result("Seed Candidates", True,
+                          f"{RANK_USERS} generated candidates ({RANK_USERS - existing} inserted in "
+                          f"{time.perf_counter() - started:.1f}s)")
+            return True
+
+        except Exception as e:
+            self.log_result("Seed Candidates", False, f"Seeding error: {str(e)}")
+            return False
+
+    def test_deck_relevance(self):
+        """Test that candidates with the viewer's techStack lead the deck"""
+        try:
+            print("\n🔄 Testing Deck Relevance...")
+
+            # The server picks up directly inserted profiles on its next feature sync
+            deadline = time.time() + 60
+            while True:
+                response = self.session.get(f"{BASE_URL}/explore/people", params={"view": "card"})
+                if response.status_code != 200:
+                    self.log_result("Deck Relevance", False, f"explore/people returned {response.status_code}")
+                    return False
+                people = response.json().get('people', [])
+                relevant = [p for p in people
+                            if set(WANTED_SKILLS) & set((p.get('profile') or {}).get('skills', []))]
+                expected = min(len(people), self.wanted_candidates)
+                if len(relevant) >= expected * 0.8 or time.time() > deadline:
+                    break
+                time.sleep(5)
+
+            if people and len(relevant) >= expected * 0.8:
+                self.log_result("Deck Relevance", True,
+                              f"{len(relevant)}/{len(people)} deck cards have Rust or WebAssembly")
+                return True
+
+            self.log_result("Deck Relevance", False,
+                          f"Only {len(relevant)}/{len(people)} deck cards match the viewer's techStack")
+            return False
+
+        except Exception as e:
+            self.log_result("Deck Relevance", False, f"Error: {str(e)}")
+            return False
+
+    def test_ranking_latency(self):
+        """Measure explore/people latency and the server's rank phase"""
+        try:
+            print(f"\n🔄 Measuring Ranking Latency ({RANK_DECKS} decks)...")
+
+            latencies, rank_times = [], []
+            for _ in range(RANK_DECKS):
+                started = time.perf_counter()
+                response = self.session.get(f"{BASE_URL}/explore/people", params={"view": "card"})
+                latencies.append((time.perf_counter() - started) * 1000)
+                if response.status_code != 200:
+                    self.log_result("Ranking Latency", False, f"explore/people returned {response.status_code}")
+                    return False
+                durations, _, _ = parse_server_timing(response.headers.get("Server-Timing", ""))
+                if "rank" in durations:
+                    rank_times.append(durations["rank"])
+
+            latencies.sort()
+            rank_times.sort()
+            p50 = latencies[len(latencies) // 2]
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            rank_summary = (f", server rank phase p50 {rank_times[len(rank_times) // 2]:.2f}ms "
+                            f"max {rank_times[-1]:.2f}ms" if rank_times else "")
+            self.log_result("Ranking Latency", True, f"explore/people p50 {p50:.1f}ms, p95 {p95:.1f}ms{rank_summary}")
+            return True
+
+        except Exception as e:
+            self.log_result("Ranking Latency", False, f"Error: {str(e)}")
+            return False
+
+    def test_precomputed_deck(self):
+        """Run the offline compatibility job and check decks come from its lists"""
+        try:
+            print("\n🔄 Testing Precomputed Candidate Lists...")
+            if self.db is None:
+                self.log_result("Precomputed Deck", True, "No database access: skipped (run compatibility_job.py)")
+                return True
+
+            import compatibility_job
+            started = time.perf_counter()
+            if not compatibility_job.run_job():
+                self.log_result("Precomputed Deck", False, "compatibility_job.py failed")
+                return False
+            job_seconds = time.perf_counter() - started
+
+            me = self.session.get(f"{BASE_URL}/auth/me").json().get('user', {})
+            stored = self.db['candidateLists'].find_one({"userId": me.get('id')}) or {}
+            response = self.session.get(f"{BASE_URL}/explore/people", params={"view": "card"})
+            if response.status_code != 200:
+                self.log_result("Precomputed Deck", False, f"explore/people returned {response.status_code}")
+                return False
+
+            _, _, counters = parse_server_timing(response.headers.get("Server-Timing", ""))
+            deck = [p['id'] for p in response.json().get('people', [])]
+            listed = set(stored.get('candidates', []))
+            served = sum(1 for user_id in deck if user_id in listed)
+            if deck and served == len(deck) and counters.get('precomputed') == len(deck):
+                self.log_result("Precomputed Deck", True,
+                              f"Deck served from a {len(listed)}-candidate list; job took {job_seconds:.1f}s")
+                return True
+
+            self.log_result("Precomputed Deck", False,
+                          f"{served}/{len(deck)} deck cards came from the precomputed list",
+                          {"counters": counters})
+            return False
+
+        except Exception as e:
+            self.log_result("Precomputed Deck", False, f"Error: {str(e)}")
+            return False
+
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+
+    def run_all_tests(self):
+        """Run all ranking tests"""
+        print("🚀 Starting Candidate Ranking Testing...")
+        print("=" * 60)
+
+        if not self.setup_test_user():
+            print("❌ Cannot proceed without authentication")
+            return False
+
+        tests = [
+            self.seed_candidates,
+            self.test_deck_relevance,
+            self.test_ranking_latency,
+            self.test_precomputed_deck,
+            self.check_query_budgets
+        ]
+
+        passed_tests = 0
+        total_tests = len(tests)
+
+        for test in tests:
+            try:
+                if test():
+                    passed_tests += 1
+            except Exception as e:
+                print(f"❌ Test {test.__name__} failed with exception: {str(e)}")
+
+        # Summary
+        print("\n" + "=" * 60)
+        print(f"📊 CANDIDATE RANKING TEST SUMMARY")
+        print(f"Passed: {passed_tests}/{total_tests}")
+        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+        print("ℹ️  Pure ranking cost without HTTP or Mongo: node scripts/bench-ranking.mjs 50000")
+        print("ℹ️  Offline job cost: python compatibility_job.py --benchmark 10000 100000")
+
+        if passed_tests == total_tests:
+            print("🎉 All candidate ranking tests passed!")
+            return True
+        else:
+            print(f"⚠️  {total_tests - passed_tests} test(s) failed")
+            return False
+
+if __name__ == "__main__":
+    tester = RankingTester()
+    success = tester.run_all_tests()
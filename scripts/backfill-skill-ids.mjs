@@ -0,0 +1,46 @@
+// Fills in interned skill ids on posts and profiles written before they
+// existed, or re-derives them all after a taxonomy change.
+//
+//   MONGO_URL=... node scripts/backfill-skill-ids.mjs [--all]
+//
+// Without --all only documents missing `skillIds` are touched. Updates go
+// out as unordered bulkWrites of BATCH documents.
+
+import { MongoClient } from 'mongodb';
+import { postSkillFields, profileSkillFields } from '../lib/skill-taxonomy.js';
+
+const BATCH = 1000;
+const all = process.argv.includes('--all');
+
+async function backfill(collection, projection, fieldsFor) {
+  const filter = all ? {} : { skillIds: { $exists: false } };
+  const cursor = collection.find(filter, { projection: { _id: 1, ...projection } });
+  let operations = [];
+  let updated = 0;
+
+  for await (const doc of cursor) {
+    operations.push({ updateOne: { filter: { _id: doc._id }, update: { $set: fieldsFor(doc) } } });
+    if (operations.length === BATCH) {
+      await collection.bulkWrite(operations, { ordered: false });
+      updated += operations.length;
+      operations = [];
+    }
+  }
+  if (operations.length > 0) {
+    await collection.bulkWrite(operations, { ordered: false });
+    updated += operations.length;
+  }
+  return updated;
+}
+
+const client = new MongoClient(process.env.MONGO_URL);
+try {
+  await client.connect();
+  const db = client.db(process.env.DB_NAME || 'hackathon_tinder');
+  const posts = await backfill(db.collection('posts'), { skillsNeeded: 1 }, postSkillFields);
+  const profiles = await backfill(db.collection('profiles'), { skills: 1, interests: 1 }, profileSkillFields);
+  console.log(`posts:    ${posts} updated`);
+  console.log(`profiles: ${profiles} updated`);
+} finally {
+  await client.close();
+}
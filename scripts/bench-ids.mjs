@@ -0,0 +1,85 @@
+// Benchmark: swipe insert throughput and `id` index size, uuidv4 vs uuidv7.
+//
+//   MONGO_URL=... node scripts/bench-ids.mjs [swipes] [batch]
+//
+// Inserts `swipes` swipe documents (default 10,000,000) into a scratch
+// collection per id scheme, each with the unique `id` index the swipe
+// buffer creates, in insertMany batches of `batch` (default 1000). Prints
+// throughput per million inserted, so the slowdown as the index outgrows
+// the cache is visible, then the final index and collection sizes. The
+// scratch collections are dropped afterwards.
+
+import { MongoClient } from 'mongodb';
+import { v4 as uuidv4 } from 'uuid';
+import { uuidv7 } from '../lib/ids.js';
+
+const SWIPES = Number(process.argv[2] || 10_000_000);
+const BATCH = Number(process.argv[3] || 1000);
+const REPORT_EVERY = 1_000_000;
+const TARGET_TYPES = ['PERSON', 'PERSON', 'PERSON', 'PROJECT', 'HACKATHON'];
+
+if (!process.env.MONGO_URL) {
+  console.error('MONGO_URL is not set');
+  process.exit(1);
+}
+
+const client = await new MongoClient(process.env.MONGO_URL).connect();
+const db = client.db(process.env.DB_NAME || 'hackathon_tinder');
+const swipers = Array.from({ length: 20000 }, () => uuidv4());
+
+function swipe(id, i) {
+  return {
+    id,
+    swiperId: swipers[i % swipers.length],
+    targetType: TARGET_TYPES[i % TARGET_TYPES.length],
+    targetId: uuidv4(),
+    direction: i % 5 === 0 ? 'RIGHT' : 'LEFT',
+    createdAt: new Date()
+  };
+}
+
+async function run(scheme, nextId) {
+  const name = `bench_ids_${scheme}`;
+  await db.collection(name).drop().catch(() => {});
+  const collection = db.collection(name);
+  await collection.createIndex({ id: 1 }, { unique: true });
+
+  console.log(`\n${scheme}`);
+  console.log(`${'inserted'.padStart(12)}${'swipes/s'.padStart(12)}`);
+  const started = performance.now();
+  let windowStarted = started;
+  for (let inserted = 0; inserted < SWIPES;) {
+    const size = Math.min(BATCH, SWIPES - inserted);
+    const batch = Array.from({ length: size }, (_, offset) => swipe(nextId(), inserted + offset));
+    await collection.insertMany(batch, { ordered: false });
+    inserted += size;
+    if (inserted % REPORT_EVERY === 0 || inserted === SWIPES) {
+      const now = performance.now();
+      const window = inserted % REPORT_EVERY || REPORT_EVERY;
+      console.log(`${inserted.toLocaleString().padStart(12)}${Math.round(window / ((now - windowStarted) / 1000)).toLocaleString().padStart(12)}`);
+      windowStarted = now;
+    }
+  }
+  const seconds = (performance.now() - started) / 1000;
+
+  const stats = await db.command({ collStats: name });
+  const result = {
+    scheme,
+    seconds,
+    rate: SWIPES / seconds,
+    idIndexMb: stats.indexSizes.id_1 / 1e6,
+    dataMb: stats.storageSize / 1e6
+  };
+  await collection.drop();
+  return result;
+}
+
+console.log(`Inserting ${SWIPES.toLocaleString()} swipes per scheme in batches of ${BATCH}`);
+const results = [await run('uuidv4', uuidv4), await run('uuidv7', () => uuidv7())];
+
+console.log(`\n${'scheme'.padEnd(8)}${'total s'.padStart(10)}${'swipes/s'.padStart(12)}${'id index MB'.padStart(13)}${'data MB'.padStart(10)}`);
+for (const r of results) {
+  console.log(`${r.scheme.padEnd(8)}${r.seconds.toFixed(1).padStart(10)}${Math.round(r.rate).toLocaleString().padStart(12)}` +
+    `${r.idIndexMb.toFixed(1).padStart(13)}${r.dataMb.toFixed(1).padStart(10)}`);
+}
+await client.close();
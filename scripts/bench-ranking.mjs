@@ -0,0 +1,89 @@
+// Micro-benchmark: ranking an explore/people deck from the feature index.
+//
+//   node scripts/bench-ranking.mjs [users] [decks]
+//
+// Generates `users` synthetic users/profiles (default 50000) from a fixed
+// seed, encodes them into the index and ranks `decks` decks for random
+// viewers, excluding a few hundred already-swiped candidates each. No
+// Mongo involved; this is the per-request ranking cost.
+
+import { createFeatureIndex, encodeFeatures } from '../lib/ranking.js';
+
+const USERS = Number(process.argv[2] || 50000);
+const DECKS = Number(process.argv[3] || 200);
+const DECK_SIZE = 10;
+const SWIPED = 300;
+
+const SKILLS = [
+  'JavaScript', 'TypeScript', 'React', 'Vue', 'Svelte', 'Node.js', 'Python', 'Django', 'FastAPI', 'Go',
+  'Rust', 'Java', 'Kotlin', 'Swift', 'C++', 'PostgreSQL', 'MongoDB', 'Redis', 'AWS', 'GCP', 'Docker',
+  'Kubernetes', 'PyTorch', 'TensorFlow', 'Figma', 'GraphQL', 'Solidity', 'Unity', 'Flutter', 'WebAssembly'
+];
+const INTERESTS = [
+  'AI/ML', 'Web3', 'FinTech', 'HealthTech', 'EdTech', 'Climate', 'Gaming', 'Open Source', 'DevTools',
+  'Social Impact', 'Robotics', 'AR/VR', 'Security', 'Data Science', 'Hardware', 'Music'
+];
+const ROLES = ['Frontend Developer', 'Backend Engineer', 'Full Stack Developer', 'ML Engineer', 'Product Designer',
+  'Data Scientist', 'Mobile Developer', 'DevOps Engineer', 'Product Manager', 'Blockchain Developer'];
+const CITIES = ['San Francisco, CA', 'New York, NY', 'Austin, TX', 'Seattle, WA', 'London, UK', 'Berlin, Germany'];
+
+// Deterministic PRNG so runs are comparable
+let seed = 42;
+function random() {
+  seed = (seed * 1664525 + 1013904223) >>> 0;
+  return seed / 0x100000000;
+}
+const pick = (list) => list[Math.floor(random() * list.length)];
+const sample = (list, n) => Array.from({ length: n }, () => pick(list));
+
+function generateUser(i) {
+  const user = { id: `user-${i}`, roleHeadline: pick(ROLES), location: pick(CITIES) };
+  const profile = {
+    userId: user.id,
+    skills: sample(SKILLS, 3 + Math.floor(random() * 8)),
+    interests: sample(INTERESTS, 2 + Math.floor(random() * 4)),
+    preferences: {
+      desiredRoles: sample(ROLES, 1 + Math.floor(random() * 3)),
+      techStack: sample(SKILLS, 2 + Math.floor(random() * 4)),
+      interestTags: sample(INTERESTS, 1 + Math.floor(random() * 3)),
+      remoteOk: random() < 0.7,
+      availabilityHrs: Math.floor(random() * 40),
+      searchPeople: random() < 0.9
+    }
+  };
+  return [user, profile];
+}
+
+const index = createFeatureIndex();
+const viewers = [];
+let started = performance.now();
+for (let i = 0; i < USERS; i++) {
+  const [user, profile] = generateUser(i);
+  const features = encodeFeatures(user, profile);
+  index.upsert(features);
+  if (i < DECKS) viewers.push(features);
+}
+const buildMs = performance.now() - started;
+
+const latencies = [];
+for (const viewer of viewers) {
+  const exclude = new Set([viewer.userId]);
+  for (let i = 0; i < SWIPED; i++) exclude.add(`user-${Math.floor(random() * USERS)}`);
+
+  started = performance.now();
+  const deck = index.rank(viewer, exclude, DECK_SIZE);
+  latencies.push(performance.now() - started);
+
+  if (deck.length !== DECK_SIZE || deck.some((c) => exclude.has(c.userId))) {
+    throw new Error(`Bad deck for ${viewer.userId}`);
+  }
+}
+
+latencies.sort((a, b) => a - b);
+const percentile = (p) => latencies[Math.min(latencies.length - 1, Math.floor(latencies.length * p))];
+
+console.log(`users:      ${USERS}`);
+console.log(`index:      ${buildMs.toFixed(0)} ms to encode, ${(USERS / buildMs).toFixed(0)} users/ms`);
+console.log(`rank p50:   ${percentile(0.5).toFixed(2)} ms per deck`);
+console.log(`rank p95:   ${percentile(0.95).toFixed(2)} ms per deck`);
+console.log(`rank max:   ${latencies[latencies.length - 1].toFixed(2)} ms per deck`);
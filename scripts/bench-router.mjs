@@ -0,0 +1,128 @@
+// Micro-benchmark: route table dispatch vs. the old sequential if-chain.
+//
+//   node scripts/bench-router.mjs [iterations]
+//
+// Both dispatchers resolve the same request mix to a route name; neither
+// touches Mongo, so the numbers are pure dispatch cost per request.
+
+import { createRouter } from '../lib/router.js';
+
+const ROUTES = [
+  ['POST', 'auth/register'],
+  ['POST', 'auth/login'],
+  ['POST', 'auth/logout'],
+  ['GET', 'auth/me'],
+  ['PUT', 'profile'],
+  ['GET', 'profile'],
+  ['GET', 'explore/people'],
+  ['POST', 'swipe'],
+  ['POST', 'posts'],
+  ['GET', 'explore/:type'],
+  ['GET', 'random-project'],
+  ['GET', 'matches'],
+  ['GET', 'inquiries'],
+  ['PATCH', 'inquiries/:id'],
+  ['GET', 'conversations'],
+  ['POST', 'conversations'],
+  ['GET', 'conversations/:id/messages'],
+  ['POST', 'messages'],
+  ['GET', 'posts/my-posts'],
+  ['PUT', 'posts/:id'],
+  ['DELETE', 'posts/:id'],
+  ['GET', 'notifications'],
+  ['POST', 'dummy-data'],
+  ['GET', 'streak'],
+  ['GET', 'overview']
+];
+
+// Replica of the pre-router handleAuth checks, in their original order.
+function linearDispatch(method, segments) {
+  const path = segments.join('/');
+  if (path === 'auth/register' && method === 'POST') return 'auth/register';
+  if (path === 'auth/login' && method === 'POST') return 'auth/login';
+  if (path === 'auth/logout' && method === 'POST') return 'auth/logout';
+  if (path === 'auth/me' && method === 'GET') return 'auth/me';
+  if (path === 'profile' && method === 'PUT') return 'profile';
+  if (path === 'profile' && method === 'GET') return 'profile';
+  if (path === 'explore/people' && method === 'GET') return 'explore/people';
+  if (path === 'swipe' && method === 'POST') return 'swipe';
+  if (path === 'posts' && method === 'POST') return 'posts';
+  if (path.startsWith('explore/') && method === 'GET') return 'explore/:type';
+  if (path === 'random-project' && method === 'GET') return 'random-project';
+  if (path === 'matches' && method === 'GET') return 'matches';
+  if (path === 'inquiries' && method === 'GET') return 'inquiries';
+  if (path.startsWith('inquiries/') && method === 'PATCH') return 'inquiries/:id';
+  if (path === 'conversations' && method === 'GET') return 'conversations';
+  if (path === 'conversations' && method === 'POST') return 'conversations';
+  if (path.startsWith('conversations/') && path.includes('/messages') && method === 'GET') return 'conversations/:id/messages';
+  if (path === 'messages' && method === 'POST') return 'messages';
+  if (path === 'posts/my-posts' && method === 'GET') return 'posts/my-posts';
+  if (path.startsWith('posts/') && method === 'PUT') return 'posts/:id';
+  if (path.startsWith('posts/') && method === 'DELETE') return 'posts/:id';
+  if (path === 'notifications' && method === 'GET') return 'notifications';
+  if (path === 'dummy-data' && method === 'POST') return 'dummy-data';
+  if (path === 'streak' && method === 'GET') return 'streak';
+  if (path === 'overview' && method === 'GET') return 'overview';
+  return null;
+}
+
+const id = '3f0c1a6e-8d52-4c1b-9b7e-2f4d6a8c0e11';
+const REQUESTS = [
+  ['GET', ['auth', 'me']],
+  ['GET', ['explore', 'people']],
+  ['GET', ['explore', 'hackathons']],
+  ['GET', ['explore', 'projects']],
+  ['POST', ['swipe']],
+  ['POST', ['swipe']],
+  ['POST', ['swipe']],
+  ['GET', ['matches']],
+  ['GET', ['conversations']],
+  ['GET', ['conversations', id, 'messages']],
+  ['POST', ['messages']],
+  ['GET', ['notifications']],
+  ['GET', ['overview']],
+  ['PATCH', ['inquiries', id]],
+  ['DELETE', ['posts', id]],
+  ['GET', ['does', 'not', 'exist']]
+];
+
+const router = createRouter();
+for (const [method, pattern] of ROUTES) {
+  router.add(method, pattern, () => pattern);
+}
+
+function routerDispatch(method, segments) {
+  const matched = router.match(method, segments);
+  return matched ? matched.route.pattern : null;
+}
+
+for (const [method, segments] of REQUESTS) {
+  const expected = linearDispatch(method, segments);
+  const actual = routerDispatch(method, segments);
+  if (expected !== actual) {
+    throw new Error(`Dispatch mismatch for ${method} ${segments.join('/')}: ${expected} != ${actual}`);
+  }
+}
+
+function bench(name, dispatch, iterations) {
+  let sink = 0;
+  for (let i = 0; i < 10000; i++) {
+    const [method, segments] = REQUESTS[i % REQUESTS.length];
+    if (dispatch(method, segments)) sink++;
+  }
+
+  const start = process.hrtime.bigint();
+  for (let i = 0; i < iterations; i++) {
+    const [method, segments] = REQUESTS[i % REQUESTS.length];
+    if (dispatch(method, segments)) sink++;
+  }
+  const elapsed = Number(process.hrtime.bigint() - start);
+
+  console.log(`${name.padEnd(12)} ${(elapsed / iterations).toFixed(1).padStart(8)} ns/request`);
+  return sink;
+}
+
+const iterations = Number(process.argv[2]) || 2000000;
+console.log(`Dispatching ${iterations} requests over ${REQUESTS.length} request shapes`);
+bench('if-chain', linearDispatch, iterations);
+bench('route table', routerDispatch, iterations);
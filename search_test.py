@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+
+import requests
+import json
+import sys
+import os
+import time
+import random
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from harness_metrics import ServerTimingCollector
+
+# Configuration
+BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
+TEST_USER_EMAIL = "search.test.user@example.com"
+TEST_USER_PASSWORD = "testpass123"
+TEST_USER_NAME = "Search Test User"
+
+# Generated corpus, inserted directly when MONGO_URL and pymongo are available
+SEARCH_POSTS = int(os.environ.get("SEARCH_POSTS", "50000"))
+SEARCH_PROFILES = int(os.environ.get("SEARCH_PROFILES", "20000"))
+# Posts created through the API when there is no database access
+SEARCH_API_POSTS = int(os.environ.get("SEARCH_API_POSTS", "40"))
+SEARCH_SECONDS = float(os.environ.get("SEARCH_SECONDS", "20"))
+SEARCH_WORKERS = int(os.environ.get("SEARCH_WORKERS", "8"))
+GENERATED_PREFIX = "search-gen-"
+
+MONGO_URL = os.environ.get("MONGO_URL")
+DB_NAME = os.environ.get("DB_NAME", "hackathon_tinder")
+
+try:
+    import pymongo
+except ImportError:
+    pymongo = None
+
+DOMAINS = ["climate", "healthcare", "education", "fintech", "gaming", "accessibility", "agriculture", "energy",
+           "transit", "music", "privacy", "robotics", "satellite", "wildlife", "housing", "logistics"]
+THINGS = ["platform", "assistant", "tracker", "marketplace", "dashboard", "simulator", "toolkit", "network",
+          "sensor", "chatbot", "pipeline", "visualizer"]
+VERBS = ["building", "prototyping", "scaling", "designing", "shipping", "researching", "open-sourcing"]
+SKILLS = ["React", "Python", "PyTorch", "Rust", "Go", "Solidity", "Figma", "Kubernetes", "TypeScript", "Swift",
+          "PostgreSQL", "GraphQL", "Unity", "Flutter", "TensorFlow", "Docker"]
+ROLES = ["Frontend Developer", "Backend Engineer", "ML Engineer", "Product Designer", "Data Scientist",
+         "Mobile Developer", "DevOps Engineer", "Researcher"]
+# Appears in about 0.1% of generated posts
+RARE_WORD = "bioluminescence"
+
+# (kind, type, query) mix issued by the throughput benchmark
+QUERY_MIX = [
+    ("single term", "all", "climate"),
+    ("single term", "posts", "robotics"),
+    ("two terms", "all", "healthcare assistant"),
+    ("two terms", "people", "rust engineer"),
+    ("phrase", "posts", '"satellite tracker"'),
+    ("skill", "all", "PyTorch"),
+    ("negation", "posts", "gaming -unity"),
+    ("rare term", "all", RARE_WORD),
+    ("no match", "all", "zzyzx"),
+]
+
+
+def generate_post(rng, i):
+    domain, thing, verb = rng.choice(DOMAINS), rng.choice(THINGS), rng.choice(VERBS)
+    notes = (f"We are {verb} a {domain} {thing} for {rng.choice(DOMAINS)} teams. "
+             f"Looking for people who enjoy {rng.choice(DOMAINS)} problems and {rng.choice(THINGS)} work.")
+    if i % 1000 == 0:
+        notes += f" Bonus track on {RARE_WORD}."
+    now = datetime.utcnow()
+    return {
+        "id": f"{GENERATED_PREFIX}{i}",
+        "type": "PROJECT" if i % 3 else "HACKATHON",
+        "leaderId": f"{GENERATED_PREFIX}leader-{i % 500}",
+        "title": f"{domain.title()} {thing.title()}",
+        "location": "Remote",
+        "websiteUrl": None,
+        "skillsNeeded": rng.sample(SKILLS, rng.randint(2, 5)),
+        "notes": notes,
+        "status": "OPEN",
+        "visibility": "PUBLIC",
+        "createdAt": now,
+        "updatedAt": now
+    }
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] if values else 0
+
+
+class SearchTester:
+    def __init__(self):
+        self.session = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session)
+        self.auth_token = None
+        self.db = None
+        self.test_results = []
+
+    def log_result(self, test_name, success, message, details=None):
+        """Log test result"""
+        status = "✅ PASS" if success else "❌ FAIL"
+        result = {
+            "test": test_name,
+            "status": status,
+            "message": message,
+            "details": details,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.test_results.append(result)
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+
+    def setup_test_user(self):
+        """Register or log in the searcher"""
+        try:
+            response = self.session.post(f"{BASE_URL}/auth/register", json={
+                "email": TEST_USER_EMAIL,
+                "password": TEST_USER_PASSWORD,
+                "name": TEST_USER_NAME
+            })
+            if response.status_code == 400 and "already exists" in response.text:
+                response = self.session.post(f"{BASE_URL}/auth/login", json={
+                    "email": TEST_USER_EMAIL,
+                    "password": TEST_USER_PASSWORD
+                })
+            if response.status_code != 200:
+                self.log_result("User Setup", False, f"Authentication failed: {response.status_code}")
+                return False
+
+            self.auth_token = response.json().get('token')
+            self.session.headers.update({'Authorization': f'Bearer {self.auth_token}'})
+            if MONGO_URL and pymongo:
+                self.db = pymongo.MongoClient(MONGO_URL)[DB_NAME]
+            self.log_result("User Setup", True, "Searcher authenticated")
+            return True
+
+        except Exception as e:
+            self.log_result("User Setup", False, f"Setup error: {str(e)}")
+            return False
+
+    def seed_corpus(self):
+        """Generate SEARCH_POSTS posts and SEARCH_PROFILES people, or a few posts via the API"""
+        try:
+            print("\n🔄 Seeding Search Corpus...")
+            rng = random.Random(11)
+
+            if self.db is None:
+                for i in range(SEARCH_API_POSTS):
+                    post = generate_post(rng, i)
+                    self.session.post(f"{BASE_URL}/posts", json={
+                        key: post[key] for key in ("type", "title", "location", "skillsNeeded", "notes")
+                    })
+                self.log_result("Seed Corpus", True, f"No database access: {SEARCH_API_POSTS} posts via the API")
+                return True
+
+            started = time.perf_counter()
+            existing = self.db['posts'].count_documents({"id": {"$regex": f"^{GENERATED_PREFIX}"}})
+            batch = []
+            for i in range(existing, SEARCH_POSTS):
+                batch.append(generate_post(rng, i))
+                if len(batch) == 5000:
+                    self.db['posts'].insert_many(batch, ordered=False)
+                    batch = []
+            if batch:
+                self.db['posts'].insert_many(batch, ordered=False)
+
+            existing_people = self.db['users'].count_documents({"id": {"$regex": f"^{GENERATED_PREFIX}user-"}})
+            now = datetime.utcnow()
+            users, profiles = [], []
+            for i in range(existing_people, SEARCH_PROFILES):
+                user_id = f"{GENERATED_PREFIX}user-{i}"
+                users.append({
+                    "id": user_id, "email": f"search.gen.{i}@example.com", "name": f"Searchable Person {i}",
+                    "username": f"search_gen_{i}", "passwordHash": "!", "imageUrl": None,
+                    "roleHeadline": rng.choice(ROLES), "location": None, "timezone": None,
+                    "createdAt": now, "updatedAt": now
+                })
+                profiles.append({
+                    "id": str(uuid.uuid4()), "userId": user_id,
+                    "bio": f"{rng.choice(VERBS).capitalize()} {rng.choice(DOMAINS)} {rng.choice(THINGS)}s",
+                    "skills": rng.sample(SKILLS, rng.randint(2, 6)), "interests": [],
+                    "revision": 1, "createdAt": now, "updatedAt": now
+                })
+                if len(users) == 5000:
+                    self.db['users'].insert_many(users, ordered=False)
+                    self.db['profiles'].insert_many(profiles, ordered=False)
+                    users, profiles = [], []
+            if users:
+                self.db['users'].insert_many(users, ordered=False)
+                self.db['profiles'].insert_many(profiles, ordered=False)
+
+            self.log_result("Seed Corpus", True, f"{SEARCH_POSTS} posts and {SEARCH_PROFILES} people "
+                                                 f"(seeded in {time.perf_counter() - started:.1f}s)")
+            return True
+
+        except Exception as e:
+            self.log_result("Seed Corpus", False, f"Seeding error: {str(e)}")
+            return False
+
+    def test_relevance_and_highlights(self):
+        """Test that a post with a unique word ranks first and its highlights mark the word"""
+        try:
+            print("\n🔄 Testing Relevance and Highlighting...")
+            word = f"quokka{uuid.uuid4().hex[:6]}"
+            response = self.session.post(f"{BASE_URL}/posts", json={
+                "type": "PROJECT",
+                "title": f"Quokka {word} tracker",
+                "location": "Remote",
+                "skillsNeeded": ["Python"],
+                "notes": f"Counting {word} sightings with camera traps. " * 10
+            })
+            if response.status_code != 200:
+                self.log_result("Relevance", False, f"Post creation failed: {response.status_code}")
+                return False
+            post_id = response.json()['post']['id']
+
+            results = self.session.get(f"{BASE_URL}/search", params={"q": f"{word} python"}).json().get('results', [])
+            if not results or results[0].get('post', {}).get('id') != post_id:
+                self.log_result("Relevance", False, "Post with the unique word did not rank first",
+                              [r.get('post', r.get('person', {})).get('id') for r in results[:3]])
+                return False
+
+            highlights = {h['field']: h for h in results[0]['highlights']}
+            title = highlights.get('title')
+            notes = highlights.get('notes')
+            marked = title and any(title['text'][s:e] == word for s, e in title['matches'])
+            if not marked or not notes or not notes['truncated'] or len(notes['text']) > 200:
+                self.log_result("Relevance", False, "Highlights missing or not marking the word", highlights)
+                return False
+
+            self.log_result("Relevance", True, f"Unique post ranked first; title and notes snippet highlighted "
+                                               f"({len(notes['matches'])} notes matches)")
+            return True
+
+        except Exception as e:
+            self.log_result("Relevance", False, f"Error: {str(e)}")
+            return False
+
+    def test_pagination(self):
+        """Test that pages do not overlap and scores never increase across pages"""
+        try:
+            print("\n🔄 Testing Search Pagination...")
+            seen, scores, pages = set(), [], 0
+            for page in range(1, 4):
+                body = self.session.get(f"{BASE_URL}/search",
+                                        params={"q": "climate", "type": "posts", "page": page, "limit": 10}).json()
+                ids = [r['post']['id'] for r in body.get('results', [])]
+                if seen & set(ids):
+                    self.log_result("Pagination", False, f"Page {page} repeats earlier results")
+                    return False
+                seen.update(ids)
+                scores.extend(r['score'] for r in body.get('results', []))
+                pages += 1
+                if not body.get('hasMore'):
+                    break
+
+            invalid = [self.session.get(f"{BASE_URL}/search", params=params).status_code
+                       for params in ({}, {"q": "x", "type": "teams"}, {"q": "x", "limit": 500}, {"q": "x", "page": 0})]
+
+            if scores != sorted(scores, reverse=True):
+                self.log_result("Pagination", False, "Scores increase across pages")
+                return False
+            if any(code != 400 for code in invalid):
+                self.log_result("Pagination", False, f"Invalid parameters returned {invalid}")
+                return False
+            self.log_result("Pagination", True, f"{len(seen)} distinct results over {pages} pages; bad params → 400")
+            return True
+
+        except Exception as e:
+            self.log_result("Pagination", False, f"Error: {str(e)}")
+            return False
+
+    def test_throughput(self):
+        """Issue QUERY_MIX from SEARCH_WORKERS threads for SEARCH_SECONDS and report QPS"""
+        try:
+            print(f"\n🔄 Measuring Search Throughput ({SEARCH_WORKERS} workers, {SEARCH_SECONDS:.0f}s)...")
+            deadline = time.perf_counter() + SEARCH_SECONDS
+
+            def worker(seed):
+                http = requests.Session()
+                http.headers.update({'Authorization': f'Bearer {self.auth_token}'})
+                rng = random.Random(seed)
+                samples = []
+                while time.perf_counter() < deadline:
+                    kind, search_type, q = rng.choice(QUERY_MIX)
+                    started = time.perf_counter()
+                    response = http.get(f"{BASE_URL}/search", params={"q": q, "type": search_type})
+                    samples.append((kind, (time.perf_counter() - started) * 1000, response.status_code))
+                return samples
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=SEARCH_WORKERS) as pool:
+                samples = [s for batch in pool.map(worker, range(SEARCH_WORKERS)) for s in batch]
+            elapsed = time.perf_counter() - started
+
+            errors = [s for s in samples if s[2] != 200]
+            print(f"{'query kind':<14}{'count':>7}{'p50 ms':>9}{'p95 ms':>9}")
+            for kind in dict.fromkeys(k for k, _, _ in QUERY_MIX):
+                latencies = [ms for k, ms, _ in samples if k == kind]
+                print(f"{kind:<14}{len(latencies):>7}{percentile(latencies, 0.5):>9.1f}{percentile(latencies, 0.95):>9.1f}")
+
+            qps = len(samples) / elapsed
+            if errors:
+                self.log_result("Search Throughput", False, f"{len(errors)}/{len(samples)} searches failed",
+                              errors[:5])
+                return False
+            self.log_result("Search Throughput", True, f"{len(samples)} searches, {qps:.1f} QPS, "
+                                                       f"p95 {percentile([ms for _, ms, _ in samples], 0.95):.1f}ms")
+            return True
+
+        except Exception as e:
+            self.log_result("Search Throughput", False, f"Error: {str(e)}")
+            return False
+
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+
+    def run_all_tests(self):
+        """Run all search tests"""
+        print("🚀 Starting Search Testing...")
+        print("=" * 60)
+
+        if not self.setup_test_user():
+            print("❌ Cannot proceed without authentication")
+            return False
+
+        tests = [
+            self.seed_corpus,
+            self.test_relevance_and_highlights,
+            self.test_pagination,
+            self.test_throughput,
+            self.check_query_budgets
+        ]
+
+        passed_tests = 0
+        total_tests = len(tests)
+
+        for test in tests:
+            try:
+                if test():
+                    passed_tests += 1
+            except Exception as e:
+                print(f"❌ Test {test.__name__} failed with exception: {str(e)}")
+
+        # Summary
+        print("\n" + "=" * 60)
+        print(f"📊 SEARCH TEST SUMMARY")
+        print(f"Passed: {passed_tests}/{total_tests}")
+        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+
+        if passed_tests == total_tests:
+            print("🎉 All search tests passed!")
+            return True
+        else:
+            print(f"⚠️  {total_tests - passed_tests} test(s) failed")
+            return False
+
+if __name__ == "__main__":
+    tester = SearchTester()
+    success = tester.run_all_tests()
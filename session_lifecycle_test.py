@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+
+import requests
+import json
+import sys
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from harness_metrics import ServerTimingCollector
+
+# Configuration
+BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
+TEST_USER_EMAIL = "session.soak.user@example.com"
+TEST_USER_PASSWORD = "testpass123"
+TEST_USER_NAME = "Session Soak User"
+
+# Must match the server's SESSION_MAX_PER_USER
+SESSION_MAX_PER_USER = int(os.environ.get("SESSION_MAX_PER_USER", "10"))
+SOAK_LOGINS = int(os.environ.get("SOAK_LOGINS", "100000"))
+SOAK_WORKERS = int(os.environ.get("SOAK_WORKERS", "16"))
+SOAK_CHECKPOINTS = 10
+
+# Optional direct database access for counting sessions
+MONGO_URL = os.environ.get("MONGO_URL")
+DB_NAME = os.environ.get("DB_NAME", "hackathon_tinder")
+
+try:
+    import pymongo
+except ImportError:
+    pymongo = None
+
+class SessionLifecycleTester:
+    def __init__(self):
+        self.session = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session)
+        self.auth_token = None
+        self.user_id = None
+        self.db = None
+        self.test_results = []
+
+    def log_result(self, test_name, success, message, details=None):
+        """Log test result"""
+        status = "✅ PASS" if success else "❌ FAIL"
+        result = {
+            "test": test_name,
+            "status": status,
+            "message": message,
+            "details": details,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.test_results.append(result)
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+
+    def login(self, http=None):
+        """Login the test user and return a fresh token"""
+        response = (http or requests).post(f"{BASE_URL}/auth/login", json={
+            "email": TEST_USER_EMAIL,
+            "password": TEST_USER_PASSWORD
+        })
+        if response.status_code == 200:
+            return response.json().get('token')
+        return None
+
+    def is_valid(self, token):
+        """Check whether a token still authenticates"""
+        response = requests.get(f"{BASE_URL}/auth/me", headers={'Authorization': f'Bearer {token}'})
+        return response.status_code == 200
+
+    def count_sessions(self):
+        """Return (user sessions, total sessions), or None without database access"""
+        if self.db is None:
+            return None
+        sessions = self.db['sessions']
+        return sessions.count_documents({'userId': self.user_id}), sessions.estimated_document_count()
+
+    def setup_test_user(self):
+        """Register and login test user"""
+        try:
+            response = self.session.post(f"{BASE_URL}/auth/register", json={
+                "email": TEST_USER_EMAIL,
+                "password": TEST_USER_PASSWORD,
+                "name": TEST_USER_NAME
+            })
+
+            if response.status_code == 200:
+                data = response.json()
+            elif response.status_code == 400 and "already exists" in response.text:
+                login_response = self.session.post(f"{BASE_URL}/auth/login", json={
+                    "email": TEST_USER_EMAIL,
+                    "password": TEST_USER_PASSWORD
+                })
+                if login_response.status_code != 200:
+                    self.log_result("User Setup", False, f"Login failed: {login_response.status_code}")
+                    return False
+                data = login_response.json()
+            else:
+                self.log_result("User Setup", False, f"Registration failed: {response.status_code}")
+                return False
+
+            self.auth_token = data.get('token')
+            self.user_id = data.get('user', {}).get('id')
+            if self.auth_token.startswith("s1."):
+                self.log_result("User Setup", False, "Server issues signed tokens; session storage is not exercised")
+                return False
+
+            if MONGO_URL and pymongo:
+                self.db = pymongo.MongoClient(MONGO_URL)[DB_NAME]
+                self.log_result("User Setup", True, "Test user authenticated, counting sessions in MongoDB")
+            else:
+                self.log_result("User Setup", True, "Test user authenticated, MONGO_URL/pymongo unavailable: checking via API only")
+            return True
+
+        except Exception as e:
+            self.log_result("User Setup", False, f"Setup error: {str(e)}")
+            return False
+
+    def test_ttl_index(self):
+        """Test that sessions carry a TTL index on expiresAt"""
+        try:
+            print("\n🔄 Testing Session TTL Index...")
+
+            if self.db is None:
+                self.log_result("Session TTL Index", True, "Skipped: no database access")
+                return True
+
+            for index in self.db['sessions'].list_indexes():
+                if index['key'] == {'expiresAt': 1} and index.get('expireAfterSeconds') == 0:
+                    self.log_result("Session TTL Index", True, f"Found TTL index {index['name']}")
+                    return True
+
+            self.log_result("Session TTL Index", False, "No expireAfterSeconds index on sessions.expiresAt")
+            return False
+
+        except Exception as e:
+            self.log_result("Session TTL Index", False, f"Error: {str(e)}")
+            return False
+
+    def test_per_user_cap(self):
+        """Test that only the newest SESSION_MAX_PER_USER sessions stay valid"""
+        try:
+            print(f"\n🔄 Testing Per-User Session Cap ({SESSION_MAX_PER_USER})...")
+
+            tokens = [self.login() for _ in range(SESSION_MAX_PER_USER + 3)]
+            if not all(tokens):
+                self.log_result("Per-User Session Cap", False, "Some logins failed")
+                return False
+
+            evicted = [token for token in tokens[:3] if self.is_valid(token)]
+            kept = [token for token in tokens[3:] if not self.is_valid(token)]
+
+            if not evicted and not kept:
+                self.log_result("Per-User Session Cap", True,
+                              f"Oldest 3 sessions evicted, newest {SESSION_MAX_PER_USER} still valid")
+                return True
+
+            self.log_result("Per-User Session Cap", False,
+                          f"{len(evicted)} old sessions still valid, {len(kept)} new sessions rejected")
+            return False
+
+        except Exception as e:
+            self.log_result("Per-User Session Cap", False, f"Error: {str(e)}")
+            return False
+
+    def test_soak_logins(self):
+        """Perform SOAK_LOGINS logins and verify the sessions collection stays bounded"""
+        try:
+            print(f"\n🔄 Soak Testing {SOAK_LOGINS} Logins ({SOAK_WORKERS} workers)...")
+
+            baseline = self.count_sessions()
+            chunk = max(1, SOAK_LOGINS // SOAK_CHECKPOINTS)
+            completed = 0
+            failures = 0
+            peak_user_sessions = 0
+            started = time.perf_counter()
+
+            # One HTTP session per worker keeps connections alive across logins
+            http_sessions = [requests.Session() for _ in range(SOAK_WORKERS)]
+
+            with ThreadPoolExecutor(max_workers=SOAK_WORKERS) as pool:
+                while completed < SOAK_LOGINS:
+                    batch = min(chunk, SOAK_LOGINS - completed)
+                    tokens = list(pool.map(lambda i: self.login(http_sessions[i % SOAK_WORKERS]), range(batch)))
+                    failures += sum(1 for token in tokens if not token)
+                    completed += batch
+
+                    counts = self.count_sessions()
+                    rate = completed / (time.perf_counter() - started)
+                    if counts:
+                        peak_user_sessions = max(peak_user_sessions, counts[0])
+                        print(f"   {completed} logins, {rate:.0f}/s, user sessions {counts[0]}, total sessions {counts[1]}")
+                    else:
+                        print(f"   {completed} logins, {rate:.0f}/s")
+
+            if failures:
+                self.log_result("Session Soak", False, f"{failures}/{SOAK_LOGINS} logins failed")
+                return False
+
+            final = self.count_sessions()
+            if final is None:
+                # Without database access the cap is checked through the API
+                return self.test_per_user_cap()
+
+            # Concurrent logins can briefly overshoot the cap before eviction runs
+            bound = SESSION_MAX_PER_USER + SOAK_WORKERS
+            growth = final[1] - baseline[1]
+            if final[0] <= SESSION_MAX_PER_USER and peak_user_sessions <= bound and growth <= SESSION_MAX_PER_USER:
+                self.log_result("Session Soak", True,
+                              f"{SOAK_LOGINS} logins left {final[0]} user sessions "
+                              f"(peak {peak_user_sessions}), total grew by {growth}")
+                return True
+
+            self.log_result("Session Soak", False,
+                          f"Sessions unbounded: user {final[0]} (peak {peak_user_sessions}), total grew by {growth}")
+            return False
+
+        except Exception as e:
+            self.log_result("Session Soak", False, f"Error: {str(e)}")
+            return False
+
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+
+    def run_all_tests(self):
+        """Run all session lifecycle tests"""
+        print("🚀 Starting Session Lifecycle Testing...")
+        print("=" * 60)
+
+        if not self.setup_test_user():
+            print("❌ Cannot proceed without authentication")
+            return False
+
+        tests = [
+            self.test_ttl_index,
+            self.test_per_user_cap,
+            self.test_soak_logins,
+            self.check_query_budgets
+        ]
+
+        passed_tests = 0
+        total_tests = len(tests)
+
+        for test in tests:
+            try:
+                if test():
+                    passed_tests += 1
+            except Exception as e:
+                print(f"❌ Test {test.__name__} failed with exception: {str(e)}")
+
+        # Summary
+        print("\n" + "=" * 60)
+        print(f"📊 SESSION LIFECYCLE TEST SUMMARY")
+        print(f"Passed: {passed_tests}/{total_tests}")
+        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+
+        if passed_tests == total_tests:
+            print("🎉 All session lifecycle tests passed!")
+            return True
+        else:
+            print(f"⚠️  {total_tests - passed_tests} test(s) failed")
+            return False
+
+if __name__ == "__main__":
+    tester = SessionLifecycleTester()
+    success = tester.run_all_tests()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+
+import requests
+import json
+import sys
+import os
+import time
+import base64
+import hmac
+import hashlib
+import uuid
+from datetime import datetime
+from harness_metrics import ServerTimingCollector
+
+# Configuration
+BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
+TEST_USER_EMAIL = "session.test.user@example.com"
+TEST_USER_PASSWORD = "testpass123"
+TEST_USER_NAME = "Session Test User"
+
+# Only needed to mint expired tokens; must match the server's SESSION_SIGNING_KEYS
+SESSION_SIGNING_KEYS = os.environ.get("SESSION_SIGNING_KEYS", "")
+THROUGHPUT_REQUESTS = int(os.environ.get("THROUGHPUT_REQUESTS", "200"))
+
+class SessionTokensTester:
+    def __init__(self):
+        self.session = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session)
+        self.auth_token = None
+        self.token_mode = None
+        self.test_results = []
+
+    def log_result(self, test_name, success, message, details=None):
+        """Log test result"""
+        status = "✅ PASS" if success else "❌ FAIL"
+        result = {
+            "test": test_name,
+            "status": status,
+            "message": message,
+            "details": details,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.test_results.append(result)
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+
+    def login(self):
+        """Login the test user and return a fresh token"""
+        response = requests.post(f"{BASE_URL}/auth/login", json={
+            "email": TEST_USER_EMAIL,
+            "password": TEST_USER_PASSWORD
+        })
+        if response.status_code == 200:
+            return response.json().get('token')
+        return None
+
+    def get_me(self, token):
+        """Call auth/me with the given bearer token"""
+        return requests.get(f"{BASE_URL}/auth/me", headers={'Authorization': f'Bearer {token}'})
+
+    def setup_test_user(self):
+        """Register and login test user"""
+        try:
+            response = self.session.post(f"{BASE_URL}/auth/register", json={
+                "email": TEST_USER_EMAIL,
+                "password": TEST_USER_PASSWORD,
+                "name": TEST_USER_NAME
+            })
+
+            if response.status_code == 200:
+                self.auth_token = response.json().get('token')
+            elif response.status_code == 400 and "already exists" in response.text:
+                self.auth_token = self.login()
+
+            if not self.auth_token:
+                self.log_result("User Setup", False, f"Could not obtain a session token: {response.status_code}")
+                return False
+
+            self.session.headers.update({'Authorization': f'Bearer {self.auth_token}'})
+            self.token_mode = "signed" if self.auth_token.startswith("s1.") else "database"
+            self.log_result("User Setup", True, f"Test user authenticated ({self.token_mode} session tokens)")
+            return True
+
+        except Exception as e:
+            self.log_result("User Setup", False, f"Setup error: {str(e)}")
+            return False
+
+    def test_token_accepted(self):
+        """Test that a freshly issued token authenticates"""
+        try:
+            print("\n🔄 Testing Fresh Token Authentication...")
+
+            response = self.get_me(self.auth_token)
+            if response.status_code == 200 and response.json().get('user', {}).get('email') == TEST_USER_EMAIL:
+                self.log_result("Fresh Token", True, "auth/me accepted the issued token")
+                return True
+
+            self.log_result("Fresh Token", False, f"auth/me returned {response.status_code}", response.text)
+            return False
+
+        except Exception as e:
+            self.log_result("Fresh Token", False, f"Error: {str(e)}")
+            return False
+
+    def test_tampered_token_rejected(self):
+        """Test that forged or modified tokens are rejected"""
+        try:
+            print("\n🔄 Testing Tampered Token Rejection...")
+
+            forged = [("Random Token", str(uuid.uuid4()))]
+            if self.token_mode == "signed":
+                version, kid, payload, signature = self.auth_token.split('.')
+                claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+                claims['exp'] = claims['exp'] + 365 * 24 * 60 * 60 * 1000
+                extended = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip('=')
+                flipped = signature[:-1] + ('A' if signature[-1] != 'A' else 'B')
+                forged.append(("Flipped Signature", f"{version}.{kid}.{payload}.{flipped}"))
+                forged.append(("Extended Expiry", f"{version}.{kid}.{extended}.{signature}"))
+                forged.append(("Unknown Key", f"{version}.no-such-key.{payload}.{signature}"))
+
+            all_rejected = True
+            for name, token in forged:
+                response = self.get_me(token)
+                if response.status_code == 401:
+                    self.log_result(f"Tampered Token - {name}", True, "Rejected with 401")
+                else:
+                    self.log_result(f"Tampered Token - {name}", False, f"Expected 401, got {response.status_code}")
+                    all_rejected = False
+
+            return all_rejected
+
+        except Exception as e:
+            self.log_result("Tampered Token", False, f"Error: {str(e)}")
+            return False
+
+    def test_expired_token_rejected(self):
+        """Test that a correctly signed but expired token is rejected"""
+        try:
+            print("\n🔄 Testing Expired Token Rejection...")
+
+            if self.token_mode != "signed":
+                self.log_result("Expired Token", True, "Skipped: server issues database session tokens")
+                return True
+
+            kid, _, secret = SESSION_SIGNING_KEYS.split(',')[0].partition(':')
+            if not secret:
+                self.log_result("Expired Token", True, "Skipped: SESSION_SIGNING_KEYS not set for the harness")
+                return True
+
+            payload = self.auth_token.split('.')[2]
+            claims = json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))
+            claims['exp'] = int(time.time() * 1000) - 1000
+            claims['jti'] = str(uuid.uuid4())
+            payload = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip('=')
+            body = f"s1.{kid.strip()}.{payload}"
+            signature = base64.urlsafe_b64encode(
+                hmac.new(secret.strip().encode(), body.encode(), hashlib.sha256).digest()
+            ).decode().rstrip('=')
+
+            response = self.get_me(f"{body}.{signature}")
+            if response.status_code == 401:
+                self.log_result("Expired Token", True, "Expired signed token rejected with 401")
+                return True
+
+            self.log_result("Expired Token", False, f"Expected 401, got {response.status_code}")
+            return False
+
+        except Exception as e:
+            self.log_result("Expired Token", False, f"Error: {str(e)}")
+            return False
+
+    def test_logout_revocation(self):
+        """Test that logout revokes only the logged-out token"""
+        try:
+            print("\n🔄 Testing Logout Revocation...")
+
+            token = self.login()
+            if not token or self.get_me(token).status_code != 200:
+                self.log_result("Logout Revocation", False, "Could not obtain a working second token")
+                return False
+
+            logout_response = requests.post(f"{BASE_URL}/auth/logout", headers={'Authorization': f'Bearer {token}'})
+            if logout_response.status_code != 200:
+                self.log_result("Logout Revocation", False, f"Logout failed: {logout_response.status_code}")
+                return False
+
+            revoked_status = self.get_me(token).status_code
+            other_status = self.get_me(self.auth_token).status_code
+
+            if revoked_status == 401 and other_status == 200:
+                self.log_result("Logout Revocation", True, "Logged-out token rejected, other session unaffected")
+                return True
+
+            self.log_result("Logout Revocation", False,
+                          f"Revoked token returned {revoked_status}, other session returned {other_status}")
+            return False
+
+        except Exception as e:
+            self.log_result("Logout Revocation", False, f"Error: {str(e)}")
+            return False
+
+    def test_auth_throughput(self):
+        """Measure authenticated request throughput for the server's session mode"""
+        try:
+            print(f"\n🔄 Measuring auth/me Throughput ({THROUGHPUT_REQUESTS} requests)...")
+
+            latencies = []
+            started = time.perf_counter()
+            for _ in range(THROUGHPUT_REQUESTS):
+                request_started = time.perf_counter()
+                response = self.session.get(f"{BASE_URL}/auth/me")
+                latencies.append((time.perf_counter() - request_started) * 1000)
+                if response.status_code != 200:
+                    self.log_result("Auth Throughput", False, f"auth/me returned {response.status_code}")
+                    return False
+            elapsed = time.perf_counter() - started
+
+            latencies.sort()
+            p50 = latencies[len(latencies) // 2]
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            self.log_result("Auth Throughput", True,
+                          f"{self.token_mode} mode: {THROUGHPUT_REQUESTS / elapsed:.1f} req/s, "
+                          f"p50 {p50:.1f}ms, p95 {p95:.1f}ms")
+            return True
+
+        except Exception as e:
+            self.log_result("Auth Throughput", False, f"Error: {str(e)}")
+            return False
+
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+
+    def run_all_tests(self):
+        """Run all session token tests"""
+        print("🚀 Starting Session Token Testing...")
+        print("=" * 60)
+
+        if not self.setup_test_user():
+            print("❌ Cannot proceed without authentication")
+            return False
+
+        tests = [
+            self.test_token_accepted,
+            self.test_tampered_token_rejected,
+            self.test_expired_token_rejected,
+            self.test_logout_revocation,
+            self.test_auth_throughput,
+            self.check_query_budgets
+        ]
+
+        passed_tests = 0
+        total_tests = len(tests)
+
+        for test in tests:
+            try:
+                if test():
+                    passed_tests += 1
+            except Exception as e:
+                print(f"❌ Test {test.__name__} failed with exception: {str(e)}")
+
+        # Summary
+        print("\n" + "=" * 60)
+        print(f"📊 SESSION TOKEN TEST SUMMARY ({self.token_mode} mode)")
+        print(f"Passed: {passed_tests}/{total_tests}")
+        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+        print("ℹ️  Run once with SESSION_MODE=database and once with SESSION_MODE=signed on the server to compare throughput")
+
+        if passed_tests == total_tests:
+            print("🎉 All session token tests passed!")
+            return True
+        else:
+            print(f"⚠️  {total_tests - passed_tests} test(s) failed")
+            return False
+
+if __name__ == "__main__":
+    tester = SessionTokensTester()
+    success = tester.run_all_tests()
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+
+import requests
+import json
+import sys
+import os
+import time
+import random
+import uuid
+from datetime import datetime
+from harness_metrics import ServerTimingCollector, parse_server_timing
+
+# Configuration
+BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
+TEST_USER_EMAIL = "filter.test.user@example.com"
+POSTER_EMAIL = "filter.test.poster@example.com"
+TEST_USER_PASSWORD = "testpass123"
+
+# Generated posts, inserted directly when MONGO_URL and pymongo are available
+FILTER_POSTS = int(os.environ.get("FILTER_POSTS", "100000"))
+FILTER_REQUESTS = int(os.environ.get("FILTER_REQUESTS", "30"))
+# Posts created through the API when there is no database access
+FILTER_API_POSTS = int(os.environ.get("FILTER_API_POSTS", "40"))
+GENERATED_PREFIX = "filter-gen-"
+
+MONGO_URL = os.environ.get("MONGO_URL")
+DB_NAME = os.environ.get("DB_NAME", "hackathon_tinder")
+
+try:
+    import pymongo
+except ImportError:
+    pymongo = None
+
+# Display name -> interned id, as lib/skill-taxonomy.js interns them
+SKILL_IDS = {
+    "JavaScript": "javascript", "TypeScript": "typescript", "React": "react", "Vue.js": "vue",
+    "Node.js": "nodejs", "Python": "python", "Go": "go", "Java": "java", "Swift": "swift",
+    "PostgreSQL": "postgresql", "MongoDB": "mongodb", "Redis": "redis", "AWS": "aws", "Docker": "docker",
+    "Kubernetes": "kubernetes", "PyTorch": "pytorch", "TensorFlow": "tensorflow", "Figma": "figma",
+    "GraphQL": "graphql", "Solidity": "solidity", "Unity": "unity", "Flutter": "flutter",
+}
+# In 1% of generated posts
+RARE_SKILL = ("Rust", "rust")
+
+# name -> query parameters; each filtered deck is checked against `expect`
+SCENARIOS = [
+    ("unfiltered", {}, None),
+    ("common skill", {"skills": "javascript"}, lambda ids: "javascript" in ids),
+    ("rare skill", {"skills": "Rust"}, lambda ids: "rust" in ids),
+    ("alias, any of two", {"skills": "react.js,golang"}, lambda ids: "react" in ids or "go" in ids),
+    ("all of two", {"skills": "Python,Torch", "match": "all"}, lambda ids: {"python", "pytorch"} <= set(ids)),
+]
+
+
+def generate_post(rng, i):
+    names = rng.sample(list(SKILL_IDS), rng.randint(2, 6))
+    skill_ids = [SKILL_IDS[name] for name in names]
+    if i % 100 == 0:
+        names.append(RARE_SKILL[0])
+        skill_ids.append(RARE_SKILL[1])
+    now = datetime.utcnow()
+    return {
+        "id": f"{GENERATED_PREFIX}{i}",
+        "type": "PROJECT" if i % 2 == 0 else "HACKATHON",
+        "leaderId": f"{GENERATED_PREFIX}leader-{i % 500}",
+        "title": f"Generated Project {i}",
+        "location": "Remote",
+        "websiteUrl": None,
+        "skillsNeeded": names,
+        "skillIds": skill_ids,
+        "notes": "Generated for skill filter benchmarks",
+        "status": "OPEN",
+        "visibility": "PUBLIC",
+        "createdAt": now,
+        "updatedAt": now
+    }
+
+
+class SkillFilterTester:
+    def __init__(self):
+        self.session = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session)
+        self.poster = requests.Session()
+        self.auth_token = None
+        self.poster_id = None
+        self.db = None
+        self.test_results = []
+
+    def log_result(self, test_name, success, message, details=None):
+        """Log test result"""
+        status = "✅ PASS" if success else "❌ FAIL"
+        result = {
+            "test": test_name,
+            "status": status,
+            "message": message,
+            "details": details,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.test_results.append(result)
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+
+    def authenticate(self, session, email, name):
+        """Register or log in `email` on `session`; returns the user or None"""
+        response = session.post(f"{BASE_URL}/auth/register", json={
+            "email": email,
+            "password": TEST_USER_PASSWORD,
+            "name": name
+        })
+        if response.status_code == 400 and "already exists" in response.text:
+            response = session.post(f"{BASE_URL}/auth/login", json={
+                "email": email,
+                "password": TEST_USER_PASSWORD
+            })
+        if response.status_code != 200:
+            return None
+        session.headers.update({'Authorization': f"Bearer {response.json().get('token')}"})
+        return response.json().get('user')
+
+    def setup_test_user(self):
+        """Authenticate the viewer and a second user who owns the alias fixtures"""
+        try:
+            viewer = self.authenticate(self.session, TEST_USER_EMAIL, "Filter Test User")
+            poster = self.authenticate(self.poster, POSTER_EMAIL, "Filter Test Poster")
+            if not viewer or not poster:
+                self.log_result("User Setup", False, "Authentication failed")
+                return False
+            self.auth_token = self.session.headers['Authorization']
+            self.poster_id = poster['id']
+
+            if MONGO_URL and pymongo:
+                self.db = pymongo.MongoClient(MONGO_URL)[DB_NAME]
+            self.log_result("User Setup", True, "Viewer and poster authenticated")
+            return True
+
+        except Exception as e:
+            self.log_result("User Setup", False, f"Setup error: {str(e)}")
+            return False
+
+    def test_alias_normalization(self):
+        """Test that spelling variants of a skill find the same posts and people"""
+        try:
+            print("\n🔄 Testing Skill Alias Normalization...")
+            marker = f"Quantum-Annealing {uuid.uuid4().hex[:8]}"
+            marker_query = marker.lower().replace("-", " ")
+
+            response = self.poster.post(f"{BASE_URL}/posts", json={
+                "type": "PROJECT",
+                "title": "Alias fixture",
+                "location": "Remote",
+                "skillsNeeded": ["React.js", marker]
+            })
+            if response.status_code != 200:
+                self.log_result("Alias Normalization", False, f"Post creation failed: {response.status_code}")
+                return False
+            post = response.json()['post']
+
+            profile_response = self.poster.put(f"{BASE_URL}/profile", json={
+                "bio": "Alias fixture",
+                "skills": ["Torch", marker],
+                "interests": ["Machine Learning"]
+            })
+            if profile_response.status_code != 200:
+                self.log_result("Alias Normalization", False, f"Profile update failed: {profile_response.status_code}")
+                return False
+
+            projects = self.session.get(f"{BASE_URL}/explore/projects", params={
+                "skills": f"ReactJS,{marker_query}", "match": "all", "view": "card"
+            }).json().get('posts', [])
+            people = self.session.get(f"{BASE_URL}/explore/people", params={
+                "skills": f"pytorch,{marker_query}", "interests": "AI/ML", "match": "all", "view": "card"
+            }).json().get('people', [])
+
+            checks = {
+                "Stored ids": post.get('skillIds', [None])[0] == "react",
+                "Post found by alias": any(p['id'] == post['id'] for p in projects),
+                "Person found by alias": any(p['id'] == self.poster_id for p in people),
+            }
+            failed = [name for name, ok in checks.items() if not ok]
+            if failed:
+                self.log_result("Alias Normalization", False, f"Failed checks: {', '.join(failed)}",
+                              {"skillIds": post.get('skillIds')})
+                return False
+
+            self.log_result("Alias Normalization", True,
+                          f"React.js/ReactJS and Torch/PyTorch resolve to one id ({post['skillIds']})")
+            return True
+
+        except Exception as e:
+            self.log_result("Alias Normalization", False, f"Error: {str(e)}")
+            return False
+
+    def test_ambiguous_aliases(self):
+        """Test that ambiguous abbreviations and broad words are not folded into one specific skill"""
+        try:
+            print("\n🔄 Testing Ambiguous Aliases...")
+            expected = {
+                "TF": "tf",
+                "TensorFlow": "tensorflow",
+                "Terraform": "terraform",
+                "CV": "cv",
+                "Computer Vision": "computervision",
+                "Security": "security",
+                "InfoSec": "cybersecurity",
+                "Next": "next",
+                "Next.js": "nextjs",
+                "Containers": "containers",
+                "AI": "ai",
+                "Artificial Intelligence": "artificialintelligence",
+                "Blockchain": "blockchain",
+                "Education": "education",
+                "Healthcare": "healthcare",
+                "Sustainability": "sustainability",
+            }
+            response = self.poster.post(f"{BASE_URL}/posts", json={
+                "type": "PROJECT",
+                "title": "Ambiguous alias fixture",
+                "location": "Remote",
+                "skillsNeeded": list(expected)
+            })
+            if response.status_code != 200:
+                self.log_result("Ambiguous Aliases", False, f"Post creation failed: {response.status_code}")
+                return False
+
+            got = dict(zip(expected, response.json()['post'].get('skillIds', [])))
+            if got != expected:
+                self.log_result("Ambiguous Aliases", False, "Skills folded into the wrong ids",
+                              {"got": got, "expected": expected})
+                return False
+            self.log_result("Ambiguous Aliases", True, f"{len(expected)} skills keep distinct ids")
+            return True
+
+        except Exception as e:
+            self.log_result("Ambiguous Aliases", False, f"Error: {str(e)}")
+            return False
+
+    def test_filter_validation(self):
+        """Test that malformed filters are rejected"""
+        try:
+            print("\n🔄 Testing Filter Validation...")
+            cases = {
+                "Unknown match": ("explore/projects", {"skills": "rust", "match": "some"}),
+                "Interests on posts": ("explore/hackathons", {"interests": "climate"}),
+                "Too many terms": ("explore/people", {"skills": ",".join(f"s{i}" for i in range(11))}),
+            }
+            failed = []
+            for name, (path, params) in cases.items():
+                response = self.session.get(f"{BASE_URL}/{path}", params=params)
+                if response.status_code != 400:
+                    failed.append(f"{name}: {response.status_code}")
+
+            if failed:
+                self.log_result("Filter Validation", False, f"Expected 400s: {', '.join(failed)}")
+                return False
+            self.log_result("Filter Validation", True, f"{len(cases)} malformed filters rejected with 400")
+            return True
+
+        except Exception as e:
+            self.log_result("Filter Validation", False, f"Error: {str(e)}")
+            return False
+
+    def seed_posts(self):
+        """Generate FILTER_POSTS posts in MongoDB, or FILTER_API_POSTS via the API"""
+        try:
+            print("\n🔄 Seeding Posts...")
+            rng = random.Random(42)
+
+            if self.db is None:
+                for i in range(FILTER_API_POSTS):
+                    post = generate_post(rng, i)
+                    self.poster.post(f"{BASE_URL}/posts", json={
+                        "type": post["type"],
+                        "title": post["title"],
+                        "location": post["location"],
+                        "skillsNeeded": post["skillsNeeded"]
+                    })
+                self.log_result("Seed Posts", True, f"No database access: {FILTER_API_POSTS} posts via the API")
+                return True
+
+            existing = self.db['posts'].count_documents({"id": {"$regex": f"^{GENERATED_PREFIX}"}})
+            started = time.perf_counter()
+            batch = []
+            for i in range(existing, FILTER_POSTS):
+                batch.append(generate_post(rng, i))
+                if len(batch) == 5000:
+                    self.db['posts'].insert_many(batch, ordered=False)
+                    batch = []
+            if batch:
+                self.db['posts'].insert_many(batch, ordered=False)
+
+            self.log_result("Seed Posts", True,
+                          f"{FILTER_POSTS} generated posts ({FILTER_POSTS - existing} inserted in "
+                          f"{time.perf_counter() - started:.1f}s)")
+            return True
+
+        except Exception as e:
+            self.log_result("Seed Posts", False, f"Seeding error: {str(e)}")
+            return False
+
+    def test_filtered_latency(self):
+        """Measure explore/projects latency per filter and check every card matches"""
+        try:
+            print(f"\n🔄 Measuring Filtered Deck Latency ({FILTER_REQUESTS} requests per filter)...")
+            print(f"{'filter':<20}{'p50 ms':>9}{'p95 ms':>9}{'db p50':>9}{'cards':>7}")
+
+            mismatches = []
+            for name, params, expect in SCENARIOS:
+                latencies, db_times, cards = [], [], 0
+                for _ in range(FILTER_REQUESTS):
+                    started = time.perf_counter()
+                    response = self.session.get(f"{BASE_URL}/explore/projects", params={**params, "view": "card"})
+                    latencies.append((time.perf_counter() - started) * 1000)
+                    if response.status_code != 200:
+                        self.log_result("Filtered Latency", False, f"{name}: explore/projects returned {response.status_code}")
+                        return False
+                    durations, _, _ = parse_server_timing(response.headers.get("Server-Timing", ""))
+                    if "db" in durations:
+                        db_times.append(durations["db"])
+                    posts = response.json().get('posts', [])
+                    cards = len(posts)
+                    if expect:
+                        mismatches.extend(f"{name}: {p['id']}" for p in posts if not expect(p.get('skillIds', [])))
+
+                latencies.sort()
+                db_times.sort()
+                db_p50 = f"{db_times[len(db_times) // 2]:.1f}" if db_times else "-"
+                print(f"{name:<20}{latencies[len(latencies) // 2]:>9.1f}"
+                      f"{latencies[int(len(latencies) * 0.95) - 1]:>9.1f}{db_p50:>9}{cards:>7}")
+
+            if mismatches:
+                self.log_result("Filtered Latency", False, f"{len(mismatches)} cards did not match their filter",
+                              mismatches[:5])
+                return False
+            self.log_result("Filtered Latency", True, f"{len(SCENARIOS)} filters measured; every card matched")
+            return True
+
+        except Exception as e:
+            self.log_result("Filtered Latency", False, f"Error: {str(e)}")
+            return False
+
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+
+    def run_all_tests(self):
+        """Run all skill filter tests"""
+        print("🚀 Starting Skill Filter Testing...")
+        print("=" * 60)
+
+        if not self.setup_test_user():
+            print("❌ Cannot proceed without authentication")
+            return False
+
+        tests = [
+            self.test_alias_normalization,
+            self.test_ambiguous_aliases,
+            self.test_filter_validation,
+            self.seed_posts,
+            self.test_filtered_latency,
+            self.check_query_budgets
+        ]
+
+        passed_tests = 0
+        total_tests = len(tests)
+
+        for test in tests:
+            try:
+                if test():
+                    passed_tests += 1
+            except Exception as e:
+                print(f"❌ Test {test.__name__} failed with exception: {str(e)}")
+
+        # Summary
+        print("\n" + "=" * 60)
+        print(f"📊 SKILL FILTER TEST SUMMARY")
+        print(f"Passed: {passed_tests}/{total_tests}")
+        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+        print("ℹ️  Posts and profiles written before skill ids existed: npm run backfill:skills")
+
+        if passed_tests == total_tests:
+            print("🎉 All skill filter tests passed!")
+            return True
+        else:
+            print(f"⚠️  {total_tests - passed_tests} test(s) failed")
+            return False
+
+if __name__ == "__main__":
+    tester = SkillFilterTester()
+    success = tester.run_all_tests()
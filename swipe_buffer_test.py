@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+
+import requests
+import json
+import sys
+import os
+import time
+import uuid
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from harness_metrics import ServerTimingCollector, parse_server_timing
+
+# Configuration
+BASE_URL = "https://projectswipe.preview.emergentagent.com/api"
+TEST_USER_EMAIL = "swipe.buffer.test.user@example.com"
+TEST_USER_PASSWORD = "testpass123"
+TEST_USER_NAME = "Swipe Buffer Test User"
+
+# Throughput comparison: swipes per direction and concurrent clients
+SWIPE_COUNT = int(os.environ.get("SWIPE_COUNT", "2000"))
+SWIPE_WORKERS = int(os.environ.get("SWIPE_WORKERS", "16"))
+# Crash test: swipes journaled by a process that is killed before flushing
+CRASH_SWIPES = int(os.environ.get("CRASH_SWIPES", "500"))
+
+MONGO_URL = os.environ.get("MONGO_URL")
+DB_NAME = os.environ.get("DB_NAME", "hackathon_tinder")
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+try:
+    import pymongo
+except ImportError:
+    pymongo = None
+
+# Journals CRASH_SWIPES swipes with flushing disabled, then kills itself
+CRASH_WRITER = """
+import { MongoClient } from 'mongodb';
+import { createSwipeBuffer } from './lib/swipe-buffer.js';
+
+const client = await new MongoClient(process.env.MONGO_URL).connect();
+const buffer = createSwipeBuffer({
+  dir: process.env.SWIPE_JOURNAL_DIR,
+  getCollection: async () => client.db(process.env.DB_NAME).collection('swipes'),
+  flushMs: 3600000,
+  maxBatch: 1000000
+});
+const count = Number(process.env.CRASH_SWIPES);
+await Promise.all(Array.from({ length: count }, (_, i) => buffer.enqueue({
+  id: `${process.env.CRASH_RUN}-${i}`,
+  swiperId: process.env.CRASH_RUN,
+  targetType: 'PERSON',
+  targetId: `crash-target-${i}`,
+  direction: 'LEFT',
+  createdAt: new Date()
+})));
+console.log(JSON.stringify({ acked: count }));
+process.kill(process.pid, 'SIGKILL');
+"""
+
+# Starts a fresh buffer on the same journal directory, which replays the
+# dead writer's journal on creation: no swipe is enqueued and ready() is only
+# read once the swipes are back. A live buffer in the same process (as after
+# a reload) journals swipes first; its journal must be left alone.
+CRASH_RECOVERY = """
+import { MongoClient } from 'mongodb';
+import { createSwipeBuffer } from './lib/swipe-buffer.js';
+
+const client = await new MongoClient(process.env.MONGO_URL).connect();
+const swipes = client.db(process.env.DB_NAME).collection('swipes');
+const options = { dir: process.env.SWIPE_JOURNAL_DIR, getCollection: async () => swipes };
+const peerRun = `${process.env.CRASH_RUN}-peer`;
+const peer = createSwipeBuffer({ ...options, flushMs: 3600000, maxBatch: 1000000 });
+await Promise.all(Array.from({ length: 10 }, (_, i) => peer.enqueue({
+  id: `${peerRun}-${i}`,
+  swiperId: peerRun,
+  targetType: 'PERSON',
+  targetId: `peer-target-${i}`,
+  direction: 'LEFT',
+  createdAt: new Date()
+})));
+
+const buffer = createSwipeBuffer(options);
+const deadline = Date.now() + 30000;
+while (await swipes.countDocuments({ swiperId: process.env.CRASH_RUN }) < Number(process.env.CRASH_SWIPES)
+    && Date.now() < deadline) {
+  await new Promise((resolve) => setTimeout(resolve, 50));
+}
+const recovered = await buffer.ready();
+const peerReplayed = await swipes.countDocuments({ swiperId: peerRun });
+const peerFlushed = await peer.flush();
+console.log(JSON.stringify({ recovered, peerReplayed, peerFlushed }));
+await client.close();
+"""
+
+class SwipeBufferTester:
+    def __init__(self):
+        self.session = requests.Session()
+        self.server_timing = ServerTimingCollector(BASE_URL)
+        self.server_timing.attach(self.session)
+        self.auth_token = None
+        self.test_results = []
+
+    def log_result(self, test_name, success, message, details=None):
+        """Log test result"""
+        status = "✅ PASS" if success else "❌ FAIL"
+        result = {
+            "test": test_name,
+            "status": status,
+            "message": message,
+            "details": details,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.test_results.append(result)
+        print(f"{status}: {test_name} - {message}")
+        if details and not success:
+            print(f"   Details: {details}")
+
+    def setup_test_user(self):
+        """Register or log in the swiping user"""
+        try:
+            response = self.session.post(f"{BASE_URL}/auth/register", json={
+                "email": TEST_USER_EMAIL,
+                "password": TEST_USER_PASSWORD,
+                "name": TEST_USER_NAME
+            })
+            if response.status_code == 400 and "already exists" in response.text:
+                response = self.session.post(f"{BASE_URL}/auth/login", json={
+                    "email": TEST_USER_EMAIL,
+                    "password": TEST_USER_PASSWORD
+                })
+            if response.status_code != 200:
+                self.log_result("User Setup", False, f"Authentication failed: {response.status_code}")
+                return False
+
+            self.auth_token = response.json().get('token')
+            self.session.headers.update({'Authorization': f'Bearer {self.auth_token}'})
+            self.log_result("User Setup", True, "Swiping user authenticated")
+            return True
+
+        except Exception as e:
+            self.log_result("User Setup", False, f"Setup error: {str(e)}")
+            return False
+
+    def test_left_swipe_visible_immediately(self):
+        """A buffered LEFT swipe blocks a repeat swipe and leaves the deck at once"""
+        try:
+            print("\n🔄 Testing Buffered Swipe Visibility...")
+            target = requests.post(f"{BASE_URL}/auth/register", json={
+                "email": f"swipe.buffer.target.{uuid.uuid4().hex[:12]}@example.com",
+                "password": TEST_USER_PASSWORD,
+                "name": "Swipe Buffer Target"
+            }).json()["user"]["id"]
+
+            response = self.session.post(f"{BASE_URL}/swipe", json={
+                "targetType": "PERSON", "targetId": target, "direction": "LEFT"
+            })
+            if response.status_code != 200:
+                self.log_result("Buffered Swipe Visibility", False, f"Swipe failed: {response.status_code}")
+                return False
+            _, _, counters = parse_server_timing(response.headers.get("Server-Timing", ""))
+            buffered = counters.get("swipes_buffered", 0) > 0
+
+            repeat = self.session.post(f"{BASE_URL}/swipe", json={
+                "targetType": "PERSON", "targetId": target, "direction": "LEFT"
+            })
+            deck = self.session.get(f"{BASE_URL}/explore/people", params={"view": "card"}).json().get("people", [])
+            in_deck = any(person["id"] == target for person in deck)
+
+            if repeat.status_code != 400 or in_deck:
+                self.log_result("Buffered Swipe Visibility", False,
+                              "Swipe not visible right after it was acknowledged",
+                              {"repeat_status": repeat.status_code, "in_deck": in_deck})
+                return False
+            self.log_result("Buffered Swipe Visibility", True,
+                          f"Repeat swipe rejected and target excluded from the deck (buffered: {buffered})")
+            return True
+
+        except Exception as e:
+            self.log_result("Buffered Swipe Visibility", False, f"Error: {str(e)}")
+            return False
+
+    def run_swipes(self, direction, count):
+        """POST `count` swipes on fresh targets from SWIPE_WORKERS clients; returns (seconds, latencies, failures)"""
+        headers = {'Authorization': f'Bearer {self.auth_token}'}
+        run = uuid.uuid4().hex[:8]
+
+        def worker(offset):
+            http = requests.Session()
+            http.headers.update(headers)
+            latencies, failures = [], 0
+            for i in range(offset, count, SWIPE_WORKERS):
+                started = time.perf_counter()
+                response = http.post(f"{BASE_URL}/swipe", json={
+                    "targetType": "PERSON", "targetId": f"bench-{run}-{i}", "direction": direction
+                })
+                latencies.append((time.perf_counter() - started) * 1000)
+                failures += response.status_code != 200
+            return latencies, failures
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=SWIPE_WORKERS) as pool:
+            results = list(pool.map(worker, range(SWIPE_WORKERS)))
+        elapsed = time.perf_counter() - started
+        return elapsed, sorted(l for latencies, _ in results for l in latencies), sum(f for _, f in results)
+
+    def test_throughput(self):
+        """Buffered LEFT swipes against synchronous RIGHT swipes"""
+        try:
+            print(f"\n🔄 Testing Swipe Throughput ({SWIPE_COUNT} per direction, {SWIPE_WORKERS} clients)...")
+            print(f"{'path':<24}{'swipes/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'failed':>8}")
+            rates = {}
+            failed = 0
+            for direction, label in (("RIGHT", "RIGHT (synchronous)"), ("LEFT", "LEFT (write-behind)")):
+                elapsed, latencies, failures = self.run_swipes(direction, SWIPE_COUNT)
+                rates[direction] = SWIPE_COUNT / elapsed
+                failed += failures
+                p50 = latencies[len(latencies) // 2]
+                p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+                print(f"{label:<24}{rates[direction]:>10.0f}{p50:>9.1f}{p95:>9.1f}{failures:>8}")
+
+            if failed:
+                self.log_result("Swipe Throughput", False, f"{failed} swipes failed")
+                return False
+            self.log_result("Swipe Throughput", True,
+                          f"LEFT {rates['LEFT']:.0f}/s vs RIGHT {rates['RIGHT']:.0f}/s "
+                          f"({rates['LEFT'] / rates['RIGHT']:.2f}x)")
+            return True
+
+        except Exception as e:
+            self.log_result("Swipe Throughput", False, f"Error: {str(e)}")
+            return False
+
+    def test_crash_safety(self):
+        """Every acknowledged swipe reaches Mongo after the process dies before flushing"""
+        if not (MONGO_URL and pymongo and shutil.which("node")):
+            print("ℹ️  Crash safety needs MONGO_URL, pymongo and node; skipped")
+            return True
+        journal = tempfile.mkdtemp(prefix="swipe-journal-")
+        run = f"crash-{uuid.uuid4().hex[:12]}"
+        swipes = pymongo.MongoClient(MONGO_URL)[DB_NAME]['swipes']
+        try:
+            print(f"\n🔄 Testing Crash Safety ({CRASH_SWIPES} journaled swipes)...")
+            env = {**os.environ, "SWIPE_JOURNAL_DIR": journal, "CRASH_RUN": run,
+                   "CRASH_SWIPES": str(CRASH_SWIPES), "DB_NAME": DB_NAME}
+            node = ["node", "--input-type=module", "-e"]
+
+            writer = subprocess.run(node + [CRASH_WRITER], cwd=REPO_DIR, env=env, capture_output=True, text=True, timeout=120)
+            acked = json.loads(writer.stdout.strip().splitlines()[-1])["acked"]
+            before = swipes.count_documents({"swiperId": run})
+
+            recovery = subprocess.run(node + [CRASH_RECOVERY], cwd=REPO_DIR, env=env, capture_output=True, text=True, timeout=120)
+            outcome = json.loads(recovery.stdout.strip().splitlines()[-1])
+            after = swipes.count_documents({"swiperId": run})
+            segments_left = [name for _, _, names in os.walk(journal) for name in names]
+
+            details = {"writer_exit": writer.returncode, "acked": acked, "in_mongo_before_recovery": before,
+                       "in_mongo_after_recovery": after, "segments_left": segments_left, **outcome}
+            if after != acked or segments_left:
+                self.log_result("Crash Safety", False, f"{acked - after} acknowledged swipes lost", details)
+                return False
+            if outcome["peerReplayed"] or outcome["peerFlushed"] != 10:
+                self.log_result("Crash Safety", False, "Recovery replayed a live buffer's journal", details)
+                return False
+            self.log_result("Crash Safety", True,
+                          f"Killed with {acked - before} swipes unflushed; all {acked} in Mongo after replay, "
+                          f"live buffer's journal left alone")
+            return True
+
+        except Exception as e:
+            self.log_result("Crash Safety", False, f"Error: {str(e)}")
+            return False
+        finally:
+            swipes.delete_many({"swiperId": {"$in": [run, f"{run}-peer"]}})
+            shutil.rmtree(journal, ignore_errors=True)
+
+    def check_query_budgets(self):
+        """Report queries-per-request and fail endpoints that regressed into N+1"""
+        return self.server_timing.check_budgets(self.log_result)
+
+    def run_all_tests(self):
+        """Run all swipe buffer tests"""
+        print("🚀 Starting Swipe Buffer Testing...")
+        print("=" * 60)
+
+        if not self.setup_test_user():
+            print("❌ Cannot proceed without authentication")
+            return False
+
+        tests = [
+            self.test_left_swipe_visible_immediately,
+            self.test_throughput,
+            self.test_crash_safety,
+            self.check_query_budgets
+        ]
+
+        passed_tests = 0
+        total_tests = len(tests)
+
+        for test in tests:
+            try:
+                if test():
+                    passed_tests += 1
+            except Exception as e:
+                print(f"❌ Test {test.__name__} failed with exception: {str(e)}")
+
+        # Summary
+        print("\n" + "=" * 60)
+        print(f"📊 SWIPE BUFFER TEST SUMMARY")
+        print(f"Passed: {passed_tests}/{total_tests}")
+        print(f"Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+
+        if passed_tests == total_tests:
+            print("🎉 All swipe buffer tests passed!")
+            return True
+        else:
+            print(f"⚠️  {total_tests - passed_tests} test(s) failed")
+            return False
+
+if __name__ == "__main__":
+    tester = SwipeBufferTester()
+    success = tester.run_all_tests()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""Swipe compaction job: folds old LEFT swipes into compressed per-user sets.
+
+LEFT swipes are only ever read back to keep their targets out of a user's
+decks, so once they are older than the raw window (SWIPE_RAW_WINDOW_DAYS)
+there is no reason to keep a document per card flip. This job streams them
+grouped by (swiperId, targetType), merges their target ids into that
+user's `swipeSets` documents ({swiperId, targetType, bucket, chunk, ids,
+count, updatedAt}, `ids` being the sorted ids newline-joined and
+zlib-deflated) and then deletes the raw documents. lib/swipe-sets.js
+decodes the sets for explore/*, likes, random-project and the repeat-swipe
+check; ids are spread over SWIPE_SET_BUCKETS buckets by hash so that check
+only inflates one of them.
+
+Sets are written before raw swipes are deleted, so a run that dies halfway
+leaves some ids in both places, which is harmless; the next run folds the
+rest. A set holds at most SWIPE_SET_MAX_IDS ids; larger buckets spill
+into further chunks. RIGHT swipes are never compacted.
+
+    python swipe_compaction_job.py
+    python swipe_compaction_job.py --benchmark 1000000
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+import zlib
+from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import groupby
+
+try:
+    import pymongo
+    from bson import Binary
+except ImportError:
+    pymongo = None
+
+MONGO_URL = os.environ.get("MONGO_URL")
+DB_NAME = os.environ.get("DB_NAME", "hackathon_tinder")
+
+RAW_WINDOW_DAYS = int(os.environ.get("SWIPE_RAW_WINDOW_DAYS", "30"))
+MAX_SET_IDS = int(os.environ.get("SWIPE_SET_MAX_IDS", "100000"))
+DELETE_BATCH = 5000
+INSERT_BATCH = 5000
+JOB_ID = "swipeCompaction"
+# Must match SWIPE_SET_BUCKETS in lib/swipe-sets.js
+SWIPE_SET_BUCKETS = 16
+COMPACTION_INDEX = [("direction", 1), ("swiperId", 1), ("targetType", 1), ("createdAt", 1)]
+
+
+def encode_ids(ids):
+    return zlib.compress("\n".join(sorted(ids)).encode("utf-8"), 6)
+
+
+def decode_ids(blob):
+    return [target for target in zlib.decompress(blob).decode("utf-8").split("\n") if target]
+
+
+def bucket_of(target_id):
+    """Swipe set bucket of a target id, as swipeSetBucket in lib/swipe-sets.js"""
+    return hashlib.md5(target_id.encode("utf-8")).digest()[0] >> 4
+
+
+def ensure_indexes(swipes, sets):
+    swipes.create_index(COMPACTION_INDEX)
+    sets.create_index([("swiperId", 1), ("targetType", 1), ("bucket", 1), ("chunk", 1)], unique=True)
+
+
+def merge_into_sets(sets, swiper_id, target_type, target_ids, now):
+    """Union `target_ids` into the last chunk of each of their buckets, spilling into new chunks"""
+    owner = {"swiperId": swiper_id, "targetType": target_type}
+    by_bucket = defaultdict(set)
+    for target in target_ids:
+        by_bucket[bucket_of(target)].add(target)
+
+    writes = []
+    for bucket, bucket_ids in by_bucket.items():
+        last = sets.find_one({**owner, "bucket": bucket}, sort=[("chunk", -1)])
+        first_chunk = last["chunk"] if last else 0
+        if last:
+            bucket_ids.update(decode_ids(last["ids"]))
+        ordered = sorted(bucket_ids)
+        for offset in range(0, len(ordered), MAX_SET_IDS):
+            part = ordered[offset:offset + MAX_SET_IDS]
+            writes.append(pymongo.UpdateOne(
+                {**owner, "bucket": bucket, "chunk": first_chunk + offset // MAX_SET_IDS},
+                {"$set": {"ids": Binary(encode_ids(part)), "count": len(part), "updatedAt": now}},
+                upsert=True))
+    if writes:
+        sets.bulk_write(writes, ordered=True)
+
+
+def has_compacted(sets, swiper_id, target_type, target_id):
+    """The repeat-swipe check of lib/swipe-sets.js: inflates only the target's bucket"""
+    docs = sets.find({"swiperId": swiper_id, "targetType": target_type,
+                      "bucket": bucket_of(target_id)}, {"_id": 0, "ids": 1})
+    return any(target_id in decode_ids(doc["ids"]) for doc in docs)
+
+
+def compact(swipes, sets, cutoff):
+    """Fold LEFT swipes created before `cutoff`; returns (swipes folded, swiper/type groups)"""
+    now = datetime.utcnow()
+    cursor = (swipes.find({"direction": "LEFT", "createdAt": {"$lt": cutoff}},
+                          {"swiperId": 1, "targetType": 1, "targetId": 1})
+              .sort([("swiperId", 1), ("targetType", 1)])
+              .hint(COMPACTION_INDEX)
+              .batch_size(10000))
+
+    folded = groups = 0
+    for (swiper_id, target_type), docs in groupby(cursor, key=lambda doc: (doc["swiperId"], doc["targetType"])):
+        groups += 1
+        target_ids, object_ids = [], []
+        for doc in docs:
+            target_ids.append(doc["targetId"])
+            object_ids.append(doc["_id"])
+            if len(target_ids) == MAX_SET_IDS:
+                merge_into_sets(sets, swiper_id, target_type, target_ids, now)
+                delete_raw(swipes, object_ids)
+                folded += len(target_ids)
+                target_ids, object_ids = [], []
+        if target_ids:
+            merge_into_sets(sets, swiper_id, target_type, target_ids, now)
+            delete_raw(swipes, object_ids)
+            folded += len(target_ids)
+    return folded, groups
+
+
+def delete_raw(swipes, object_ids):
+    for start in range(0, len(object_ids), DELETE_BATCH):
+        swipes.delete_many({"_id": {"$in": object_ids[start:start + DELETE_BATCH]}})
+
+
+def run_job():
+    if pymongo is None:
+        print("❌ swipe_compaction_job.py needs pymongo")
+        return False
+    if not MONGO_URL:
+        print("❌ MONGO_URL is not set")
+        return False
+
+    db = pymongo.MongoClient(MONGO_URL)[DB_NAME]
+    ensure_indexes(db["swipes"], db["swipeSets"])
+    cutoff = datetime.utcnow() - timedelta(days=RAW_WINDOW_DAYS)
+
+    started = time.perf_counter()
+    folded, groups = compact(db["swipes"], db["swipeSets"], cutoff)
+    print(f"✅ Folded {folded} LEFT swipes older than {RAW_WINDOW_DAYS} days into {groups} swipe sets "
+          f"in {time.perf_counter() - started:.1f}s")
+
+    db["jobState"].update_one({"_id": JOB_ID}, {"$set": {
+        "cutoff": cutoff,
+        "finishedAt": datetime.utcnow(),
+        "folded": folded
+    }}, upsert=True)
+    return True
+
+
+TARGET_TYPES = [("PERSON", 0.6), ("PROJECT", 0.25), ("HACKATHON", 0.15)]
+
+
+def generate_swipes(swipes, total, seed=42):
+    """Insert `total` swipes over 180 days with a heavy tail of prolific swipers; returns swiper ids by volume"""
+    rng = random.Random(seed)
+    users = [f"bench-swiper-{i}" for i in range(max(100, total // 500))]
+    weights = [1 / (rank + 1) ** 0.9 for rank in range(len(users))]
+    types, type_weights = zip(*TARGET_TYPES)
+    now = datetime.utcnow()
+
+    batch = []
+    for swiper_id in rng.choices(users, weights, k=total):
+        batch.append({
+            "id": str(uuid.uuid4()),
+            "swiperId": swiper_id,
+            "targetType": rng.choices(types, type_weights)[0],
+            "targetId": str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            "direction": "LEFT" if rng.random() < 0.8 else "RIGHT",
+            "createdAt": now - timedelta(seconds=rng.uniform(0, 180 * 86400))
+        })
+        if len(batch) == INSERT_BATCH:
+            swipes.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        swipes.insert_many(batch, ordered=False)
+    return users
+
+
+def storage(db, name):
+    """(documents, data bytes, data + index bytes on disk)"""
+    stats = db.command("collStats", name)
+    return stats["count"], stats["size"], stats["storageSize"] + stats["totalIndexSize"]
+
+
+def exclusion_latency(swipes, sets, swiper_ids, repeats=5):
+    """Median ms to load each heavy swiper's PERSON exclusion list, and its length"""
+    timings, sizes = [], []
+    for swiper_id in swiper_ids:
+        for _ in range(repeats):
+            started = time.perf_counter()
+            ids = [doc["targetId"] for doc in swipes.find(
+                {"swiperId": swiper_id, "targetType": "PERSON"}, {"_id": 0, "targetId": 1})]
+            for doc in sets.find({"swiperId": swiper_id, "targetType": "PERSON"}, {"_id": 0, "ids": 1}):
+                ids.extend(decode_ids(doc["ids"]))
+            timings.append((time.perf_counter() - started) * 1000)
+        sizes.append(len(ids))
+    return statistics.median(timings), statistics.median(sizes)
+
+
+def swipe_check_latency(swipes, sets, swiper_ids, repeats=5):
+    """Median ms of POST swipe's repeat check for a target not yet swiped: bucketed, and inflating every set
+
+    A miss is the worst case for both, since no set can stop the scan early.
+    """
+    bucketed, full = [], []
+    for swiper_id in swiper_ids:
+        for _ in range(repeats):
+            target_id = str(uuid.uuid4())
+            started = time.perf_counter()
+            swipes.find_one({"swiperId": swiper_id, "targetType": "PERSON", "targetId": target_id})
+            has_compacted(sets, swiper_id, "PERSON", target_id)
+            bucketed.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            swipes.find_one({"swiperId": swiper_id, "targetType": "PERSON", "targetId": target_id})
+            any(target_id in decode_ids(doc["ids"]) for doc in sets.find(
+                {"swiperId": swiper_id, "targetType": "PERSON"}, {"_id": 0, "ids": 1}))
+            full.append((time.perf_counter() - started) * 1000)
+    return statistics.median(bucketed), statistics.median(full)
+
+
+def benchmark(sizes, keep=False):
+    """Storage, exclusion-list and swipe-check latency before and after compaction, on scratch collections"""
+    if pymongo is None or not MONGO_URL:
+        print("❌ The benchmark needs pymongo and MONGO_URL")
+        return False
+
+    db = pymongo.MongoClient(MONGO_URL)[DB_NAME]
+    swipes, sets = db["bench_swipes"], db["bench_swipeSets"]
+    print(f"{'swipes':>9}  {'stage':<10}{'raw docs':>10}{'set docs':>10}{'data MB':>9}{'disk MB':>9}"
+          f"{'B/swipe':>9}{'heavy load ms':>15}{'ids':>8}{'check ms':>10}{'full-scan ms':>14}")
+    for total in sizes:
+        swipes.drop()
+        sets.drop()
+        swipes.create_index([("swiperId", 1), ("targetType", 1)])
+        ensure_indexes(swipes, sets)
+        heavy = generate_swipes(swipes, total)[:10]
+
+        def report(stage):
+            raw_count, raw_data, raw_disk = storage(db, "bench_swipes")
+            set_count, set_data, set_disk = storage(db, "bench_swipeSets") if stage == "compacted" else (0, 0, 0)
+            latency, ids = exclusion_latency(swipes, sets, heavy)
+            check, full_scan = swipe_check_latency(swipes, sets, heavy)
+            data, disk = raw_data + set_data, raw_disk + set_disk
+            print(f"{total:>9}  {stage:<10}{raw_count:>10}{set_count:>10}{data / 1e6:>9.1f}{disk / 1e6:>9.1f}"
+                  f"{data / total:>9.1f}{latency:>15.2f}{ids:>8.0f}{check:>10.2f}{full_scan:>14.2f}")
+
+        report("raw")
+        started = time.perf_counter()
+        folded, groups = compact(swipes, sets, datetime.utcnow() - timedelta(days=RAW_WINDOW_DAYS))
+        elapsed = time.perf_counter() - started
+        try:
+            # Deleted documents only give disk space back after a compact
+            db.command("compact", "bench_swipes")
+        except pymongo.errors.OperationFailure:
+            pass
+        report("compacted")
+        print(f"{'':>11}folded {folded} swipes into {groups} sets in {elapsed:.1f}s "
+              f"({folded / elapsed:.0f} swipes/s)")
+        if not keep:
+            swipes.drop()
+            sets.drop()
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--benchmark", type=int, nargs="*", metavar="SWIPES",
+                        help="compare storage, load and swipe-check latency on generated swipes (default 1000000)")
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark collections")
+    args = parser.parse_args()
+
+    if args.benchmark is not None:
+        return benchmark(args.benchmark or [1000000], keep=args.keep)
+    return run_job()
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)